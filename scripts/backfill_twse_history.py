@@ -5,15 +5,38 @@ Backfill TWSE daily index series for roll25_cache, up to N trading days.
 
 Design goals (audit-first):
 - No guessing. If fetch/parse fails => exit non-zero.
-- Deterministic: you tell me the end date and limit; we walk backwards day by day.
-- Rate-limit friendly: retry with backoff (2s,4s,8s).
+- Deterministic: you tell me the end date and limit; we walk backwards month by month.
+- Rate-limit friendly: bounded concurrency + shared rate limit + retry with backoff (2s,4s,8s).
 - Output:
   - roll25_cache/roll25.json (merged, newest-first, dedup by date)
+  - roll25_cache/roll25_store.npz + roll25_derived.npz (uncapped columnar history, scripts/roll25_store.py;
+    rows already in the store keep their non-None fields when a backfilled row has None)
   - roll25_cache/latest_report.json (optional: you can re-run update_twse_sidecar.py after backfill)
 
-Notes:
-- This script assumes you have a TWSE endpoint that can query a specific date via `date=YYYYMMDD`.
-- If your environment cannot access those endpoints, it will fail loudly.
+Sources (same monthly endpoints as update_twse_sidecar.py --backfill-months; templates from
+roll25_cache/twse_schema.json["backfill"], placeholder {yyyymm01}):
+  FMTQIK        -> date, trade_value, close, change   (required)
+  MI_5MINS_HIST -> date, high, low, close             (optional; degrade to None)
+Each payload is one calendar month, so a 252-day backfill needs ~13 months x 2 = ~26 requests
+(the old day-by-day walk issued 2 requests per calendar day, weekends/holidays included).
+
+Raw payloads go through scripts/twse_client.py (pooled session, global rate limit, on-disk cache in
+TWSE_HTTP_CACHE_DIR, default .twse_http_cache):
+- A closed month (last day < today in TZ) is looked up in / stored to the cache; since it is only
+  stored once closed, the stored payload is complete and the client treats it as immutable.
+- The still-open month (end month of a run, rows still being appended) bypasses the cache entirely
+  (_month_closed guard): it is never stored, so it can never be reused as immutable after month end.
+- Only stat == OK payloads are cached, so an error/empty page is never pinned.
+A rerun after an interrupted backfill therefore resumes from the months already on disk.
+
+Env:
+  BACKFILL_LIMIT       trading days wanted (default 252)
+  BACKFILL_END_DATE    YYYY-MM-DD (default: today in TZ)
+  BACKFILL_JOBS        concurrent month fetches (default 4)
+  BACKFILL_MAX_MONTHS  safety cap on months scanned (default 40)
+  TZ                   default Asia/Taipei
+
+Exit codes: 1 = schema/FMTQIK fetch failure, 2 = 0 usable days, 3 = dedupe failure.
 """
 
 from __future__ import annotations
@@ -21,24 +44,38 @@ from __future__ import annotations
 import json
 import os
 import sys
-import time
-import re
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
 from zoneinfo import ZoneInfo
 
+from update_twse_sidecar import (
+    FmtRow,
+    OhlcRow,
+    _load_schema,
+    _merge_roll,
+    _month_add,
+    _month_yyyymm01,
+    _parse_twse_monthly_fmtqik,
+    _parse_twse_monthly_ohlc,
+)
+import roll25_store
+from twse_client import get_client, month_period_end, stat_ok
+
 CACHE_DIR = "roll25_cache"
 ROLL25_PATH = os.path.join(CACHE_DIR, "roll25.json")
+STORE_PATH, DERIVED_PATH = roll25_store.store_paths(CACHE_DIR)
+
+# ~21 trading days per month; first wave asks for limit/MIN_DAYS_PER_MONTH months, then extends
+MIN_DAYS_PER_MONTH = 20
 
-# --- Candidate endpoints (date-parameterized) ---
-# You may need to adjust these if TWSE changes formats.
-FMTQIK_URL_TMPL = "https://www.twse.com.tw/exchangeReport/FMTQIK?response=json&date={yyyymmdd}"
-MI_5MINS_HIST_URL_TMPL = "https://www.twse.com.tw/indicesReport/MI_5MINS_HIST?response=json&date={yyyymmdd}"
+UA = "twse-backfill/2.0 (+github-actions)"
 
-UA = "twse-backfill/1.0 (+github-actions)"
+ENDPOINTS = {
+    "fmtqik": ("fmtqik_url_tpl", _parse_twse_monthly_fmtqik),
+    "mi_5mins_hist": ("mi_5mins_hist_url_tpl", _parse_twse_monthly_ohlc),
+}
 
 # ---------- helpers ----------
 
@@ -60,150 +97,74 @@ def _atomic_write(path: str, obj: Any) -> None:
         json.dump(obj, f, ensure_ascii=False, indent=2, sort_keys=False)
     os.replace(tmp, path)
 
-def _safe_float(x: Any) -> Optional[float]:
-    if x is None:
-        return None
-    if isinstance(x, (int, float)):
-        return float(x)
-    s = str(x).strip()
-    if s == "" or s.upper() == "NA" or s.lower() == "null":
-        return None
-    s = s.replace(",", "")
-    try:
-        return float(s)
-    except Exception:
-        return None
-
-def _safe_int(x: Any) -> Optional[int]:
-    f = _safe_float(x)
-    if f is None:
-        return None
-    try:
-        return int(round(f))
-    except Exception:
-        return None
-
-def _yyyymmdd(d: date) -> str:
-    return d.strftime("%Y%m%d")
-
-def _iso(d: date) -> str:
-    return d.isoformat()
-
-def _http_get_json(url: str, timeout: int = 25) -> Any:
-    headers = {"Accept": "application/json", "User-Agent": UA}
-    # retry w/ backoff
-    for i, sleep_s in enumerate([0, 2, 4, 8], start=1):
-        if sleep_s:
-            time.sleep(sleep_s)
-        try:
-            r = requests.get(url, headers=headers, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            last = (i == 4)
-            print(f"[WARN] GET failed (try {i}/4): {url} err={e}")
-            if last:
-                raise
-    raise RuntimeError("unreachable")
-
-def _unwrap_rows(payload: Any) -> List[Dict[str, Any]]:
-    # common TWSE json patterns
-    if isinstance(payload, dict):
-        for k in ("data", "result", "records", "items", "aaData", "dataset"):
-            v = payload.get(k)
-            if isinstance(v, list):
-                return [x for x in v if isinstance(x, (dict, list, tuple, str, int, float))]
-    if isinstance(payload, list):
-        return payload  # might be list-of-dicts or list-of-lists
-    return []
-
-def _find_number_in_row(row: Any, idx: int) -> Optional[float]:
-    # row may be list-like
-    try:
-        if isinstance(row, (list, tuple)) and idx < len(row):
-            return _safe_float(row[idx])
-    except Exception:
-        return None
-    return None
-
-# ---------- parsing (best-effort but strict failure on "no usable") ----------
-
-@dataclass
-class Daily:
-    date_iso: str
-    close: Optional[float]
-    change: Optional[float]
-    trade_value: Optional[int]
-    high: Optional[float]
-    low: Optional[float]
-
-def _parse_fmtqik_one_day(payload: Any, target_iso: str) -> Tuple[Optional[float], Optional[float], Optional[int]]:
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, str(default)).strip() or str(default))
+
+def _month_closed(yyyymm01: str, today: date) -> bool:
+    """True once the month's last calendar day is before today: its payload can no longer change."""
+    return month_period_end(yyyymm01) < today
+
+def _http_get_json(url: str, yyyymm01: str, today: date, info: Dict[str, Any], timeout: int = 25) -> Any:
+    # retry w/ backoff (2s,4s,8s); closed months come from the shared twse_client payload cache,
+    # the open month is always fetched and never stored (a partial month must not outlive month end)
+    return get_client().get_json(
+        url,
+        headers={"Accept": "application/json", "User-Agent": UA},
+        timeout=timeout,
+        max_tries=4,
+        backoffs=(2, 4, 8),
+        period_end=month_period_end(yyyymm01),
+        cacheable=stat_ok,
+        use_cache=_month_closed(yyyymm01, today),
+        info=info,
+    )
+
+# ---------- month fetch (bounded pool) ----------
+
+def _fetch_month(schema: Dict[str, Any], endpoint: str, yyyymm01: str, today: date) -> Tuple[List[Any], str]:
     """
-    Return (close, change, trade_value) for target date.
-    This is strict: if we cannot locate target date info, return (None,None,None).
+    Return (parsed rows, source) for one endpoint-month; source = "cache" / "http".
+    Raises on HTTP failure.
     """
-    rows = _unwrap_rows(payload)
-
-    # TWSE website json often returns list-of-lists under 'data'
-    # If list-of-lists: we must infer columns; that varies. We'll try a few patterns.
-    if isinstance(payload, dict) and isinstance(payload.get("data"), list):
-        data = payload["data"]
-        # Try find date column present in each row
-        for row in data:
-            if not isinstance(row, (list, tuple)):
-                continue
-            # Look for YYYY/MM/DD or YYYY-MM-DD in any cell
-            row_str = " ".join([str(x) for x in row])
-            if target_iso in row_str or target_iso.replace("-", "/") in row_str:
-                # Heuristic indexes are not guaranteed; so we fail unless we can identify numbers safely.
-                # Minimal safe approach: extract first 3 numeric-like fields after the date cell.
-                nums = [ _safe_float(x) for x in row if _safe_float(x) is not None ]
-                # Expect at least close and trade value; if not enough, treat as unusable.
-                if len(nums) < 2:
-                    return (None, None, None)
-
-                # We cannot safely know which is which without schema. So: refuse to guess.
-                return (None, None, None)
-
-    # If list-of-dicts style: try keys
-    if isinstance(payload, list):
-        dict_rows = [r for r in payload if isinstance(r, dict)]
-        for r in dict_rows:
-            d = str(r.get("Date") or r.get("date") or r.get("日期") or "").strip()
-            # normalize
-            if d == target_iso or d.replace("/", "-") == target_iso:
-                close = _safe_float(r.get("TAIEX") or r.get("Close") or r.get("close") or r.get("收盤指數") or r.get("收盤"))
-                chg = _safe_float(r.get("Change") or r.get("change") or r.get("漲跌點數") or r.get("漲跌"))
-                tv = _safe_int(r.get("TradeValue") or r.get("tradeValue") or r.get("成交金額"))
-                return (close, chg, tv)
-
-    return (None, None, None)
-
-def _parse_ohlc_one_day(payload: Any, target_iso: str) -> Tuple[Optional[float], Optional[float]]:
+    tpl_key, parser = ENDPOINTS[endpoint]
+    url = schema["backfill"][tpl_key].format(yyyymm01=yyyymm01)
+    info: Dict[str, Any] = {}
+    rows = parser(_http_get_json(url, yyyymm01, today, info))
+    return rows, ("cache" if info.get("cache") == "hit" else "http")
+
+def _fetch_months(
+    schema: Dict[str, Any], months: List[str], jobs: int, today: date
+) -> Tuple[Dict[str, List[FmtRow]], Dict[str, List[OhlcRow]], Dict[str, int]]:
     """
-    Return (high, low). Strictly return None if cannot locate.
+    Fetch FMTQIK + MI_5MINS_HIST for every month in months with at most `jobs` requests in flight
+    (the client's global rate limit still spaces the actual requests).
+    FMTQIK failure => exit 1; MI_5MINS_HIST failure => [] for that month (degrade).
     """
-    if isinstance(payload, list):
-        dict_rows = [r for r in payload if isinstance(r, dict)]
-        for r in dict_rows:
-            d = str(r.get("Date") or r.get("date") or r.get("日期") or "").strip()
-            if d == target_iso or d.replace("/", "-") == target_iso:
-                high = _safe_float(r.get("HighestIndex") or r.get("High") or r.get("high") or r.get("最高") or r.get("最高價"))
-                low  = _safe_float(r.get("LowestIndex") or r.get("Low")  or r.get("low")  or r.get("最低") or r.get("最低價"))
-                return (high, low)
-
-    # TWSE website json may also be dict with "data": list-of-lists
-    if isinstance(payload, dict) and isinstance(payload.get("data"), list):
-        data = payload["data"]
-        for row in data:
-            if not isinstance(row, (list, tuple)):
-                continue
-            row_str = " ".join([str(x) for x in row])
-            if target_iso in row_str or target_iso.replace("-", "/") in row_str:
-                # Cannot safely map columns without schema => refuse guessing
-                return (None, None)
+    tasks = [(ep, m) for m in months for ep in ENDPOINTS]
+    counts = {"cache": 0, "http": 0, "failed": 0}
 
-    return (None, None)
+    def _one(task: Tuple[str, str]) -> Tuple[str, str, List[Any], str, Optional[BaseException]]:
+        ep, m = task
+        try:
+            rows, src = _fetch_month(schema, ep, m, today)
+            return ep, m, rows, src, None
+        except Exception as e:
+            return ep, m, [], "failed", e
+
+    fmt: Dict[str, List[FmtRow]] = {}
+    ohlc: Dict[str, List[OhlcRow]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for ep, m, rows, src, err in pool.map(_one, tasks):
+            counts[src] += 1
+            if err is not None:
+                if ep == "fmtqik":
+                    print(f"[ERROR] FMTQIK fetch failed for month={m}: {err}")
+                    sys.exit(1)
+                # OHLC is allowed to be missing; keep None (degrade), but we still want close+tv
+                print(f"[WARN] OHLC fetch failed for month={m}: {err}")
+            print(f"[{src.upper()}] {ep} month={m[:6]} rows={len(rows)}")
+            (fmt if ep == "fmtqik" else ohlc)[m] = rows
+    return fmt, ohlc, counts
 
 # ---------- merge ----------
 
@@ -220,88 +181,123 @@ def _merge(existing: List[Dict[str, Any]], new_items: List[Dict[str, Any]]) -> T
     dates = [str(x.get("date", "")) for x in merged]
     return merged, (len(dates) == len(set(dates)))
 
+def _build_days(
+    fmt_by_month: Dict[str, List[FmtRow]], ohlc_by_month: Dict[str, List[OhlcRow]], end_iso: str
+) -> List[Dict[str, Any]]:
+    """
+    Newest-first accepted days <= end_iso. STRICT: a day needs close + trade_value
+    (close from FMTQIK, else MI_5MINS_HIST close of the same date, as in update_twse_sidecar).
+    """
+    ohlc_by_date = {r.date: r for rows in ohlc_by_month.values() for r in rows}
+    out: List[Dict[str, Any]] = []
+    seen = set()
+    for rows in fmt_by_month.values():
+        for f in rows:
+            if f.date > end_iso or f.date in seen:
+                continue
+            o = ohlc_by_date.get(f.date)
+            close = f.close if f.close is not None else (o.close if o else None)
+            if close is None or f.trade_value is None:
+                print(f"[SKIP] {f.date} (close/trade_value missing) close={close} tv={f.trade_value}")
+                continue
+            seen.add(f.date)
+            out.append({
+                "date": f.date,
+                "close": close,
+                "change": f.change,
+                "trade_value": int(f.trade_value),
+                "high": (o.high if o else None),
+                "low": (o.low if o else None),
+            })
+    out.sort(key=lambda x: x["date"], reverse=True)
+    return out
+
 # ---------- main ----------
 
 def main() -> None:
     _ensure_dir()
 
-    limit = int(os.environ.get("BACKFILL_LIMIT", "252").strip() or "252")
+    limit = _env_int("BACKFILL_LIMIT", 252)
     end_iso = os.environ.get("BACKFILL_END_DATE", "").strip()  # optional: YYYY-MM-DD
     tz_name = os.environ.get("TZ", "Asia/Taipei")
+    jobs = _env_int("BACKFILL_JOBS", 4)
+    max_months = _env_int("BACKFILL_MAX_MONTHS", 40)  # safety cap: don't scan forever
 
     tz = ZoneInfo(tz_name)
     today_local = datetime.now(tz=tz).date()
     end_date = today_local if not end_iso else date.fromisoformat(end_iso)
 
+    try:
+        schema = _load_schema()
+    except Exception as e:
+        print(f"[FATAL] schema load failed: {e}")
+        sys.exit(1)
+    backfill = schema.get("backfill", {})
+    for k, _ in ENDPOINTS.values():
+        tpl = backfill.get(k)
+        if not isinstance(tpl, str) or "{yyyymm01}" not in tpl:
+            print(f"[FATAL] schema.backfill.{k} missing/invalid (needs '{{yyyymm01}}')")
+            sys.exit(1)
+
     existing = _read_json(ROLL25_PATH, default=[])
     if not isinstance(existing, list):
         existing = []
 
-    got: List[Dict[str, Any]] = []
-    d = end_date
-    hard_days = 800  # safety cap: don't scan forever
-
-    print(f"[INFO] backfill start: end_date={end_date.isoformat()} limit={limit} tz={tz_name}")
-
-    for _ in range(hard_days):
-        iso = _iso(d)
-        ymd = _yyyymmdd(d)
-
-        fmt_url = FMTQIK_URL_TMPL.format(yyyymmdd=ymd)
-        ohlc_url = MI_5MINS_HIST_URL_TMPL.format(yyyymmdd=ymd)
+    client = get_client()
+    print(f"[INFO] backfill start: end_date={end_date.isoformat()} limit={limit} tz={tz_name} "
+          f"jobs={jobs} http_cache={'on' if client.cache_enable else 'off'}:{client.cache_dir}")
 
-        try:
-            fmt_raw = _http_get_json(fmt_url)
-        except Exception as e:
-            # If endpoint doesn't support date, you'll likely fail here.
-            print(f"[ERROR] FMTQIK fetch failed for {iso}: {e}")
-            sys.exit(1)
-
-        try:
-            ohlc_raw = _http_get_json(ohlc_url)
-        except Exception as e:
-            # OHLC is allowed to be missing; keep None (degrade), but we still want close+tv
-            print(f"[WARN] OHLC fetch failed for {iso}: {e}")
-            ohlc_raw = None
-
-        close, chg, tv = _parse_fmtqik_one_day(fmt_raw, iso)
-        high, low = (None, None)
-        if ohlc_raw is not None:
-            high, low = _parse_ohlc_one_day(ohlc_raw, iso)
-
-        # STRICT: we must at least have close + trade_value to accept a day
-        if close is None or tv is None:
-            # likely non-trading day or parse mismatch; skip silently but log
-            print(f"[SKIP] {iso} (close/trade_value missing) close={close} tv={tv}")
-        else:
-            got.append({
-                "date": iso,
-                "close": close,
-                "change": chg,
-                "trade_value": int(tv),
-                "high": high,
-                "low": low,
-            })
-            print(f"[OK] {iso} close={close} tv={tv} high={high} low={low}  (got={len(got)})")
+    end_month = date(end_date.year, end_date.month, 1)
+    fmt_by_month: Dict[str, List[FmtRow]] = {}
+    ohlc_by_month: Dict[str, List[OhlcRow]] = {}
+    totals = {"cache": 0, "http": 0, "failed": 0}
+    got: List[Dict[str, Any]] = []
 
+    # first wave covers limit at a conservative days/month; later waves add months for the shortfall
+    want = limit // MIN_DAYS_PER_MONTH + 1
+    while len(fmt_by_month) < max_months:
+        start = len(fmt_by_month)
+        stop = min(max_months, start + max(1, want))
+        months = [_month_yyyymm01(_month_add(end_month, -i)) for i in range(start, stop)]
+        fmt, ohlc, counts = _fetch_months(schema, months, jobs, today_local)
+        fmt_by_month.update(fmt)
+        ohlc_by_month.update(ohlc)
+        for k, v in counts.items():
+            totals[k] += v
+
+        got = _build_days(fmt_by_month, ohlc_by_month, end_date.isoformat())
         if len(got) >= limit:
             break
+        if not any(fmt.values()):
+            # a whole wave with no rows: ran past the endpoint's history
+            print(f"[INFO] no FMTQIK rows for months {months[-1][:6]}..{months[0][:6]}; stop scanning")
+            break
+        want = (limit - len(got)) // MIN_DAYS_PER_MONTH + 1
 
-        d = d - timedelta(days=1)
+    got = got[:limit]
+    print(f"[INFO] months_scanned={len(fmt_by_month)} requests={totals['http']} "
+          f"cache_hits={totals['cache']} failed={totals['failed']}")
 
     if not got:
-        print("[FATAL] Backfill got 0 usable days. This usually means: endpoint not date-parameterized OR parse mismatch.")
+        print("[FATAL] Backfill got 0 usable days. This usually means: endpoint unavailable OR parse mismatch.")
         sys.exit(2)
 
     merged, dedupe_ok = _merge(existing, got)
     _atomic_write(ROLL25_PATH, merged)
 
     print(f"[DONE] backfill wrote: {ROLL25_PATH}")
-    print(f"       new_days={len(got)} merged_total={len(merged)} dedupe_ok={dedupe_ok}")
+    print(f"       new_days={len(got)} range={got[-1]['date']}..{got[0]['date']} "
+          f"merged_total={len(merged)} dedupe_ok={dedupe_ok}")
 
     if not dedupe_ok:
         print("[FATAL] dedupe failed (duplicate dates).")
         sys.exit(3)
 
+    store_old = roll25_store.load_store(STORE_PATH, DERIVED_PATH)
+    history, _ = _merge_roll(store_old.items() if store_old is not None else [], merged, cap=None)
+    _, info = roll25_store.update_store(STORE_PATH, DERIVED_PATH, history, old=store_old)
+    print(f"[DONE] store wrote: {STORE_PATH} rows={info['rows']} range={info['first_date']}..{info['last_date']} "
+          f"mode={info['mode']} rows_recomputed={info['rows_recomputed']}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
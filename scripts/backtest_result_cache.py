@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/backtest_result_cache.py
+
+On-disk result cache for backtest_tw0050_leverage_mvp.run_backtest (leverage_sim results) plus a
+small LRU helper for generated files.
+
+Slot key  = sha1(script fingerprint, part ("full"/"pre"/"post"), Params as JSON)[:16]
+Content   = sha1 over the rows the loop reads: dates, price, bb_z, ma_fast, ma_slow, rv20, rv20_q60
+            and the forbid mask (digest_inputs). Stored next to the result.
+
+lookup:
+- same content digest                     -> "hit"   (stored result, nothing recomputed)
+- stored rows are an exact prefix          -> "tail"  (leverage_sim.simulate(resume=...) runs only
+  (digest of the first n_old new rows)                  the appended bars)
+- anything else                            -> "miss"  (full run; the slot is overwritten)
+
+All inputs are causal (rolling indicators, forbid mask compared on the prefix), so hit/tail results
+equal a full run exactly.
+
+Storage: <root>/<key>.npz (equity, lever_on, trade arrays; JSON meta string; no pickle) and
+<root>/index.json with last_used_utc per entry. finalize() applies LRU eviction by entry count and
+total bytes; entries used by the current run are never evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from leverage_sim import COUNTER_FIELDS, TRADE_FIELDS
+
+CACHE_FORMAT = "bt_result_cache_v1"
+DIGEST_COLS = ["price", "bb_z", "ma_fast", "ma_slow", "rv20", "rv20_q60"]
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _atomic_write_json(path: str, obj: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def digest_inputs(dates: np.ndarray, cols: Dict[str, np.ndarray], forbid: Optional[np.ndarray], n: int) -> str:
+    """sha1 of rows [0, n) of everything the bar loop reads (order of DIGEST_COLS fixed)."""
+    h = hashlib.sha1()
+    h.update("\n".join(str(d) for d in dates[:n]).encode("utf-8"))
+    for c in DIGEST_COLS:
+        h.update(c.encode("utf-8"))
+        h.update(np.ascontiguousarray(np.asarray(cols[c], dtype=np.float64)[:n]).tobytes())
+    if forbid is None:
+        h.update(b"forbid:none")
+    else:
+        h.update(b"forbid:")
+        h.update(np.packbits(np.asarray(forbid, dtype=bool)[:n]).tobytes())
+    return h.hexdigest()
+
+
+def lru_evict(
+    entries: Dict[str, Dict[str, Any]],
+    keep: Iterable[str],
+    max_entries: int,
+    max_bytes: int,
+    remove: Callable[[str], None],
+) -> List[str]:
+    """
+    Evict least-recently-used names (by entries[name]["last_used_utc"]) until count <= max_entries and
+    total bytes <= max_bytes (0 = no limit). Names in keep are never evicted. Returns evicted names.
+    """
+    keep_set = set(keep)
+    order = sorted(
+        (k for k in entries if k not in keep_set),
+        key=lambda k: (str(entries[k].get("last_used_utc") or ""), k),
+    )
+    total = sum(int(v.get("bytes") or 0) for v in entries.values())
+    evicted: List[str] = []
+    for k in order:
+        over_n = max_entries > 0 and len(entries) > max_entries
+        over_b = max_bytes > 0 and total > max_bytes
+        if not (over_n or over_b):
+            break
+        try:
+            remove(k)
+        except FileNotFoundError:
+            pass
+        total -= int(entries[k].get("bytes") or 0)
+        entries.pop(k, None)
+        evicted.append(k)
+    return evicted
+
+
+class ResultCache:
+    """
+    Slot-addressed store of leverage_sim results. Safe to share across fork workers: entries are
+    written with os.replace; the LRU index is only written by finalize() in the parent.
+    """
+
+    def __init__(self, root: str, fingerprint: str, max_entries: int = 256, max_bytes: int = 64 << 20) -> None:
+        self.root = root
+        self.fingerprint = str(fingerprint)
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        os.makedirs(root, exist_ok=True)
+
+    def slot_key(self, part: str, params: Dict[str, Any]) -> str:
+        s = json.dumps({"fp": self.fingerprint, "part": str(part), "params": params}, sort_keys=True)
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.npz")
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                meta = json.loads(str(z["meta"]))
+                if meta.get("format") != CACHE_FORMAT or meta.get("fingerprint") != self.fingerprint:
+                    return None
+                sim: Dict[str, Any] = {
+                    "equity": z["equity"].astype(float),
+                    "lever_on": z["lever_on"].astype(bool),
+                    "trades": {k: z[f"t_{k}"] for k in TRADE_FIELDS},
+                }
+            sim["n_trades"] = int(meta["n_trades"])
+            sim["counters"] = {k: int(meta["counters"][k]) for k in COUNTER_FIELDS}
+            sim["totals"] = meta["totals"]
+            sim["state"] = meta["state"]
+            return {"meta": meta, "sim": sim}
+        except Exception:
+            return None
+
+    def _store(self, key: str, sim: Dict[str, Any], digest: str, n: int, part: str) -> None:
+        meta = {
+            "format": CACHE_FORMAT,
+            "fingerprint": self.fingerprint,
+            "part": str(part),
+            "rows": int(n),
+            "digest": digest,
+            "stored_at_utc": utc_now_iso(),
+            "n_trades": int(sim["n_trades"]),
+            "counters": sim["counters"],
+            "totals": sim["totals"],
+            "state": sim["state"],
+        }
+        arrays = {f"t_{k}": np.asarray(sim["trades"][k]) for k in TRADE_FIELDS}
+        tmp = self._path(key) + f".{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                meta=np.array(json.dumps(meta, sort_keys=True)),
+                equity=np.asarray(sim["equity"], dtype=float),
+                lever_on=np.asarray(sim["lever_on"], dtype=bool),
+                **arrays,
+            )
+        os.replace(tmp, self._path(key))
+
+    def run(
+        self,
+        part: str,
+        params: Dict[str, Any],
+        dates: np.ndarray,
+        cols: Dict[str, np.ndarray],
+        forbid: Optional[np.ndarray],
+        compute: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Cached compute(resume). Returns (sim, info) with info = {key, mode, rows, rows_recomputed}.
+        compute(None) is a full run; compute(prev_sim) resumes from prev_sim["state"].
+        """
+        key = self.slot_key(part, params)
+        n = int(len(dates))
+        digest = digest_inputs(dates, cols, forbid, n)
+        hit = self._load(key)
+        mode = "miss"
+        sim: Optional[Dict[str, Any]] = None
+        rows_recomputed = n
+        if hit is not None:
+            n_old = int(hit["meta"].get("rows", 0))
+            if n_old == n and hit["meta"].get("digest") == digest:
+                mode, sim, rows_recomputed = "hit", hit["sim"], 0
+            elif 0 < n_old < n and hit["meta"].get("digest") == digest_inputs(dates, cols, forbid, n_old):
+                mode, sim, rows_recomputed = "tail", compute(hit["sim"]), n - n_old
+        if sim is None:
+            sim = compute(None)
+        if mode != "hit":
+            try:
+                self._store(key, sim, digest, n, part)
+            except Exception as e:
+                print(f"WARNING: result cache write failed for {key}: {type(e).__name__}: {e}")
+        return sim, {"key": key, "mode": mode, "rows": n, "rows_recomputed": int(rows_recomputed)}
+
+    def finalize(self, used_keys: Iterable[str]) -> Dict[str, Any]:
+        """Update last_used for used_keys, drop index rows without files, LRU-evict. Returns audit."""
+        idx_path = os.path.join(self.root, "index.json")
+        try:
+            with open(idx_path, "r", encoding="utf-8") as f:
+                idx = json.load(f)
+            entries: Dict[str, Dict[str, Any]] = dict(idx.get("entries") or {})
+        except Exception:
+            entries = {}
+
+        files = {fn[:-4] for fn in os.listdir(self.root) if fn.endswith(".npz")}
+        entries = {k: v for k, v in entries.items() if k in files}
+        now = utc_now_iso()
+        used = set(used_keys) & files
+        for k in files:
+            e = entries.setdefault(k, {"last_used_utc": ""})
+            e["bytes"] = int(os.path.getsize(self._path(k)))
+            if k in used:
+                e["last_used_utc"] = now
+
+        evicted = lru_evict(entries, used, self.max_entries, self.max_bytes, lambda k: os.remove(self._path(k)))
+        _atomic_write_json(idx_path, {"format": CACHE_FORMAT, "updated_at_utc": now, "entries": entries})
+        return {
+            "root": self.root,
+            "entries": int(len(entries)),
+            "bytes": int(sum(int(v.get("bytes") or 0) for v in entries.values())),
+            "used": int(len(used)),
+            "evicted": int(len(evicted)),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def lru_touch_and_evict_files(
+    dir_path: str,
+    index_name: str,
+    match: Callable[[str], bool],
+    used_names: Iterable[str],
+    max_files: int,
+) -> Dict[str, Any]:
+    """
+    LRU for generated files in dir_path (e.g. equity_curve.*.csv): index_name keeps last_used_utc per
+    file name; files written by this run (used_names) are stamped now; files unknown to the index count
+    as oldest. Keeps at most max_files matching files (used files always kept; max_files <= 0 keeps
+    only those). Best-effort, never raises.
+    """
+    out: Dict[str, Any] = {"ok": False, "dir": dir_path, "index": index_name, "removed": 0, "kept": 0, "errors": []}
+    try:
+        idx_path = os.path.join(dir_path, index_name)
+        try:
+            with open(idx_path, "r", encoding="utf-8") as f:
+                last_used: Dict[str, str] = dict(json.load(f).get("last_used_utc") or {})
+        except Exception:
+            last_used = {}
+        names = [ent.name for ent in os.scandir(dir_path) if ent.is_file(follow_symlinks=False) and match(ent.name)]
+        now = utc_now_iso()
+        used = {os.path.basename(u) for u in used_names}
+        entries = {nm: {"last_used_utc": (now if nm in used else last_used.get(nm, "")), "bytes": 0} for nm in names}
+
+        def _rm(nm: str) -> None:
+            os.remove(os.path.join(dir_path, nm))
+
+        # max_files <= 0: keep only this run's files
+        limit = int(max_files) if int(max_files) > 0 else max(len(used & set(names)), 1)
+        removed = lru_evict(entries, used, limit, 0, _rm)
+        _atomic_write_json(
+            idx_path,
+            {"updated_at_utc": now, "last_used_utc": {k: v["last_used_utc"] for k, v in sorted(entries.items())}},
+        )
+        out.update({"ok": True, "removed": int(len(removed)), "kept": int(len(entries))})
+    except Exception as e:
+        out["errors"].append(f"{type(e).__name__}: {e}")
+    return out
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+backtest_tw0050_leverage_mc.py
+
+Monte Carlo stress test for the 0050 leverage strategies (backtest_tw0050_leverage_mvp.py) on
+synthetic price paths from a stationary block bootstrap of tw0050_bb_cache/data.csv.
+
+Paths:
+- daily log returns of the price column (same loading as the backtest: load_backtest_inputs);
+  returns on ratio-break days (split / re-base artifacts, price_breaks.detect_break_flags) are dropped.
+- stationary bootstrap (Politis & Romano 1994): blocks start at a uniform random day, block length is
+  geometric with mean --block_mean_days, blocks wrap around the end of the sample.
+- each path starts at the last historical price and has --horizon_days bars (0 = history length).
+
+Engine:
+- per path, indicators (BB z, MA fast/slow, RV20, RV20 q60) are computed once per indicator key and
+  shared by the strategies; signals via leverage_sim.build_signals.
+- paths x strategies run as lanes of one leverage_sim.simulate_batch bar loop (per-lane prices),
+  --batch_paths paths per batch.
+- batches run in a fork process pool (--jobs); each batch draws from its own generator seeded with
+  (--seed, batch index), so results do not depend on --jobs or on batch completion order.
+- only per-(path, strategy) metrics leave a batch; paths are never materialized beyond one batch, so
+  memory is bounded by --batch_paths regardless of --n_paths. --out_paths_csv streams the metric rows.
+
+Not modeled: the contamination forbid mask (synthetic paths have no ratio breaks), pre/post
+segmentation, go/no-go.
+
+Output (--out_json): per strategy, distributions (quantiles, mean) of MDD, terminal equity, CAGR,
+delta CAGR vs base-only, margin_call_count, min_maint_ratio, plus P(margin call >= 1) and P(hard fail).
+
+Usage:
+    python scripts/backtest_tw0050_leverage_mc.py --cache_dir tw0050_bb_cache --n_paths 2000 \\
+        --set maintenance_margin=1.3 --set maint_ratio_mode=equity_over_borrow --jobs 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest_tw0050_leverage_mvp import (
+    SCRIPT_FINGERPRINT as BACKTEST_FINGERPRINT,
+    Params,
+    _calc_indicators,
+    _fmt_lever_mult,
+    _indicator_key,
+    _prepare_df,
+    _sim_spec,
+    _write_json,
+    load_backtest_inputs,
+    utc_now_iso,
+)
+from leverage_params import BASE_DEFAULTS, coerce_param, split_kv
+from leverage_sim import build_signals, simulate_batch
+from price_breaks import detect_break_flags
+
+
+SCHEMA_VERSION = "mc_v1"
+SCRIPT_FINGERPRINT = "backtest_tw0050_leverage_mc@2026-10-16.v1.stationary_block_bootstrap"
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+# per-(path, strategy) metrics returned by a batch (all float; NaN = undefined)
+LANE_METRICS = [
+    "mdd",
+    "terminal_equity",
+    "cagr",
+    "delta_cagr",
+    "margin_call_count",
+    "min_maint_ratio",
+    "n_trades",
+    "equity_min",
+    "equity_negative_days",
+    "hard_fail",
+]
+PATH_METRICS = ["base_mdd", "base_terminal_equity", "base_cagr"]
+
+
+# =========================
+# Bootstrap
+# =========================
+def historical_log_returns(price: np.ndarray, ratio_hi: float, ratio_lo: float) -> Tuple[np.ndarray, int]:
+    """Daily log returns without ratio-break days and non-finite values. Returns (returns, dropped)."""
+    p = np.asarray(price, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.log(p[1:] / p[:-1])
+    keep = np.isfinite(r) & ~detect_break_flags(p, ratio_hi, ratio_lo)[1:]
+    return r[keep], int(r.shape[0] - int(keep.sum()))
+
+
+def stationary_bootstrap_indices(rng: np.random.Generator, m: int, n_paths: int, horizon: int, mean_block: float) -> np.ndarray:
+    """
+    (n_paths, horizon) indices into a sample of length m. A new block starts with probability
+    1/mean_block (always at t=0) at a uniform random index; inside a block indices advance by one
+    (mod m).
+    """
+    p_new = 1.0 / max(float(mean_block), 1.0)
+    new = rng.random((n_paths, horizon)) < p_new
+    new[:, 0] = True
+    starts = rng.integers(0, m, size=(n_paths, horizon))
+    t = np.arange(horizon)
+    block_t0 = np.maximum.accumulate(np.where(new, t, 0), axis=1)
+    rows = np.arange(n_paths)[:, None]
+    return (starts[rows, block_t0] + (t - block_t0)) % m
+
+
+def _drawdown_min(eq: np.ndarray) -> np.ndarray:
+    """Column-wise MDD with backtest _max_drawdown semantics (non-positive running max ignored)."""
+    v = np.where(np.isfinite(eq), eq, np.nan)
+    rm = np.maximum.accumulate(np.where(np.isnan(v), -np.inf, v), axis=0)
+    rm = np.where(np.isfinite(rm) & (rm > 0.0), rm, np.nan)
+    with np.errstate(invalid="ignore"):
+        dd = v / rm - 1.0
+    out = np.full(eq.shape[1], np.nan)
+    ok = ~np.all(np.isnan(dd), axis=0)
+    out[ok] = np.nanmin(dd[:, ok], axis=0)
+    return out
+
+
+def _cagr(start: np.ndarray, end: np.ndarray, years: float) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ok = (start > 0.0) & (end > 0.0)
+        return np.where(ok, (end / start) ** (1.0 / years) - 1.0, np.nan)
+
+
+# =========================
+# Batch worker
+# =========================
+# Workers get the return sample and strategy specs once (initializer; fork shares them copy-on-write).
+_MC_STATE: Dict[str, Any] = {}
+
+
+def _mc_init(state: Dict[str, Any]) -> None:
+    _MC_STATE.clear()
+    _MC_STATE.update(state)
+
+
+def _mc_run_batch(batch: int) -> Dict[str, Any]:
+    st = _MC_STATE
+    n_paths = int(min(st["batch_paths"], st["n_paths"] - batch * st["batch_paths"]))
+    rets: np.ndarray = st["returns"]
+    horizon = int(st["horizon"])
+    strategies: List[Tuple[str, Params]] = st["strategies"]
+    K = len(strategies)
+
+    rng = np.random.default_rng([int(st["seed"]), int(batch)])
+    idx = stationary_bootstrap_indices(rng, int(rets.shape[0]), n_paths, horizon, float(st["block_mean_days"]))
+    logp = np.empty((n_paths, horizon + 1))
+    logp[:, 0] = math.log(float(st["p_start"]))
+    np.cumsum(rets[idx], axis=1, out=logp[:, 1:])
+    logp[:, 1:] += logp[:, :1]
+    paths = np.exp(logp)  # n_paths x n
+    del idx, logp
+
+    base_shares = 1.0 / float(st["p_start"])
+    sigs: List[Dict[str, np.ndarray]] = []
+    for b in range(n_paths):
+        price = pd.Series(paths[b])
+        ind_by_key: Dict[Any, Dict[str, np.ndarray]] = {}
+        for _sid, p in strategies:
+            k = _indicator_key(p)
+            if k not in ind_by_key:
+                ind_by_key[k] = _calc_indicators(price, p)
+            ind = ind_by_key[k]
+            sigs.append(
+                build_signals(
+                    ind["price"], ind["bb_z"], ind["ma_fast"], ind["ma_slow"], ind["rv20"], ind["rv20_q60"],
+                    entry_mode=str(p.entry_mode), entry_z=float(p.entry_z), exit_z=float(p.exit_z),
+                    trend_rule=str(p.trend_rule),
+                )
+            )
+
+    lanes_px = np.repeat(paths.T, K, axis=1)  # n x (n_paths*K), lane = b*K + k
+    sims = simulate_batch(lanes_px, sigs, [None] * (n_paths * K), st["specs"] * n_paths, base_shares)
+    del lanes_px, sigs
+
+    eq = np.stack([s["equity"] for s in sims], axis=1)
+    n = int(eq.shape[0])
+    years = max((n - 1) / float(st["trading_days"]), 1e-12)
+
+    base_eq = (base_shares * paths).T  # n x n_paths
+    base_cagr = _cagr(base_eq[0], base_eq[-1], years)
+    out: Dict[str, Any] = {
+        "batch": int(batch),
+        "n_paths": n_paths,
+        "base_mdd": _drawdown_min(base_eq),
+        "base_terminal_equity": base_eq[-1].copy(),
+        "base_cagr": base_cagr,
+    }
+
+    cagr = _cagr(eq[0], eq[-1], years)
+    eq_min = np.nanmin(np.where(np.isfinite(eq), eq, np.nan), axis=0)
+    neg_days = np.sum(np.isfinite(eq) & (eq < 0.0), axis=0).astype(float)
+    hard_fail = (eq_min <= float(st["hard_fail_equity_le"])) | (
+        (neg_days > 0) if bool(st["hard_fail_any_negative_days"]) else False
+    )
+    lane = {
+        "mdd": _drawdown_min(eq),
+        "terminal_equity": eq[-1].copy(),
+        "cagr": cagr,
+        "delta_cagr": cagr - np.repeat(base_cagr, K),
+        "margin_call_count": np.array([float(s["counters"]["margin_call_count"]) for s in sims]),
+        "min_maint_ratio": np.array(
+            [np.nan if s["totals"]["min_maint_ratio"] is None else float(s["totals"]["min_maint_ratio"]) for s in sims]
+        ),
+        "n_trades": np.array([float(s["n_trades"]) for s in sims]),
+        "equity_min": eq_min,
+        "equity_negative_days": neg_days,
+        "hard_fail": hard_fail.astype(float),
+    }
+    for k, v in lane.items():
+        out[k] = v.reshape(n_paths, K)
+    return out
+
+
+# =========================
+# Aggregation
+# =========================
+def _dist(v: np.ndarray) -> Dict[str, Any]:
+    x = np.asarray(v, dtype=float)
+    x = x[np.isfinite(x)]
+    if x.size == 0:
+        return {"n": 0}
+    out: Dict[str, Any] = {"n": int(x.size), "mean": float(x.mean()), "min": float(x.min()), "max": float(x.max())}
+    for q, val in zip(QUANTILES, np.quantile(x, QUANTILES)):
+        out[f"p{int(round(q * 100)):02d}"] = float(val)
+    return out
+
+
+def _strategy_summary(sid: str, p: Params, col: Dict[str, np.ndarray], base: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    mc = col["margin_call_count"]
+    return {
+        "strategy_id": sid,
+        "entry_mode": str(p.entry_mode),
+        "leverage_frac": float(p.leverage_frac),
+        "maintenance_margin": float(p.maintenance_margin),
+        "maint_ratio_mode": str(p.maint_ratio_mode),
+        "paths": int(mc.shape[0]),
+        "p_margin_call": float(np.mean(mc >= 1.0)) if mc.size else None,
+        "p_hard_fail": float(np.mean(col["hard_fail"] > 0.0)) if mc.size else None,
+        "p_terminal_below_base": float(np.mean(col["terminal_equity"] < base["base_terminal_equity"])) if mc.size else None,
+        "mdd": _dist(col["mdd"]),
+        "terminal_equity": _dist(col["terminal_equity"]),
+        "cagr": _dist(col["cagr"]),
+        "delta_cagr_vs_base": _dist(col["delta_cagr"]),
+        "margin_call_count": _dist(mc),
+        "min_maint_ratio": _dist(col["min_maint_ratio"]),
+        "n_trades": _dist(col["n_trades"]),
+    }
+
+
+def _build_strategies(suite: str, levels: List[float], base: Dict[str, Any]) -> List[Tuple[str, Params]]:
+    """Same strategy set / ids as the backtest suite (bb_conditional, always_*, trend_*)."""
+    out: List[Tuple[str, Params]] = []
+    if suite in ["all", "single_bb"]:
+        out.append(("bb_conditional", Params(**{**base, "entry_mode": "bb"})))
+    if suite in ["all", "bench_only"]:
+        for L in levels:
+            out.append((f"always_leverage_{_fmt_lever_mult(L)}x", Params(**{**base, "entry_mode": "always", "leverage_frac": float(L - 1.0)})))
+        for L in levels:
+            sid = f"trend_leverage_{base['trend_rule']}_{_fmt_lever_mult(L)}x"
+            out.append((sid, Params(**{**base, "entry_mode": "trend", "leverage_frac": float(L - 1.0)})))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Block-bootstrap Monte Carlo stress test for the 0050 leverage strategies.")
+    ap.add_argument("--cache_dir", default="tw0050_bb_cache")
+    ap.add_argument("--price_csv", default="data.csv")
+    ap.add_argument("--stats_json", default="stats_latest.json")
+    ap.add_argument("--price_col", default=None)
+    ap.add_argument("--break_ratio_hi", type=float, default=None)
+    ap.add_argument("--break_ratio_lo", type=float, default=None)
+
+    ap.add_argument("--n_paths", type=int, default=1000)
+    ap.add_argument("--horizon_days", type=int, default=0, help="Bars per path (0 = history length).")
+    ap.add_argument("--block_mean_days", type=float, default=20.0, help="Mean block length of the stationary bootstrap.")
+    ap.add_argument("--seed", type=int, default=20261016)
+    ap.add_argument("--batch_paths", type=int, default=64, help="Paths per vectorized batch (bounds memory).")
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = cpu count, 1 = serial).")
+
+    ap.add_argument("--strategy_suite", default="all", choices=["all", "single_bb", "bench_only"])
+    ap.add_argument("--bench_lever_levels", default="1.1,1.2,1.3,1.5")
+    ap.add_argument("--set", dest="set_", action="append", default=[], help="KEY=VALUE Params override (repeatable).")
+    ap.add_argument("--hard_fail_equity_le", type=float, default=0.0)
+    ap.add_argument("--no_hard_fail_any_negative_days", action="store_true", default=False)
+
+    ap.add_argument("--out_json", default="backtest_mc.json")
+    ap.add_argument("--out_paths_csv", default="", help="Optional per-(path, strategy) metrics CSV (streamed).")
+    args = ap.parse_args()
+
+    if int(args.n_paths) <= 0 or int(args.batch_paths) <= 0:
+        raise SystemExit("ERROR: --n_paths and --batch_paths must be > 0")
+    if int(args.horizon_days) < 0 or int(args.jobs) < 0:
+        raise SystemExit("ERROR: --horizon_days and --jobs must be >= 0")
+    if not (float(args.block_mean_days) >= 1.0):
+        raise SystemExit("ERROR: --block_mean_days must be >= 1")
+
+    base = dict(BASE_DEFAULTS)
+    for k, v in split_kv(args.set_, "--set"):
+        base[k] = coerce_param(k, v)
+    try:
+        levels = sorted({float(x) for x in str(args.bench_lever_levels).split(",") if x.strip()})
+    except ValueError:
+        raise SystemExit(f"ERROR: --bench_lever_levels must be comma-separated numbers: {args.bench_lever_levels!r}")
+    levels = [L for L in levels if np.isfinite(L) and L > 1.0]
+    strategies = _build_strategies(str(args.strategy_suite), levels, base)
+    if not strategies:
+        raise SystemExit("ERROR: no strategies selected")
+
+    inp = load_backtest_inputs(
+        cache_dir=str(args.cache_dir),
+        price_csv=str(args.price_csv),
+        stats_json=str(args.stats_json),
+        price_col=args.price_col,
+        break_ratio_hi=args.break_ratio_hi,
+        break_ratio_lo=args.break_ratio_lo,
+    )
+    df = _prepare_df(inp["df_raw"])
+    hist = df["price"].to_numpy(dtype=float)
+    rets, dropped = historical_log_returns(hist, float(inp["ratio_hi"]), float(inp["ratio_lo"]))
+    if rets.shape[0] < 100:
+        raise SystemExit(f"ERROR: not enough usable returns for bootstrap: {rets.shape[0]}")
+    horizon = int(args.horizon_days) if int(args.horizon_days) > 0 else int(len(hist) - 1)
+    min_rows = max(int(p.bb_window) + 5 for _sid, p in strategies)
+    if horizon + 1 < min_rows:
+        raise SystemExit(f"ERROR: --horizon_days too short for bb_window (need >= {min_rows - 1})")
+
+    p_start = float(hist[-1])
+    if all(float(p.maintenance_margin) <= 0.0 for _sid, p in strategies):
+        print("NOTE: maintenance_margin=0 for all strategies -> margin calls are not modeled "
+              "(use --set maintenance_margin=... --set maint_ratio_mode=...)")
+
+    n_batches = -(-int(args.n_paths) // int(args.batch_paths))
+    state = {
+        "returns": rets,
+        "p_start": p_start,
+        "horizon": horizon,
+        "block_mean_days": float(args.block_mean_days),
+        "seed": int(args.seed),
+        "n_paths": int(args.n_paths),
+        "batch_paths": int(args.batch_paths),
+        "strategies": strategies,
+        "specs": [_sim_spec(p, 1.0 / p_start) for _sid, p in strategies],
+        "trading_days": int(base["trading_days"]),
+        "hard_fail_equity_le": float(args.hard_fail_equity_le),
+        "hard_fail_any_negative_days": not bool(args.no_hard_fail_any_negative_days),
+    }
+
+    sids = [sid for sid, _p in strategies]
+    cols: Dict[str, List[np.ndarray]] = {k: [] for k in LANE_METRICS + PATH_METRICS}
+    out_csv = os.path.join(str(args.cache_dir), str(args.out_paths_csv)) if str(args.out_paths_csv).strip() else None
+    fcsv = open(out_csv, "w", encoding="utf-8", newline="") if out_csv else None
+    writer = csv.writer(fcsv) if fcsv else None
+    if writer:
+        writer.writerow(["path", "strategy_id"] + LANE_METRICS + PATH_METRICS)
+
+    jobs = int(args.jobs) if int(args.jobs) > 0 else int(os.cpu_count() or 1)
+    jobs = min(jobs, n_batches)
+    t0 = time.perf_counter()
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        if jobs > 1:
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+            pool = ProcessPoolExecutor(max_workers=jobs, mp_context=ctx, initializer=_mc_init, initargs=(state,))
+            results = pool.map(_mc_run_batch, range(n_batches))
+        else:
+            _mc_init(state)
+            results = map(_mc_run_batch, range(n_batches))
+
+        done = 0
+        for res in results:
+            for k in LANE_METRICS + PATH_METRICS:
+                cols[k].append(res[k])
+            if writer:
+                p0 = int(res["batch"]) * int(args.batch_paths)
+                for b in range(int(res["n_paths"])):
+                    pv = [res[k][b] for k in PATH_METRICS]
+                    for j, sid in enumerate(sids):
+                        writer.writerow([p0 + b, sid] + [res[k][b, j] for k in LANE_METRICS] + pv)
+            done += int(res["n_paths"])
+            if done % max(int(args.batch_paths) * 16, 1) == 0 or done == int(args.n_paths):
+                print(f"NOTE: {done}/{args.n_paths} paths ({time.perf_counter() - t0:.1f}s)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if fcsv:
+            fcsv.close()
+    elapsed = time.perf_counter() - t0
+
+    lane_all = {k: np.concatenate(cols[k], axis=0) for k in LANE_METRICS}
+    base_all = {k: np.concatenate(cols[k], axis=0) for k in PATH_METRICS}
+    summaries = [
+        _strategy_summary(sid, p, {k: v[:, j] for k, v in lane_all.items()}, base_all)
+        for j, (sid, p) in enumerate(strategies)
+    ]
+
+    out = {
+        "generated_at_utc": utc_now_iso(),
+        "schema_version": SCHEMA_VERSION,
+        "script_fingerprint": SCRIPT_FINGERPRINT,
+        "backtest_fingerprint": BACKTEST_FINGERPRINT,
+        "inputs": {
+            "cache_dir": str(args.cache_dir),
+            "price_csv_resolved": inp["price_path"],
+            "price_col": inp["price_col"],
+            "history_rows": int(len(hist)),
+            "history_start": str(df["date"].iloc[0]),
+            "history_end": str(df["date"].iloc[-1]),
+            "returns_used": int(rets.shape[0]),
+            "returns_dropped_breaks_or_nonfinite": int(dropped),
+            "break_ratio_hi": float(inp["ratio_hi"]),
+            "break_ratio_lo": float(inp["ratio_lo"]),
+            "params_base": base,
+            "strategy_suite": str(args.strategy_suite),
+            "bench_levels": levels,
+        },
+        "bootstrap": {
+            "method": "stationary_block_bootstrap (geometric block lengths, circular wrap)",
+            "n_paths": int(args.n_paths),
+            "horizon_days": int(horizon),
+            "block_mean_days": float(args.block_mean_days),
+            "seed": int(args.seed),
+            "seed_policy": "batch b uses numpy default_rng([seed, b]); independent of --jobs",
+            "p_start": p_start,
+            "p_start_policy": "last historical price",
+        },
+        "engine": {
+            "batch_paths": int(args.batch_paths),
+            "batches": int(n_batches),
+            "lanes_per_batch": int(args.batch_paths) * len(strategies),
+            "jobs": int(jobs),
+            "elapsed_sec": round(elapsed, 3),
+            "paths_per_sec": round(float(args.n_paths) / elapsed, 2) if elapsed > 0 else None,
+            "forbid_mask": "not applied (synthetic paths have no ratio breaks)",
+            "hard_fail_rule": {
+                "equity_le": float(args.hard_fail_equity_le),
+                "any_negative_days": not bool(args.no_hard_fail_any_negative_days),
+            },
+        },
+        "base_only": {
+            "mdd": _dist(base_all["base_mdd"]),
+            "terminal_equity": _dist(base_all["base_terminal_equity"]),
+            "cagr": _dist(base_all["base_cagr"]),
+        },
+        "strategies": summaries,
+        "outputs": {"paths_csv": str(args.out_paths_csv) if out_csv else None},
+    }
+    out_json_path = os.path.join(str(args.cache_dir), str(args.out_json))
+    _write_json(out_json_path, out)
+
+    print(f"OK: wrote {out_json_path} ({args.n_paths} paths x {len(strategies)} strategies, {elapsed:.1f}s)")
+    if out_csv:
+        print(f"OK: wrote {out_csv}")
+    for s in summaries:
+        mdd50 = (s["mdd"] or {}).get("p50")
+        mdd05 = (s["mdd"] or {}).get("p05")
+        print(f"  {s['strategy_id']:<40} mdd p50={mdd50} p05={mdd05} P(margin_call)={s['p_margin_call']} P(hard_fail)={s['p_hard_fail']}")
+
+
+if __name__ == "__main__":
+    main()
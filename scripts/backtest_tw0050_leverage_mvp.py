@@ -6,6 +6,47 @@ backtest_tw0050_leverage_mvp.py
 
 Audit-first MVP backtest for "base hold + conditional leverage leg" using BB z-score.
 
+v26.14 (2026-10-16):
+- ADD(perf): --equity_curve_format {csv,npz,both} (default csv = v26.13 output). npz writes all strategy
+  curves of the run into ONE columnar file cache_dir/equity_curves.<tag>.npz (shared date/price columns;
+  per strategy equity, equity_base_only as --equity_curve_dtype float64|float32, lever_on as bool).
+  Uncompressed members => the renderer memory-maps columns instead of parsing N CSVs.
+  See scripts/equity_curve_store.py. Strategy objects carry "equity_curve_npz"; outputs.equity_curves_npz.
+- CHANGE(ops): equity curve LRU (--equity_curve_keep) also covers equity_curves.*.npz.
+
+v26.13 (2026-10-16):
+- ADD(perf): --result_cache DIR: simulation results are cached under cache_dir/DIR, keyed by
+  (script fingerprint, part full/pre/post, Params) with a sha1 of the rows the bar loop reads.
+  Same rows -> reused; rows only appended -> leverage_sim.simulate resumes from the stored loop state and
+  runs just the new bars; otherwise recomputed. Results are identical to a full run.
+  LRU eviction by --result_cache_max_entries / --result_cache_max_mb. See scripts/backtest_result_cache.py.
+- CHANGE(ops): the v26.9 blanket delete of equity_curve.*.csv at start of run is replaced by LRU eviction
+  (--equity_curve_keep, default 32; 0 = keep only this run's files). Audit: inputs.equity_curve_cleanup.
+
+v26.12 (2026-10-16):
+- PERF: run_backtest bar loop moved to scripts/leverage_sim.py: signals are precomputed boolean arrays,
+  state is plain floats, trades are a struct of arrays turned into the same dicts at the end
+  (~5x faster per run). Same float ops in the same order => identical equity/trades/audit.
+- ADD: run_backtest_batch(df, params_list, ...) runs K parameter sets through one vectorized bar loop
+  (leverage_sim.simulate_batch); pays off for large K (hundreds), see tools/bench_leverage_sim.py.
+
+v26.11 (2026-10-16):
+- ADD(perf): indicators (BB z, MA fast/slow, RV20, RV20 q60) are computed once per price frame and
+  indicator key (bb_window, bb_ddof, ma windows, trading_days) and handed to run_backtest as arrays;
+  the 9-strategy suite no longer recomputes them per strategy/segment.
+- ADD: --segment_indicator_warmup {segment,full}. "segment" (default) keeps the v26.9 per-segment warmup
+  exactly (pre/post indicators recomputed from the segment's first row, once per segment);
+  "full" slices the full-history arrays (warm segments; not equivalent, audited per segment).
+- REFACTOR: price/stats/break loading moved to load_backtest_inputs (shared with
+  backtest_tw0050_leverage_sweep.py, the grid-search driver). Outputs unchanged.
+
+v26.10 (2026-10-16):
+- ADD(perf): --jobs N runs each strategy's full/pre/post backtests in a process pool.
+  The price frame and segment frames are handed to workers once; results are merged in
+  strategy order, so JSON/CSV outputs match a serial run (--jobs 1, default).
+- REFACTOR: segmentation split/post-start planning moved to _plan_segmentation (strategy-independent).
+- REFACTOR: break detection / forbid mask use the shared scripts/price_breaks.py.
+
 v26.9 (2026-02-24):
 - ADD(ops): cleanup old per-strategy equity curve CSVs in cache_dir at start of each run
   to avoid accumulating many equity_curve.*.csv files across runs.
@@ -56,20 +97,28 @@ v26:
 from __future__ import annotations
 
 import argparse
+import copy
 import hashlib
 import json
 import math
+import multiprocessing
 import os
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone, date as _date
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from backtest_result_cache import DIGEST_COLS, ResultCache, lru_touch_and_evict_files
+from equity_curve_store import write_curves
+from leverage_sim import SimSpec, build_signals, cost_rates, simulate, simulate_batch, trades_to_dicts
+from price_breaks import break_positions, contamination_mask
+
 
-SCHEMA_VERSION = "v26.9"
-SCRIPT_FINGERPRINT = "backtest_tw0050_leverage_mvp@2026-02-24.v26.9.cleanup_equity_curve_csvs"
+SCHEMA_VERSION = "v26.14"
+SCRIPT_FINGERPRINT = "backtest_tw0050_leverage_mvp@2026-10-16.v26.14.equity_curves_npz"
 
 # Tag used for per-strategy equity curve csv naming (stable per script fingerprint)
 _EQUITY_CURVE_TAG = hashlib.sha1(SCRIPT_FINGERPRINT.encode("utf-8")).hexdigest()[:10]
@@ -124,54 +173,6 @@ def _ensure_parent(path: str) -> None:
         os.makedirs(parent, exist_ok=True)
 
 
-def _cleanup_equity_curve_csvs(cache_dir: str) -> Dict[str, Any]:
-    """
-    v26.9:
-    Delete old per-strategy equity curve CSVs to prevent accumulation across runs.
-
-    Target: files in cache_dir where:
-      - filename startswith "equity_curve."
-      - filename endswith ".csv"
-
-    Best-effort:
-      - never raises
-      - returns audit dict {ok, removed, errors}
-    """
-    out: Dict[str, Any] = {"ok": False, "cache_dir": cache_dir, "removed": 0, "errors": []}
-
-    if not cache_dir:
-        out["errors"].append("cache_dir empty")
-        return out
-    if not os.path.isdir(cache_dir):
-        out["errors"].append("cache_dir not a directory")
-        return out
-
-    removed = 0
-    errors: List[str] = []
-    try:
-        with os.scandir(cache_dir) as it:
-            for ent in it:
-                try:
-                    if not ent.is_file(follow_symlinks=False):
-                        continue
-                    name = ent.name
-                    if not (name.startswith("equity_curve.") and name.endswith(".csv")):
-                        continue
-                    os.remove(ent.path)
-                    removed += 1
-                except Exception as e:
-                    errors.append(f"{getattr(ent, 'name', 'unknown')}: {type(e).__name__}: {e}")
-    except Exception as e:
-        out["errors"].append(f"scan: {type(e).__name__}: {e}")
-        out["removed"] = int(removed)
-        return out
-
-    out["ok"] = True
-    out["removed"] = int(removed)
-    out["errors"] = errors
-    return out
-
-
 def _json_sanitize(obj: Any, _depth: int = 0, _max_depth: int = 60) -> Any:
     """
     Make obj JSON-safe:
@@ -526,23 +527,12 @@ def detect_breaks_from_price(df: pd.DataFrame, ratio_hi: float, ratio_lo: float)
     px = pd.to_numeric(df["price"], errors="coerce").to_numpy(dtype=float)
     dates = df["date"].astype(str).to_numpy()
 
-    p0 = px[:-1]
-    p1 = px[1:]
-    valid = np.isfinite(p0) & np.isfinite(p1) & (p0 > 0.0)
-    if not np.any(valid):
-        return out
-
-    ratio = np.full_like(p1, np.nan, dtype=float)
-    ratio[valid] = p1[valid] / p0[valid]
-
-    mask = (ratio >= float(ratio_hi)) | (ratio <= float(ratio_lo))
-    idxs = (np.where(mask & np.isfinite(ratio))[0] + 1).astype(int)
+    idxs = break_positions(px, ratio_hi=float(ratio_hi), ratio_lo=float(ratio_lo))
     if idxs.size == 0:
         return out
 
     for i in idxs.tolist():
-        j = i - 1
-        ratio_val = float(ratio[j]) if (0 <= j < len(ratio) and np.isfinite(ratio[j])) else None
+        ratio_val = float(px[i] / px[i - 1])
         out.append(
             {
                 "idx": int(i),
@@ -639,23 +629,19 @@ def build_entry_forbidden_mask(
     contam_horizon: int,
     z_clear_days: int,
 ) -> List[bool]:
-    forbid = [False] * int(n)
     if n <= 0 or not breaks:
-        return forbid
-
-    ch = max(int(contam_horizon), 0)
-    zc = max(int(z_clear_days), 0)
+        return [False] * max(int(n), 0)
 
+    idxs: List[int] = []
     for b in breaks:
         try:
-            bi = int(b["idx"])
+            idxs.append(int(b["idx"]))
         except Exception:
             continue
-        lo = max(bi - ch, 0)
-        hi = min(bi + zc - 1, n - 1)
-        for i in range(lo, hi + 1):
-            forbid[i] = True
-    return forbid
+
+    # entry i forbidden for i in [b - contam_horizon, b + z_clear_days - 1]
+    mask = contamination_mask(int(n), idxs, horizon=int(contam_horizon), clear_days=int(z_clear_days))
+    return mask.tolist()
 
 
 def _turnover_from_lever_on(lever_on: pd.Series) -> Optional[float]:
@@ -799,6 +785,76 @@ class Params:
     maint_ratio_mode: str
 
 
+INDICATOR_COLS = ["bb_z", "ma_fast", "ma_slow", "rv20", "rv20_q60"]
+SEGMENT_INDICATOR_WARMUP = ["segment", "full"]
+
+
+def _indicator_key(params: Params) -> Tuple[int, int, int, int, int]:
+    return (
+        int(params.bb_window),
+        int(params.bb_ddof),
+        max(int(params.trend_ma_fast), 1),
+        max(int(params.trend_ma_slow), 1),
+        int(params.trading_days),
+    )
+
+
+def _calc_indicators(price: pd.Series, params: Params) -> Dict[str, np.ndarray]:
+    """
+    All indicator columns run_backtest needs, on one prepared price series (same ops as v26.9).
+    The input prices are kept under "price": indicators depend only on that sequence, so a caller can
+    check alignment by comparing prices.
+    """
+    ma_fast_n = max(int(params.trend_ma_fast), 1)
+    ma_slow_n = max(int(params.trend_ma_slow), 1)
+
+    # v26.5+: RV20 filter (used only to block BB-mode entries)
+    rets = price.pct_change()
+    rv20 = rets.rolling(window=_RV20_WINDOW, min_periods=_RV20_WINDOW).std(ddof=0) * math.sqrt(params.trading_days)
+    rv20_q60 = rv20.rolling(window=_RV20_Q_LOOKBACK, min_periods=_RV20_Q_MIN_PERIODS).quantile(_RV20_Q)
+
+    return {
+        "price": price.to_numpy(dtype=float),
+        "bb_z": _calc_bb_z(price, window=params.bb_window, ddof=params.bb_ddof).to_numpy(dtype=float),
+        "ma_fast": _calc_sma(price, window=ma_fast_n).to_numpy(dtype=float),
+        "ma_slow": _calc_sma(price, window=ma_slow_n).to_numpy(dtype=float),
+        "rv20": rv20.to_numpy(dtype=float),
+        "rv20_q60": rv20_q60.to_numpy(dtype=float),
+    }
+
+
+class _IndicatorCache:
+    """
+    Indicator arrays per (frame, indicator key); frame is "full", "pre" or "post".
+    Strategies that share bb_window/ddof/ma windows/trading_days reuse one computation per frame.
+    Arrays are read-only views for callers (run_backtest copies them into its own frame).
+    """
+
+    def __init__(self) -> None:
+        self._store: Dict[Tuple[str, Tuple[int, int, int, int, int]], Dict[str, Any]] = {}
+
+    def get(self, frame: str, df_prepared: pd.DataFrame, params: Params) -> Dict[str, np.ndarray]:
+        k = (str(frame), _indicator_key(params))
+        hit = self._store.get(k)
+        px = df_prepared["price"].to_numpy(dtype=float)
+        if hit is not None and np.array_equal(hit["arrays"]["price"], px):
+            return hit["arrays"]
+        arrays = _calc_indicators(df_prepared["price"], params)
+        self._store[k] = {"n": int(len(px)), "dates": df_prepared["date"].astype(str).to_numpy(), "arrays": arrays}
+        return arrays
+
+    def slice_full(self, params: Params, df_seg_prepared: pd.DataFrame, start: int) -> Optional[Dict[str, np.ndarray]]:
+        """Full-history arrays for rows [start, start+len(seg)) if the dates line up; else None."""
+        hit = self._store.get(("full", _indicator_key(params)))
+        m = int(len(df_seg_prepared))
+        if hit is None or start < 0 or start + m > int(hit["n"]) or m == 0:
+            return None
+        seg_dates = df_seg_prepared["date"].astype(str).to_numpy()
+        if not np.array_equal(hit["dates"][start:start + m], seg_dates):
+            return None
+        return {c: a[start:start + m] for c, a in hit["arrays"].items()}
+
+
 def _maint_ratio_semantics(mode: str) -> str:
     m = str(mode).strip()
     if m == "equity_over_borrow":
@@ -808,373 +864,160 @@ def _maint_ratio_semantics(mode: str) -> str:
     return "maint_ratio = equity / (lever_shares*price) (account equity vs lever leg notional; v26 default)"
 
 
-def run_backtest(
+def _sim_spec(params: Params, base_shares: float) -> SimSpec:
+    rates = cost_rates(params.fee_rate, params.tax_rate, _slip_rate(params.slip_bps))
+    return SimSpec(
+        entry_mode=str(params.entry_mode),
+        lever_shares_target=max(float(base_shares) * float(params.leverage_frac), 0.0),
+        borrow_apr=float(params.borrow_apr),
+        trading_days=int(params.trading_days),
+        max_hold_days=int(params.max_hold_days),
+        cost_on=str(params.cost_on),
+        entry_rate=rates["entry_rate"],
+        exit_rate=rates["exit_rate"],
+        entry_rate_ok=rates["entry_rate_ok"],
+        exit_rate_ok=rates["exit_rate_ok"],
+        maintenance_margin=float(params.maintenance_margin),
+        maint_ratio_mode=str(params.maint_ratio_mode).strip(),
+    )
+
+
+def _prepare_backtest_frame(
     df: pd.DataFrame,
     params: Params,
-    forbid_entry_mask: Optional[List[bool]] = None,
-) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    indicators: Optional[Dict[str, np.ndarray]],
+) -> Tuple[pd.DataFrame, float]:
+    """Prepared frame with INDICATOR_COLS attached + base_shares (1 / first price)."""
     df = _prepare_df(df)
 
     n = int(len(df))
     if n < params.bb_window + 5:
         raise ValueError("not enough rows for bb window")
 
-    df["bb_z"] = _calc_bb_z(df["price"], window=params.bb_window, ddof=params.bb_ddof)
-
-    ma_fast_n = max(int(params.trend_ma_fast), 1)
-    ma_slow_n = max(int(params.trend_ma_slow), 1)
-    df["ma_fast"] = _calc_sma(df["price"], window=ma_fast_n)
-    df["ma_slow"] = _calc_sma(df["price"], window=ma_slow_n)
-
-    # v26.5+: RV20 filter (compute once; used only to block BB-mode entries)
-    rets = df["price"].pct_change()
-    df["rv20"] = rets.rolling(window=_RV20_WINDOW, min_periods=_RV20_WINDOW).std(ddof=0) * math.sqrt(params.trading_days)
-    df["rv20_q60"] = df["rv20"].rolling(window=_RV20_Q_LOOKBACK, min_periods=_RV20_Q_MIN_PERIODS).quantile(_RV20_Q)
+    if indicators is not None:
+        if any(c not in indicators or len(indicators[c]) != n for c in INDICATOR_COLS):
+            indicators = None
+        elif not np.array_equal(indicators.get("price"), df["price"].to_numpy(dtype=float)):
+            indicators = None
+    if indicators is None:
+        indicators = _calc_indicators(df["price"], params)
+    for c in INDICATOR_COLS:
+        df[c] = np.array(indicators[c], dtype=float, copy=True)
 
     p0 = float(df["price"].iloc[0])
     if not np.isfinite(p0) or p0 <= 0.0:
         raise ValueError("invalid first price")
 
-    base_shares = 1.0 / p0
-    lever_shares_target = max(float(base_shares) * float(params.leverage_frac), 0.0)
+    return df, 1.0 / p0
+
+
+def _signals(df: pd.DataFrame, params: Params) -> Dict[str, np.ndarray]:
+    return build_signals(
+        df["price"].to_numpy(dtype=float),
+        df["bb_z"].to_numpy(dtype=float),
+        df["ma_fast"].to_numpy(dtype=float),
+        df["ma_slow"].to_numpy(dtype=float),
+        df["rv20"].to_numpy(dtype=float),
+        df["rv20_q60"].to_numpy(dtype=float),
+        entry_mode=str(params.entry_mode),
+        entry_z=float(params.entry_z),
+        exit_z=float(params.exit_z),
+        trend_rule=str(params.trend_rule),
+    )
+
+
+def _forbid_array(forbid_entry_mask: Optional[List[bool]], n: int) -> Optional[np.ndarray]:
+    if forbid_entry_mask is not None and len(forbid_entry_mask) == n:
+        return np.asarray(forbid_entry_mask, dtype=bool)
+    return None
 
+
+def run_backtest(
+    df: pd.DataFrame,
+    params: Params,
+    forbid_entry_mask: Optional[List[bool]] = None,
+    indicators: Optional[Dict[str, np.ndarray]] = None,
+    result_cache: Optional[ResultCache] = None,
+    cache_part: str = "full",
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    indicators: precomputed INDICATOR_COLS arrays for the prepared df (see _IndicatorCache), used only
+    when their "price" array equals df["price"]; otherwise they are computed here.
+    result_cache: optional ResultCache; the simulation is looked up by (fingerprint, cache_part, params)
+    and the digest of the rows it reads (hit / tail-only recompute / miss), see backtest_result_cache.py.
+    """
+    df, base_shares = _prepare_backtest_frame(df, params, indicators)
     prices = df["price"].to_numpy(dtype=float)
-    zs = df["bb_z"].to_numpy(dtype=float)
-    dates = df["date"].astype(str).to_numpy()
-    ma_fast = df["ma_fast"].to_numpy(dtype=float)
-    ma_slow = df["ma_slow"].to_numpy(dtype=float)
-    rv20 = df["rv20"].to_numpy(dtype=float)
-    rv20_q60 = df["rv20_q60"].to_numpy(dtype=float)
-
-    lever_shares = 0.0
-    borrow_principal = 0.0
-    cash = 0.0
-    in_lever = False
-    hold_days = 0
-    interest_paid_total = 0.0
-
-    entry_cost_total = 0.0
-    exit_cost_total = 0.0
-    cost_paid_total = 0.0
-
-    slip_rate = _slip_rate(params.slip_bps)
-
-    trades: List[Dict[str, Any]] = []
-    cur_trade: Optional[Dict[str, Any]] = None
-
-    eq_arr = np.empty(n, dtype=float)
-    base_arr = np.empty(n, dtype=float)
-    lev_on_arr = np.empty(n, dtype=bool)
-
-    skipped_entries_on_forbidden = 0
-    skipped_entries_on_nonpositive_equity = 0
-    skipped_entries_same_day_exit = 0  # v26.4 audit
-    skipped_entries_on_rv20 = 0         # v26.5 audit
-
-    exit_count_by_exit_z = 0
-    exit_count_by_max_hold_days = 0
-    exit_count_by_trend_off = 0
-    exit_count_by_end_of_data = 0
-    forced_eod_close = 0
-
-    margin_call_count = 0
-    min_maint_ratio = None
-
-    forbid = forbid_entry_mask if (forbid_entry_mask is not None and len(forbid_entry_mask) == n) else [False] * n
-
-    def _trend_on(i: int) -> bool:
-        if params.trend_rule == "price_gt_ma60":
-            m = ma_slow[i]
-            p = prices[i]
-            if not np.isfinite(m) or not np.isfinite(p):
-                return False
-            return p > m
-        f = ma_fast[i]
-        s = ma_slow[i]
-        if not np.isfinite(f) or not np.isfinite(s):
-            return False
-        return f > s
-
-    def _entry_signal(i: int) -> bool:
-        if params.entry_mode == "always":
-            return True
-        if params.entry_mode == "trend":
-            return _trend_on(i)
-        zf_entry = _to_finite_float(zs[i])
-        return (zf_entry is not None) and (zf_entry <= float(params.entry_z))
-
-    def _rv20_block(i: int) -> bool:
-        if str(params.entry_mode) != "bb":
-            return False
-        r = rv20[i]
-        q = rv20_q60[i]
-        return bool(np.isfinite(r) and np.isfinite(q) and (float(r) > float(q)))
-
-    def _exit_signal(i: int) -> Tuple[bool, str]:
-        by_time = (params.max_hold_days > 0 and hold_days >= params.max_hold_days)
-        if by_time:
-            return True, "max_hold_days"
-
-        if params.entry_mode == "always":
-            return False, "none"
-
-        if params.entry_mode == "trend":
-            if not _trend_on(i):
-                return True, "trend_off"
-            return False, "none"
-
-        zf = _to_finite_float(zs[i])
-        by_z = (zf is not None and zf >= float(params.exit_z))
-        return (by_z, ("exit_z" if by_z else "none"))
+    sig = _signals(df, params)
+    fb = _forbid_array(forbid_entry_mask, int(len(df)))
+    spec = _sim_spec(params, base_shares)
+
+    def _compute(resume: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return simulate(prices, sig, fb, spec, base_shares, resume=resume)
+
+    if result_cache is None:
+        return _backtest_output(df, params, _compute(None), base_shares)
+
+    sim, info = result_cache.run(
+        cache_part,
+        asdict(params),
+        df["date"].astype(str).to_numpy(),
+        {c: df[c].to_numpy(dtype=float) for c in DIGEST_COLS},
+        fb,
+        _compute,
+    )
+    df_out, summary = _backtest_output(df, params, sim, base_shares)
+    summary.setdefault("audit", {})["result_cache"] = info
+    return df_out, summary
 
-    timing_assumption = "assume close-at-EOD on exit date; interest charged for that day before exit"
 
-    def _maint_ratio(equity: float, lever_notional: float, total_notional: float, borrow: float) -> Optional[float]:
-        mode = str(params.maint_ratio_mode).strip()
-        if mode not in MAINT_RATIO_MODES:
-            mode = "equity_over_lever_notional"
+def run_backtest_batch(
+    df: pd.DataFrame,
+    params_list: List[Params],
+    forbid_entry_masks: Optional[List[Optional[List[bool]]]] = None,
+    indicators_list: Optional[List[Optional[Dict[str, np.ndarray]]]] = None,
+) -> List[Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """
+    run_backtest for K parameter sets on one price frame, with one shared bar loop
+    (leverage_sim.simulate_batch). Results equal K run_backtest calls; any invalid set raises.
+    """
+    K = len(params_list)
+    masks = forbid_entry_masks if forbid_entry_masks is not None else [None] * K
+    inds = indicators_list if indicators_list is not None else [None] * K
+    frames: List[pd.DataFrame] = []
+    base_shares = 0.0
+    for params, ind in zip(params_list, inds):
+        d, base_shares = _prepare_backtest_frame(df, params, ind)
+        frames.append(d)
+    if not frames:
+        return []
+    sims = simulate_batch(
+        frames[0]["price"].to_numpy(dtype=float),
+        [_signals(d, p) for d, p in zip(frames, params_list)],
+        [_forbid_array(m, int(len(d))) for m, d in zip(masks, frames)],
+        [_sim_spec(p, base_shares) for p in params_list],
+        base_shares,
+    )
+    return [_backtest_output(d, p, s, base_shares) for d, p, s in zip(frames, params_list, sims)]
 
-        denom = None
-        if mode == "equity_over_borrow":
-            denom = borrow
-        elif mode == "equity_over_total_notional":
-            denom = total_notional
-        else:
-            denom = lever_notional
 
-        if denom is None or denom <= 0.0:
-            return None
-        if not np.isfinite(equity) or not np.isfinite(denom):
-            return None
-        return float(equity) / float(denom)
-
-    for i in range(n):
-        exited_today = False
-
-        price = float(prices[i])
-        z_raw = float(zs[i]) if np.isfinite(zs[i]) else float("nan")
-        date = str(dates[i])
-
-        # accrue interest at start of bar if in position
-        if in_lever and borrow_principal > 0.0:
-            interest = _daily_interest(borrow_principal, params.borrow_apr, params.trading_days)
-            cash -= interest
-            interest_paid_total += interest
-            if cur_trade is not None:
-                cur_trade["interest_paid"] = float(cur_trade.get("interest_paid", 0.0) + interest)
-
-        base_now = base_shares * price
-
-        # maintenance margin check BEFORE normal hold_days increment
-        if in_lever and float(params.maintenance_margin) > 0.0:
-            total_shares_flat = base_shares + lever_shares
-            total_notional = float(total_shares_flat * price)
-            equity_flat = float(total_notional + cash - borrow_principal)
-
-            lever_notional = float(lever_shares * price)
-            mr = _maint_ratio(equity_flat, lever_notional, total_notional, float(borrow_principal))
-
-            if mr is not None:
-                if (min_maint_ratio is None) or (mr < float(min_maint_ratio)):
-                    min_maint_ratio = float(mr)
-
-            if (mr is not None) and (mr < float(params.maintenance_margin)):
-                hold_days_effective = int(hold_days) + 1  # v26.2 alignment
-
-                proceeds = lever_shares * price
-
-                if params.cost_on == "all":
-                    notional_exit = (base_shares + lever_shares) * price
-                else:
-                    notional_exit = lever_shares * price
-
-                exit_cost = _exit_cost(notional_exit, params.fee_rate, params.tax_rate, slip_rate)
-                if exit_cost > 0.0:
-                    cash -= exit_cost
-                    exit_cost_total += exit_cost
-                    cost_paid_total += exit_cost
-
-                cash += proceeds
-                cash -= borrow_principal
-
-                if cur_trade is not None:
-                    cur_trade["exit_date"] = date
-                    cur_trade["exit_price"] = price
-                    cur_trade["hold_days"] = int(hold_days_effective)
-                    cur_trade["exit_reason"] = "margin_call"
-                    cur_trade["exit_cost"] = float(exit_cost)
-                    cost_paid = float(cur_trade.get("entry_cost", 0.0) + cur_trade.get("exit_cost", 0.0))
-                    cur_trade["cost_paid"] = float(cost_paid)
-                    lever_leg_pnl = float(proceeds - float(cur_trade.get("borrow_principal", 0.0)))
-                    cur_trade["lever_leg_pnl"] = float(lever_leg_pnl)
-                    net_after_costs = lever_leg_pnl - float(cur_trade.get("interest_paid", 0.0)) - cost_paid
-                    cur_trade["net_lever_pnl_after_costs"] = float(net_after_costs)
-                    trades.append(cur_trade)
-
-                margin_call_count += 1
-
-                borrow_principal = 0.0
-                lever_shares = 0.0
-                in_lever = False
-                cur_trade = None
-                hold_days = 0
-
-                exited_today = True
-
-        # normal exit logic
-        if in_lever:
-            hold_days += 1
-            exit_now, exit_reason = _exit_signal(i)
-
-            if exit_now:
-                proceeds = lever_shares * price
-
-                if params.cost_on == "all":
-                    notional_exit = (base_shares + lever_shares) * price
-                else:
-                    notional_exit = lever_shares * price
-
-                exit_cost = _exit_cost(notional_exit, params.fee_rate, params.tax_rate, slip_rate)
-                if exit_cost > 0.0:
-                    cash -= exit_cost
-                    exit_cost_total += exit_cost
-                    cost_paid_total += exit_cost
-
-                cash += proceeds
-                cash -= borrow_principal
-
-                if cur_trade is not None:
-                    cur_trade["exit_date"] = date
-                    cur_trade["exit_price"] = price
-                    cur_trade["hold_days"] = int(hold_days)
-                    cur_trade["exit_reason"] = str(exit_reason)
-                    cur_trade["exit_cost"] = float(exit_cost)
-                    cost_paid = float(cur_trade.get("entry_cost", 0.0) + cur_trade.get("exit_cost", 0.0))
-                    cur_trade["cost_paid"] = float(cost_paid)
-                    lever_leg_pnl = float(proceeds - float(cur_trade.get("borrow_principal", 0.0)))
-                    cur_trade["lever_leg_pnl"] = float(lever_leg_pnl)
-                    net_after_costs = lever_leg_pnl - float(cur_trade.get("interest_paid", 0.0)) - cost_paid
-                    cur_trade["net_lever_pnl_after_costs"] = float(net_after_costs)
-                    trades.append(cur_trade)
-
-                if exit_reason == "exit_z":
-                    exit_count_by_exit_z += 1
-                elif exit_reason == "max_hold_days":
-                    exit_count_by_max_hold_days += 1
-                elif exit_reason == "trend_off":
-                    exit_count_by_trend_off += 1
-
-                borrow_principal = 0.0
-                lever_shares = 0.0
-                in_lever = False
-                cur_trade = None
-                hold_days = 0
-
-                exited_today = True
-
-        # entry logic (apply RV20 filter only when entry would otherwise be allowed)
-        if not in_lever:
-            if exited_today:
-                if _entry_signal(i):
-                    skipped_entries_same_day_exit += 1
-            else:
-                if forbid[i]:
-                    if _entry_signal(i):
-                        skipped_entries_on_forbidden += 1
-                else:
-                    if _entry_signal(i):
-                        if _rv20_block(i):
-                            skipped_entries_on_rv20 += 1
-                        else:
-                            equity_flat = (base_shares + lever_shares) * price + cash - borrow_principal
-                            if equity_flat <= 0.0:
-                                skipped_entries_on_nonpositive_equity += 1
-                            elif lever_shares_target > 0.0:
-                                borrow = float(lever_shares_target * price)
-                                if borrow > 0.0:
-                                    if params.cost_on == "all":
-                                        notional_entry = (base_shares + lever_shares_target) * price
-                                    else:
-                                        notional_entry = lever_shares_target * price
-
-                                    entry_cost = _entry_cost(notional_entry, params.fee_rate, slip_rate)
-                                    if entry_cost > 0.0:
-                                        cash -= entry_cost
-                                        entry_cost_total += entry_cost
-                                        cost_paid_total += entry_cost
-
-                                    borrow_principal = borrow
-                                    lever_shares = lever_shares_target
-                                    in_lever = True
-                                    hold_days = 0
-
-                                    zf_entry = _to_finite_float(z_raw)
-                                    cur_trade = {
-                                        "entry_date": date,
-                                        "entry_price": price,
-                                        "entry_z": zf_entry,
-                                        "borrow_principal": float(borrow_principal),
-                                        "lever_shares": float(lever_shares),
-                                        "entry_cost": float(entry_cost),
-                                        "exit_cost": 0.0,
-                                        "cost_paid": float(entry_cost),
-                                        "interest_paid": 0.0,
-                                    }
-
-        total_shares_eod = base_shares + lever_shares
-        equity_eod = total_shares_eod * price + cash - borrow_principal
-        eq_arr[i] = float(equity_eod)
-        base_arr[i] = float(base_now)
-        lev_on_arr[i] = bool(in_lever)
-
-    open_at_end = bool(in_lever)
-    if in_lever and cur_trade is not None and n > 0:
-        last_price = float(prices[-1])
-        last_date = str(dates[-1])
-        proceeds = lever_shares * last_price
-
-        if params.cost_on == "all":
-            notional_exit = (base_shares + lever_shares) * last_price
-        else:
-            notional_exit = lever_shares * last_price
-
-        exit_cost = _exit_cost(notional_exit, params.fee_rate, params.tax_rate, slip_rate)
-        if exit_cost > 0.0:
-            cash -= exit_cost
-            exit_cost_total += exit_cost
-            cost_paid_total += exit_cost
-
-        cash += proceeds
-        cash -= borrow_principal
-
-        cur_trade["exit_date"] = last_date
-        cur_trade["exit_price"] = last_price
-        cur_trade["hold_days"] = int(hold_days)
-        cur_trade["exit_reason"] = "end_of_data"
-        cur_trade["exit_cost"] = float(exit_cost)
-        cost_paid = float(cur_trade.get("entry_cost", 0.0) + float(cur_trade.get("exit_cost", 0.0)))
-        cur_trade["cost_paid"] = float(cost_paid)
-        cur_trade["lever_leg_pnl"] = float(proceeds - float(cur_trade.get("borrow_principal", 0.0)))
-        net_after_costs = float(cur_trade["lever_leg_pnl"]) - float(cur_trade.get("interest_paid", 0.0)) - cost_paid
-        cur_trade["net_lever_pnl_after_costs"] = float(net_after_costs)
-        trades.append(cur_trade)
-
-        forced_eod_close += 1
-        exit_count_by_end_of_data += 1
-
-        in_lever = False
-        borrow_principal = 0.0
-        lever_shares = 0.0
-        cur_trade = None
-
-        equity_final = base_shares * last_price + cash
-        eq_arr[-1] = float(equity_final)
-        lev_on_arr[-1] = False
+def _backtest_output(
+    df: pd.DataFrame,
+    params: Params,
+    sim: Dict[str, Any],
+    base_shares: float,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    p0 = float(df["price"].iloc[0])
+    lever_shares_target = max(float(base_shares) * float(params.leverage_frac), 0.0)
+    trades = trades_to_dicts(sim["trades"], df["date"].astype(str).to_numpy())
+    cnt = sim["counters"]
+    tot = sim["totals"]
+    timing_assumption = "assume close-at-EOD on exit date; interest charged for that day before exit"
 
     df_out = df[["date", "date_ts", "price", "bb_z", "ma_fast", "ma_slow"]].copy()
-    df_out["equity"] = eq_arr
-    df_out["equity_base_only"] = base_arr
-    df_out["lever_on"] = lev_on_arr
+    df_out["equity"] = sim["equity"]
+    df_out["equity_base_only"] = base_shares * df["price"].to_numpy(dtype=float)
+    df_out["lever_on"] = sim["lever_on"]
 
     z_ser = pd.to_numeric(df_out["bb_z"], errors="coerce").replace([np.inf, -np.inf], np.nan)
     z_non_nan = int(z_ser.notna().sum())
@@ -1246,12 +1089,12 @@ def run_backtest(
             "lever_shares_target": float(lever_shares_target),
             "bb_z_non_nan": z_non_nan,
             "bb_z_first_valid_date": z_first_valid_date,
-            "interest_paid_total": float(interest_paid_total),
+            "interest_paid_total": float(tot["interest_paid_total"]),
             "trades": int(len(trades)),
-            "skipped_entries_on_forbidden": int(skipped_entries_on_forbidden),
-            "skipped_entries_on_nonpositive_equity": int(skipped_entries_on_nonpositive_equity),
-            "skipped_entries_same_day_exit": int(skipped_entries_same_day_exit),
-            "skipped_entries_on_rv20": int(skipped_entries_on_rv20),
+            "skipped_entries_on_forbidden": int(cnt["skipped_entries_on_forbidden"]),
+            "skipped_entries_on_nonpositive_equity": int(cnt["skipped_entries_on_nonpositive_equity"]),
+            "skipped_entries_same_day_exit": int(cnt["skipped_entries_same_day_exit"]),
+            "skipped_entries_on_rv20": int(cnt["skipped_entries_on_rv20"]),
             "rv20_filter": {
                 "enabled": True,
                 "scope": "bb_entry_only",
@@ -1265,14 +1108,14 @@ def run_backtest(
             },
             "equity_negative_days": int(equity_negative_days),
             "equity_min": equity_min,
-            "open_at_end": bool(open_at_end),
-            "forced_eod_close": int(forced_eod_close),
-            "exit_count_by_exit_z": int(exit_count_by_exit_z),
-            "exit_count_by_max_hold_days": int(exit_count_by_max_hold_days),
-            "exit_count_by_trend_off": int(exit_count_by_trend_off),
-            "exit_count_by_end_of_data": int(exit_count_by_end_of_data),
-            "margin_call_count": int(margin_call_count),
-            "min_maintenance_ratio": float(min_maint_ratio) if min_maint_ratio is not None else None,
+            "open_at_end": bool(tot["open_at_end"]),
+            "forced_eod_close": int(cnt["forced_eod_close"]),
+            "exit_count_by_exit_z": int(cnt["exit_count_by_exit_z"]),
+            "exit_count_by_max_hold_days": int(cnt["exit_count_by_max_hold_days"]),
+            "exit_count_by_trend_off": int(cnt["exit_count_by_trend_off"]),
+            "exit_count_by_end_of_data": int(cnt["exit_count_by_end_of_data"]),
+            "margin_call_count": int(cnt["margin_call_count"]),
+            "min_maintenance_ratio": float(tot["min_maint_ratio"]) if tot["min_maint_ratio"] is not None else None,
             "maintenance_margin": float(params.maintenance_margin),
             "maint_ratio_mode": str(params.maint_ratio_mode),
             "maintenance_ratio_semantics": _maint_ratio_semantics(params.maint_ratio_mode),
@@ -1301,9 +1144,9 @@ def run_backtest(
                 "base leg is held (not liquidated) but still counted in cost_on='all'."
             ),
             "slippage_model": "cash penalty = notional * slip_rate per side; slip_rate = slip_bps * 1e-4",
-            "entry_cost_total": float(entry_cost_total),
-            "exit_cost_total": float(exit_cost_total),
-            "cost_paid_total": float(cost_paid_total),
+            "entry_cost_total": float(tot["entry_cost_total"]),
+            "exit_cost_total": float(tot["exit_cost_total"]),
+            "cost_paid_total": float(tot["cost_paid_total"]),
             "leverage_definition": (
                 "lever_shares_target = base_shares(t0) * leverage_frac; not rebalanced => effective leverage drifts with price"
             ),
@@ -1352,7 +1195,18 @@ def _segment_backtest(
     ratio_hi: float,
     ratio_lo: float,
     segment_min_rows_mult: float,
+    indicator_cache: Optional[_IndicatorCache] = None,
+    full_start: Optional[int] = None,
+    indicator_warmup: str = "segment",
+    result_cache: Optional[ResultCache] = None,
 ) -> Tuple[Dict[str, Any], Optional[pd.DataFrame]]:
+    """
+    indicator_warmup:
+      - "segment": indicators recomputed on the segment alone (own BB/MA/RV20 warmup; v26.9 behavior).
+                   With indicator_cache they are computed once per segment and shared across strategies.
+      - "full"   : slice the full-history arrays at rows [full_start, full_start+rows) (segment starts warm).
+                   NOT equivalent to "segment"; falls back to "segment" if rows/dates do not line up.
+    """
     seg_out: Dict[str, Any] = {
         "segment": {
             "name": name,
@@ -1412,8 +1266,20 @@ def _segment_backtest(
             z_clear_days=int(params.z_clear_days),
         )
 
+    indicators: Optional[Dict[str, np.ndarray]] = None
+    warmup_used = "segment"
+    if indicator_warmup == "full" and indicator_cache is not None and full_start is not None:
+        indicators = indicator_cache.slice_full(params, df_clean, int(full_start))
+        if indicators is not None:
+            warmup_used = "full"
+    if indicators is None and indicator_cache is not None:
+        indicators = indicator_cache.get(name, df_clean, params)
+
     try:
-        df_bt, seg_sum = run_backtest(df_clean, params, forbid_entry_mask=forbid_mask_seg)
+        df_bt, seg_sum = run_backtest(
+            df_clean, params, forbid_entry_mask=forbid_mask_seg, indicators=indicators,
+            result_cache=result_cache, cache_part=f"{name}.{warmup_used}",
+        )
     except Exception as e:
         seg_out["ok"] = False
         seg_out["error"] = f"exception: {type(e).__name__}: {e}"
@@ -1435,6 +1301,8 @@ def _segment_backtest(
             "forbid_mask_scope_note": "applies forbid mask ONLY when entry_mode == 'bb'",
             "segment_min_rows_mult": float(mult),
             "segment_min_rows": int(min_rows),
+            "indicator_warmup": warmup_used,
+            "indicator_warmup_requested": str(indicator_warmup),
         }
     )
 
@@ -1621,6 +1489,72 @@ def _hard_fail_eval(
     return (len(reasons) > 0), reasons
 
 
+def load_backtest_inputs(
+    *,
+    cache_dir: str,
+    price_csv: str,
+    stats_json: str,
+    price_col: Optional[str],
+    break_ratio_hi: Optional[float],
+    break_ratio_lo: Optional[float],
+) -> Dict[str, Any]:
+    """
+    Price frame + break samples exactly as the suite reads them (also used by the parameter sweep).
+    Break ratios: CLI value > stats_json break_detection > defaults.
+    """
+    price_path = os.path.join(cache_dir, str(price_csv))
+    if not os.path.isfile(price_path):
+        raise SystemExit(f"ERROR: missing price csv: {price_path}")
+
+    stats_path = os.path.join(cache_dir, str(stats_json))
+    stats = _read_json(stats_path)
+
+    ratio_hi = float(break_ratio_hi) if break_ratio_hi is not None else _DEFAULT_RATIO_HI
+    ratio_lo = float(break_ratio_lo) if break_ratio_lo is not None else _DEFAULT_RATIO_LO
+
+    if isinstance(stats, dict):
+        bd = stats.get("break_detection", {})
+        if isinstance(bd, dict):
+            try:
+                if break_ratio_hi is None and ("break_ratio_hi" in bd):
+                    ratio_hi = float(bd["break_ratio_hi"])
+            except Exception:
+                pass
+            try:
+                if break_ratio_lo is None and ("break_ratio_lo" in bd):
+                    ratio_lo = float(bd["break_ratio_lo"])
+            except Exception:
+                pass
+
+    df_raw = pd.read_csv(price_path)
+    df_raw = _normalize_date_col(df_raw)
+
+    pc = _find_price_col(df_raw, price_col)
+    df_raw["price"] = pd.to_numeric(df_raw[pc], errors="coerce")
+    df_raw = df_raw.dropna(subset=["price"]).copy()
+
+    if isinstance(stats, dict):
+        raw_samples, break_samples_source = _extract_break_samples_from_stats(stats)
+    else:
+        raw_samples, break_samples_source = [], None
+
+    raw_breaks = raw_samples if raw_samples else detect_breaks_from_price(df_raw, ratio_hi, ratio_lo)
+    breaks_aligned = align_break_indices(df_raw, raw_breaks)
+
+    return {
+        "price_path": price_path,
+        "stats_path": stats_path,
+        "stats": stats,
+        "ratio_hi": float(ratio_hi),
+        "ratio_lo": float(ratio_lo),
+        "df_raw": df_raw,
+        "price_col": str(pc),
+        "raw_samples": raw_samples,
+        "break_samples_source": break_samples_source,
+        "breaks_aligned": breaks_aligned,
+    }
+
+
 def _default_post_start_next_row(df_raw_in: pd.DataFrame, split_ts: pd.Timestamp) -> Tuple[pd.Timestamp, str]:
     """
     v26.8: exclude split day from post by default.
@@ -1636,33 +1570,19 @@ def _default_post_start_next_row(df_raw_in: pd.DataFrame, split_ts: pd.Timestamp
         return split_ts, "fallback_split_date_exception"
 
 
-def _run_one_strategy(
+def _plan_segmentation(
     *,
-    strategy_id: str,
     df_raw_in: pd.DataFrame,
-    params: Params,
     breaks_aligned_in: List[Dict[str, Any]],
-    ratio_hi_in: float,
-    ratio_lo_in: float,
-    forbid_mask_full_in: Optional[List[bool]],
     seg_spec_in: str,
     seg_raw_in: str,
     segment_break_rank: int,
     segment_post_start_date: Optional[str],
-    segment_min_rows_mult: float,
-    omit_trades: bool,
-    gonogo_th_in: Dict[str, Any],
-) -> Tuple[Dict[str, Any], pd.DataFrame, Dict[str, Any], Optional[pd.DataFrame], Dict[str, Any]]:
-    if params.entry_mode == "always" and int(params.max_hold_days) > 0:
-        print(
-            f"NOTE: strategy {strategy_id}: entry_mode=always with max_hold_days={params.max_hold_days} "
-            "will exit/reenter periodically. With same-day reentry blocked, effective cycle is max_hold_days+1."
-        )
-
-    forbid_for_strategy = forbid_mask_full_in if (params.entry_mode == "bb") else None
-
-    df_bt, summary = run_backtest(df_raw_in, params, forbid_entry_mask=forbid_for_strategy)
-
+) -> Tuple[Dict[str, Any], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Strategy-independent part of the segmentation: split/post-start dates and the pre/post frames.
+    Returns (segmentation block without segment results, df_pre, df_post); frames are None when disabled.
+    """
     segmentation: Dict[str, Any] = {
         "enabled": False,
         "mode": None,
@@ -1674,86 +1594,153 @@ def _run_one_strategy(
         "segments": {},
         "compare": None,
         "compare_error": None,
-        "compute_cost_note": "Per strategy: full + pre + post backtests (3x). Not optimized.",
+        "compute_cost_note": "Per strategy: full + pre + post backtests (3x). --jobs N runs them in a process pool.",
     }
 
-    post_df_bt: Optional[pd.DataFrame] = None
     disable_tokens = ["none", "off", "disable", "disabled", "0", "false"]
 
     if seg_spec_in in disable_tokens:
         segmentation["enabled"] = False
         segmentation["mode"] = "none"
         segmentation["notes"] = "segmentation disabled by --segment_split_date=none/off"
-    else:
-        split_ts: Optional[pd.Timestamp] = None
-        if seg_spec_in == "auto":
-            rk = int(segment_break_rank)
-            if len(breaks_aligned_in) > 0 and 0 <= rk < len(breaks_aligned_in):
-                split_ts = _parse_ymd(str(breaks_aligned_in[rk].get("break_date")))
-                segmentation["mode"] = "auto_break_rank"
-            else:
-                msg = f"segment_break_rank={rk} out of range (breaks_detected={len(breaks_aligned_in)}); segmentation disabled"
-                print(f"WARNING: {msg}")
-                segmentation["enabled"] = False
-                segmentation["mode"] = "auto_break_rank"
-                segmentation["notes"] = msg
-                split_ts = None
+        return segmentation, None, None
+
+    split_ts: Optional[pd.Timestamp] = None
+    if seg_spec_in == "auto":
+        rk = int(segment_break_rank)
+        if len(breaks_aligned_in) > 0 and 0 <= rk < len(breaks_aligned_in):
+            split_ts = _parse_ymd(str(breaks_aligned_in[rk].get("break_date")))
+            segmentation["mode"] = "auto_break_rank"
         else:
-            segmentation["mode"] = "manual"
-            split_ts = _parse_ymd(seg_raw_in)
-            if split_ts is None:
-                print(f"WARNING: could not parse --segment_split_date={seg_raw_in!r} as YYYY-MM-DD; segmentation disabled")
-
+            msg = f"segment_break_rank={rk} out of range (breaks_detected={len(breaks_aligned_in)}); segmentation disabled"
+            print(f"WARNING: {msg}")
+            segmentation["enabled"] = False
+            segmentation["mode"] = "auto_break_rank"
+            segmentation["notes"] = msg
+            split_ts = None
+    else:
+        segmentation["mode"] = "manual"
+        split_ts = _parse_ymd(seg_raw_in)
         if split_ts is None:
-            if segmentation.get("notes") is None:
-                segmentation["enabled"] = False
-                segmentation["notes"] = "no valid split_date (auto had no breaks, or manual date parse failed)"
+            print(f"WARNING: could not parse --segment_split_date={seg_raw_in!r} as YYYY-MM-DD; segmentation disabled")
+
+    if split_ts is None:
+        if segmentation.get("notes") is None:
+            segmentation["enabled"] = False
+            segmentation["notes"] = "no valid split_date (auto had no breaks, or manual date parse failed)"
+        return segmentation, None, None
+
+    # v26.8: default post_start excludes split day (use next row)
+    if segment_post_start_date:
+        post_start_ts = _parse_ymd(segment_post_start_date)
+        if post_start_ts is None:
+            print(f"WARNING: could not parse --segment_post_start_date={segment_post_start_date!r}; fallback to split_date")
+            post_start_ts = split_ts
+            post_policy = "manual_override_parse_failed_fallback_split_date"
         else:
-            # v26.8: default post_start excludes split day (use next row)
-            if segment_post_start_date:
-                post_start_ts = _parse_ymd(segment_post_start_date)
-                if post_start_ts is None:
-                    print(f"WARNING: could not parse --segment_post_start_date={segment_post_start_date!r}; fallback to split_date")
-                    post_start_ts = split_ts
-                    post_policy = "manual_override_parse_failed_fallback_split_date"
-                else:
-                    post_policy = "manual_override"
-            else:
-                post_start_ts, post_policy = _default_post_start_next_row(df_raw_in, split_ts)
-
-            segmentation["enabled"] = True
-            segmentation["split_date"] = split_ts.date().isoformat()
-            segmentation["post_start_date"] = post_start_ts.date().isoformat()
-            segmentation["post_start_policy"] = str(post_policy)
-
-            segmentation["notes"] = (
-                "Each segment equity is normalized to 1.0 at its own start (base_shares=1/segment_first_price). "
-                "Segment results are NOT chainable into a single continuous equity curve. "
-                "v26.8 default: split_date is excluded from BOTH pre and post (post starts at next trading row), "
-                "unless you override --segment_post_start_date."
-            )
+            post_policy = "manual_override"
+    else:
+        post_start_ts, post_policy = _default_post_start_next_row(df_raw_in, split_ts)
+
+    segmentation["enabled"] = True
+    segmentation["split_date"] = split_ts.date().isoformat()
+    segmentation["post_start_date"] = post_start_ts.date().isoformat()
+    segmentation["post_start_policy"] = str(post_policy)
+
+    segmentation["notes"] = (
+        "Each segment equity is normalized to 1.0 at its own start (base_shares=1/segment_first_price). "
+        "Segment results are NOT chainable into a single continuous equity curve. "
+        "v26.8 default: split_date is excluded from BOTH pre and post (post starts at next trading row), "
+        "unless you override --segment_post_start_date."
+    )
 
-            # IMPORTANT:
-            # pre: < split_ts
-            # post: >= post_start_ts (usually next row, so split day is excluded)
-            df_pre = df_raw_in.loc[df_raw_in["date_ts"] < split_ts].copy().reset_index(drop=True)
-            df_post = df_raw_in.loc[df_raw_in["date_ts"] >= post_start_ts].copy().reset_index(drop=True)
+    # IMPORTANT:
+    # pre: < split_ts
+    # post: >= post_start_ts (usually next row, so split day is excluded)
+    df_pre = df_raw_in.loc[df_raw_in["date_ts"] < split_ts].copy().reset_index(drop=True)
+    df_post = df_raw_in.loc[df_raw_in["date_ts"] >= post_start_ts].copy().reset_index(drop=True)
+    return segmentation, df_pre, df_post
 
+
+def _run_one_strategy(
+    *,
+    strategy_id: str,
+    df_raw_in: pd.DataFrame,
+    params: Params,
+    breaks_aligned_in: List[Dict[str, Any]],
+    ratio_hi_in: float,
+    ratio_lo_in: float,
+    forbid_mask_full_in: Optional[List[bool]],
+    seg_spec_in: str,
+    seg_raw_in: str,
+    segment_break_rank: int,
+    segment_post_start_date: Optional[str],
+    segment_min_rows_mult: float,
+    omit_trades: bool,
+    gonogo_th_in: Dict[str, Any],
+    precomputed: Optional[Dict[str, Any]] = None,
+    indicator_cache: Optional[_IndicatorCache] = None,
+    indicator_warmup: str = "segment",
+    result_cache: Optional[ResultCache] = None,
+) -> Tuple[Dict[str, Any], pd.DataFrame, Dict[str, Any], Optional[pd.DataFrame], Dict[str, Any]]:
+    """
+    precomputed (--jobs > 1): {"plan": _plan_segmentation(...) result, "full"/"pre"/"post": futures}.
+    Results are taken in the same order as the serial path (full, pre, post), so a worker exception
+    surfaces at the same point and the assembled output is identical.
+    """
+    if params.entry_mode == "always" and int(params.max_hold_days) > 0:
+        print(
+            f"NOTE: strategy {strategy_id}: entry_mode=always with max_hold_days={params.max_hold_days} "
+            "will exit/reenter periodically. With same-day reentry blocked, effective cycle is max_hold_days+1."
+        )
+
+    forbid_for_strategy = forbid_mask_full_in if (params.entry_mode == "bb") else None
+
+    if precomputed is None:
+        ind_full = indicator_cache.get("full", _prepare_df(df_raw_in), params) if indicator_cache is not None else None
+        df_bt, summary = run_backtest(
+            df_raw_in, params, forbid_entry_mask=forbid_for_strategy, indicators=ind_full, result_cache=result_cache,
+        )
+        segmentation, df_pre, df_post = _plan_segmentation(
+            df_raw_in=df_raw_in,
+            breaks_aligned_in=breaks_aligned_in,
+            seg_spec_in=seg_spec_in,
+            seg_raw_in=seg_raw_in,
+            segment_break_rank=segment_break_rank,
+            segment_post_start_date=segment_post_start_date,
+        )
+    else:
+        df_bt, summary = precomputed["full"].result()
+        seg_plan, df_pre, df_post = precomputed["plan"]
+        segmentation = copy.deepcopy(seg_plan)
+
+    post_df_bt: Optional[pd.DataFrame] = None
+
+    if df_pre is not None and df_post is not None:
+        if precomputed is None:
             seg_pre, _pre_df_bt = _segment_backtest(
-                "pre", df_pre, params, ratio_hi_in, ratio_lo_in, float(segment_min_rows_mult)
+                "pre", df_pre, params, ratio_hi_in, ratio_lo_in, float(segment_min_rows_mult),
+                indicator_cache=indicator_cache, full_start=0, indicator_warmup=indicator_warmup,
+                result_cache=result_cache,
             )
             seg_post, post_df_bt = _segment_backtest(
-                "post", df_post, params, ratio_hi_in, ratio_lo_in, float(segment_min_rows_mult)
+                "post", df_post, params, ratio_hi_in, ratio_lo_in, float(segment_min_rows_mult),
+                indicator_cache=indicator_cache, full_start=int(len(df_raw_in) - len(df_post)),
+                indicator_warmup=indicator_warmup, result_cache=result_cache,
             )
+        else:
+            seg_pre, _pre_df_bt = precomputed["pre"].result()
+            seg_post, post_df_bt = precomputed["post"].result()
 
-            segmentation["segments"]["pre"] = seg_pre
-            segmentation["segments"]["post"] = seg_post
+        segmentation["segments"]["pre"] = seg_pre
+        segmentation["segments"]["post"] = seg_post
+        segmentation["indicator_warmup"] = str(indicator_warmup)
 
-            try:
-                if seg_pre.get("ok") and seg_post.get("ok"):
-                    segmentation["compare"] = _seg_compare_block(seg_pre, seg_post)
-            except Exception as e:
-                segmentation["compare_error"] = f"{type(e).__name__}: {e}"
+        try:
+            if seg_pre.get("ok") and seg_post.get("ok"):
+                segmentation["compare"] = _seg_compare_block(seg_pre, seg_post)
+        except Exception as e:
+            segmentation["compare_error"] = f"{type(e).__name__}: {e}"
 
     gonogo = _post_gonogo_decision(segmentation, gonogo_th_in)
 
@@ -1787,6 +1774,61 @@ def _run_one_strategy(
     return out, df_bt, segmentation, post_df_bt, summary
 
 
+def _collect_result_cache_infos(obj: Any) -> List[Dict[str, Any]]:
+    """All audit["result_cache"] blocks (full + segment runs) found in the suite output."""
+    found: List[Dict[str, Any]] = []
+    if isinstance(obj, dict):
+        rc = obj.get("result_cache")
+        if isinstance(rc, dict) and rc.get("key"):
+            found.append(rc)
+        for k, v in obj.items():
+            if k != "result_cache":
+                found.extend(_collect_result_cache_infos(v))
+    elif isinstance(obj, list):
+        for v in obj:
+            found.extend(_collect_result_cache_infos(v))
+    return found
+
+
+# ===== --jobs process pool =====
+# Workers get the parsed price frame / segment frames once (initializer; fork shares them copy-on-write)
+# and run single backtests by (part, params). Merging happens in the parent in strategy order.
+_POOL_STATE: Dict[str, Any] = {}
+
+
+def _pool_init(state: Dict[str, Any]) -> None:
+    _POOL_STATE.clear()
+    _POOL_STATE.update(state)
+
+
+def _pool_run_part(part: str, params: Params) -> Tuple[Any, Any]:
+    st = _POOL_STATE
+    cache: _IndicatorCache = st["indicator_cache"]
+    if part == "full":
+        forbid = st["forbid_mask"] if params.entry_mode == "bb" else None
+        ind_full = cache.get("full", _prepare_df(st["df_raw"]), params)
+        return run_backtest(
+            st["df_raw"], params, forbid_entry_mask=forbid, indicators=ind_full, result_cache=st["result_cache"],
+        )
+    df_seg = st["df_pre"] if part == "pre" else st["df_post"]
+    full_start = 0 if part == "pre" else int(len(st["df_raw"]) - len(df_seg))
+    return _segment_backtest(
+        part, df_seg, params, st["ratio_hi"], st["ratio_lo"], st["segment_min_rows_mult"],
+        indicator_cache=cache, full_start=full_start, indicator_warmup=st["indicator_warmup"],
+        result_cache=st["result_cache"],
+    )
+
+
+def _make_pool(jobs: int, state: Dict[str, Any]) -> Optional[ProcessPoolExecutor]:
+    try:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+        return ProcessPoolExecutor(max_workers=int(jobs), mp_context=ctx, initializer=_pool_init, initargs=(state,))
+    except Exception as e:
+        print(f"WARNING: process pool unavailable ({type(e).__name__}: {e}); running strategies serially")
+        return None
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
 
@@ -1841,6 +1883,14 @@ def main() -> None:
     ap.add_argument("--segment_split_date", default="auto")
     ap.add_argument("--segment_break_rank", type=int, default=0)
     ap.add_argument("--segment_post_start_date", default=None)
+    ap.add_argument(
+        "--segment_indicator_warmup",
+        type=str,
+        default="segment",
+        choices=SEGMENT_INDICATOR_WARMUP,
+        help="segment: pre/post recompute BB/MA/RV20 from their own first row (equivalent to v26.9; default). "
+        "full: slice the full-history indicator arrays (segments start warm; NOT equivalent).",
+    )
     ap.add_argument(
         "--segment_min_rows_mult",
         type=float,
@@ -1849,6 +1899,43 @@ def main() -> None:
     )
 
     ap.add_argument("--omit_trades", action="store_true", default=False)
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run strategy full/pre/post backtests in N worker processes (0=cpu count, 1=serial). Outputs are identical.",
+    )
+    ap.add_argument(
+        "--result_cache",
+        default="",
+        help="Directory (under cache_dir) for cached simulation results keyed by script fingerprint + params "
+        "+ digest of the input rows. Unchanged strategies are reused, appended bars only recompute the tail. "
+        "Empty (default) disables.",
+    )
+    ap.add_argument("--result_cache_max_entries", type=int, default=256, help="LRU cap on cached results (0 = no cap).")
+    ap.add_argument("--result_cache_max_mb", type=float, default=64.0, help="LRU cap on cache size in MB (0 = no cap).")
+    ap.add_argument(
+        "--equity_curve_keep",
+        type=int,
+        default=32,
+        help="Keep at most N equity_curve.*.csv files in cache_dir (least recently written evicted first; "
+        "this run's files are always kept). 0 keeps only this run's files (v26.9 behavior).",
+    )
+    ap.add_argument(
+        "--equity_curve_format",
+        type=str,
+        default="csv",
+        choices=["csv", "npz", "both"],
+        help="Per-strategy equity curves: one csv per strategy (default), one columnar npz for the whole run "
+        "(equity_curves.<tag>.npz; memory-mapped by the renderer), or both.",
+    )
+    ap.add_argument(
+        "--equity_curve_dtype",
+        type=str,
+        default="float64",
+        choices=["float64", "float32"],
+        help="Float dtype of equity columns in the npz (float32 halves the file; csv is unaffected).",
+    )
 
     ap.add_argument("--gonogo_delta_sharpe0_lt", type=float, default=0.0)
     ap.add_argument("--gonogo_delta_abs_mdd_gt", type=float, default=0.0)
@@ -1896,6 +1983,10 @@ def main() -> None:
         raise SystemExit("ERROR: --leverage_frac must be >= 0 (negative leverage not supported in this MVP)")
     if int(args.contam_horizon) < 0 or int(args.z_clear_days) < 0:
         raise SystemExit("ERROR: --contam_horizon and --z_clear_days must be >= 0")
+    if int(args.jobs) < 0:
+        raise SystemExit("ERROR: --jobs must be >= 0")
+    if int(args.result_cache_max_entries) < 0 or float(args.result_cache_max_mb) < 0.0:
+        raise SystemExit("ERROR: --result_cache_max_entries and --result_cache_max_mb must be >= 0")
 
     suite = str(args.strategy_suite)
     if suite in ["all", "single_bb"]:
@@ -1904,53 +1995,32 @@ def main() -> None:
 
     cache_dir = str(args.cache_dir)
 
-    # v26.9: cleanup old equity_curve.*.csv (best-effort, non-fatal)
-    cleanup_info = _cleanup_equity_curve_csvs(cache_dir)
-    if cleanup_info.get("ok"):
-        nrm = int(cleanup_info.get("removed", 0) or 0)
-        if nrm > 0:
-            print(f"NOTE: removed {nrm} old equity_curve.*.csv files in cache_dir: {cache_dir}")
-    else:
-        print(f"WARNING: equity_curve cleanup failed: {cleanup_info}")
-
-    price_path = os.path.join(cache_dir, str(args.price_csv))
-    if not os.path.isfile(price_path):
-        raise SystemExit(f"ERROR: missing price csv: {price_path}")
-
-    stats_path = os.path.join(cache_dir, str(args.stats_json))
-    stats = _read_json(stats_path)
-
-    ratio_hi = float(args.break_ratio_hi) if args.break_ratio_hi is not None else _DEFAULT_RATIO_HI
-    ratio_lo = float(args.break_ratio_lo) if args.break_ratio_lo is not None else _DEFAULT_RATIO_LO
-
-    if isinstance(stats, dict):
-        bd = stats.get("break_detection", {})
-        if isinstance(bd, dict):
-            try:
-                if args.break_ratio_hi is None and ("break_ratio_hi" in bd):
-                    ratio_hi = float(bd["break_ratio_hi"])
-            except Exception:
-                pass
-            try:
-                if args.break_ratio_lo is None and ("break_ratio_lo" in bd):
-                    ratio_lo = float(bd["break_ratio_lo"])
-            except Exception:
-                pass
-
-    df_raw = pd.read_csv(price_path)
-    df_raw = _normalize_date_col(df_raw)
-
-    pc = _find_price_col(df_raw, args.price_col)
-    df_raw["price"] = pd.to_numeric(df_raw[pc], errors="coerce")
-    df_raw = df_raw.dropna(subset=["price"]).copy()
-
-    if isinstance(stats, dict):
-        raw_samples, break_samples_source = _extract_break_samples_from_stats(stats)
-    else:
-        raw_samples, break_samples_source = [], None
+    result_cache: Optional[ResultCache] = None
+    if str(args.result_cache).strip():
+        result_cache = ResultCache(
+            os.path.join(cache_dir, str(args.result_cache).strip()),
+            SCRIPT_FINGERPRINT,
+            max_entries=int(args.result_cache_max_entries),
+            max_bytes=int(float(args.result_cache_max_mb) * (1 << 20)),
+        )
 
-    raw_breaks = raw_samples if raw_samples else detect_breaks_from_price(df_raw, ratio_hi, ratio_lo)
-    breaks_aligned = align_break_indices(df_raw, raw_breaks)
+    inp = load_backtest_inputs(
+        cache_dir=cache_dir,
+        price_csv=str(args.price_csv),
+        stats_json=str(args.stats_json),
+        price_col=args.price_col,
+        break_ratio_hi=args.break_ratio_hi,
+        break_ratio_lo=args.break_ratio_lo,
+    )
+    price_path = inp["price_path"]
+    stats_path = inp["stats_path"]
+    ratio_hi = inp["ratio_hi"]
+    ratio_lo = inp["ratio_lo"]
+    df_raw = inp["df_raw"]
+    pc = inp["price_col"]
+    raw_samples = inp["raw_samples"]
+    break_samples_source = inp["break_samples_source"]
+    breaks_aligned = inp["breaks_aligned"]
 
     forbid_mask = None
     if bool(args.skip_contaminated) and len(breaks_aligned) > 0:
@@ -2050,6 +2120,7 @@ def main() -> None:
                 "any_negative_days": bool(getattr(args, "hard_fail_any_negative_days")),
             },
             "segment_min_rows_mult": float(args.segment_min_rows_mult),
+            "segment_indicator_warmup": str(args.segment_indicator_warmup),
             "segment_post_start_default_policy": "exclude_split_day_next_row (v26.8) unless --segment_post_start_date is provided",
             "rv20_filter_policy": {
                 "enabled": True,
@@ -2060,7 +2131,9 @@ def main() -> None:
                 "q_min_periods": int(_RV20_Q_MIN_PERIODS),
             },
             "equity_curve_tag": _EQUITY_CURVE_TAG,
-            "equity_curve_cleanup": cleanup_info,  # v26.9 audit
+            "equity_curve_cleanup": None,  # v26.13: LRU audit, filled in before the JSON is written
+            "equity_curve_format": str(args.equity_curve_format),
+            "equity_curve_dtype": str(args.equity_curve_dtype),
         },
         "strategy_suite": {
             "mode": str(args.strategy_suite),
@@ -2086,7 +2159,8 @@ def main() -> None:
             "v26.6: hard_fail scope='post' still enforces full_floor.",
             "v26.7+: write per-strategy equity curve CSV for renderer evidence.",
             "v26.8: default post_start_date excludes split_date (cut singularity day from segment stats).",
-            "v26.9: cleanup old equity_curve.*.csv files in cache_dir at start of run.",
+            "v26.13: equity_curve.*.csv files in cache_dir are LRU-evicted (--equity_curve_keep) instead of deleted at start of run.",
+            "v26.14: --equity_curve_format npz|both writes all curves of the run to one columnar equity_curves.<tag>.npz.",
         ],
     }
 
@@ -2094,6 +2168,56 @@ def main() -> None:
     abort_reason: Optional[str] = None
 
     results_by_sid: Dict[str, Dict[str, Any]] = {}
+    curve_csv = str(args.equity_curve_format) in ("csv", "both")
+    curve_npz = str(args.equity_curve_format) in ("npz", "both")
+    npz_frame: Optional[Tuple[List[str], np.ndarray]] = None
+    npz_curves: Dict[str, Dict[str, np.ndarray]] = {}
+
+    # indicators once per (frame, bb_window/ddof/ma windows/trading_days), shared by all strategies
+    indicator_cache = _IndicatorCache()
+    df_full_prepared = _prepare_df(df_raw)
+    for (_sid, params) in strategies:
+        indicator_cache.get("full", df_full_prepared, params)
+
+    jobs = int(args.jobs) if int(args.jobs) > 0 else int(os.cpu_count() or 1)
+    jobs = min(jobs, 3 * len(strategies))
+    pool: Optional[ProcessPoolExecutor] = None
+    pending: Dict[str, Dict[str, Any]] = {}
+    if jobs > 1:
+        seg_plan = _plan_segmentation(
+            df_raw_in=df_raw,
+            breaks_aligned_in=breaks_aligned,
+            seg_spec_in=seg_spec,
+            seg_raw_in=seg_raw,
+            segment_break_rank=int(args.segment_break_rank),
+            segment_post_start_date=args.segment_post_start_date,
+        )
+        if seg_plan[1] is not None and seg_plan[2] is not None:
+            for (_sid, params) in strategies:
+                indicator_cache.get("pre", _prepare_df(seg_plan[1]), params)
+                indicator_cache.get("post", _prepare_df(seg_plan[2]), params)
+        pool = _make_pool(
+            jobs,
+            {
+                "df_raw": df_raw,
+                "df_pre": seg_plan[1],
+                "df_post": seg_plan[2],
+                "forbid_mask": forbid_mask,
+                "ratio_hi": ratio_hi,
+                "ratio_lo": ratio_lo,
+                "segment_min_rows_mult": float(args.segment_min_rows_mult),
+                "indicator_cache": indicator_cache,
+                "indicator_warmup": str(args.segment_indicator_warmup),
+                "result_cache": result_cache,
+            },
+        )
+        if pool is not None:
+            print(f"NOTE: --jobs {jobs}: {len(strategies)} strategies x (full, pre, post) in a process pool")
+            parts = ["full", "pre", "post"] if seg_plan[1] is not None else ["full"]
+            for (sid, params) in strategies:
+                pending[sid] = {"plan": seg_plan}
+                for part in parts:
+                    pending[sid][part] = pool.submit(_pool_run_part, part, params)
 
     for (sid, params) in strategies:
         try:
@@ -2112,6 +2236,10 @@ def main() -> None:
                 segment_min_rows_mult=float(args.segment_min_rows_mult),
                 omit_trades=bool(args.omit_trades),
                 gonogo_th_in=gonogo_th,
+                precomputed=pending.get(sid),
+                indicator_cache=indicator_cache,
+                indicator_warmup=str(args.segment_indicator_warmup),
+                result_cache=result_cache,
             )
         except Exception as e:
             err_type = type(e).__name__
@@ -2170,19 +2298,36 @@ def main() -> None:
         strat_obj["suite_hard_fail_reasons"] = hard_reasons
 
         # v26.7+: write per-strategy equity curve csv (best-effort)
-        eq_curve_name = f"equity_curve.{_EQUITY_CURVE_TAG}__{sid}.csv"
-        eq_curve_path = os.path.join(cache_dir, eq_curve_name)
-        _ensure_parent(eq_curve_path)
-        try:
-            df_bt[["date", "price", "bb_z", "ma_fast", "ma_slow", "equity", "equity_base_only", "lever_on"]].to_csv(
-                eq_curve_path, index=False, encoding="utf-8"
-            )
-            strat_obj["equity_curve_csv"] = eq_curve_name
-            strat_obj["equity_curve_csv_resolved"] = eq_curve_path
-        except Exception as e:
+        if curve_csv:
+            eq_curve_name = f"equity_curve.{_EQUITY_CURVE_TAG}__{sid}.csv"
+            eq_curve_path = os.path.join(cache_dir, eq_curve_name)
+            _ensure_parent(eq_curve_path)
+            try:
+                df_bt[["date", "price", "bb_z", "ma_fast", "ma_slow", "equity", "equity_base_only", "lever_on"]].to_csv(
+                    eq_curve_path, index=False, encoding="utf-8"
+                )
+                strat_obj["equity_curve_csv"] = eq_curve_name
+                strat_obj["equity_curve_csv_resolved"] = eq_curve_path
+            except Exception as e:
+                strat_obj["equity_curve_csv"] = None
+                strat_obj["equity_curve_csv_resolved"] = None
+                strat_obj["equity_curve_csv_error"] = f"{type(e).__name__}: {e}"
+        else:
             strat_obj["equity_curve_csv"] = None
             strat_obj["equity_curve_csv_resolved"] = None
-            strat_obj["equity_curve_csv_error"] = f"{type(e).__name__}: {e}"
+
+        # v26.14: collect columns for the run-wide npz (written once after the loop)
+        if curve_npz:
+            if npz_frame is None:
+                npz_frame = (df_bt["date"].astype(str).tolist(), df_bt["price"].to_numpy(dtype=float))
+            if len(df_bt) == len(npz_frame[0]):
+                npz_curves[sid] = {
+                    "equity": df_bt["equity"].to_numpy(dtype=float),
+                    "equity_base_only": df_bt["equity_base_only"].to_numpy(dtype=float),
+                    "lever_on": df_bt["lever_on"].to_numpy(dtype=bool),
+                }
+            else:
+                strat_obj["equity_curve_npz_error"] = f"row count {len(df_bt)} != {len(npz_frame[0])}"
 
         suite_out["strategies"].append(strat_obj)
 
@@ -2260,6 +2405,9 @@ def main() -> None:
         }
         compare_rows.append(row)
 
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
     suite_out["abort_reason"] = abort_reason
     if abort_reason is not None:
         suite_out["suite_ok"] = False
@@ -2332,6 +2480,59 @@ def main() -> None:
         "export_policy": "top1_by_compare_policy else first_success",
     }
 
+    # v26.14: one columnar file for all curves of this run (best-effort)
+    suite_out["outputs"]["equity_curves_npz"] = None
+    if npz_curves and npz_frame is not None:
+        npz_name = f"equity_curves.{_EQUITY_CURVE_TAG}.npz"
+        npz_path = os.path.join(cache_dir, npz_name)
+        _ensure_parent(npz_path)
+        try:
+            nbytes = write_curves(
+                npz_path,
+                npz_frame[0],
+                npz_frame[1],
+                npz_curves,
+                meta={"script_fingerprint": SCRIPT_FINGERPRINT, "equity_curve_tag": _EQUITY_CURVE_TAG},
+                dtype=str(args.equity_curve_dtype),
+            )
+            for s in suite_out["strategies"]:
+                if s.get("strategy_id") in npz_curves:
+                    s["equity_curve_npz"] = npz_name
+            suite_out["outputs"]["equity_curves_npz"] = npz_name
+            print(f"NOTE: wrote {len(npz_curves)} equity curves to {npz_path} ({nbytes} bytes)")
+        except Exception as e:
+            suite_out["outputs"]["equity_curves_npz_error"] = f"{type(e).__name__}: {e}"
+            print(f"WARNING: equity curve npz write failed: {type(e).__name__}: {e}")
+
+    # v26.13: LRU instead of blanket delete; this run's curves (incl. the export csvs written below) are kept
+    used_curves = [s.get("equity_curve_csv") for s in suite_out["strategies"] if s.get("equity_curve_csv")]
+    if suite_out["outputs"].get("equity_curves_npz"):
+        used_curves.append(suite_out["outputs"]["equity_curves_npz"])
+    used_curves += [str(args.out_equity_csv)] + ([str(args.out_post_equity_csv)] if args.out_post_equity_csv else [])
+    cleanup_info = lru_touch_and_evict_files(
+        cache_dir,
+        "equity_curve.lru.json",
+        match=lambda nm: (nm.startswith("equity_curve.") and nm.endswith(".csv"))
+        or (nm.startswith("equity_curves.") and nm.endswith(".npz")),
+        used_names=used_curves,
+        max_files=int(args.equity_curve_keep),
+    )
+    suite_out["inputs"]["equity_curve_cleanup"] = cleanup_info
+    if cleanup_info.get("ok"):
+        nrm = int(cleanup_info.get("removed", 0) or 0)
+        if nrm > 0:
+            print(f"NOTE: evicted {nrm} least recently used equity_curve.*.csv files in cache_dir: {cache_dir}")
+    else:
+        print(f"WARNING: equity_curve LRU cleanup failed: {cleanup_info}")
+
+    if result_cache is not None:
+        rc_infos = _collect_result_cache_infos(suite_out["strategies"])
+        rc_audit = result_cache.finalize([i["key"] for i in rc_infos])
+        rc_audit["modes"] = {m: sum(1 for i in rc_infos if i.get("mode") == m) for m in ("hit", "tail", "miss")}
+        rc_audit["rows_recomputed"] = int(sum(int(i.get("rows_recomputed") or 0) for i in rc_infos))
+        suite_out["inputs"]["result_cache"] = rc_audit
+        print(f"NOTE: result cache {rc_audit['modes']} entries={rc_audit['entries']} evicted={rc_audit['evicted']}")
+
     _write_json(out_json_path, suite_out)
 
     _ensure_parent(out_cmp_path)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+backtest_tw0050_leverage_sweep.py
+
+Parameter sweep (grid search) for the 0050 leverage backtest (backtest_tw0050_leverage_mvp.py).
+
+One process reads data.csv / stats_latest.json once, builds the grid, and runs run_backtest
+(full history, same semantics as the suite's "full" part) for every combination. Results go to
+one table: one row per combination, all Params columns + metrics.
+
+Batching (default; --no_batch = one run_backtest per combination): the valid combinations of a
+chunk run as lanes of one run_backtest_batch / leverage_sim.simulate_batch bar loop on the shared
+price path. Results are identical to per-combination runs; a batch that raises falls back to
+per-combination runs for that chunk.
+
+Reuse:
+- indicators (BB z, MA fast/slow, RV20, RV20 q60) are computed once per indicator key
+  (bb_window, bb_ddof, trend_ma_fast, trend_ma_slow, trading_days) and shared by all grid points;
+- forbid masks are built once per (contam_horizon, z_clear_days).
+- --jobs N: combinations are split into chunks and run in a fork process pool; workers inherit
+  the price frame and indicator arrays. Row order is the grid order regardless of --jobs.
+
+Grid syntax (--grid KEY=SPEC, repeatable; or --grid_file JSON/YAML {"base": {...}, "grid": {...}}):
+  -2.5:-1.0:0.25   inclusive numeric range (start:stop:step)
+  0,0.5,1          explicit list
+  bb|always|trend  explicit list (strings; '|' also accepted as separator)
+Fixed overrides: --set KEY=VALUE (repeatable). Keys are Params fields.
+
+Not covered: pre/post segmentation, go/no-go and equity/trade CSVs (use the suite for a
+shortlisted combination).
+
+Usage:
+    python scripts/backtest_tw0050_leverage_sweep.py --cache_dir tw0050_bb_cache \\
+        --grid entry_z=-2.5:-1.0:0.25 --grid exit_z=-0.5:0.5:0.25 \\
+        --grid leverage_frac=0.2,0.5,1.0 --grid max_hold_days=0,20,60 --jobs 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backtest_tw0050_leverage_mvp import (
+    SCRIPT_FINGERPRINT as BACKTEST_FINGERPRINT,
+    Params,
+    _IndicatorCache,
+    _hard_fail_eval,
+    _indicator_key,
+    _prepare_df,
+    _write_json,
+    build_entry_forbidden_mask,
+    load_backtest_inputs,
+    run_backtest,
+    run_backtest_batch,
+    utc_now_iso,
+)
+from leverage_params import BASE_DEFAULTS, PARAM_TYPES, coerce_param, split_kv
+
+
+SCHEMA_VERSION = "sweep_v1"
+SCRIPT_FINGERPRINT = "backtest_tw0050_leverage_sweep@2026-10-16.v1"
+
+METRIC_COLS = [
+    "ok",
+    "error",
+    "cagr",
+    "mdd",
+    "sharpe0",
+    "vol_ann",
+    "calmar",
+    "end_equity",
+    "base_cagr",
+    "base_mdd",
+    "base_sharpe0",
+    "delta_cagr",
+    "delta_mdd",
+    "delta_sharpe0",
+    "turnover_proxy",
+    "trades",
+    "margin_call_count",
+    "min_maintenance_ratio",
+    "equity_min",
+    "equity_negative_days",
+    "hard_fail",
+    "interest_paid_total",
+    "cost_paid_total",
+    "skipped_entries_on_forbidden",
+    "skipped_entries_on_rv20",
+    "forbid_mask_applied",
+]
+
+
+def _parse_spec(key: str, spec: Any) -> List[Any]:
+    """Grid values for one key from a list / scalar / 'a:b:step' / 'a,b,c' spec."""
+    if isinstance(spec, (list, tuple)):
+        vals = [coerce_param(key, v) for v in spec]
+    elif isinstance(spec, str) and spec.count(":") == 2 and PARAM_TYPES.get(key) in ("int", "float"):
+        a, b, st = (float(x) for x in spec.split(":"))
+        if st == 0 or (b - a) / st < 0:
+            raise SystemExit(f"ERROR: {key}: bad range {spec!r}")
+        k = int(math.floor((b - a) / st + 1e-9))
+        # round to the step's decimals so 0.1-style steps do not leave float drift in the table
+        dec = max(0, -int(math.floor(math.log10(abs(st))))) + 2 if abs(st) < 1 else 6
+        vals = [coerce_param(key, round(a + i * st, dec)) for i in range(k + 1)]
+    elif isinstance(spec, str):
+        parts = [p for p in spec.replace("|", ",").split(",") if p.strip()]
+        vals = [coerce_param(key, p) for p in parts]
+    else:
+        vals = [coerce_param(key, spec)]
+    vals = list(dict.fromkeys(vals))
+    if not vals:
+        raise SystemExit(f"ERROR: {key}: empty grid")
+    return vals
+
+
+def _load_grid_file(path: str) -> Dict[str, Any]:
+    if not os.path.isfile(path):
+        raise SystemExit(f"ERROR: missing grid file: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith((".yml", ".yaml")):
+        try:
+            import yaml  # optional; JSON grid files need nothing extra
+        except ImportError:
+            raise SystemExit("ERROR: YAML grid file needs PyYAML (pip install pyyaml) or use JSON")
+        obj = yaml.safe_load(text)
+    else:
+        obj = json.loads(text)
+    if not isinstance(obj, dict):
+        raise SystemExit("ERROR: grid file must be a mapping")
+    if "grid" not in obj and "base" not in obj:
+        obj = {"grid": obj}
+    return obj
+
+
+def build_grid(
+    base_overrides: Dict[str, Any],
+    grid_specs: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[str], List[Dict[str, Any]]]:
+    """(base, swept keys, list of full param dicts in itertools.product order)."""
+    base = dict(BASE_DEFAULTS)
+    for k, v in base_overrides.items():
+        base[k] = coerce_param(k, v)
+    keys = list(grid_specs.keys())
+    values = [_parse_spec(k, grid_specs[k]) for k in keys]
+    combos: List[Dict[str, Any]] = []
+    for tup in itertools.product(*values):
+        d = dict(base)
+        d.update(dict(zip(keys, tup)))
+        combos.append(d)
+    return base, keys, combos
+
+
+def _combo_check(d: Dict[str, Any], allow_inverted_z: bool) -> Optional[str]:
+    if int(d["bb_window"]) < 2:
+        return "bb_window < 2"
+    if int(d["trading_days"]) <= 0:
+        return "trading_days <= 0"
+    if int(d["max_hold_days"]) < 0:
+        return "max_hold_days < 0"
+    if float(d["leverage_frac"]) < 0.0:
+        return "leverage_frac < 0"
+    if int(d["contam_horizon"]) < 0 or int(d["z_clear_days"]) < 0:
+        return "contam_horizon / z_clear_days < 0"
+    if d["entry_mode"] == "bb" and float(d["exit_z"]) < float(d["entry_z"]) and not allow_inverted_z:
+        return "exit_z < entry_z (set --allow_inverted_z)"
+    return None
+
+
+def _metrics_row(summary: Dict[str, Any], forbid_applied: bool, hf_equity_le: float, hf_neg_days: bool) -> Dict[str, Any]:
+    pl = summary.get("perf_leverage") or {}
+    pb = summary.get("perf_base_only") or {}
+    au = summary.get("audit") or {}
+    dv = summary.get("delta_vs_base") or {}
+    hard_fail, _ = _hard_fail_eval(
+        full_audit=au, post_audit=None, scope="full", equity_le=hf_equity_le, any_negative_days=hf_neg_days
+    )
+    return {
+        "ok": bool(pl.get("ok")),
+        "error": None,
+        "cagr": pl.get("cagr"),
+        "mdd": pl.get("mdd"),
+        "sharpe0": pl.get("sharpe0"),
+        "vol_ann": pl.get("vol_ann"),
+        "calmar": summary.get("calmar_leverage"),
+        "end_equity": pl.get("end"),
+        "base_cagr": pb.get("cagr"),
+        "base_mdd": pb.get("mdd"),
+        "base_sharpe0": pb.get("sharpe0"),
+        "delta_cagr": dv.get("cagr"),
+        "delta_mdd": dv.get("mdd"),
+        "delta_sharpe0": dv.get("sharpe0"),
+        "turnover_proxy": summary.get("turnover_proxy"),
+        "trades": au.get("trades"),
+        "margin_call_count": au.get("margin_call_count"),
+        "min_maintenance_ratio": au.get("min_maintenance_ratio"),
+        "equity_min": au.get("equity_min"),
+        "equity_negative_days": au.get("equity_negative_days"),
+        "hard_fail": bool(hard_fail),
+        "interest_paid_total": au.get("interest_paid_total"),
+        "cost_paid_total": au.get("cost_paid_total"),
+        "skipped_entries_on_forbidden": au.get("skipped_entries_on_forbidden"),
+        "skipped_entries_on_rv20": au.get("skipped_entries_on_rv20"),
+        "forbid_mask_applied": bool(forbid_applied),
+    }
+
+
+# ===== worker state (fork shares it copy-on-write) =====
+_SWEEP_STATE: Dict[str, Any] = {}
+
+
+def _sweep_init(state: Dict[str, Any]) -> None:
+    _SWEEP_STATE.clear()
+    _SWEEP_STATE.update(state)
+
+
+def _forbid_mask(st: Dict[str, Any], p: Params) -> Optional[List[bool]]:
+    # suite rule: mask only for bb entries, only when skip_contaminated and breaks exist
+    if p.entry_mode != "bb" or not p.skip_contaminated or not st["breaks_aligned"]:
+        return None
+    masks: Dict[Tuple[int, int], List[bool]] = st.setdefault("forbid_masks", {})
+    k = (int(p.contam_horizon), int(p.z_clear_days))
+    if k not in masks:
+        masks[k] = build_entry_forbidden_mask(
+            n=len(st["df_raw"]), breaks=st["breaks_aligned"], contam_horizon=k[0], z_clear_days=k[1]
+        )
+    return masks[k]
+
+
+def _sweep_run_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Rows for one chunk (grid order). With batching, the chunk's valid combos share one
+    run_backtest_batch bar loop (same results as per-combo run_backtest); if the batch raises, the
+    chunk falls back to per-combo runs so the error lands on the offending row only.
+    """
+    st = _SWEEP_STATE
+    cache: _IndicatorCache = st["indicator_cache"]
+    rows: List[Dict[str, Any]] = []
+    runs: List[Tuple[Dict[str, Any], Params, Optional[List[bool]], Dict[str, Any]]] = []
+    for combo_id, d in chunk:
+        row: Dict[str, Any] = {"combo_id": int(combo_id)}
+        row.update(d)
+        rows.append(row)
+        err = _combo_check(d, st["allow_inverted_z"])
+        if err is None:
+            try:
+                p = Params(**d)
+                runs.append((row, p, _forbid_mask(st, p), cache.get("full", st["df_prepared"], p)))
+            except Exception as e:
+                err = f"{type(e).__name__}: {e}"
+        if err is not None:
+            _set_error(row, err)
+
+    summaries: Optional[List[Dict[str, Any]]] = None
+    if st["batch"] and len(runs) > 1:
+        try:
+            out = run_backtest_batch(
+                st["df_raw"], [r[1] for r in runs], [r[2] for r in runs], [r[3] for r in runs]
+            )
+            summaries = [summary for _, summary in out]
+        except Exception:
+            summaries = None
+    for i, (row, p, forbid, ind) in enumerate(runs):
+        try:
+            if summaries is not None:
+                summary = summaries[i]
+            else:
+                _, summary = run_backtest(st["df_raw"], p, forbid_entry_mask=forbid, indicators=ind)
+            row.update(_metrics_row(summary, forbid is not None, st["hf_equity_le"], st["hf_neg_days"]))
+        except Exception as e:
+            _set_error(row, f"{type(e).__name__}: {e}")
+    return rows
+
+
+def _set_error(row: Dict[str, Any], err: str) -> None:
+    row.update({c: None for c in METRIC_COLS})
+    row["ok"] = False
+    row["error"] = err
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Grid search over backtest_tw0050_leverage_mvp parameters.")
+    ap.add_argument("--cache_dir", required=True)
+    ap.add_argument("--price_csv", default="data.csv")
+    ap.add_argument("--stats_json", default="stats_latest.json")
+    ap.add_argument("--price_col", default=None)
+    ap.add_argument("--break_ratio_hi", type=float, default=None)
+    ap.add_argument("--break_ratio_lo", type=float, default=None)
+
+    ap.add_argument("--grid", action="append", default=[], help="KEY=SPEC (a:b:step | v1,v2,...). Repeatable.")
+    ap.add_argument("--grid_file", default=None, help='JSON (or YAML with PyYAML) {"base": {...}, "grid": {KEY: SPEC|list}}')
+    ap.add_argument("--set", dest="set_", action="append", default=[], help="KEY=VALUE fixed override. Repeatable.")
+    ap.add_argument("--allow_inverted_z", action="store_true", default=False)
+    ap.add_argument("--max_combos", type=int, default=20000, help="Refuse grids larger than this (0 = no limit).")
+
+    ap.add_argument("--hard_fail_equity_le", type=float, default=0.0)
+    ap.add_argument("--no_hard_fail_any_negative_days", dest="hard_fail_any_negative_days", action="store_false", default=True)
+
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = cpu count, 1 = serial).")
+    ap.add_argument("--chunk_size", type=int, default=0, help="Combinations per task (0 = auto).")
+    ap.add_argument("--no_batch", dest="batch", action="store_false", default=True,
+                    help="Run every combination through its own run_backtest (default: one batched bar loop per chunk).")
+
+    ap.add_argument("--out_csv", default="backtest_sweep.csv")
+    ap.add_argument("--out_json", default="backtest_sweep.json")
+    ap.add_argument("--top", type=int, default=10, help="Rows listed in out_json top_by_calmar.")
+    args = ap.parse_args()
+
+    if int(args.jobs) < 0:
+        raise SystemExit("ERROR: --jobs must be >= 0")
+
+    base_over: Dict[str, Any] = {}
+    grid_specs: Dict[str, Any] = {}
+    if args.grid_file:
+        gf = _load_grid_file(str(args.grid_file))
+        base_over.update(gf.get("base") or {})
+        grid_specs.update(gf.get("grid") or {})
+    base_over.update(dict(split_kv(args.set_, "--set")))
+    grid_specs.update(dict(split_kv(args.grid, "--grid")))
+    if not grid_specs:
+        raise SystemExit("ERROR: empty grid (use --grid KEY=SPEC or --grid_file)")
+
+    base, swept, combos = build_grid(base_over, grid_specs)
+    if int(args.max_combos) > 0 and len(combos) > int(args.max_combos):
+        raise SystemExit(f"ERROR: grid has {len(combos)} combinations > --max_combos {args.max_combos}")
+
+    cache_dir = str(args.cache_dir)
+    inp = load_backtest_inputs(
+        cache_dir=cache_dir,
+        price_csv=str(args.price_csv),
+        stats_json=str(args.stats_json),
+        price_col=args.price_col,
+        break_ratio_hi=args.break_ratio_hi,
+        break_ratio_lo=args.break_ratio_lo,
+    )
+    df_raw = inp["df_raw"]
+    df_prepared = _prepare_df(df_raw)
+
+    indicator_cache = _IndicatorCache()
+    ind_keys: Dict[Tuple[int, int, int, int, int], None] = {}
+    for d in combos:
+        if _combo_check(d, bool(args.allow_inverted_z)) is None:
+            p = Params(**d)
+            if _indicator_key(p) not in ind_keys:
+                ind_keys[_indicator_key(p)] = None
+                indicator_cache.get("full", df_prepared, p)
+
+    state = {
+        "df_raw": df_raw,
+        "df_prepared": df_prepared,
+        "breaks_aligned": inp["breaks_aligned"],
+        "indicator_cache": indicator_cache,
+        "allow_inverted_z": bool(args.allow_inverted_z),
+        "hf_equity_le": float(args.hard_fail_equity_le),
+        "hf_neg_days": bool(args.hard_fail_any_negative_days),
+        "batch": bool(args.batch),
+    }
+
+    jobs = int(args.jobs) if int(args.jobs) > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(jobs, len(combos)))
+    if int(args.chunk_size) > 0:
+        chunk = int(args.chunk_size)
+    elif args.batch:
+        # batched chunks: one bar loop per chunk, wide lanes pay off (leverage_sim.simulate_batch)
+        chunk = max(1, min(256, -(-len(combos) // jobs)))
+    else:
+        chunk = max(1, min(64, len(combos) // (jobs * 4) or 1))
+    items = list(enumerate(combos))
+    chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+
+    t0 = time.time()
+    rows: List[Dict[str, Any]] = []
+    pool: Optional[ProcessPoolExecutor] = None
+    if jobs > 1:
+        try:
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+            pool = ProcessPoolExecutor(max_workers=jobs, mp_context=ctx, initializer=_sweep_init, initargs=(state,))
+        except Exception as e:
+            print(f"WARNING: process pool unavailable ({type(e).__name__}: {e}); running serially")
+            pool = None
+    if pool is not None:
+        with pool:
+            for part in pool.map(_sweep_run_chunk, chunks):
+                rows.extend(part)
+    else:
+        jobs = 1
+        _sweep_init(state)
+        for c in chunks:
+            rows.extend(_sweep_run_chunk(c))
+    elapsed = time.time() - t0
+
+    param_cols = [f.name for f in fields(Params)]
+    df_out = pd.DataFrame(rows, columns=["combo_id"] + param_cols + METRIC_COLS)
+
+    out_csv = os.path.join(cache_dir, str(args.out_csv))
+    out_json = os.path.join(cache_dir, str(args.out_json))
+    os.makedirs(os.path.dirname(os.path.abspath(out_csv)), exist_ok=True)
+    df_out.to_csv(out_csv, index=False)
+
+    df_rank = df_out[df_out["ok"].astype(bool) & ~df_out["hard_fail"].fillna(False).astype(bool)].copy()
+    df_rank = df_rank.dropna(subset=["calmar"]).sort_values(["calmar", "sharpe0"], ascending=[False, False])
+    top_cols = ["combo_id"] + swept + ["cagr", "mdd", "sharpe0", "calmar", "turnover_proxy", "trades", "margin_call_count"]
+
+    meta: Dict[str, Any] = {
+        "generated_at_utc": utc_now_iso(),
+        "schema_version": SCHEMA_VERSION,
+        "script_fingerprint": SCRIPT_FINGERPRINT,
+        "backtest_fingerprint": BACKTEST_FINGERPRINT,
+        "inputs": {
+            "cache_dir": cache_dir,
+            "price_csv_resolved": inp["price_path"],
+            "price_col": inp["price_col"],
+            "rows": int(len(df_prepared)),
+            "start_date": str(df_prepared["date"].iloc[0]) if len(df_prepared) else None,
+            "end_date": str(df_prepared["date"].iloc[-1]) if len(df_prepared) else None,
+            "break_ratio_hi": inp["ratio_hi"],
+            "break_ratio_lo": inp["ratio_lo"],
+            "breaks_detected": int(len(inp["breaks_aligned"])),
+            "break_samples_source": inp["break_samples_source"] if inp["raw_samples"] else "detect_breaks_from_price",
+        },
+        "base": base,
+        "grid": {k: _parse_spec(k, grid_specs[k]) for k in swept},
+        "combos": int(len(combos)),
+        "combos_ok": int(df_out["ok"].astype(bool).sum()),
+        "combos_hard_fail": int(df_out["hard_fail"].fillna(False).astype(bool).sum()),
+        "scope": "full history only (no pre/post segmentation); same run_backtest as the suite's full part",
+        "forbid_mask_policy": "entry_mode == 'bb' and skip_contaminated and breaks exist (suite rule)",
+        "hard_fail_policy": {
+            "scope": "full",
+            "equity_le": float(args.hard_fail_equity_le),
+            "any_negative_days": bool(args.hard_fail_any_negative_days),
+        },
+        "ranking_policy": "calmar desc, sharpe0 desc; EXCLUDE not ok / hard_fail",
+        "top_by_calmar": df_rank[top_cols].head(max(int(args.top), 0)).to_dict(orient="records"),
+        "perf": {
+            "jobs": int(jobs),
+            "chunk_size": int(chunk),
+            "batched": bool(args.batch),
+            "indicator_keys": int(len(ind_keys)),
+            "elapsed_sec": round(float(elapsed), 3),
+            "combos_per_sec": round(len(combos) / elapsed, 2) if elapsed > 0 else None,
+        },
+        "outputs": {"csv": out_csv, "json": out_json},
+    }
+    _write_json(out_json, meta)
+
+    print(f"OK: {len(combos)} combinations ({int(meta['combos_ok'])} ok) in {elapsed:.1f}s, jobs={jobs}")
+    print(f"OK: wrote {out_csv}")
+    print(f"OK: wrote {out_json}")
+
+
+if __name__ == "__main__":
+    main()
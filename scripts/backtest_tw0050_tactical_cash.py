@@ -4,6 +4,14 @@
 """
 backtest_tw0050_tactical_cash.py
 
+v2.4 (2026-10-16):
+- ADD: --walk_forward mode. Every MA length in --wf_ma_windows is run on rolling (or anchored, i.e.
+  rolling-origin) train/test windows; the train-best MA per window (--wf_select_metric) is flagged.
+  One signal array per MA length is computed once and sliced per window; windows run in a process pool
+  (--jobs). Output: compact per-(window, MA) KPI table (--wf_out_csv, _perf_summary/_trade_kpis fields)
+  + JSON with per-MA stability and selected out-of-sample summary (--wf_out_json).
+- REFACTOR: bar loop moved to simulate_tactical(), signals to _signal_arrays(). Single-run outputs unchanged.
+
 v2.3 (2026-02-24):
 - FIX(exec_delay=0 bug): if exec_delay_days == 0, execute immediately on the same bar.
   This prevents "scheduled but never executed" due to loop ordering.
@@ -28,16 +36,21 @@ from __future__ import annotations
 import argparse
 import json
 import math
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, date as _date
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from price_breaks import break_positions
+
 
-SCRIPT_FINGERPRINT = "backtest_tw0050_tactical_cash@2026-02-24.v2.3.fix_execdelay0_and_force_close"
-SCHEMA_VERSION = "v2.3"
+SCRIPT_FINGERPRINT = "backtest_tw0050_tactical_cash@2026-10-16.v2.4.walk_forward"
+SCHEMA_VERSION = "v2.4"
 
 _DEFAULT_RATIO_HI = 1.8
 _DEFAULT_RATIO_LO = round(1.0 / _DEFAULT_RATIO_HI, 10)
@@ -309,23 +322,12 @@ def detect_breaks_from_price(df: pd.DataFrame, ratio_hi: float, ratio_lo: float)
     px = pd.to_numeric(df["price"], errors="coerce").to_numpy(dtype=float)
     dates = df["date"].astype(str).to_numpy()
 
-    p0 = px[:-1]
-    p1 = px[1:]
-    valid = np.isfinite(p0) & np.isfinite(p1) & (p0 > 0.0)
-    if not np.any(valid):
-        return out
-
-    ratio = np.full_like(p1, np.nan, dtype=float)
-    ratio[valid] = p1[valid] / p0[valid]
-
-    mask = (ratio >= float(ratio_hi)) | (ratio <= float(ratio_lo))
-    idxs = (np.where(mask & np.isfinite(ratio))[0] + 1).astype(int)
+    idxs = break_positions(px, ratio_hi=float(ratio_hi), ratio_lo=float(ratio_lo))
     if idxs.size == 0:
         return out
 
     for i in idxs.tolist():
-        j = i - 1
-        ratio_val = float(ratio[j]) if (0 <= j < len(ratio) and np.isfinite(ratio[j])) else None
+        ratio_val = float(px[i] / px[i - 1])
         out.append(
             {
                 "idx": int(i),
@@ -482,126 +484,38 @@ def _build_post_df(
     return df_post, seg
 
 
-def main() -> None:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--cache_dir", required=True)
-    ap.add_argument("--price_csv", default="data.csv")
-    ap.add_argument("--price_col", default=None)
-
-    ap.add_argument("--stats_json", default="stats_latest.json")
-    ap.add_argument("--segment_split_date", default="auto")
-    ap.add_argument("--segment_break_rank", type=int, default=0)
-    ap.add_argument("--segment_post_start_date", default=None)
-    ap.add_argument("--break_ratio_hi", type=float, default=None)
-    ap.add_argument("--break_ratio_lo", type=float, default=None)
-
-    ap.add_argument("--ma_window", type=int, default=60)
-    ap.add_argument("--core_frac", type=float, default=0.90)
-
-    ap.add_argument("--signal_lag_days", type=int, default=1)
-    ap.add_argument("--exec_delay_days", type=int, default=0)
-    ap.add_argument("--extra_slip_bps", type=float, default=0.0)
-
-    ap.add_argument("--trading_days", type=int, default=252)
-    ap.add_argument("--perf_ddof", type=int, default=0, choices=[0, 1])
-
-    ap.add_argument("--fee_rate", type=float, default=0.001425)
-    ap.add_argument("--tax_rate", type=float, default=0.0010)
-    ap.add_argument("--slip_bps", type=float, default=5.0)
-
-    ap.add_argument("--out_json", default="tactical_cash_backtest.json")
-    ap.add_argument("--out_equity_csv", default="tactical_cash_equity.csv")
-    ap.add_argument("--out_trades_csv", default="tactical_cash_trades.csv")
-
-    args = ap.parse_args()
-
-    if int(args.ma_window) < 2:
-        raise SystemExit("ERROR: --ma_window must be >= 2")
-
-    lag = int(args.signal_lag_days)
-    if lag < 0 or lag > 10:
-        raise SystemExit("ERROR: --signal_lag_days must be in [0,10]")
-
-    exec_delay = int(args.exec_delay_days)
-    if exec_delay < 0 or exec_delay > 10:
-        raise SystemExit("ERROR: --exec_delay_days must be in [0,10]")
-
-    extra_slip_bps = float(args.extra_slip_bps)
-    if (not np.isfinite(extra_slip_bps)) or extra_slip_bps < 0.0 or extra_slip_bps > 200.0:
-        raise SystemExit("ERROR: --extra_slip_bps must be in [0,200]")
-
-    core_frac = float(args.core_frac)
-    if (not np.isfinite(core_frac)) or core_frac <= 0.0 or core_frac >= 1.0:
-        raise SystemExit("ERROR: --core_frac must be in (0,1)")
-
-    cache_dir = str(args.cache_dir)
-    price_path = os.path.join(cache_dir, str(args.price_csv))
-    if not os.path.isfile(price_path):
-        raise SystemExit(f"ERROR: missing price csv: {price_path}")
-
-    stats_path = os.path.join(cache_dir, str(args.stats_json))
-    stats = _read_json(stats_path)
-
-    ratio_hi = float(args.break_ratio_hi) if args.break_ratio_hi is not None else _DEFAULT_RATIO_HI
-    ratio_lo = float(args.break_ratio_lo) if args.break_ratio_lo is not None else _DEFAULT_RATIO_LO
-
-    if isinstance(stats, dict):
-        bd = stats.get("break_detection", {})
-        if isinstance(bd, dict):
-            try:
-                if args.break_ratio_hi is None and ("break_ratio_hi" in bd):
-                    ratio_hi = float(bd["break_ratio_hi"])
-            except Exception:
-                pass
-            try:
-                if args.break_ratio_lo is None and ("break_ratio_lo" in bd):
-                    ratio_lo = float(bd["break_ratio_lo"])
-            except Exception:
-                pass
-
-    df = pd.read_csv(price_path)
-    df = _normalize_date_col(df)
-    pc = _find_price_col(df, args.price_col)
-    df["price"] = pd.to_numeric(df[pc], errors="coerce")
-    df = df.dropna(subset=["price"]).sort_values("date_ts").reset_index(drop=True)
-
-    df_use, seg_audit = _build_post_df(
-        df_raw=df,
-        stats=stats,
-        seg_split_date=str(args.segment_split_date),
-        seg_break_rank=int(args.segment_break_rank),
-        seg_post_start_date=args.segment_post_start_date,
-        ratio_hi=float(ratio_hi),
-        ratio_lo=float(ratio_lo),
-    )
-
-    min_rows = int(args.ma_window) + 10 + max(lag, 0) + max(exec_delay, 0)
-    if len(df_use) < min_rows:
-        raise SystemExit(
-            f"ERROR: not enough rows after segmentation: rows={len(df_use)} min_rows={min_rows} "
-            f"(ma_window={args.ma_window}, lag={lag}, exec_delay={exec_delay})"
-        )
-
-    p0 = float(df_use["price"].iloc[0])
-    if not np.isfinite(p0) or p0 <= 0:
-        raise SystemExit("ERROR: invalid first price in chosen analysis period")
+# --------------------------
+# Simulation core (shared by the single run and --walk_forward)
+# --------------------------
 
-    df_use = df_use.copy()
-    df_use["ma"] = _calc_sma(df_use["price"], int(args.ma_window))
-    df_use["signal_raw"] = (df_use["price"] > df_use["ma"]) & df_use["ma"].notna()
+def _signal_arrays(price: pd.Series, ma_window: int, lag: int) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """(ma, signal_raw, signal_exec) with signal_exec[t] = signal_raw[t-lag] (False before the first MA)."""
+    ma = _calc_sma(price, int(ma_window))
+    signal_raw = (price > ma) & ma.notna()
     if lag > 0:
-        df_use["signal_exec"] = df_use["signal_raw"].shift(lag).fillna(False).astype(bool)
+        signal_exec = signal_raw.shift(lag).fillna(False).astype(bool)
     else:
-        df_use["signal_exec"] = df_use["signal_raw"].fillna(False).astype(bool)
-
-    prices = df_use["price"].to_numpy(dtype=float)
-    dates = df_use["date"].astype(str).to_numpy()
-    desired = df_use["signal_exec"].astype(bool).to_numpy()
-
-    slip_rate = _slip_rate_from_bps(float(args.slip_bps)) + _slip_rate_from_bps(extra_slip_bps)
-    fee_rate = float(args.fee_rate)
-    tax_rate = float(args.tax_rate)
-
+        signal_exec = signal_raw.fillna(False).astype(bool)
+    return ma, signal_raw, signal_exec
+
+
+def simulate_tactical(
+    prices: np.ndarray,
+    dates: np.ndarray,
+    desired: np.ndarray,
+    *,
+    core_frac: float,
+    fee_rate: float,
+    tax_rate: float,
+    slip_rate: float,
+    exec_delay: int,
+    extra_slip_bps: float,
+) -> Dict[str, Any]:
+    """
+    Core + tactical-cash overlay on one price window (equity starts at 1.0 on prices[0]).
+    Returns {equity, equity_base, overlay_on, trades, counters, core_shares, cash0}.
+    """
+    p0 = float(prices[0])
     core_shares = float(core_frac) / p0
     cash0 = float(1.0 - core_frac)
 
@@ -762,6 +676,425 @@ def main() -> None:
         equity[-1] = float(core_shares * price + cash)
         overlay_on[-1] = False
 
+
+    return {
+        "equity": equity,
+        "equity_base": equity_base,
+        "overlay_on": overlay_on,
+        "trades": trades,
+        "core_shares": core_shares,
+        "cash0": cash0,
+        "counters": {
+            "scheduled_entries": int(scheduled_entries),
+            "scheduled_exits": int(scheduled_exits),
+            "executed_entries": int(executed_entries),
+            "executed_exits": int(executed_exits),
+            "immediate_exec_entries": int(immediate_exec_entries),
+            "immediate_exec_exits": int(immediate_exec_exits),
+            "skipped_schedule_due_to_eod": int(skipped_schedule_due_to_eod),
+        },
+    }
+
+
+# --------------------------
+# Walk-forward / rolling-origin evaluation (--walk_forward)
+# --------------------------
+
+WF_ANCHORS = ["rolling", "anchored"]
+WF_SELECT_METRICS = ["calmar", "sharpe0", "cagr"]
+
+WF_COLS = [
+    "window",
+    "train_start",
+    "train_end",
+    "test_start",
+    "test_end",
+    "ma_window",
+    "selected",
+    "train_cagr",
+    "train_mdd",
+    "train_sharpe0",
+    "train_calmar",
+    "test_cagr",
+    "test_mdd",
+    "test_sharpe0",
+    "test_calmar",
+    "test_base_cagr",
+    "test_base_mdd",
+    "test_delta_cagr",
+    "test_delta_mdd",
+    "test_n_trades",
+    "test_win_rate",
+    "test_profit_factor",
+    "test_avg_hold_days",
+    "test_time_in_market_pct",
+]
+
+
+def _wf_windows(n: int, train_days: int, test_days: int, step_days: int, anchor: str) -> List[Tuple[int, int, int, int]]:
+    """(train_a, train_b, test_a, test_b) half-open row ranges; test windows tile forward by step_days."""
+    out: List[Tuple[int, int, int, int]] = []
+    t0 = int(train_days)
+    while t0 + int(test_days) <= n:
+        a = 0 if anchor == "anchored" else t0 - int(train_days)
+        out.append((a, t0, t0, t0 + int(test_days)))
+        t0 += int(step_days)
+    return out
+
+
+def _wf_eval(
+    prices: np.ndarray,
+    dates: np.ndarray,
+    desired: np.ndarray,
+    a: int,
+    b: int,
+    ctx: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Overlay run on rows [a, b) (equity normalized to 1.0 at row a, flat start, warm signals)."""
+    sim = simulate_tactical(
+        prices[a:b], dates[a:b], desired[a:b],
+        core_frac=ctx["core_frac"], fee_rate=ctx["fee_rate"], tax_rate=ctx["tax_rate"], slip_rate=ctx["slip_rate"],
+        exec_delay=ctx["exec_delay"], extra_slip_bps=ctx["extra_slip_bps"],
+    )
+    idx = pd.Index(dates[a:b])
+    perf = _perf_summary(pd.Series(sim["equity"], index=idx), trading_days=ctx["trading_days"], perf_ddof=ctx["perf_ddof"])
+    perf_base = _perf_summary(pd.Series(sim["equity_base"], index=idx), trading_days=ctx["trading_days"], perf_ddof=ctx["perf_ddof"])
+    on = sim["overlay_on"]
+    tim = float(sum(1 for x in on if x) / len(on)) if on else None
+    return {"perf": perf, "perf_base": perf_base, "kpis": _trade_kpis(sim["trades"], time_in_market_pct=tim)}
+
+
+def _wf_metric(perf: Dict[str, Any], metric: str) -> Optional[float]:
+    if not perf.get("ok"):
+        return None
+    if metric == "calmar":
+        return _calmar(perf)
+    return _to_finite_float(perf.get(metric))
+
+
+def _wf_diff(x: Any, y: Any) -> Optional[float]:
+    a, b = _to_finite_float(x), _to_finite_float(y)
+    return (a - b) if (a is not None and b is not None) else None
+
+
+def _wf_window_rows(w: int, win: Tuple[int, int, int, int], st: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """All MA lengths on one window; the train-best (by select metric, first MA on ties) is marked selected."""
+    tra, trb, tea, teb = win
+    prices, dates, ctx = st["prices"], st["dates"], st["ctx"]
+    rows: List[Dict[str, Any]] = []
+    best_i, best_v = -1, float("-inf")
+    for k, ma in enumerate(st["ma_windows"]):
+        desired = st["desired_by_ma"][ma]
+        tr = _wf_eval(prices, dates, desired, tra, trb, ctx)
+        te = _wf_eval(prices, dates, desired, tea, teb, ctx)
+        pt, pe, pb, kp = tr["perf"], te["perf"], te["perf_base"], te["kpis"]
+        v = _wf_metric(pt, st["select_metric"])
+        if v is not None and v > best_v:
+            best_i, best_v = k, v
+        rows.append(
+            {
+                "window": int(w),
+                "train_start": str(dates[tra]),
+                "train_end": str(dates[trb - 1]),
+                "test_start": str(dates[tea]),
+                "test_end": str(dates[teb - 1]),
+                "ma_window": int(ma),
+                "selected": False,
+                "train_cagr": pt.get("cagr"),
+                "train_mdd": pt.get("mdd"),
+                "train_sharpe0": pt.get("sharpe0"),
+                "train_calmar": _calmar(pt),
+                "test_cagr": pe.get("cagr"),
+                "test_mdd": pe.get("mdd"),
+                "test_sharpe0": pe.get("sharpe0"),
+                "test_calmar": _calmar(pe),
+                "test_base_cagr": pb.get("cagr"),
+                "test_base_mdd": pb.get("mdd"),
+                "test_delta_cagr": _wf_diff(pe.get("cagr"), pb.get("cagr")),
+                "test_delta_mdd": _wf_diff(pe.get("mdd"), pb.get("mdd")),
+                "test_n_trades": kp.get("n_trades"),
+                "test_win_rate": kp.get("win_rate"),
+                "test_profit_factor": kp.get("profit_factor"),
+                "test_avg_hold_days": kp.get("avg_hold_days"),
+                "test_time_in_market_pct": kp.get("time_in_market_pct"),
+            }
+        )
+    if best_i >= 0:
+        rows[best_i]["selected"] = True
+    return rows
+
+
+# Workers get prices / per-MA signal arrays once (initializer; fork shares them copy-on-write).
+_WF_STATE: Dict[str, Any] = {}
+
+
+def _wf_pool_init(state: Dict[str, Any]) -> None:
+    _WF_STATE.clear()
+    _WF_STATE.update(state)
+
+
+def _wf_pool_run(chunk: List[Tuple[int, Tuple[int, int, int, int]]]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for w, win in chunk:
+        out.extend(_wf_window_rows(w, win, _WF_STATE))
+    return out
+
+
+def _wf_median(vals: List[Any]) -> Optional[float]:
+    v = [x for x in (_to_finite_float(y) for y in vals) if x is not None]
+    return float(np.median(v)) if v else None
+
+
+def _wf_summary(rows: List[Dict[str, Any]], ma_windows: List[int]) -> Dict[str, Any]:
+    per_ma: Dict[str, Any] = {}
+    for ma in ma_windows:
+        rs = [r for r in rows if r["ma_window"] == ma]
+        dc = [x for x in (_to_finite_float(r["test_delta_cagr"]) for r in rs) if x is not None]
+        per_ma[str(ma)] = {
+            "windows": int(len(rs)),
+            "selected": int(sum(1 for r in rs if r["selected"])),
+            "test_calmar_median": _wf_median([r["test_calmar"] for r in rs]),
+            "test_delta_cagr_median": _wf_median(dc),
+            "test_delta_cagr_pos_frac": (float(sum(1 for x in dc if x > 0) / len(dc)) if dc else None),
+            "test_delta_mdd_median": _wf_median([r["test_delta_mdd"] for r in rs]),
+        }
+
+    sel = [r for r in rows if r["selected"]]
+    seq = [int(r["ma_window"]) for r in sel]
+    dc_sel = [x for x in (_to_finite_float(r["test_delta_cagr"]) for r in sel) if x is not None]
+    return {
+        "per_ma": per_ma,
+        "selected_oos": {
+            "windows": int(len(sel)),
+            "ma_sequence": seq,
+            "switches": int(sum(1 for i in range(1, len(seq)) if seq[i] != seq[i - 1])),
+            "test_calmar_median": _wf_median([r["test_calmar"] for r in sel]),
+            "test_delta_cagr_median": _wf_median(dc_sel),
+            "test_delta_cagr_pos_frac": (float(sum(1 for x in dc_sel if x > 0) / len(dc_sel)) if dc_sel else None),
+            "test_delta_mdd_median": _wf_median([r["test_delta_mdd"] for r in sel]),
+        },
+    }
+
+
+def run_walk_forward(
+    df_use: pd.DataFrame,
+    ma_windows: List[int],
+    *,
+    lag: int,
+    train_days: int,
+    test_days: int,
+    step_days: int,
+    anchor: str,
+    select_metric: str,
+    ctx: Dict[str, Any],
+    jobs: int = 1,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Evaluate every MA length on every train/test window. One signal array per MA length is computed on the
+    whole analysis period and sliced per window (signals are warm at each window start; positions/equity
+    restart flat at 1.0). Returns (rows in WF_COLS order, audit).
+    """
+    prices = df_use["price"].to_numpy(dtype=float)
+    dates = df_use["date"].astype(str).to_numpy()
+    desired_by_ma = {
+        int(ma): _signal_arrays(df_use["price"], int(ma), lag)[2].to_numpy(dtype=bool) for ma in ma_windows
+    }
+    windows = _wf_windows(int(len(prices)), train_days, test_days, step_days, anchor)
+    state = {
+        "prices": prices,
+        "dates": dates,
+        "desired_by_ma": desired_by_ma,
+        "ma_windows": [int(m) for m in ma_windows],
+        "select_metric": str(select_metric),
+        "ctx": ctx,
+    }
+
+    tasks = list(enumerate(windows))
+    rows: List[Dict[str, Any]] = []
+    used_jobs = 1
+    if jobs > 1 and len(tasks) > 1:
+        used_jobs = min(int(jobs), len(tasks))
+        chunk = max(1, -(-len(tasks) // (used_jobs * 4)))
+        chunks = [tasks[i : i + chunk] for i in range(0, len(tasks), chunk)]
+        methods = multiprocessing.get_all_start_methods()
+        mp_ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(
+            max_workers=used_jobs, mp_context=mp_ctx, initializer=_wf_pool_init, initargs=(state,)
+        ) as pool:
+            for part in pool.map(_wf_pool_run, chunks):
+                rows.extend(part)
+    else:
+        for w, win in tasks:
+            rows.extend(_wf_window_rows(w, win, state))
+
+    audit = {
+        "rows_analysis": int(len(prices)),
+        "windows": int(len(windows)),
+        "ma_windows": [int(m) for m in ma_windows],
+        "train_days": int(train_days),
+        "test_days": int(test_days),
+        "step_days": int(step_days),
+        "anchor": str(anchor),
+        "select_metric": str(select_metric),
+        "jobs": int(used_jobs),
+        "window_policy": (
+            "rolling: train=[t0-train_days, t0); anchored (rolling-origin): train=[start, t0); "
+            "test=[t0, t0+test_days); t0 advances by step_days"
+        ),
+        "signal_policy": (
+            f"one signal array per MA length on the analysis period (lag={lag}), sliced per window (warm MA); "
+            "each train/test run starts flat with equity 1.0 (core_frac / first price)"
+        ),
+    }
+    return rows, audit
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cache_dir", required=True)
+    ap.add_argument("--price_csv", default="data.csv")
+    ap.add_argument("--price_col", default=None)
+
+    ap.add_argument("--stats_json", default="stats_latest.json")
+    ap.add_argument("--segment_split_date", default="auto")
+    ap.add_argument("--segment_break_rank", type=int, default=0)
+    ap.add_argument("--segment_post_start_date", default=None)
+    ap.add_argument("--break_ratio_hi", type=float, default=None)
+    ap.add_argument("--break_ratio_lo", type=float, default=None)
+
+    ap.add_argument("--ma_window", type=int, default=60)
+    ap.add_argument("--core_frac", type=float, default=0.90)
+
+    ap.add_argument("--signal_lag_days", type=int, default=1)
+    ap.add_argument("--exec_delay_days", type=int, default=0)
+    ap.add_argument("--extra_slip_bps", type=float, default=0.0)
+
+    ap.add_argument("--trading_days", type=int, default=252)
+    ap.add_argument("--perf_ddof", type=int, default=0, choices=[0, 1])
+
+    ap.add_argument("--fee_rate", type=float, default=0.001425)
+    ap.add_argument("--tax_rate", type=float, default=0.0010)
+    ap.add_argument("--slip_bps", type=float, default=5.0)
+
+    ap.add_argument("--out_json", default="tactical_cash_backtest.json")
+    ap.add_argument("--out_equity_csv", default="tactical_cash_equity.csv")
+    ap.add_argument("--out_trades_csv", default="tactical_cash_trades.csv")
+
+    ap.add_argument(
+        "--walk_forward",
+        action="store_true",
+        default=False,
+        help="Walk-forward mode: evaluate --wf_ma_windows on rolling train/test windows over the analysis period "
+        "and write --wf_out_csv / --wf_out_json instead of the single-run outputs.",
+    )
+    ap.add_argument("--wf_ma_windows", default="20,40,60,90,120,200", help="Comma-separated MA lengths.")
+    ap.add_argument("--wf_train_days", type=int, default=756)
+    ap.add_argument("--wf_test_days", type=int, default=126)
+    ap.add_argument("--wf_step_days", type=int, default=0, help="Origin step in rows (0 = wf_test_days).")
+    ap.add_argument("--wf_anchor", default="rolling", choices=WF_ANCHORS, help="anchored = expanding train (rolling origin).")
+    ap.add_argument("--wf_select_metric", default="calmar", choices=WF_SELECT_METRICS)
+    ap.add_argument("--wf_out_csv", default="tactical_cash_walkforward.csv")
+    ap.add_argument("--wf_out_json", default="tactical_cash_walkforward.json")
+    ap.add_argument("--jobs", type=int, default=1, help="Walk-forward worker processes (0 = cpu count, 1 = serial).")
+
+    args = ap.parse_args()
+
+    if int(args.ma_window) < 2:
+        raise SystemExit("ERROR: --ma_window must be >= 2")
+
+    lag = int(args.signal_lag_days)
+    if lag < 0 or lag > 10:
+        raise SystemExit("ERROR: --signal_lag_days must be in [0,10]")
+
+    exec_delay = int(args.exec_delay_days)
+    if exec_delay < 0 or exec_delay > 10:
+        raise SystemExit("ERROR: --exec_delay_days must be in [0,10]")
+
+    extra_slip_bps = float(args.extra_slip_bps)
+    if (not np.isfinite(extra_slip_bps)) or extra_slip_bps < 0.0 or extra_slip_bps > 200.0:
+        raise SystemExit("ERROR: --extra_slip_bps must be in [0,200]")
+
+    core_frac = float(args.core_frac)
+    if (not np.isfinite(core_frac)) or core_frac <= 0.0 or core_frac >= 1.0:
+        raise SystemExit("ERROR: --core_frac must be in (0,1)")
+
+    cache_dir = str(args.cache_dir)
+    price_path = os.path.join(cache_dir, str(args.price_csv))
+    if not os.path.isfile(price_path):
+        raise SystemExit(f"ERROR: missing price csv: {price_path}")
+
+    stats_path = os.path.join(cache_dir, str(args.stats_json))
+    stats = _read_json(stats_path)
+
+    ratio_hi = float(args.break_ratio_hi) if args.break_ratio_hi is not None else _DEFAULT_RATIO_HI
+    ratio_lo = float(args.break_ratio_lo) if args.break_ratio_lo is not None else _DEFAULT_RATIO_LO
+
+    if isinstance(stats, dict):
+        bd = stats.get("break_detection", {})
+        if isinstance(bd, dict):
+            try:
+                if args.break_ratio_hi is None and ("break_ratio_hi" in bd):
+                    ratio_hi = float(bd["break_ratio_hi"])
+            except Exception:
+                pass
+            try:
+                if args.break_ratio_lo is None and ("break_ratio_lo" in bd):
+                    ratio_lo = float(bd["break_ratio_lo"])
+            except Exception:
+                pass
+
+    df = pd.read_csv(price_path)
+    df = _normalize_date_col(df)
+    pc = _find_price_col(df, args.price_col)
+    df["price"] = pd.to_numeric(df[pc], errors="coerce")
+    df = df.dropna(subset=["price"]).sort_values("date_ts").reset_index(drop=True)
+
+    df_use, seg_audit = _build_post_df(
+        df_raw=df,
+        stats=stats,
+        seg_split_date=str(args.segment_split_date),
+        seg_break_rank=int(args.segment_break_rank),
+        seg_post_start_date=args.segment_post_start_date,
+        ratio_hi=float(ratio_hi),
+        ratio_lo=float(ratio_lo),
+    )
+
+    if bool(args.walk_forward):
+        _main_walk_forward(args, df_use, seg_audit, pc, price_path, lag, exec_delay, extra_slip_bps, core_frac)
+        return
+
+    min_rows = int(args.ma_window) + 10 + max(lag, 0) + max(exec_delay, 0)
+    if len(df_use) < min_rows:
+        raise SystemExit(
+            f"ERROR: not enough rows after segmentation: rows={len(df_use)} min_rows={min_rows} "
+            f"(ma_window={args.ma_window}, lag={lag}, exec_delay={exec_delay})"
+        )
+
+    p0 = float(df_use["price"].iloc[0])
+    if not np.isfinite(p0) or p0 <= 0:
+        raise SystemExit("ERROR: invalid first price in chosen analysis period")
+
+    df_use = df_use.copy()
+    df_use["ma"], df_use["signal_raw"], df_use["signal_exec"] = _signal_arrays(df_use["price"], int(args.ma_window), lag)
+
+    prices = df_use["price"].to_numpy(dtype=float)
+    dates = df_use["date"].astype(str).to_numpy()
+    desired = df_use["signal_exec"].astype(bool).to_numpy()
+
+    slip_rate = _slip_rate_from_bps(float(args.slip_bps)) + _slip_rate_from_bps(extra_slip_bps)
+    fee_rate = float(args.fee_rate)
+    tax_rate = float(args.tax_rate)
+
+    sim = simulate_tactical(
+        prices, dates, desired,
+        core_frac=core_frac, fee_rate=fee_rate, tax_rate=tax_rate, slip_rate=slip_rate,
+        exec_delay=exec_delay, extra_slip_bps=extra_slip_bps,
+    )
+    trades = sim["trades"]
+    equity, equity_base, overlay_on = sim["equity"], sim["equity_base"], sim["overlay_on"]
+    counters = sim["counters"]
+    core_shares, cash0 = sim["core_shares"], sim["cash0"]
+
     df_out = df_use[["date", "date_ts", "price", "ma", "signal_raw", "signal_exec"]].copy()
     df_out["equity"] = equity
     df_out["equity_base_only"] = equity_base
@@ -817,13 +1150,13 @@ def main() -> None:
             "time_in_market_days": time_in_market_days,
             "time_in_market_pct": time_in_market_pct,
             "pending_action_policy": "single pending action; ignores flips until executed (conservative). exec_delay=0 executes immediately (v2.3 fix).",
-            "scheduled_entries": int(scheduled_entries),
-            "scheduled_exits": int(scheduled_exits),
-            "executed_entries": int(executed_entries),
-            "executed_exits": int(executed_exits),
-            "immediate_exec_entries": int(immediate_exec_entries),
-            "immediate_exec_exits": int(immediate_exec_exits),
-            "skipped_schedule_due_to_eod": int(skipped_schedule_due_to_eod),
+            "scheduled_entries": int(counters["scheduled_entries"]),
+            "scheduled_exits": int(counters["scheduled_exits"]),
+            "executed_entries": int(counters["executed_entries"]),
+            "executed_exits": int(counters["executed_exits"]),
+            "immediate_exec_entries": int(counters["immediate_exec_entries"]),
+            "immediate_exec_exits": int(counters["immediate_exec_exits"]),
+            "skipped_schedule_due_to_eod": int(counters["skipped_schedule_due_to_eod"]),
             "timing_assumption": timing_assumption,
         },
         "perf": {
@@ -867,5 +1200,106 @@ def main() -> None:
     print("NOTE:", timing_assumption)
 
 
+def _main_walk_forward(
+    args: argparse.Namespace,
+    df_use: pd.DataFrame,
+    seg_audit: Dict[str, Any],
+    pc: str,
+    price_path: str,
+    lag: int,
+    exec_delay: int,
+    extra_slip_bps: float,
+    core_frac: float,
+) -> None:
+    try:
+        ma_windows = sorted({int(x) for x in str(args.wf_ma_windows).split(",") if x.strip()})
+    except ValueError:
+        raise SystemExit(f"ERROR: --wf_ma_windows must be comma-separated integers: {args.wf_ma_windows!r}")
+    if not ma_windows or ma_windows[0] < 2:
+        raise SystemExit("ERROR: --wf_ma_windows must list MA lengths >= 2")
+    train_days, test_days = int(args.wf_train_days), int(args.wf_test_days)
+    step_days = int(args.wf_step_days) if int(args.wf_step_days) > 0 else test_days
+    if train_days < 20 or test_days < 5:
+        raise SystemExit("ERROR: --wf_train_days must be >= 20 and --wf_test_days >= 5")
+    if int(args.jobs) < 0:
+        raise SystemExit("ERROR: --jobs must be >= 0")
+    jobs = int(args.jobs) if int(args.jobs) > 0 else int(os.cpu_count() or 1)
+
+    slip_rate = _slip_rate_from_bps(float(args.slip_bps)) + _slip_rate_from_bps(extra_slip_bps)
+    ctx = {
+        "core_frac": float(core_frac),
+        "fee_rate": float(args.fee_rate),
+        "tax_rate": float(args.tax_rate),
+        "slip_rate": float(slip_rate),
+        "exec_delay": int(exec_delay),
+        "extra_slip_bps": float(extra_slip_bps),
+        "trading_days": int(args.trading_days),
+        "perf_ddof": int(args.perf_ddof),
+    }
+
+    t0 = time.perf_counter()
+    rows, wf_audit = run_walk_forward(
+        df_use,
+        ma_windows,
+        lag=lag,
+        train_days=train_days,
+        test_days=test_days,
+        step_days=step_days,
+        anchor=str(args.wf_anchor),
+        select_metric=str(args.wf_select_metric),
+        ctx=ctx,
+        jobs=jobs,
+    )
+    wf_audit["elapsed_sec"] = round(time.perf_counter() - t0, 3)
+    if not rows:
+        raise SystemExit(
+            f"ERROR: no walk-forward windows: rows={len(df_use)} train_days={train_days} test_days={test_days}"
+        )
+
+    cache_dir = str(args.cache_dir)
+    out_csv = os.path.join(cache_dir, str(args.wf_out_csv))
+    out_json_path = os.path.join(cache_dir, str(args.wf_out_json))
+
+    out_json = {
+        "generated_at_utc": utc_now_iso(),
+        "schema_version": SCHEMA_VERSION,
+        "script_fingerprint": SCRIPT_FINGERPRINT,
+        "mode": "walk_forward",
+        "inputs": {
+            "cache_dir": cache_dir,
+            "price_csv": str(args.price_csv),
+            "price_csv_resolved": price_path,
+            "price_col": str(pc),
+            "core_frac": float(core_frac),
+            "signal_lag_days": int(lag),
+            "exec_delay_days": int(exec_delay),
+            "extra_slip_bps": float(extra_slip_bps),
+            "fee_rate": float(args.fee_rate),
+            "tax_rate": float(args.tax_rate),
+            "slip_bps": float(args.slip_bps),
+            "slip_rate_total": float(slip_rate),
+            "segment_split_date": str(args.segment_split_date),
+            "segment_break_rank": int(args.segment_break_rank),
+            "segment_post_start_date": args.segment_post_start_date,
+        },
+        "segmentation": seg_audit,
+        "walk_forward": wf_audit,
+        "summary": _wf_summary(rows, ma_windows),
+        "table_csv": str(args.wf_out_csv),
+    }
+
+    _write_json(out_json_path, out_json)
+    _ensure_parent(out_csv)
+    pd.DataFrame(rows, columns=WF_COLS).to_csv(out_csv, index=False, encoding="utf-8")
+
+    sel = out_json["summary"]["selected_oos"]
+    print(f"OK: wrote {out_json_path}")
+    print(f"OK: wrote {out_csv} ({len(rows)} rows, {wf_audit['windows']} windows x {len(ma_windows)} MA)")
+    print(
+        f"NOTE: selected MA sequence switches={sel['switches']} "
+        f"oos delta_cagr median={sel['test_delta_cagr_median']} pos_frac={sel['test_delta_cagr_pos_frac']}"
+    )
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -17,6 +17,7 @@ Key audit fixes:
    - Else: omit tail line
 2) The summary's confidence for VXN matches the selected bucket (not hardwired to B).
 3) VXN section renders C_poswatch bucket (if present) with its own confidence.
+4) PRICE / VXN sections render historical_simulation_extra (monitor --extra_gate) when present.
 """
 
 from __future__ import annotations
@@ -24,7 +25,7 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -270,6 +271,23 @@ def _build_15s_summary(price: Dict[str, Any], vxn: Optional[Dict[str, Any]]) ->
     return "## 15秒摘要\n\n" + price_line + "\n" + vxn_line + "\n"
 
 
+def _render_extra_gates(snippet: Dict[str, Any], stale_flag: str) -> List[str]:
+    """historical_simulation_extra (--extra_gate); empty when the snippet has none."""
+    extra = snippet.get("historical_simulation_extra")
+    if not isinstance(extra, dict) or not extra:
+        return []
+    out = ["### Historical simulation (extra gates)\n"]
+    for name, h in extra.items():
+        h = h if isinstance(h, dict) else {}
+        conf, reason = _confidence(h.get("sample_size"), stale_flag)
+        g = h.get("gate") if isinstance(h.get("gate"), dict) else {}
+        out.append(f"#### {name} ({g.get('field', '')} {g.get('op', '')} {g.get('value', '')})\n")
+        out.append(f"- confidence: **`{conf}`** ({reason})\n")
+        out.append(_table_kv(h))
+        out.append("")
+    return out
+
+
 def _render_price_section(price: Dict[str, Any]) -> str:
     meta = price.get("meta", {})
     latest = price.get("latest", {}) or {}
@@ -319,6 +337,7 @@ def _render_price_section(price: Dict[str, Any]) -> str:
     out.append(f"- confidence: **`{conf_level}`** ({conf_reason})\n")
     out.append(_table_kv(hist))
     out.append("")
+    out.extend(_render_extra_gates(price, stale_flag))
     return "\n".join(out)
 
 
@@ -404,6 +423,7 @@ def _render_vxn_section(vxn: Dict[str, Any]) -> str:
         out.append(_table_kv(hist if isinstance(hist, dict) else {}))
         out.append("")
 
+    out.extend(_render_extra_gates(vxn, stale_flag))
     return "\n".join(out)
 
 
@@ -1,6 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+"""
+build_tw0050_forward_return_conditional.py
+
+Forward-return distribution of 0050 conditioned on the BB z bucket at entry, per horizon, in
+raw and clean (break-contaminated entries excluded) mode.
+
+v8_0 (2026-10-16):
+- PERF: every scheme x horizon x mode x bucket statistic (n, hit_rate, p90..p05, min + min audit)
+  comes from ONE grouped pass (_conditional_table): z-bucket codes per scheme, one forward-return
+  matrix (n x H) and one contamination matrix, a single lexsort over (group, return, entry index)
+  and per-group quantiles by the numpy "linear" rule. Replaces the per horizon/bucket DataFrame
+  filters, Series.quantile calls and idxmin audits; numbers are bit-identical to v7_6.
+- ADD: forward_return_conditional.table = compact row table (columns + rows) with every group;
+  the hierarchical "horizons" block is derived from it. --extra_horizons / --extra_bucket_schemes
+  add rows to the table only (one more column / code array in the same pass).
+"""
+
 from __future__ import annotations
 
 import argparse
@@ -8,14 +25,26 @@ import json
 import math
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
+from forward_cube import cube_column, update_cube
+from price_breaks import break_positions, contamination_mask
+
 
 # ===== Audit stamp =====
-BUILD_SCRIPT_FINGERPRINT = "build_tw0050_forward_return_conditional@2026-02-21.v7_5"
+BUILD_SCRIPT_FINGERPRINT = "build_tw0050_forward_return_conditional@2026-10-16.v8_0"
+
+PRIMARY_SCHEME = "bb_z_5bucket_v1"
+PRIMARY_THRESHOLDS = (1.5, 2.0)
+QUANTILES = [("p90", 0.90), ("p50", 0.50), ("p25", 0.25), ("p10", 0.10), ("p05", 0.05)]
+TABLE_COLUMNS = (
+    ["scheme", "horizon", "mode", "bucket", "n", "hit_rate"]
+    + [qn for qn, _ in QUANTILES]
+    + ["min", "min_entry_date", "min_entry_price", "min_future_date", "min_future_price"]
+)
 
 
 def utc_now_iso() -> str:
@@ -104,28 +133,32 @@ def _calc_bb_z(series: pd.Series, window: int, ddof: int) -> pd.Series:
     return z
 
 
-def _bucket_from_z(z: float, thr_near: float = 1.5, thr_extreme: float = 2.0) -> str:
-    # Defensive: NaN should never be bucketed silently.
-    if z is None or (isinstance(z, float) and not math.isfinite(z)):
-        return "UNKNOWN"
-    if z <= -thr_extreme:
-        return "<=-2"
-    if (-thr_extreme < z) and (z <= -thr_near):
-        return "(-2,-1.5]"
-    if (-thr_near < z) and (z < thr_near):
-        return "(-1.5,1.5)"
-    if (thr_near <= z) and (z < thr_extreme):
-        return "[1.5,2)"
-    return ">=2"
-
-
-def _quantile(s: pd.Series, q: float) -> Optional[float]:
-    if s.empty:
-        return None
-    try:
-        return float(s.quantile(q))
-    except Exception:
-        return None
+def _bucket_labels(thresholds: Sequence[float]) -> List[str]:
+    """
+    Symmetric z buckets for increasing positive thresholds T, ordered low -> high:
+    <=-T[-1], (-T[k+1],-T[k]], ..., (-T[0],T[0]), [T[k],T[k+1]), ..., >=T[-1].
+    (1.5, 2.0) gives the v1 labels: <=-2, (-2,-1.5], (-1.5,1.5), [1.5,2), >=2.
+    """
+    t = [float(x) for x in thresholds]
+    m = len(t)
+    labels = [f"<=-{t[-1]:g}"]
+    labels += [f"(-{t[k + 1]:g},-{t[k]:g}]" for k in reversed(range(m - 1))]
+    labels.append(f"(-{t[0]:g},{t[0]:g})")
+    labels += [f"[{t[k]:g},{t[k + 1]:g})" for k in range(m - 1)]
+    labels.append(f">={t[-1]:g}")
+    return labels
+
+
+def _bucket_codes(z: np.ndarray, thresholds: Sequence[float]) -> np.ndarray:
+    """Index into _bucket_labels(thresholds) per row; -1 for non-finite z (never bucketed silently)."""
+    z = np.asarray(z, dtype=float)
+    t = np.asarray(thresholds, dtype=float)
+    with np.errstate(invalid="ignore"):
+        k_neg = (z[:, None] <= -t[None, :]).sum(axis=1)
+        k_pos = (z[:, None] >= t[None, :]).sum(axis=1)
+    codes = (len(t) - k_neg + k_pos).astype(np.int64)
+    codes[~np.isfinite(z)] = -1
+    return codes
 
 
 def _forward_return(series: pd.Series, horizon: int) -> pd.Series:
@@ -135,16 +168,9 @@ def _forward_return(series: pd.Series, horizon: int) -> pd.Series:
 
 def _detect_break_positions(price: pd.Series, hi: float, lo: float) -> np.ndarray:
     """
-    break at index i means ratio = price[i] / price[i-1] triggers.
+    break at index i means ratio = price[i] / price[i-1] triggers (shared rule: price_breaks.py).
     """
-    px = price.astype(float)
-    prev = px.shift(1)
-    ratio = px / prev
-    bad = ratio.isna() | ~np.isfinite(ratio)
-    ratio = ratio.mask(bad)
-    is_break = (ratio > hi) | (ratio < lo)
-    is_break = is_break.fillna(False)
-    return np.where(is_break.values)[0]
+    return break_positions(price.to_numpy(dtype=float), ratio_hi=hi, ratio_lo=lo)
 
 
 def _contam_mask_from_breaks(n: int, break_pos: np.ndarray, horizon: int) -> np.ndarray:
@@ -152,55 +178,143 @@ def _contam_mask_from_breaks(n: int, break_pos: np.ndarray, horizon: int) -> np.
     If break occurs at i, it contaminates entries t where t < i <= t+horizon  => t in [i-horizon, i-1]
     Return boolean array length n: True => contaminated.
     """
-    if n <= 0 or break_pos.size == 0:
-        return np.zeros(n, dtype=bool)
+    return contamination_mask(n, break_pos, horizon=horizon)
 
-    delta = np.zeros(n + 1, dtype=int)
-    for i in break_pos:
-        if i <= 0:
-            continue
-        start = max(0, int(i) - int(horizon))
-        end = int(i)  # exclusive
-        if start < end:
-            delta[start] += 1
-            delta[end] -= 1
-    cum = np.cumsum(delta[:-1])
-    return cum > 0
 
-
-def _min_audit_global(part: pd.DataFrame, df_all: pd.DataFrame, ret_col: str, horizon: int) -> Dict[str, Any]:
+def _group_stats(vals: np.ndarray, gid: np.ndarray, t_pos: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
     """
-    part contains a subset of rows but MUST keep 't_pos' (global integer position in df_all).
-    future row is df_all.iloc[t_pos + horizon].
-
-    Note: if multiple rows share the minimum return, the first occurrence (by index order) is used.
+    Grouped n / hit_rate / quantiles / min / argmin for all groups in one sort.
+    Quantiles follow numpy's "linear" method (what Series.quantile uses) including its lerp, so
+    values are bit-identical to per-group Series.quantile. argmin = smallest t_pos among ties.
     """
-    if part.empty:
-        return {}
+    order = np.lexsort((t_pos, vals, gid))
+    v = vals[order]
+    n = np.bincount(gid, minlength=n_groups).astype(np.int64)
+    start = np.concatenate(([0], np.cumsum(n)[:-1])).astype(np.int64)
+    has = n > 0
+    last = np.maximum(n - 1, 0)
+
+    out: Dict[str, np.ndarray] = {"n": n}
+    pos = np.bincount(gid, weights=(vals > 0.0).astype(float), minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["hit_rate"] = np.where(has, pos / np.maximum(n, 1), np.nan)
+
+    safe = np.where(has, start, 0)
+    for name, q in QUANTILES:
+        virt = last.astype(float) * float(q)
+        prev = np.floor(virt)
+        gamma = virt - prev
+        i_prev = prev.astype(np.int64)
+        i_next = i_prev + 1
+        top = virt >= last
+        i_prev[top] = last[top]
+        i_next[top] = last[top]
+        a = v[np.where(has, safe + i_prev, 0)] if v.size else np.zeros(n_groups)
+        b = v[np.where(has, safe + i_next, 0)] if v.size else np.zeros(n_groups)
+        d = b - a
+        val = np.where(gamma >= 0.5, b - d * (1.0 - gamma), a + d * gamma)
+        out[name] = np.where(has, val, np.nan)
+
+    out["min"] = np.where(has, v[safe] if v.size else np.nan, np.nan)
+    out["argmin_t"] = np.where(has, t_pos[order][safe] if v.size else -1, -1)
+    return out
 
-    i = part[ret_col].idxmin()
-    if pd.isna(i):
-        return {}
 
-    row = part.loc[i]
-    t_pos = int(row["t_pos"])
+def _conditional_table(
+    ret: np.ndarray,
+    contam: np.ndarray,
+    horizons: Sequence[int],
+    base: np.ndarray,
+    schemes: Sequence[Tuple[str, np.ndarray, List[str]]],
+    dates: Sequence[str],
+    prices: np.ndarray,
+) -> Tuple[List[List[Any]], Dict[Tuple[str, int, str], Dict[str, int]]]:
+    """
+    ret / contam: n x H forward return and contamination matrices (column j = horizons[j]).
+    base: entry rows eligible in every mode (lookback + finite z). schemes: (name, codes, labels).
+    Modes: raw = base & finite ret; clean = raw & ~contam.
 
-    out: Dict[str, Any] = {
-        "min": float(row[ret_col]),
-        "min_entry_date": str(row["date"]),
-        "min_entry_price": float(row["price"]),
-    }
+    Returns (rows in TABLE_COLUMNS order, sorted scheme/horizon/mode/bucket; totals per
+    (scheme, horizon, mode) with n_total and unknown_bucket_n).
+    """
+    n_rows = int(ret.shape[0])
+    groups: List[Tuple[str, int, str, List[str]]] = []
+    t_parts: List[np.ndarray] = []
+    v_parts: List[np.ndarray] = []
+    g_parts: List[np.ndarray] = []
+    totals: Dict[Tuple[str, int, str], Dict[str, int]] = {}
+    g0 = 0
+    for name, codes, labels in schemes:
+        for j, h in enumerate(horizons):
+            raw = base & np.isfinite(ret[:, j])
+            for mode, mask in (("raw", raw), ("clean", raw & ~contam[:, j])):
+                ok = mask & (codes >= 0)
+                t = np.flatnonzero(ok)
+                t_parts.append(t)
+                v_parts.append(ret[t, j])
+                g_parts.append(g0 + codes[t])
+                groups.append((name, int(h), mode, labels))
+                totals[(name, int(h), mode)] = {
+                    "n_total": int(mask.sum()),
+                    "unknown_bucket_n": int((mask & (codes < 0)).sum()),
+                }
+                g0 += len(labels)
+
+    t_all = np.concatenate(t_parts) if t_parts else np.zeros(0, dtype=np.int64)
+    v_all = np.concatenate(v_parts) if v_parts else np.zeros(0, dtype=float)
+    g_all = np.concatenate(g_parts) if g_parts else np.zeros(0, dtype=np.int64)
+    st = _group_stats(v_all, g_all, t_all, g0)
+
+    rows: List[List[Any]] = []
+    g = 0
+    for name, h, mode, labels in groups:
+        for bk in labels:
+            k = int(st["n"][g])
+            if k > 0:
+                t = int(st["argmin_t"][g])
+                fut = t + h
+                rows.append(
+                    [name, h, mode, bk, k, float(st["hit_rate"][g])]
+                    + [float(st[qn][g]) for qn, _ in QUANTILES]
+                    + [
+                        float(st["min"][g]),
+                        str(dates[t]),
+                        float(prices[t]),
+                        str(dates[fut]) if 0 <= fut < n_rows else None,
+                        float(prices[fut]) if 0 <= fut < n_rows else None,
+                    ]
+                )
+            g += 1
+    return rows, totals
 
-    fut_pos = t_pos + horizon
-    if 0 <= fut_pos < len(df_all):
-        fut = df_all.iloc[fut_pos]
-        out["min_future_date"] = str(fut["date"])
-        out["min_future_price"] = float(fut["price"])
-    else:
-        out["min_future_date"] = None
-        out["min_future_price"] = None
 
-    return out
+def _mode_obj_from_table(
+    rows: List[List[Any]], totals: Dict[Tuple[str, int, str], Dict[str, int]], scheme: str, h: int, mode: str
+) -> Dict[str, Any]:
+    """v7 hierarchical raw/clean object for one (scheme, horizon, mode), read off the compact table."""
+    ix = {c: i for i, c in enumerate(TABLE_COLUMNS)}
+    by_bucket: List[Dict[str, Any]] = []
+    min_audit_by_bucket: List[Dict[str, Any]] = []
+    for r in rows:
+        if r[ix["scheme"]] != scheme or r[ix["horizon"]] != h or r[ix["mode"]] != mode:
+            continue
+        bk, n = r[ix["bucket"]], r[ix["n"]]
+        by_bucket.append(
+            {"bucket_canonical": bk, "n": n, "hit_rate": r[ix["hit_rate"]],
+             **{qn: r[ix[qn]] for qn, _ in QUANTILES}, "min": r[ix["min"]]}
+        )
+        min_audit_by_bucket.append(
+            {"bucket_canonical": bk, "n": n, "min": r[ix["min"]],
+             **{c: r[ix[c]] for c in ("min_entry_date", "min_entry_price", "min_future_date", "min_future_price")}}
+        )
+    tot = totals.get((scheme, h, mode), {"n_total": 0, "unknown_bucket_n": 0})
+    return {
+        "definition": f"scheme={scheme}; horizon={h}D; mode={mode}",
+        "n_total": int(tot["n_total"]),
+        "by_bucket": by_bucket,
+        "min_audit_by_bucket": min_audit_by_bucket,
+        "unknown_bucket_n": int(tot["unknown_bucket_n"]),
+    }
 
 
 def _current_bucket_key(z: float) -> Dict[str, str]:
@@ -215,18 +329,31 @@ def _current_bucket_key(z: float) -> Dict[str, str]:
     return {"key": "z_1.5_to_2.0", "canonical": "[1.5,2)"}
 
 
-def _parse_horizons(s: str) -> List[int]:
+def _parse_horizons(s: str, allow_empty: bool = False) -> List[int]:
     out: List[int] = []
     for part in str(s).split(","):
         part = part.strip()
         if not part:
             continue
         out.append(int(part))
-    if not out:
+    if not out and not allow_empty:
         raise SystemExit("ERROR: --horizons empty")
     return out
 
 
+def _parse_bucket_schemes(s: str) -> List[Tuple[str, List[float]]]:
+    """ "1.0,1.5,2.0;2.5" -> [("bb_z_sym_1_1.5_2", [1.0, 1.5, 2.0]), ("bb_z_sym_2.5", [2.5])] """
+    out: List[Tuple[str, List[float]]] = []
+    for grp in str(s).split(";"):
+        thr = [float(x) for x in grp.split(",") if x.strip()]
+        if not thr:
+            continue
+        if any(t <= 0.0 for t in thr) or any(b <= a for a, b in zip(thr, thr[1:])):
+            raise SystemExit(f"ERROR: bucket thresholds must be positive and increasing: {grp!r}")
+        out.append(("bb_z_sym_" + "_".join(f"{t:g}" for t in thr), thr))
+    return out
+
+
 def _normalize_date_col(df: pd.DataFrame) -> pd.DataFrame:
     if "date" not in df.columns:
         for c in ["Date", "DATE", "timestamp", "time", "Time"]:
@@ -241,7 +368,7 @@ def _normalize_date_col(df: pd.DataFrame) -> pd.DataFrame:
 
 
 # --- self-check helpers ---
-_ALLOWED_BUCKETS = ["<=-2", "(-2,-1.5]", "(-1.5,1.5)", "[1.5,2)", ">=2"]
+_ALLOWED_BUCKETS = _bucket_labels(PRIMARY_THRESHOLDS)
 
 
 def _by_bucket_map(obj: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -283,6 +410,17 @@ def main() -> None:
     ap.add_argument("--bb_k", type=float, default=2.0)  # kept for meta consistency
     ap.add_argument("--bb_ddof", type=int, default=0)
     ap.add_argument("--horizons", default="10,20")
+    ap.add_argument(
+        "--extra_horizons",
+        default="",
+        help="comma list; extra horizons reported only in forward_return_conditional.table (e.g. 5,60)",
+    )
+    ap.add_argument(
+        "--extra_bucket_schemes",
+        default="",
+        help="';'-separated increasing positive z thresholds, one symmetric scheme each, table only "
+        "(e.g. '1.0,1.5,2.0;2.5')",
+    )
 
     ap.add_argument("--break_ratio_hi", type=float, default=1.8)
     ap.add_argument("--break_ratio_lo", type=float, default=0.5555555556)
@@ -293,6 +431,12 @@ def main() -> None:
     ap.add_argument("--break_samples_n", type=int, default=5)
     ap.add_argument("--excluded_entries_sample_n", type=int, default=5)
 
+    ap.add_argument(
+        "--fwd_cube",
+        default="",
+        help="forward cube file inside cache_dir (e.g. data.fwd_cube.npz); slice fwd_ret/contam from it (incremental)",
+    )
+
     ap.add_argument("--enable_self_check", action="store_true", help="Enable internal consistency self-check")
     ap.add_argument("--self_check_eps", type=float, default=1e-12, help="Tolerance for float comparisons in self-check")
 
@@ -355,10 +499,32 @@ def main() -> None:
     df["bb_z"] = df["bb_z"].replace([np.inf, -np.inf], np.nan)
 
     horizons = _parse_horizons(args.horizons)
-    for h in horizons:
-        df[f"ret_{h}D"] = _forward_return(df["price"], horizon=h)
+    extra_horizons = [h for h in _parse_horizons(args.extra_horizons, allow_empty=True) if h not in horizons]
+    table_horizons = horizons + extra_horizons
+    extra_schemes = [sc for sc in _parse_bucket_schemes(args.extra_bucket_schemes) if sc[0] != PRIMARY_SCHEME]
+
+    cube: Optional[Dict[str, Any]] = None
+    fwd_cube_info: Optional[Dict[str, Any]] = None
+    if str(args.fwd_cube).strip():
+        cube, fwd_cube_info = update_cube(
+            os.path.join(cache_dir, str(args.fwd_cube).strip()),
+            dates=df["date"].astype(str).tolist(),
+            prices=df["price"].to_numpy(dtype=float),
+            horizons=table_horizons,
+            hi=float(args.break_ratio_hi),
+            lo=float(args.break_ratio_lo),
+        )
 
-    break_pos = _detect_break_positions(df["price"], hi=float(args.break_ratio_hi), lo=float(args.break_ratio_lo))
+    for h in table_horizons:
+        if cube is not None:
+            df[f"ret_{h}D"] = cube_column(cube, "fwd_ret", h)
+        else:
+            df[f"ret_{h}D"] = _forward_return(df["price"], horizon=h)
+
+    if cube is not None:
+        break_pos = np.where(cube["is_break"])[0]
+    else:
+        break_pos = _detect_break_positions(df["price"], hi=float(args.break_ratio_hi), lo=float(args.break_ratio_lo))
     break_count_detected = int(len(break_pos))
 
     break_samples: List[Dict[str, Any]] = []
@@ -414,12 +580,13 @@ def main() -> None:
             "rows_price_csv": rows_price_csv,
             "lookback_years": lookback_years,
             "lookback_start_date": lookback_start_date,
+            "fwd_cube": fwd_cube_info,
         },
         "dq": {"flags": [], "notes": []},
         "forward_return_conditional": {
             "schema": "hier",
-            "scheme": "bb_z_5bucket_v1",
-            "thresholds": {"extreme": 2.0, "near": 1.5},
+            "scheme": PRIMARY_SCHEME,
+            "thresholds": {"extreme": PRIMARY_THRESHOLDS[1], "near": PRIMARY_THRESHOLDS[0]},
             "bb_window": int(args.bb_window),
             "bb_k": float(args.bb_k),
             "bb_ddof": int(args.bb_ddof),
@@ -486,67 +653,33 @@ def main() -> None:
             "current_bucket_canonical": None,
         }
 
-    def summarize_mode(h: int, mode_name: str, mask: pd.Series) -> Dict[str, Any]:
-        ret_col = f"ret_{h}D"
-
-        # Defensive: ensure bb_z is present inside summarize_mode itself.
-        mask2 = mask & df["bb_z"].notna() & np.isfinite(df["bb_z"].astype(float))
-        dfm = df.loc[mask2].copy()
-
-        # v7_5 FIX: also ensure ret_col is valid here (do not rely on caller mask).
-        # This should be redundant in the current pipeline (base_mask_h already includes ret_col.notna()).
-        dfm = dfm[dfm[ret_col].notna()].copy()
-
-        if dfm.empty:
-            return {
-                "definition": f"scheme=bb_z_5bucket_v1; horizon={h}D; mode={mode_name}",
-                "n_total": 0,
-                "by_bucket": [],
-                "min_audit_by_bucket": [],
-                "unknown_bucket_n": 0,
-            }
-
-        dfm["bucket_canonical"] = dfm["bb_z"].astype(float).map(lambda z: _bucket_from_z(float(z)))
-        unknown_n = int((dfm["bucket_canonical"] == "UNKNOWN").sum())
-
-        if unknown_n > 0:
-            out["dq"]["flags"].append("BUCKET_UNKNOWN_IN_SUMMARIZE")
-            out["dq"]["notes"].append(f"horizon={h}D mode={mode_name}: unknown_bucket_n={unknown_n}")
-
-        by_bucket: List[Dict[str, Any]] = []
-        min_audit_by_bucket: List[Dict[str, Any]] = []
-
-        for bk in _ALLOWED_BUCKETS:
-            part = dfm[dfm["bucket_canonical"] == bk]
-            n = int(len(part))
-            if n == 0:
-                continue
-
-            s = part[ret_col].astype(float)
-            rec = {
-                "bucket_canonical": bk,
-                "n": n,
-                "hit_rate": float((s > 0).mean()),
-                "p90": _quantile(s, 0.90),
-                "p50": _quantile(s, 0.50),
-                "p25": _quantile(s, 0.25),
-                "p10": _quantile(s, 0.10),
-                "p05": _quantile(s, 0.05),
-                "min": float(s.min()),
-            }
-            by_bucket.append(rec)
-
-            ma = _min_audit_global(part, df, ret_col=ret_col, horizon=h)
-            ma = {"bucket_canonical": bk, "n": n, **ma}
-            min_audit_by_bucket.append(ma)
-
-        return {
-            "definition": f"scheme=bb_z_5bucket_v1; horizon={h}D; mode={mode_name}",
-            "n_total": int(len(dfm)),
-            "by_bucket": by_bucket,
-            "min_audit_by_bucket": min_audit_by_bucket,
-            "unknown_bucket_n": unknown_n,
-        }
+    # v8_0: all scheme x horizon x mode x bucket stats in one grouped pass
+    contam_by_h: Dict[int, np.ndarray] = {}
+    for h in table_horizons:
+        if cube is not None:
+            contam_by_h[h] = cube_column(cube, "contaminated", h)
+        else:
+            contam_by_h[h] = _contam_mask_from_breaks(len(df), break_pos, horizon=h)
+
+    z_arr = df["bb_z"].to_numpy(dtype=float)
+    schemes = [(PRIMARY_SCHEME, list(PRIMARY_THRESHOLDS))] + extra_schemes
+    table_rows, table_totals = _conditional_table(
+        ret=np.column_stack([df[f"ret_{h}D"].to_numpy(dtype=float) for h in table_horizons]),
+        contam=np.column_stack([np.asarray(contam_by_h[h], dtype=bool) for h in table_horizons]),
+        horizons=table_horizons,
+        base=(lookback_mask & base_z).to_numpy(dtype=bool),
+        schemes=[(name, _bucket_codes(z_arr, thr), _bucket_labels(thr)) for name, thr in schemes],
+        dates=df["date"].astype(str).tolist(),
+        prices=df["price"].to_numpy(dtype=float),
+    )
+    out["forward_return_conditional"]["table"] = {
+        "columns": TABLE_COLUMNS,
+        "rows": table_rows,
+        "schemes": {name: {"thresholds": [float(t) for t in thr], "buckets": _bucket_labels(thr)} for name, thr in schemes},
+        "horizons": [int(h) for h in table_horizons],
+        "extra_horizons": [int(h) for h in extra_horizons],
+        "quantile_method": "linear (numpy/pandas default)",
+    }
 
     def first_break_in_window(t: int, h: int) -> Optional[int]:
         if break_pos.size == 0:
@@ -564,13 +697,13 @@ def main() -> None:
         ret_col = f"ret_{h}D"
         base_mask_h = lookback_mask & base_z & df[ret_col].notna()
 
-        raw_obj = summarize_mode(h, "raw", base_mask_h)
-
-        contam_arr = _contam_mask_from_breaks(len(df), break_pos, horizon=h)
-        contam = pd.Series(contam_arr, index=df.index, dtype=bool)
-
-        clean_mask_h = base_mask_h & (~contam)
-        clean_obj = summarize_mode(h, "clean", clean_mask_h)
+        raw_obj = _mode_obj_from_table(table_rows, table_totals, PRIMARY_SCHEME, h, "raw")
+        contam = pd.Series(contam_by_h[h], index=df.index, dtype=bool)
+        clean_obj = _mode_obj_from_table(table_rows, table_totals, PRIMARY_SCHEME, h, "clean")
+        for mode_name, obj in (("raw", raw_obj), ("clean", clean_obj)):
+            if int(obj["unknown_bucket_n"]) > 0:
+                out["dq"]["flags"].append("BUCKET_UNKNOWN_IN_SUMMARIZE")
+                out["dq"]["notes"].append(f"horizon={h}D mode={mode_name}: unknown_bucket_n={obj['unknown_bucket_n']}")
 
         excluded_by_break_mask = int((base_mask_h & contam & base_z).sum())
 
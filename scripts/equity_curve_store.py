@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/equity_curve_store.py
+
+Columnar file for all per-strategy equity curves of one backtest run
+(backtest_tw0050_leverage_mvp.py --equity_curve_format npz|both; read by render_backtest_mvp.py).
+
+Layout: an UNCOMPRESSED .npz (plain zip of .npy members), so np.load() reads it and every column can
+also be memory-mapped in place (the zip central directory is the column index):
+
+    date                      datetime64[D]  (n,)   shared
+    price                     float64        (n,)   shared
+    <strategy_id>.equity          float32|64 (n,)
+    <strategy_id>.equity_base_only float32|64 (n,)
+    <strategy_id>.lever_on        bool       (n,)
+    meta                      JSON string    (format, strategies, dtype, script fingerprint)
+
+No pickle anywhere. Writes go to a temp file + os.replace.
+
+    from equity_curve_store import open_curves, write_curves
+    write_curves(path, dates, price, {"bb_conditional": {"equity": ..., ...}}, meta={...})
+    st = open_curves(path)
+    eq = st.column("bb_conditional", "equity")     # np.memmap (read-only)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zipfile
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+CURVES_FORMAT = "equity_curves_v1"
+CURVE_FIELDS = ["equity", "equity_base_only", "lever_on"]
+
+
+def write_curves(
+    path: str,
+    dates: Sequence[str],
+    price: np.ndarray,
+    curves: Mapping[str, Mapping[str, np.ndarray]],
+    meta: Optional[Dict[str, Any]] = None,
+    dtype: str = "float64",
+) -> int:
+    """Write one columnar file; curves = {strategy_id: {field: array}} with CURVE_FIELDS. Returns bytes."""
+    n = int(len(dates))
+    fdt = np.dtype(dtype)
+    if fdt not in (np.dtype("float32"), np.dtype("float64")):
+        raise ValueError(f"dtype must be float32 or float64, got {dtype!r}")
+
+    arrays: Dict[str, np.ndarray] = {
+        "date": np.asarray(dates, dtype="datetime64[D]"),
+        "price": np.asarray(price, dtype=np.float64),
+    }
+    for sid, cols in curves.items():
+        for f in CURVE_FIELDS:
+            a = np.asarray(cols[f])
+            if a.shape != (n,):
+                raise ValueError(f"{sid}.{f}: expected shape ({n},), got {a.shape}")
+            arrays[f"{sid}.{f}"] = a.astype(bool) if f == "lever_on" else a.astype(fdt)
+
+    m = {
+        "format": CURVES_FORMAT,
+        "rows": n,
+        "strategies": list(curves.keys()),
+        "fields": list(CURVE_FIELDS),
+        "float_dtype": str(fdt),
+    }
+    m.update(meta or {})
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(m, ensure_ascii=False, sort_keys=True)), **arrays)
+    os.replace(tmp, path)
+    return int(os.path.getsize(path))
+
+
+class CurveStore:
+    """Read-only view of a write_curves() file; columns are memory-mapped on first access."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._offsets: Dict[str, int] = {}
+        self._cols: Dict[str, np.ndarray] = {}
+        with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+            for zi in zf.infolist():
+                if not zi.filename.endswith(".npy"):
+                    continue
+                if zi.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"{path}: member {zi.filename} is compressed; cannot memory-map")
+                # local header: 30 bytes + name + extra, then the .npy payload
+                fh.seek(zi.header_offset + 26)
+                ln = int.from_bytes(fh.read(2), "little")
+                le = int.from_bytes(fh.read(2), "little")
+                self._offsets[zi.filename[:-4]] = zi.header_offset + 30 + ln + le
+        if "meta" not in self._offsets:
+            raise ValueError(f"{path}: missing meta")
+        self.meta: Dict[str, Any] = json.loads(str(self._load("meta")[()]))
+        if self.meta.get("format") != CURVES_FORMAT:
+            raise ValueError(f"{path}: unknown format {self.meta.get('format')!r}")
+
+    def _load(self, key: str) -> np.ndarray:
+        hit = self._cols.get(key)
+        if hit is not None:
+            return hit
+        off = self._offsets[key]
+        with open(self.path, "rb") as fh:
+            fh.seek(off)
+            version = npy_format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran, dtype = npy_format.read_array_header_1_0(fh)
+            else:
+                shape, fortran, dtype = npy_format.read_array_header_2_0(fh)
+            data_off = fh.tell()
+        if dtype.hasobject:
+            raise ValueError(f"{self.path}: {key} has object dtype")
+        if len(shape) == 0 or int(np.prod(shape)) == 0:
+            with open(self.path, "rb") as fh:
+                fh.seek(off)
+                arr = npy_format.read_array(fh, allow_pickle=False)
+        else:
+            arr = np.memmap(self.path, dtype=dtype, mode="r", offset=data_off, shape=shape,
+                            order="F" if fortran else "C")
+        self._cols[key] = arr
+        return arr
+
+    @property
+    def strategies(self) -> List[str]:
+        return [str(s) for s in self.meta.get("strategies", [])]
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._load("date")
+
+    def dates_iso(self) -> List[str]:
+        return np.datetime_as_string(self.dates, unit="D").tolist()
+
+    @property
+    def price(self) -> np.ndarray:
+        return self._load("price")
+
+    def column(self, strategy_id: str, field: str) -> np.ndarray:
+        key = f"{strategy_id}.{field}"
+        if key not in self._offsets:
+            raise KeyError(key)
+        return self._load(key)
+
+    def has(self, strategy_id: str) -> bool:
+        return f"{strategy_id}.equity" in self._offsets
+
+
+def open_curves(path: str) -> CurveStore:
+    return CurveStore(path)
@@ -8,14 +8,19 @@ import json
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 import requests
 
+from twse_client import NO_DATA_STAT, day_period_end, get_client, stat_ok_or_no_data
+
 # ===== Audit stamp =====
-BUILD_SCRIPT_FINGERPRINT = "fetch_tw0050_chip_overlay@2026-02-19.v6"
+BUILD_SCRIPT_FINGERPRINT = "fetch_tw0050_chip_overlay@2026-10-16.v9.day_cache_stat_guard"
+DAY_CACHE_FORMAT = "chip_overlay_day_v2"  # bump when fetch_t86_one_day / fetch_twt72u_one_day output changes
 
 TWSE_T86_TPL = "https://www.twse.com.tw/fund/T86?response=json&date={ymd}&selectType=ALLBUT0999"
 TWSE_TWT72U_TPL = "https://www.twse.com.tw/exchangeReport/TWT72U?response=json&date={ymd}&selectType=SLBNLB"
@@ -120,24 +125,29 @@ def http_get_text(url: str, cfg: FetchCfg) -> Tuple[Optional[str], Optional[str]
     return None, last_err
 
 
-def http_get_json(url: str, cfg: FetchCfg) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+def http_get_json(url: str, cfg: FetchCfg, period_end: Optional[date] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """TWSE JSON via the shared twse_client (pooled session, global rate limit, payload cache)."""
     headers = {
         "User-Agent": "Mozilla/5.0 (compatible; chip_overlay_bot/1.0; +https://github.com/)",
         "Accept": "application/json,text/plain,*/*",
         "Accept-Language": "zh-TW,zh;q=0.9,en;q=0.7",
-        "Connection": "close",
     }
-    last_err = None
-    for i in range(max(1, cfg.retries)):
-        try:
-            r = requests.get(url, headers=headers, timeout=cfg.timeout)
-            r.raise_for_status()
-            return r.json(), None
-        except Exception as e:
-            last_err = f"{type(e).__name__}: {e}"
-            if i < cfg.retries - 1:
-                time.sleep(cfg.backoff * (2**i))
-    return None, last_err
+    tries = max(1, cfg.retries)
+    try:
+        j = get_client().get_json(
+            url,
+            headers=headers,
+            timeout=cfg.timeout,
+            max_tries=tries,
+            backoffs=[cfg.backoff * (2**i) for i in range(tries)],
+            period_end=period_end,
+            cacheable=stat_ok_or_no_data,
+        )
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    if not isinstance(j, dict):
+        return None, f"unexpected_payload_type:{type(j).__name__}"
+    return j, None
 
 
 def _pick_row_by_stock(data_rows: List[List[Any]], stock_no: str) -> Optional[List[Any]]:
@@ -211,12 +221,13 @@ def _t86_idx_total3(fields: List[str]) -> Optional[int]:
 def fetch_t86_one_day(stock_no: str, ymd_str: str, cfg: FetchCfg) -> Dict[str, Any]:
     url = TWSE_T86_TPL.format(ymd=ymd_str)
     out: Dict[str, Any] = {"dq": [], "fields": [], "raw_row": None, "col_idx": {}}
-    j, err = http_get_json(url, cfg)
+    j, err = http_get_json(url, cfg, period_end=day_period_end(ymd_str))
     if j is None:
         out["dq"].append("T86_FETCH_FAILED")
         out["dq"].append(f"T86_ERR:{err}")
         return out
 
+    out["stat"] = j.get("stat")
     fields = safe_get(j, "fields", []) or []
     data_rows = safe_get(j, "data", []) or []
     out["fields"] = fields
@@ -263,12 +274,13 @@ def fetch_t86_one_day(stock_no: str, ymd_str: str, cfg: FetchCfg) -> Dict[str, A
 def fetch_twt72u_one_day(stock_no: str, ymd_str: str, cfg: FetchCfg) -> Dict[str, Any]:
     url = TWSE_TWT72U_TPL.format(ymd=ymd_str)
     out: Dict[str, Any] = {"dq": [], "fields": [], "raw_row": None, "col_idx": {}}
-    j, err = http_get_json(url, cfg)
+    j, err = http_get_json(url, cfg, period_end=day_period_end(ymd_str))
     if j is None:
         out["dq"].append("TWT72U_FETCH_FAILED")
         out["dq"].append(f"TWT72U_ERR:{err}")
         return out
 
+    out["stat"] = j.get("stat")
     fields = safe_get(j, "fields", []) or []
     data_rows = safe_get(j, "data", []) or []
     out["fields"] = fields
@@ -434,7 +446,73 @@ def fetch_etf_units(stock_no: str, cfg: FetchCfg, pcf_url: Optional[str]) -> Tup
     return etf, dq
 
 
-def build_overlay(stock_no: str, stats_path: str, window_n: int, cfg: FetchCfg, pcf_url: Optional[str]) -> Dict[str, Any]:
+def _day_cache_path(day_cache_dir: str, stock_no: str, ymd_str: str) -> str:
+    return os.path.join(day_cache_dir, str(stock_no), f"{ymd_str}.json")
+
+
+def _day_cacheable(ymd_str: str, t86: Dict[str, Any], twt72u: Dict[str, Any]) -> bool:
+    """
+    A day result may be persisted / reused only if both payloads passed stat_ok_or_no_data
+    (a throttle or error page must not be pinned as a non-trading day). An all-EMPTY weekday must
+    come from TWSE's real no-data stat on both endpoints.
+    """
+    stats = [str(t86.get("stat") or ""), str(twt72u.get("stat") or "")]
+    if not all(stat_ok_or_no_data({"stat": st}) for st in stats):
+        return False
+    all_empty = "T86_EMPTY" in (t86.get("dq") or []) and "TWT72U_EMPTY" in (twt72u.get("dq") or [])
+    weekday = datetime.strptime(ymd_str, "%Y%m%d").weekday() < 5
+    if all_empty and weekday:
+        return all(NO_DATA_STAT in st for st in stats)
+    return True
+
+
+def _fetch_day(
+    stock_no: str, ymd_str: str, cfg: FetchCfg, day_cache_dir: Optional[str], closed: bool
+) -> Tuple[str, Dict[str, Any], Dict[str, Any], str]:
+    """
+    (date, t86, twt72u, source) for one calendar day; source = hit / fetched / stored. Past days (closed=True) are served from / persisted to
+    the per-date result cache; a day with a *_FETCH_FAILED flag or a payload stat rejected by
+    _day_cacheable is never persisted (and such a cached entry is never served).
+    """
+    path = _day_cache_path(day_cache_dir, stock_no, ymd_str) if day_cache_dir else None
+    if path and closed and os.path.isfile(path):
+        try:
+            c = load_json(path)
+            if (
+                c.get("format") == DAY_CACHE_FORMAT
+                and c.get("stock_no") == str(stock_no)
+                and c.get("date") == ymd_str
+                and _day_cacheable(ymd_str, c["t86"], c["twt72u"])
+            ):
+                return ymd_str, c["t86"], c["twt72u"], "hit"
+        except Exception:
+            pass
+
+    t86 = fetch_t86_one_day(stock_no, ymd_str, cfg)
+    twt72u = fetch_twt72u_one_day(stock_no, ymd_str, cfg)
+
+    failed = "T86_FETCH_FAILED" in t86["dq"] or "TWT72U_FETCH_FAILED" in twt72u["dq"]
+    if path and closed and not failed and _day_cacheable(ymd_str, t86, twt72u):
+        try:
+            obj = {"format": DAY_CACHE_FORMAT, "stock_no": str(stock_no), "date": ymd_str, "t86": t86, "twt72u": twt72u}
+            tmp = f"{path}.{os.getpid()}.tmp"
+            write_json(tmp, obj)
+            os.replace(tmp, path)
+            return ymd_str, t86, twt72u, "stored"
+        except OSError:
+            pass
+    return ymd_str, t86, twt72u, "fetched"
+
+
+def build_overlay(
+    stock_no: str,
+    stats_path: str,
+    window_n: int,
+    cfg: FetchCfg,
+    pcf_url: Optional[str],
+    jobs: int = 4,
+    day_cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
     if not os.path.exists(stats_path):
         raise SystemExit(f"ERROR: stats_path not found: {stats_path}")
 
@@ -454,43 +532,57 @@ def build_overlay(stock_no: str, stats_path: str, window_n: int, cfg: FetchCfg,
     max_lookback = max(30, window_n * 8)
     got = 0
     cur = last_dt
-
-    while got < window_n and len(per_day) < max_lookback:
-        ds = ymd(cur)
-        day_entry: Dict[str, Any] = {
-            "date": ds,
-            "dq": [],
-            "sources": {
-                "t86": TWSE_T86_TPL.format(ymd=ds),
-                "twt72u": TWSE_TWT72U_TPL.format(ymd=ds),
-            },
-        }
-
-        t86 = fetch_t86_one_day(stock_no, ds, cfg)
-        twt72u = fetch_twt72u_one_day(stock_no, ds, cfg)
-        day_entry["t86"] = t86
-        day_entry["twt72u"] = twt72u
-
-        is_t86_ok = ("T86_EMPTY" not in (t86.get("dq") or [])) and (t86.get("raw_row") is not None)
-        is_twt_ok = ("TWT72U_EMPTY" not in (twt72u.get("dq") or [])) and (twt72u.get("raw_row") is not None)
-        if (not is_t86_ok) and (not is_twt_ok):
-            day_entry["dq"].append("NON_TRADING_OR_NO_DATA")
-
-        if is_t86_ok:
-            f = t86.get("foreign_net_shares")
-            t = t86.get("trust_net_shares")
-            d = t86.get("dealer_net_shares")
-            tt = t86.get("total3_net_shares")
-            if all(isinstance(x, int) for x in [f, t, d, tt]):
-                foreign_sum += int(f)
-                trust_sum += int(t)
-                dealer_sum += int(d)
-                total3_sum += int(tt)
-                t86_days_used.append(ds)
-                got += 1
-
-        per_day.append(day_entry)
-        cur = cur - timedelta(days=1)
+    day_cache_stats = {"hit": 0, "fetched": 0, "stored": 0}
+    today_local = datetime.now(tz=ZoneInfo("Asia/Taipei")).date()
+
+    # Same backward walk and stop rule as the serial loop; days are fetched ahead in batches (~1.5
+    # calendar days per wanted trading day) so T86/TWT72U requests overlap. Extra days fetched past
+    # the stop point are discarded from the output (but stay cached).
+    with ThreadPoolExecutor(max_workers=max(1, int(jobs))) as pool:
+        while got < window_n and len(per_day) < max_lookback:
+            n_batch = min(max_lookback - len(per_day), max(2, ((window_n - got) * 3 + 1) // 2 + 1))
+            batch = [cur - timedelta(days=i) for i in range(n_batch)]
+            days = list(pool.map(
+                lambda d: _fetch_day(stock_no, ymd(d), cfg, day_cache_dir, d < today_local),
+                batch,
+            ))
+            for day in days:
+                day_cache_stats[day[3]] += 1
+
+            for ds, t86, twt72u, _ in days:
+                if got >= window_n or len(per_day) >= max_lookback:
+                    break
+                day_entry: Dict[str, Any] = {
+                    "date": ds,
+                    "dq": [],
+                    "sources": {
+                        "t86": TWSE_T86_TPL.format(ymd=ds),
+                        "twt72u": TWSE_TWT72U_TPL.format(ymd=ds),
+                    },
+                }
+                day_entry["t86"] = t86
+                day_entry["twt72u"] = twt72u
+
+                is_t86_ok = ("T86_EMPTY" not in (t86.get("dq") or [])) and (t86.get("raw_row") is not None)
+                is_twt_ok = ("TWT72U_EMPTY" not in (twt72u.get("dq") or [])) and (twt72u.get("raw_row") is not None)
+                if (not is_t86_ok) and (not is_twt_ok):
+                    day_entry["dq"].append("NON_TRADING_OR_NO_DATA")
+
+                if is_t86_ok:
+                    f = t86.get("foreign_net_shares")
+                    t = t86.get("trust_net_shares")
+                    d = t86.get("dealer_net_shares")
+                    tt = t86.get("total3_net_shares")
+                    if all(isinstance(x, int) for x in [f, t, d, tt]):
+                        foreign_sum += int(f)
+                        trust_sum += int(t)
+                        dealer_sum += int(d)
+                        total3_sum += int(tt)
+                        t86_days_used.append(ds)
+                        got += 1
+
+                per_day.append(day_entry)
+            cur = cur - timedelta(days=n_batch)
 
     # Borrow summary: latest two available
     def _borrow_rec(e: Dict[str, Any]) -> Optional[Tuple[str, Optional[int], Optional[float]]]:
@@ -553,6 +645,9 @@ def build_overlay(stock_no: str, stats_path: str, window_n: int, cfg: FetchCfg,
             "retries": int(cfg.retries),
             "backoff": float(cfg.backoff),
             "aligned_last_date": aligned_last_date,
+            "http_cache": get_client().audit(),
+            "jobs": int(jobs),
+            "day_cache": {"dir": day_cache_dir, **day_cache_stats},
         },
         "sources": {
             "t86_tpl": TWSE_T86_TPL,
@@ -582,6 +677,12 @@ def main() -> int:
     ap.add_argument("--retries", type=int, default=3)
     ap.add_argument("--backoff", type=float, default=1.5)
     ap.add_argument("--pcf_url", default=None)
+    ap.add_argument("--jobs", type=int, default=4, help="concurrent day fetches (T86 + TWT72U per day)")
+    ap.add_argument(
+        "--day_cache_dir",
+        default=os.path.join(os.environ.get("TWSE_HTTP_CACHE_DIR", ".twse_http_cache"), "chip_overlay_days"),
+        help="per-date result cache for past days ('' disables)",
+    )
     args = ap.parse_args()
 
     out_path = args.out or args.out_path
@@ -605,6 +706,8 @@ def main() -> int:
         window_n=int(args.window_n),
         cfg=cfg,
         pcf_url=args.pcf_url,
+        jobs=int(args.jobs),
+        day_cache_dir=(str(args.day_cache_dir) or None),
     )
 
     write_json(str(out_path), payload)
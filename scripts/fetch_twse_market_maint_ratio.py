@@ -29,6 +29,20 @@ Other robustness:
 - Adds browser-like headers + Referer
 - Checks 'stat' != 'OK' early
 
+v7 (values unchanged):
+- HTTP goes through scripts/twse_client.py (shared pooled session, global rate limit across TWSE
+  scripts, on-disk payload cache). A past date's stat=OK MI_MARGN/MI_INDEX payload is reused instead of
+  refetched; today's entries expire after the client TTL. latest.json gains "http_cache" (audit).
+
+v8 (single-date mode unchanged):
+- --date-range START:END backfills the history in one job: weekdays are fetched on a worker pool
+  (--jobs), each day's fin_shares/close maps are stored as (index, value) arrays on one shared
+  security-code index (DayArrays); per day fin*close is vectorized and summed left to right in
+  MI_MARGN code order, so collateral / maint_ratio_pct are bit-identical to single-date mode.
+  --arrays-out keeps the dense per-day arrays (.npz). Non-trading days (TWSE "no data" page) are
+  skipped; weekdays failing for any other reason are retried once, all listed in notes ("failed:")
+  and make the run exit 1 (good days are still upserted). --out gets the newest computed day.
+
 Outputs:
 - latest.json (always)
 - history.json (upsert by data_date, if --history provided)
@@ -38,14 +52,18 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import time
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Iterable
 
-import requests
+import numpy as np
 from zoneinfo import ZoneInfo
 
+from twse_client import NO_DATA_STAT, day_period_end, get_client, stat_ok, stat_ok_or_no_data
+
 UA = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -142,26 +160,29 @@ def _twse_headers(referer: str) -> Dict[str, str]:
         "Connection": "keep-alive",
     }
 
-def request_json(session: requests.Session, url: str, params: Dict[str, str], referer: str, timeout: int = 30) -> Dict[str, Any]:
-    last_err: Optional[str] = None
+def request_json(
+    url: str, params: Dict[str, str], referer: str, timeout: int = 30, cacheable: Callable[[Any], bool] = stat_ok
+) -> Dict[str, Any]:
+    """
+    GET via the shared twse_client (pooled session, global rate limit, payload cache).
+    A past trading day's stat=OK payload is immutable; the cache buster '_' is not part of the key.
+    """
     p = dict(params)
     p["_"] = str(int(time.time() * 1000))  # cache buster
-
-    for i, backoff in enumerate((2, 4, 8), start=1):
-        try:
-            r = session.get(url, params=p, headers=_twse_headers(referer), timeout=timeout)
-            if r.status_code in (429, 500, 502, 503, 504):
-                raise RuntimeError(f"http_{r.status_code}")
-            r.raise_for_status()
-            try:
-                return r.json()
-            except Exception:
-                text = r.text.lstrip("\ufeff").strip()
-                return json.loads(text)
-        except Exception as e:
-            last_err = f"try{i}:{type(e).__name__}:{e}"
-            time.sleep(backoff)
-    raise RuntimeError(last_err or "request_failed")
+    obj = get_client().get_json(
+        url,
+        params=p,
+        referer=referer,
+        headers=_twse_headers(referer),
+        timeout=timeout,
+        max_tries=3,
+        backoffs=(2, 4, 8),
+        period_end=day_period_end(params["date"]),
+        cacheable=cacheable,
+    )
+    if not isinstance(obj, dict):
+        raise RuntimeError(f"unexpected_payload_type:{type(obj).__name__}")
+    return obj
 
 def _stat_guard(obj: Dict[str, Any], name: str) -> None:
     stat = obj.get("stat")
@@ -465,6 +486,9 @@ def _extract_close_from_fields_data(fields: List[Any], data: List[Any], code_key
     return out, "ok"
 
 def upsert_history(history_path: str, item: Dict[str, Any], max_items: int = 1200) -> None:
+    upsert_history_items(history_path, [item], max_items=max_items)
+
+def upsert_history_items(history_path: str, items_in: List[Dict[str, Any]], max_items: int = 1200) -> None:
     data = {"schema_version": SCHEMA_HISTORY, "items": []}
     try:
         with open(history_path, "r", encoding="utf-8") as f:
@@ -476,17 +500,14 @@ def upsert_history(history_path: str, item: Dict[str, Any], max_items: int = 120
     if not isinstance(items, list):
         items = []
 
-    dd = item.get("data_date")
+    by_date = {it.get("data_date"): it for it in items_in if it.get("data_date")}
     new_items: List[Dict[str, Any]] = []
-    replaced = False
     for it in items:
-        if isinstance(it, dict) and it.get("data_date") == dd:
-            new_items.append(item)
-            replaced = True
+        if isinstance(it, dict) and it.get("data_date") in by_date:
+            new_items.append(by_date.pop(it.get("data_date")))
         else:
             new_items.append(it if isinstance(it, dict) else {})
-    if not replaced:
-        new_items.append(item)
+    new_items.extend(by_date.values())
 
     new_items = sorted([x for x in new_items if x.get("data_date")], key=lambda x: str(x.get("data_date") or ""))
     if len(new_items) > max_items:
@@ -498,6 +519,268 @@ def upsert_history(history_path: str, item: Dict[str, Any], max_items: int = 120
     with open(history_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
+# ---------- --date-range mode ----------
+
+def parse_date_range(s: str) -> Tuple[str, str]:
+    """'YYYYMMDD:YYYYMMDD' or 'YYYY-MM-DD..YYYY-MM-DD' -> (start, end) as YYYYMMDD."""
+    parts = [x for x in re.split(r"\.\.|:|,", s.strip()) if x.strip()]
+    if len(parts) != 2:
+        raise ValueError(f"date_range_invalid:{s}")
+    a = normalize_date_to_yyyymmdd(parts[0])
+    b = normalize_date_to_yyyymmdd(parts[1])
+    if not a or not b or a > b:
+        raise ValueError(f"date_range_invalid:{s}")
+    return a, b
+
+def iter_weekdays(start_yyyymmdd: str, end_yyyymmdd: str) -> List[str]:
+    d = datetime.strptime(start_yyyymmdd, "%Y%m%d").date()
+    end = datetime.strptime(end_yyyymmdd, "%Y%m%d").date()
+    out: List[str] = []
+    while d <= end:
+        if d.weekday() < 5:
+            out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
+
+def _is_no_data(obj: Dict[str, Any]) -> bool:
+    return NO_DATA_STAT in str(obj.get("stat", ""))
+
+def fetch_day_inputs(date_yyyymmdd: str, today: date) -> Dict[str, Any]:
+    """
+    MI_MARGN + MI_INDEX for one day, reduced to (total, fin_shares, close_by_code).
+    ok=False + no_data=True for TWSE's "no data" page (non-trading day); ok=False with error for
+    fetch / parse failures (same guards as single-date mode).
+    """
+    out: Dict[str, Any] = {"date": date_yyyymmdd, "ok": False, "no_data": False, "error": None, "notes": []}
+    # a past day's "no data" page is final; today's may still turn into data
+    cacheable = stat_ok_or_no_data if day_period_end(date_yyyymmdd) < today else stat_ok
+    try:
+        margn = request_json(
+            TWSE_MI_MARGN,
+            params={"response": "json", "date": date_yyyymmdd, "selectType": "ALL"},
+            referer="https://www.twse.com.tw/zh/trading/margin/mi-margn.html",
+            cacheable=cacheable,
+        )
+        if _is_no_data(margn):
+            out["no_data"] = True
+            return out
+        _stat_guard(margn, "MI_MARGN")
+        total_amt_twd, total_src = extract_total_financing_amount_twd(margn)
+        if total_amt_twd is None:
+            raise RuntimeError(f"total_financing_amount_not_found:{total_src}")
+        fin_shares, fin_src, fin_conf = extract_financing_shares_by_code(margn, out["notes"])
+        if not fin_shares:
+            raise RuntimeError(f"financing_shares_not_found:{fin_src}")
+
+        mi_index = request_json(
+            TWSE_MI_INDEX,
+            params={"response": "json", "date": date_yyyymmdd, "type": "ALLBUT0999"},
+            referer="https://www.twse.com.tw/zh/trading/historical/mi-index.html",
+            cacheable=cacheable,
+        )
+        if _is_no_data(mi_index):
+            out["no_data"] = True
+            return out
+        _stat_guard(mi_index, "MI_INDEX")
+        close_by_code, px_src = extract_close_by_code(mi_index, out["notes"])
+        if not close_by_code:
+            raise RuntimeError(f"close_prices_not_found:{px_src}")
+
+        out.update({
+            "ok": True,
+            "total_financing_amount_twd": int(total_amt_twd),
+            "fin_shares": fin_shares,
+            "fin_conf": bool(fin_conf),
+            "close_by_code": close_by_code,
+            "srcs": [f"total_financing_amount: {total_src}", f"fin_shares: {fin_src}",
+                     f"fin_pick_confident: {bool(fin_conf)}", f"close_prices: {px_src}"],
+        })
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    return out
+
+
+class DayArrays:
+    """
+    Per-day financing shares / closes as compact arrays aligned to one shared security-code index
+    (codes appended in first-seen order; a day stores only (index, value) pairs).
+    """
+
+    def __init__(self) -> None:
+        self.code_idx: Dict[str, int] = {}
+        self.dates: List[str] = []
+        self.total_financing: List[int] = []
+        self.fin_conf: List[bool] = []
+        self.fin: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.px: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def _index(self, codes: Iterable[str]) -> np.ndarray:
+        ci = self.code_idx
+        return np.fromiter((ci.setdefault(c, len(ci)) for c in codes), dtype=np.int32)
+
+    def add(self, day: Dict[str, Any]) -> None:
+        fin = day["fin_shares"]
+        px = day["close_by_code"]
+        self.dates.append(day["date"])
+        self.total_financing.append(int(day["total_financing_amount_twd"]))
+        self.fin_conf.append(bool(day["fin_conf"]))
+        self.fin.append((self._index(fin.keys()), np.fromiter(fin.values(), dtype=np.int64, count=len(fin))))
+        self.px.append((self._index(px.keys()), np.fromiter(px.values(), dtype=np.float64, count=len(px))))
+
+    @property
+    def codes(self) -> List[str]:
+        return list(self.code_idx.keys())
+
+    def dense(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(fin_shares int64 [days, codes], fin_mask bool, close float64 with NaN = no close)."""
+        n_d, n_c = len(self.dates), len(self.code_idx)
+        fin = np.zeros((n_d, n_c), dtype=np.int64)
+        fin_mask = np.zeros((n_d, n_c), dtype=bool)
+        close = np.full((n_d, n_c), np.nan, dtype=np.float64)
+        for i, ((fi, fv), (pi, pv)) in enumerate(zip(self.fin, self.px)):
+            fin[i, fi] = fv
+            fin_mask[i, fi] = True
+            close[i, pi] = pv
+        return fin, fin_mask, close
+
+
+def compute_ratio_arrays(
+    arrays: DayArrays, close: np.ndarray, col_mask: Optional[np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """
+    Single-date formula for all days: Σ fin*close*1000 over codes with both, / total * 100.
+    Per day the products are vectorized and summed left to right (np.cumsum) in the day's MI_MARGN
+    code order, i.e. the same float operations in the same order as the single-date loop, so
+    collateral / maint_ratio_pct are bit-identical to single-date mode.
+    """
+    n_d = len(arrays.dates)
+    collateral = np.zeros(n_d, dtype=np.float64)
+    included = np.zeros(n_d, dtype=np.int64)
+    missing = np.zeros(n_d, dtype=np.int64)
+    for i, (fi, fv) in enumerate(arrays.fin):
+        if col_mask is not None:
+            keep = col_mask[fi]
+            fi, fv = fi[keep], fv[keep]
+        px = close[i, fi]
+        have_px = ~np.isnan(px)
+        prod = fv[have_px].astype(np.float64) * px[have_px] * 1000.0
+        collateral[i] = float(np.cumsum(prod)[-1]) if prod.size else 0.0
+        included[i] = int(have_px.sum())
+        missing[i] = int(fi.size - included[i])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        maint = collateral / np.array(arrays.total_financing, dtype=np.float64) * 100.0
+    return {"collateral": collateral, "included": included, "missing": missing, "maint": maint}
+
+def write_day_arrays(path: str, arrays: DayArrays, fin: np.ndarray, fin_mask: np.ndarray, close: np.ndarray) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(
+            f,
+            codes=np.array(arrays.codes, dtype=str),
+            dates=np.array(arrays.dates, dtype=str),
+            total_financing_amount_twd=np.array(arrays.total_financing, dtype=np.int64),
+            fin_conf=np.array(arrays.fin_conf, dtype=bool),
+            fin_shares=fin,
+            fin_mask=fin_mask,
+            close=close,
+        )
+    os.replace(tmp, path)
+
+def run_date_range(args: argparse.Namespace, latest: Dict[str, Any], gen_utc: str) -> List[str]:
+    """
+    Fetch every weekday in --date-range on a worker pool, then compute all days at once.
+    Non-trading days (TWSE "no data" page) are skipped. Days that fail for any other reason
+    (HTTP / timeout / parse) are retried once; the ones still failing are all listed in the notes and
+    returned (the caller exits non-zero). latest gets the newest computed day.
+    """
+    start, end = parse_date_range(args.date_range)
+    days = iter_weekdays(start, end)
+    today = datetime.now(tz=ZoneInfo(args.tz)).date()
+    latest["params"]["date_range"] = f"{start}:{end}"
+    latest["params"]["jobs"] = int(args.jobs)
+
+    with ThreadPoolExecutor(max_workers=max(1, int(args.jobs))) as pool:
+        results = {r["date"]: r for r in pool.map(lambda d: fetch_day_inputs(d, today), days)}
+    for ds in [d for d in days if not results[d]["ok"] and not results[d]["no_data"]]:
+        results[ds] = fetch_day_inputs(ds, today)
+
+    arrays = DayArrays()
+    no_data: List[str] = []
+    failed: List[str] = []
+    srcs: Dict[str, List[str]] = {}
+    for ds in days:  # chronological, whatever order the pool finished in
+        r = results[ds]
+        if r["ok"]:
+            arrays.add(r)
+            srcs[ds] = r["srcs"]
+        elif r["no_data"]:
+            no_data.append(ds)
+        else:
+            failed.append(f"{ds}:{r['error']}")
+    print(f"[INFO] date_range={start}:{end} weekdays={len(days)} days_ok={len(arrays.dates)} "
+          f"no_data={len(no_data)} failed={len(failed)} codes={len(arrays.code_idx)}")
+    latest["notes"].append(f"date_range_days_ok={len(arrays.dates)} no_data={len(no_data)} failed={len(failed)}")
+    if no_data:
+        latest["notes"].append("no_data:" + ",".join(no_data))
+    latest["notes"].extend(f"failed:{x}" for x in failed)
+    if failed:
+        print(f"[ERROR] {len(failed)} weekday(s) failed (not a TWSE no-data day):")
+        for x in failed:
+            print(f"  {x}")
+
+    if not arrays.dates:
+        if failed:
+            raise RuntimeError(f"date_range_all_days_failed:{len(failed)}")
+        raise RuntimeError("date_range_no_trading_days_parsed")
+
+    fin, fin_mask, close = arrays.dense()
+    col_mask = None
+    if args.exclude_non4:
+        col_mask = np.array([re.fullmatch(r"\d{4}", c) is not None for c in arrays.codes], dtype=bool)
+    res = compute_ratio_arrays(arrays, close, col_mask)
+
+    if args.arrays_out.strip():
+        write_day_arrays(args.arrays_out.strip(), arrays, fin, fin_mask, close)
+        latest["notes"].append(f"arrays_out={args.arrays_out.strip()}")
+
+    hist_items: List[Dict[str, Any]] = []
+    last_i: Optional[int] = None
+    for i, ds in enumerate(arrays.dates):
+        if int(res["included"][i]) == 0:
+            failed.append(f"{ds}:all_prices_missing_after_merge")
+            latest["notes"].append(f"failed:{ds}:all_prices_missing_after_merge")
+            continue
+        conf = arrays.fin_conf[i]
+        hist_items.append({
+            "data_date": f"{ds[0:4]}-{ds[4:6]}-{ds[6:8]}",
+            "maint_ratio_pct": round(float(res["maint"][i]), 6),
+            "total_financing_amount_twd": int(arrays.total_financing[i]),
+            "total_collateral_value_twd": int(round(float(res["collateral"][i]))),
+            "included_count": int(res["included"][i]),
+            "missing_price_count": int(res["missing"][i]),
+            "confidence": "OK" if conf else "DOWNGRADED",
+            "dq_reason": "" if conf else "fin_col_pick_low_confidence",
+            "generated_at_utc": gen_utc,
+        })
+        last_i = i
+    if last_i is None:
+        raise RuntimeError("all_prices_missing_after_merge")
+
+    newest = hist_items[-1]
+    latest["fetch_status"] = "OK"
+    latest["params"]["date"] = arrays.dates[last_i]
+    for k in ("confidence", "dq_reason", "data_date", "total_financing_amount_twd", "total_collateral_value_twd",
+              "maint_ratio_pct", "included_count", "missing_price_count"):
+        latest[k] = newest[k]
+    latest["notes"].extend(srcs[arrays.dates[last_i]])
+
+    if args.history.strip():
+        upsert_history_items(args.history.strip(), hist_items, max_items=int(args.max_history))
+    if failed:
+        latest["fetch_status"] = "DOWNGRADED"
+        latest["error"] = f"date_range_failed_days:{len(failed)}"
+    return failed
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--date", help="YYYYMMDD (preferred). If omitted, try --date-from.", default="")
@@ -507,6 +790,11 @@ def main() -> int:
     ap.add_argument("--tz", default="Asia/Taipei")
     ap.add_argument("--exclude-non4", action="store_true", help="Exclude codes not 4 digits (roughly filter ETFs/others)")
     ap.add_argument("--max-history", type=int, default=1200)
+    ap.add_argument("--date-range", default="",
+                    help="Backfill mode: START:END (YYYYMMDD or YYYY-MM-DD); every trading day -> --history, newest -> --out")
+    ap.add_argument("--jobs", type=int, default=4, help="--date-range: concurrent day fetches")
+    ap.add_argument("--arrays-out", default="",
+                    help="--date-range: optional .npz of per-day fin_shares/close arrays on the shared code index")
     args = ap.parse_args()
 
     tz = ZoneInfo(args.tz)
@@ -519,7 +807,7 @@ def main() -> int:
 
     latest: Dict[str, Any] = {
         "schema_version": SCHEMA_LATEST,
-        "script_fingerprint": "fetch_twse_market_maint_ratio_py@v6_guard_short_table_grouping",
+        "script_fingerprint": "fetch_twse_market_maint_ratio_py@v8_date_range_arrays",
         "generated_at_utc": gen_utc,
         "generated_at_local": gen_local,
         "timezone": args.tz,
@@ -538,6 +826,21 @@ def main() -> int:
         "error": None,
     }
 
+    if args.date_range.strip():
+        # a backfill must not leave silent gaps: any failed (non no-data) weekday -> exit 1
+        rc = 0
+        try:
+            if run_date_range(args, latest, gen_utc):
+                rc = 1
+        except Exception as e:
+            latest["error"] = str(e)
+            latest["dq_reason"] = "fetch_or_parse_failed"
+            rc = 1
+        latest["http_cache"] = get_client().audit()
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(latest, f, ensure_ascii=False, indent=2)
+        return rc
+
     margn: Optional[Dict[str, Any]] = None
     mi_index: Optional[Dict[str, Any]] = None
 
@@ -545,56 +848,53 @@ def main() -> int:
         if not date_yyyymmdd:
             raise ValueError("date_missing_or_invalid")
 
-        with requests.Session() as s:
-            # 1) MI_MARGN
-            margn = request_json(
-                s,
-                TWSE_MI_MARGN,
-                params={"response": "json", "date": date_yyyymmdd, "selectType": "ALL"},
-                referer="https://www.twse.com.tw/zh/trading/margin/mi-margn.html",
-            )
-            _stat_guard(margn, "MI_MARGN")
-
-            total_amt_twd, total_src = extract_total_financing_amount_twd(margn)
-            if total_amt_twd is None:
-                raise RuntimeError(f"total_financing_amount_not_found:{total_src}")
-
-            fin_shares, fin_src, fin_conf = extract_financing_shares_by_code(margn, latest["notes"])
-            if not fin_shares:
-                raise RuntimeError(f"financing_shares_not_found:{fin_src}")
-
-            if args.exclude_non4:
-                fin_shares = {k: v for k, v in fin_shares.items() if re.fullmatch(r"\d{4}", k)}
-
-            # 2) MI_INDEX
-            mi_index = request_json(
-                s,
-                TWSE_MI_INDEX,
-                params={"response": "json", "date": date_yyyymmdd, "type": "ALLBUT0999"},
-                referer="https://www.twse.com.tw/zh/trading/historical/mi-index.html",
-            )
-            _stat_guard(mi_index, "MI_INDEX")
-
-            close_by_code, px_src = extract_close_by_code(mi_index, latest["notes"])
-            if not close_by_code:
-                raise RuntimeError(f"close_prices_not_found:{px_src}")
-
-            # 3) Merge + compute
-            total_collateral = 0.0
-            missing_px = 0
-            included = 0
-            for code, shares in fin_shares.items():
-                px = close_by_code.get(code)
-                if px is None:
-                    missing_px += 1
-                    continue
-                total_collateral += float(shares) * float(px) * 1000.0
-                included += 1
-
-            if included == 0:
-                raise RuntimeError("all_prices_missing_after_merge")
-
-            maint = (total_collateral / float(total_amt_twd)) * 100.0
+        # 1) MI_MARGN
+        margn = request_json(
+            TWSE_MI_MARGN,
+            params={"response": "json", "date": date_yyyymmdd, "selectType": "ALL"},
+            referer="https://www.twse.com.tw/zh/trading/margin/mi-margn.html",
+        )
+        _stat_guard(margn, "MI_MARGN")
+
+        total_amt_twd, total_src = extract_total_financing_amount_twd(margn)
+        if total_amt_twd is None:
+            raise RuntimeError(f"total_financing_amount_not_found:{total_src}")
+
+        fin_shares, fin_src, fin_conf = extract_financing_shares_by_code(margn, latest["notes"])
+        if not fin_shares:
+            raise RuntimeError(f"financing_shares_not_found:{fin_src}")
+
+        if args.exclude_non4:
+            fin_shares = {k: v for k, v in fin_shares.items() if re.fullmatch(r"\d{4}", k)}
+
+        # 2) MI_INDEX
+        mi_index = request_json(
+            TWSE_MI_INDEX,
+            params={"response": "json", "date": date_yyyymmdd, "type": "ALLBUT0999"},
+            referer="https://www.twse.com.tw/zh/trading/historical/mi-index.html",
+        )
+        _stat_guard(mi_index, "MI_INDEX")
+
+        close_by_code, px_src = extract_close_by_code(mi_index, latest["notes"])
+        if not close_by_code:
+            raise RuntimeError(f"close_prices_not_found:{px_src}")
+
+        # 3) Merge + compute
+        total_collateral = 0.0
+        missing_px = 0
+        included = 0
+        for code, shares in fin_shares.items():
+            px = close_by_code.get(code)
+            if px is None:
+                missing_px += 1
+                continue
+            total_collateral += float(shares) * float(px) * 1000.0
+            included += 1
+
+        if included == 0:
+            raise RuntimeError("all_prices_missing_after_merge")
+
+        maint = (total_collateral / float(total_amt_twd)) * 100.0
 
         latest["fetch_status"] = "OK"
         # confidence downgraded if financing column pick relied on weak fallback
@@ -641,6 +941,7 @@ def main() -> int:
         except Exception:
             pass
 
+    latest["http_cache"] = get_client().audit()
     with open(args.out, "w", encoding="utf-8") as f:
         json.dump(latest, f, ensure_ascii=False, indent=2)
 
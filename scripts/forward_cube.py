@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/forward_cube.py
+
+Precomputed forward-outcome cube for one price file (e.g. tw0050_bb_cache/data.csv):
+
+    date x horizon x {fwd_ret, fwd_mdd, fwd_runup, contaminated}
+
+Definitions (entry index t, horizon h, prices already sorted by date, NaN prices dropped):
+- fwd_ret[t, h]      = prices[t+h] / prices[t] - 1                       (NaN if t+h > n-1)
+- fwd_mdd[t, h]      = min(prices[t+1 .. t+h]) / prices[t] - 1           (forward_extrema kernel)
+- fwd_runup[t, h]    = max(prices[t+1 .. t+h]) / prices[t] - 1
+- contaminated[t, h] = a ratio break j exists with t < j <= t+h
+- is_break[j]        = shared ratio rule in price_breaks.py (>= hi or <= lo, both prices > 0)
+
+fwd_ret / is_break / contaminated match build_tw0050_forward_return_conditional.py
+(_forward_return / _detect_break_positions / _contam_mask_from_breaks) bit-for-bit;
+fwd_mdd matches tw0050_bb60_k2_forwardmdd20.compute_forward_mdd (raw, nan_policy="omit").
+
+Storage: one compressed .npz next to the price csv (columnar: 1-D date/price/is_break arrays,
+2-D n x H arrays per field, JSON meta string). No pickle.
+
+Incremental update:
+- same params + stored dates/prices are an exact prefix of the new series
+  -> only rows t >= n_old - max(h) are recomputed (older rows have complete windows and
+     cannot see new breaks), the rest is copied from the stored cube.
+- anything else (history rewritten, e.g. adjclose re-based after a dividend; new horizon;
+  different break thresholds; unreadable file or older CUBE_FORMAT, e.g. a v1 cube built under
+  the old break rule) -> full rebuild.
+
+Usage:
+    python scripts/forward_cube.py --cache_dir tw0050_bb_cache --price_csv data.csv
+
+    from forward_cube import update_cube, cube_column
+    cube, info = update_cube(path, dates, prices, [10, 20], hi=1.8, lo=0.5555555556)
+    ret20 = cube_column(cube, "fwd_ret", 20)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from forward_extrema import forward_mdd_runup
+from price_breaks import contamination_mask, detect_break_flags
+
+# v2: is_break requires both prices > 0 (price_breaks.py); v1 cubes are rebuilt, not extended
+CUBE_FORMAT = "fwd_cube_v2"
+FIELDS = ("fwd_ret", "fwd_mdd", "fwd_runup", "contaminated")
+DEFAULT_HORIZONS = (5, 10, 20, 60)
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _forward_ret(p: np.ndarray, h: int) -> np.ndarray:
+    n = p.shape[0]
+    out = np.full(n, np.nan, dtype=float)
+    if h < n:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[: n - h] = p[h:] / p[: n - h] - 1.0
+    return out
+
+
+def compute_cube_rows(
+    prices: np.ndarray,
+    horizons: Sequence[int],
+    hi: float,
+    lo: float,
+    start: int = 0,
+) -> Dict[str, np.ndarray]:
+    """
+    Cube rows [start, n). Row values depend only on prices[t .. t+max(h)], so computing on the
+    tail slice is exact. is_break is always returned for the full series (cheap, O(n)).
+    """
+    p = np.asarray(prices, dtype=float)
+    n = int(p.shape[0])
+    hs = [int(h) for h in horizons]
+    tail = p[start:]
+    m = int(tail.shape[0])
+
+    is_break = detect_break_flags(p, hi, lo)
+    break_pos = np.where(is_break)[0]
+    ext = forward_mdd_runup(tail, hs, nan_policy="omit")
+
+    out: Dict[str, np.ndarray] = {
+        "fwd_ret": np.full((m, len(hs)), np.nan, dtype=float),
+        "fwd_mdd": np.full((m, len(hs)), np.nan, dtype=float),
+        "fwd_runup": np.full((m, len(hs)), np.nan, dtype=float),
+        "contaminated": np.zeros((m, len(hs)), dtype=bool),
+    }
+    for k, h in enumerate(hs):
+        out["fwd_ret"][:, k] = _forward_ret(tail, h)
+        out["fwd_mdd"][:, k] = ext[h]["mdd"]
+        out["fwd_runup"][:, k] = ext[h]["runup"]
+        out["contaminated"][:, k] = contamination_mask(n, break_pos, horizon=h)[start:]
+    out["is_break"] = is_break
+    return out
+
+
+def load_cube(path: str) -> Optional[Dict[str, Any]]:
+    """Stored cube as {dates, prices, is_break, horizons, fields..., meta}; None if missing/unreadable."""
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            cube: Dict[str, Any] = {k: z[k] for k in z.files}
+        cube["meta"] = json.loads(str(cube["meta"]))
+        if cube["meta"].get("format") != CUBE_FORMAT:
+            return None
+        n = int(cube["prices"].shape[0])
+        for f in FIELDS:
+            if cube[f].shape != (n, int(cube["horizons"].shape[0])):
+                return None
+        return cube
+    except Exception:
+        return None
+
+
+def save_cube(path: str, cube: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    arrays = {k: v for k, v in cube.items() if k != "meta"}
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(cube["meta"], ensure_ascii=False, sort_keys=True)), **arrays)
+    os.replace(tmp, path)
+
+
+def cube_column(cube: Dict[str, Any], field: str, horizon: int) -> np.ndarray:
+    """One (field, horizon) column aligned to cube['dates']; KeyError if the horizon is not stored."""
+    hs = [int(h) for h in cube["horizons"].tolist()]
+    if int(horizon) not in hs:
+        raise KeyError(f"horizon {horizon} not in cube horizons {hs}")
+    return cube[field][:, hs.index(int(horizon))]
+
+
+def _full_cube(dates: np.ndarray, prices: np.ndarray, hs: List[int], hi: float, lo: float) -> Dict[str, Any]:
+    rows = compute_cube_rows(prices, hs, hi, lo, start=0)
+    cube: Dict[str, Any] = {
+        "dates": dates,
+        "prices": prices,
+        "horizons": np.asarray(hs, dtype=np.int64),
+    }
+    cube.update(rows)
+    return cube
+
+
+def update_cube(
+    path: str,
+    dates: Sequence[str],
+    prices: Sequence[float],
+    horizons: Sequence[int],
+    hi: float,
+    lo: float,
+    save: bool = True,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load the cube at path, bring it up to date with (dates, prices) and write it back.
+    Stored horizons are kept (the requested ones are added). Returns (cube, info) where
+    info["mode"] is "reuse" | "incremental" | "full" with the reason and rows recomputed.
+    """
+    d = np.asarray([str(x) for x in dates], dtype=str)
+    p = np.asarray(prices, dtype=float)
+    n = int(p.shape[0])
+    if d.shape[0] != n:
+        raise ValueError("dates and prices must have the same length")
+    req = sorted({int(h) for h in horizons})
+    if not req or req[0] < 1:
+        raise ValueError("horizons must be >= 1")
+
+    old = load_cube(path)
+    mode = "full"
+    reason = "no_cube"
+    hs = req
+    cube: Optional[Dict[str, Any]] = None
+    rows_recomputed = n
+
+    if old is not None:
+        om = old["meta"]
+        old_hs = [int(h) for h in old["horizons"].tolist()]
+        hs = sorted(set(old_hs) | set(req))
+        n_old = int(old["prices"].shape[0])
+        if hs != old_hs:
+            reason = "horizons_changed"
+        elif float(om.get("break_ratio_hi", np.nan)) != float(hi) or float(om.get("break_ratio_lo", np.nan)) != float(lo):
+            reason = "break_params_changed"
+        elif n_old > n or not (
+            np.array_equal(old["dates"], d[:n_old]) and np.array_equal(old["prices"], p[:n_old], equal_nan=True)
+        ):
+            reason = "history_rewritten"
+        elif n_old == n:
+            mode, reason, cube, rows_recomputed = "reuse", "unchanged", old, 0
+        else:
+            start = max(0, n_old - hs[-1])
+            rows = compute_cube_rows(p, hs, hi, lo, start=start)
+            cube = {"dates": d, "prices": p, "horizons": old["horizons"], "is_break": rows["is_break"]}
+            for f in FIELDS:
+                cube[f] = np.concatenate([old[f][:start], rows[f]], axis=0)
+            mode, reason, rows_recomputed = "incremental", "appended_rows", n - start
+
+    if cube is None:
+        cube = _full_cube(d, p, hs, hi, lo)
+
+    if mode != "reuse":
+        cube["meta"] = {
+            "format": CUBE_FORMAT,
+            "updated_at_utc": utc_now_iso(),
+            "rows": n,
+            "first_date": str(d[0]) if n else None,
+            "last_date": str(d[-1]) if n else None,
+            "horizons": hs,
+            "fields": list(FIELDS),
+            "break_ratio_hi": float(hi),
+            "break_ratio_lo": float(lo),
+            "definitions": {
+                "fwd_ret": "prices[t+h]/prices[t]-1",
+                "fwd_mdd": "min(prices[t+1..t+h])/prices[t]-1 (nan omitted)",
+                "fwd_runup": "max(prices[t+1..t+h])/prices[t]-1 (nan omitted)",
+                "contaminated": "break j with t < j <= t+h",
+                "is_break": "prices[j]/prices[j-1] >= hi or <= lo (both prices > 0)",
+            },
+            "last_update": {"mode": mode, "reason": reason, "rows_recomputed": int(rows_recomputed)},
+        }
+        if save and path:
+            save_cube(path, cube)
+
+    info = {
+        "path": path,
+        "format": CUBE_FORMAT,
+        "mode": mode,
+        "reason": reason,
+        "rows": n,
+        "rows_recomputed": int(rows_recomputed),
+        "horizons": hs,
+    }
+    return cube, info
+
+
+def main() -> int:
+    import pandas as pd
+
+    ap = argparse.ArgumentParser(description="Build/update the forward-outcome cube next to a price csv.")
+    ap.add_argument("--cache_dir", default="tw0050_bb_cache")
+    ap.add_argument("--price_csv", default="data.csv")
+    ap.add_argument("--price_col", default="adjclose")
+    ap.add_argument("--out", default="data.fwd_cube.npz", help="cube file name inside cache_dir")
+    ap.add_argument("--horizons", default=",".join(str(h) for h in DEFAULT_HORIZONS))
+    ap.add_argument("--break_ratio_hi", type=float, default=1.8)
+    ap.add_argument("--break_ratio_lo", type=float, default=0.5555555556)
+    args = ap.parse_args()
+
+    price_path = os.path.join(args.cache_dir, args.price_csv)
+    if not os.path.isfile(price_path):
+        raise SystemExit(f"ERROR: missing price csv: {price_path}")
+
+    df = pd.read_csv(price_path)
+    if "date" not in df.columns or args.price_col not in df.columns:
+        raise SystemExit(f"ERROR: price csv needs columns date,{args.price_col}")
+    df["date_ts"] = pd.to_datetime(df["date"], errors="coerce")
+    df["price"] = pd.to_numeric(df[args.price_col], errors="coerce")
+    df = df.dropna(subset=["date_ts", "price"]).sort_values("date_ts").reset_index(drop=True)
+    dates = df["date_ts"].dt.date.astype(str).to_numpy()
+
+    horizons = [int(x) for x in str(args.horizons).split(",") if x.strip()]
+    out_path = os.path.join(args.cache_dir, args.out)
+    _, info = update_cube(
+        out_path,
+        dates,
+        df["price"].to_numpy(dtype=float),
+        horizons,
+        hi=float(args.break_ratio_hi),
+        lo=float(args.break_ratio_lo),
+    )
+    print(f"OK: {out_path} mode={info['mode']} reason={info['reason']} rows={info['rows']} "
+          f"recomputed={info['rows_recomputed']} horizons={info['horizons']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/forward_extrema.py
+
+Shared forward-window extrema kernel (numpy) for the forward-MDD / forward-runup monitors:
+- scripts/tw0050_bb60_k2_forwardmdd20.py  (compute_forward_mdd, break-clean masks)
+- scripts/vt_bb60_forwardmdd20.py         (compute_forward_mdd)
+- scripts/nasdaq_bb_len60_k2_logclose.py  (forward_mdd / forward_max_runup per event)
+
+Window for entry t and horizon h:
+- include_entry=False : prices[t+1 .. t+h]   (0050 / VT definition)
+- include_entry=True  : prices[t   .. t+h]   (Nasdaq definition)
+- partial_tail=False  : t+h > n-1 -> NaN      (0050 / VT)
+- partial_tail=True   : window truncated at n-1 (Nasdaq: j = min(i+h, n-1))
+
+Algorithm:
+- One sparse table (doubling min/max) is built per price array up to the largest horizon:
+  O(n log H) build, then O(n) vectorized per horizon (two overlapping power-of-two blocks).
+  All horizons share the same table, so adding horizons is nearly free.
+- nan_policy="propagate" uses np.minimum/np.maximum (a NaN in the window -> NaN, like np.min);
+  nan_policy="omit" uses np.fmin/np.fmax (NaN ignored, like np.nanmin; all-NaN -> NaN).
+
+Results are bit-identical to the per-index loops: min(prices[w]) / base - 1 equals
+min(prices[w] / base - 1) because IEEE division/subtraction are monotone for base > 0.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+MaskArg = Union[None, np.ndarray, Mapping[int, np.ndarray]]
+
+
+class _SparseTable:
+    """Doubling min/max table: level k holds op over prices[i : i + 2**k]."""
+
+    def __init__(self, prices: np.ndarray, max_len: int, nan_policy: str = "propagate") -> None:
+        if nan_policy not in ("propagate", "omit"):
+            raise ValueError("nan_policy must be 'propagate' or 'omit'")
+        self.n = int(prices.shape[0])
+        self._fmin = np.minimum if nan_policy == "propagate" else np.fmin
+        self._fmax = np.maximum if nan_policy == "propagate" else np.fmax
+        self.mins = [prices]
+        self.maxs = [prices]
+        k = 1
+        while (1 << k) <= max(1, max_len) and (1 << k) <= self.n:
+            half = 1 << (k - 1)
+            pm, px = self.mins[-1], self.maxs[-1]
+            self.mins.append(self._fmin(pm[:-half], pm[half:]))
+            self.maxs.append(self._fmax(px[:-half], px[half:]))
+            k += 1
+
+    def query(self, starts: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Min/max over prices[s : s+L] for each (s, L); L must be >= 1."""
+        out_min = np.empty(starts.shape[0], dtype=float)
+        out_max = np.empty(starts.shape[0], dtype=float)
+        if starts.shape[0] == 0:
+            return out_min, out_max
+        ks = np.floor(np.log2(lengths)).astype(np.int64)
+        # guard float log2 rounding at exact powers of two
+        ks = np.where((1 << (ks + 1)) <= lengths, ks + 1, ks)
+        ks = np.where((1 << ks) > lengths, ks - 1, ks)
+        for k in np.unique(ks):
+            sel = ks == k
+            s = starts[sel]
+            e = s + lengths[sel] - (1 << int(k))
+            lm, lx = self.mins[int(k)], self.maxs[int(k)]
+            out_min[sel] = self._fmin(lm[s], lm[e])
+            out_max[sel] = self._fmax(lx[s], lx[e])
+        return out_min, out_max
+
+
+def forward_window_extrema(
+    prices: np.ndarray,
+    horizons: Iterable[int],
+    include_entry: bool = False,
+    partial_tail: bool = False,
+    nan_policy: str = "propagate",
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    For each horizon h: (future_min, future_max) arrays of length n aligned to the entry index.
+    Entries without a (full, unless partial_tail) window are NaN.
+    """
+    p = np.asarray(prices, dtype=float)
+    n = int(p.shape[0])
+    hs = sorted({int(h) for h in horizons})
+    if any(h < 0 for h in hs):
+        raise ValueError("horizons must be >= 0")
+    out: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    if n == 0 or not hs:
+        return {h: (np.full(n, np.nan), np.full(n, np.nan)) for h in hs}
+
+    off = 0 if include_entry else 1
+    table = _SparseTable(p, max_len=hs[-1] + 1 - off, nan_policy=nan_policy)
+    t = np.arange(n, dtype=np.int64)
+    for h in hs:
+        fmin = np.full(n, np.nan, dtype=float)
+        fmax = np.full(n, np.nan, dtype=float)
+        start = t + off
+        end = t + h if not partial_tail else np.minimum(t + h, n - 1)
+        ok = (start <= end) & (end <= n - 1)
+        if ok.any():
+            qmin, qmax = table.query(start[ok], end[ok] - start[ok] + 1)
+            fmin[ok] = qmin
+            fmax[ok] = qmax
+        out[h] = (fmin, fmax)
+    return out
+
+
+def forward_mdd_runup(
+    prices: np.ndarray,
+    horizons: Sequence[int],
+    valid_entry_mask: MaskArg = None,
+    include_entry: bool = False,
+    partial_tail: bool = False,
+    nan_policy: str = "propagate",
+    require_positive_base: bool = True,
+    require_positive_extreme: bool = False,
+) -> Dict[int, Dict[str, np.ndarray]]:
+    """
+    Forward max drawdown / max run-up for many horizons in one pass:
+      mdd[h][t]   = min(window) / prices[t] - 1
+      runup[h][t] = max(window) / prices[t] - 1
+
+    valid_entry_mask: None, one bool array for all horizons, or {h: bool array} (horizon-aware
+      break-contamination masks). Entries with mask False are NaN; the price series is untouched.
+    require_positive_base: base must be finite and > 0 (0050 / VT rule).
+    require_positive_extreme: window min/max must be finite and > 0 (VT rule for future_min).
+    """
+    p = np.asarray(prices, dtype=float)
+    n = int(p.shape[0])
+    ext = forward_window_extrema(p, horizons, include_entry=include_entry, partial_tail=partial_tail, nan_policy=nan_policy)
+
+    base_ok = np.ones(n, dtype=bool)
+    if require_positive_base:
+        base_ok = np.isfinite(p) & (p > 0)
+
+    out: Dict[int, Dict[str, np.ndarray]] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for h, (fmin, fmax) in ext.items():
+            if valid_entry_mask is None:
+                m = base_ok
+            elif isinstance(valid_entry_mask, Mapping):
+                mk = valid_entry_mask.get(h)
+                m = base_ok if mk is None else (base_ok & np.asarray(mk, dtype=bool))
+            else:
+                m = base_ok & np.asarray(valid_entry_mask, dtype=bool)
+
+            m_mdd = m
+            m_run = m
+            if require_positive_extreme:
+                m_mdd = m & np.isfinite(fmin) & (fmin > 0)
+                m_run = m & np.isfinite(fmax) & (fmax > 0)
+
+            mdd = np.full(n, np.nan, dtype=float)
+            run = np.full(n, np.nan, dtype=float)
+            mdd[m_mdd] = fmin[m_mdd] / p[m_mdd] - 1.0
+            run[m_run] = fmax[m_run] / p[m_run] - 1.0
+            out[h] = {"mdd": mdd, "runup": run}
+    return out
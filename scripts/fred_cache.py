@@ -9,6 +9,10 @@ Outputs (under ./cache):
 - latest.json           : array of records (same as latest.csv)
 - history.json          : rolling store, key=(series_id, data_date); same data_date reruns overwrite by as_of_ts
                            keep last CAP_PER_SERIES per series; JSON array (record-per-line) for citation
+- history_series/      : partitioned store of history.json; one <series_id>.jsonl log per series + index.json.
+                          Upserts append only changed rows to touched series (last line per data_date wins);
+                          a series file is compacted only when its log exceeds CAP_PER_SERIES + slack.
+                          history.json is still exported every run as the compatibility view.
 - history_lite.json     : per series keep last BACKFILL_TARGET_VALID records; JSON array (record-per-line)
 - stats_latest.json     : precomputed metrics per series (ma/dev/z/p + ret1), to reduce prompt loading
                           NOTE: stats_latest.json includes stats_policy.script_version for version governance
@@ -23,6 +27,8 @@ Env:
 - GITHUB_REPOSITORY (optional)
 - DATA_SHA (optional) commit sha that contains the data files (preferred for pinned)
 - GITHUB_SHA fallback
+- FRED_FETCH_WORKERS (optional, default 4) concurrent fetch workers; 1 = strictly serial
+- FRED_MIN_INTERVAL_MS (optional, default 500) shared per-host min spacing between request starts
 
 Behavior notes:
 - attempted_success avoids repeatedly doing HEAVY self-heal (to reach >=252 valid points).
@@ -37,11 +43,14 @@ import math
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta, date as date_cls
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
 
 import requests
 
@@ -92,6 +101,9 @@ RETRY_STATUS = {429, 500, 502, 503, 504}
 # history policy
 # -------------------------
 CAP_PER_SERIES = 400  # keep last N records PER series (records keyed by (series_id, data_date))
+HISTORY_SERIES_DIRNAME = "history_series"
+HISTORY_SERIES_INDEX = "index.json"
+HISTORY_SERIES_FORMAT = "jsonl_log_per_series_v1"
 
 # -------------------------
 # backfill policy (heavy self-heal)
@@ -129,11 +141,29 @@ def _env_bool(name: str, default: bool) -> bool:
     return default
 
 
+# physical log lines allowed beyond CAP_PER_SERIES before a series file is compacted
+PARTITION_COMPACT_SLACK = _env_int("HISTORY_PARTITION_COMPACT_SLACK", 120, min_v=0, max_v=5000)
+
 RECENT_HEAL_ENABLE = _env_bool("RECENT_HEAL_ENABLE", True)
 RECENT_HEAL_LIMIT = _env_int("RECENT_HEAL_LIMIT", 90, min_v=2, max_v=500)
 RECENT_HEAL_TAIL_POINTS = _env_int("RECENT_HEAL_TAIL_POINTS", 40, min_v=5, max_v=200)
 RECENT_HEAL_MAX_CALLS_PER_RUN = _env_int("RECENT_HEAL_MAX_CALLS_PER_RUN", 6, min_v=0, max_v=50)
 
+# Incremental heal: ask FRED only for observations from (first suspicious gap or newest cached
+# data_date) minus an overlap window (catches revisions). RECENT_HEAL_LIMIT stays as the ceiling.
+# Heavy backfill is unaffected: it only runs when _count_valid_per_series is under target.
+INCREMENTAL_ENABLE = _env_bool("FRED_INCREMENTAL_ENABLE", True)
+INCREMENTAL_OVERLAP_DAYS = _env_int("FRED_INCREMENTAL_OVERLAP_DAYS", 10, min_v=0, max_v=365)
+
+# -------------------------
+# concurrency policy
+# -------------------------
+# Workers only overlap network waits; every decision (heal budget, backfill trigger) and every
+# dq/backfill_state write still happens in SERIES_IDS order on the main thread.
+FETCH_WORKERS = _env_int("FRED_FETCH_WORKERS", 4, min_v=1, max_v=16)
+# FRED allows ~120 req/min per key; 500ms spacing keeps a full pool under that ceiling.
+MIN_INTERVAL_MS = _env_int("FRED_MIN_INTERVAL_MS", 500, min_v=0, max_v=10000)
+
 # -------------------------
 # stats policy (version-governed)
 # -------------------------
@@ -184,7 +214,7 @@ def _now_utc_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def _safe_source_url(series_id: str, limit_n: int) -> str:
+def _safe_source_url(series_id: str, limit_n: int, observation_start: Optional[str] = None) -> str:
     """DO NOT include api_key in source_url."""
     params = {
         "series_id": series_id,
@@ -192,9 +222,11 @@ def _safe_source_url(series_id: str, limit_n: int) -> str:
         "sort_order": "desc",
         "limit": int(limit_n),
     }
-    qs = "&".join(
-        [f"{k}={requests.utils.quote(str(params[k]))}" for k in ["series_id", "file_type", "sort_order", "limit"]]
-    )
+    keys = ["series_id", "file_type", "sort_order", "limit"]
+    if observation_start:
+        params["observation_start"] = observation_start
+        keys.append("observation_start")
+    qs = "&".join([f"{k}={requests.utils.quote(str(params[k]))}" for k in keys])
     return f"{BASE_URL}?{qs}"
 
 
@@ -202,8 +234,8 @@ def _safe_source_url_latest(series_id: str) -> str:
     return _safe_source_url(series_id, 1)
 
 
-def _safe_source_url_backfill(series_id: str, limit_n: int) -> str:
-    return _safe_source_url(series_id, limit_n)
+def _safe_source_url_backfill(series_id: str, limit_n: int, observation_start: Optional[str] = None) -> str:
+    return _safe_source_url(series_id, limit_n, observation_start)
 
 
 def _redact_secrets(s: str) -> str:
@@ -216,6 +248,47 @@ def _redact_secrets(s: str) -> str:
     return s
 
 
+class _HostRateLimiter:
+    """
+    Shared per-host limiter: request starts to the same host are spaced >= min_interval apart.
+    Thread-safe; the sleep happens outside the lock so other hosts are never blocked.
+    """
+
+    def __init__(self, min_interval_secs: float) -> None:
+        self.min_interval_secs = max(0.0, float(min_interval_secs))
+        self._lock = threading.Lock()
+        self._next_at: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if self.min_interval_secs <= 0:
+            return
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_at.get(host, 0.0))
+            self._next_at[host] = slot + self.min_interval_secs
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_RATE_LIMITER = _HostRateLimiter(MIN_INTERVAL_MS / 1000.0)
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _map_ordered(fn: Callable[[_T], _R], items: List[_T], workers: int = FETCH_WORKERS) -> List[_R]:
+    """
+    Apply fn to items, possibly concurrently; results are returned in input order.
+    workers<=1 (or a single item) runs inline, identical to the historical serial loop.
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as ex:
+        return list(ex.map(fn, items))
+
+
 @dataclass
 class FetchResult:
     record: Dict[str, str]
@@ -234,6 +307,7 @@ def _http_get_with_retry(
     for i in range(MAX_ATTEMPTS):
         attempt = i + 1
         try:
+            _RATE_LIMITER.wait(url)
             r = session.get(url, params=params, timeout=TIMEOUT_SECS)
             last_status = r.status_code
 
@@ -377,23 +451,31 @@ def fetch_latest_obs(session: requests.Session, series_id: str, as_of_ts: str) -
 
 
 def fetch_recent_observations(
-    session: requests.Session, series_id: str, as_of_ts: str, limit_n: int, note_prefix: str = "backfill"
+    session: requests.Session,
+    series_id: str,
+    as_of_ts: str,
+    limit_n: int,
+    note_prefix: str = "backfill",
+    observation_start: Optional[str] = None,
 ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
     """
     Fetch a window of recent observations (desc), filter invalid values.
+    observation_start (YYYY-MM-DD) narrows the window server-side; limit_n remains the ceiling.
     Returns (rows, meta) where meta is audit info (attempts/status/err_code/count_raw/count_kept).
     """
     api_key = os.getenv("FRED_API_KEY", "")
+    src_url = _safe_source_url_backfill(series_id, limit_n, observation_start)
 
     meta: Dict[str, Any] = {
         "series_id": series_id,
         "limit": int(limit_n),
+        "observation_start": observation_start or "NA",
         "attempts": 0,
         "http_status": "NA",
         "err": "NA",
         "count_raw": 0,
         "count_kept": 0,
-        "source_url": _safe_source_url_backfill(series_id, limit_n),
+        "source_url": src_url,
     }
 
     if not api_key or len(api_key) < 10:
@@ -407,6 +489,8 @@ def fetch_recent_observations(
         "sort_order": "desc",
         "limit": int(limit_n),
     }
+    if observation_start:
+        params["observation_start"] = observation_start
 
     r, err_code, attempts, last_status = _http_get_with_retry(session, BASE_URL, params)
     meta["attempts"] = attempts
@@ -445,7 +529,7 @@ def fetch_recent_observations(
                 "series_id": series_id,
                 "data_date": dd,
                 "value": vv,
-                "source_url": _safe_source_url_backfill(series_id, limit_n),
+                "source_url": src_url,
                 "notes": note,
             }
         )
@@ -637,8 +721,16 @@ def _has_suspicious_gaps_daily(dates_asc: List[date_cls]) -> bool:
     - any other delta_days > 1 is suspicious
     Conservative: better to do a small repair call than leave holes.
     """
+    return _first_suspicious_gap_start(dates_asc) is not None
+
+
+def _first_suspicious_gap_start(dates_asc: List[date_cls]) -> Optional[date_cls]:
+    """
+    Same heuristic as _has_suspicious_gaps_daily, but returns the last valid date BEFORE the
+    earliest suspicious gap (None if no gap). Used to anchor incremental observation_start.
+    """
     if len(dates_asc) < 2:
-        return False
+        return None
 
     for i in range(1, len(dates_asc)):
         a = dates_asc[i - 1]
@@ -652,9 +744,47 @@ def _has_suspicious_gaps_daily(dates_asc: List[date_cls]) -> bool:
         if a.weekday() == 4 and b.weekday() == 0 and delta == 3:
             continue
 
-        return True
+        return a
 
-    return False
+    return None
+
+
+def _newest_valid_date_per_series(rows: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Single pass over history rows: series_id -> newest data_date with a numeric value.
+    """
+    newest: Dict[str, str] = {}
+    for r in rows:
+        if not isinstance(r, dict):
+            continue
+        sid = str(r.get("series_id", "")).strip()
+        dd = str(r.get("data_date", "")).strip()
+        if not sid or not _is_ymd(dd):
+            continue
+        if _to_float(str(r.get("value", "NA"))) is None:
+            continue
+        if dd > newest.get(sid, ""):
+            newest[sid] = dd
+    return newest
+
+
+def _incremental_observation_start(
+    newest_dd: Optional[str],
+    gap_start: Optional[date_cls],
+    overlap_days: int = INCREMENTAL_OVERLAP_DAYS,
+) -> Optional[str]:
+    """
+    observation_start = min(gap_start, newest_dd) - overlap_days.
+    Returns None (=> full RECENT_HEAL_LIMIT window) when incremental mode is off or no anchor exists.
+    """
+    if not INCREMENTAL_ENABLE:
+        return None
+    anchor = _ymd_to_date(newest_dd) if newest_dd else None
+    if gap_start is not None and (anchor is None or gap_start < anchor):
+        anchor = gap_start
+    if anchor is None:
+        return None
+    return (anchor - timedelta(days=int(overlap_days))).isoformat()
 
 
 def _upsert_history_per_series(
@@ -759,6 +889,176 @@ def _make_history_lite(rows: List[Dict[str, str]], per_series_keep: int) -> List
     return lite
 
 
+# -------------------------
+# partitioned history store (cache/history_series)
+# -------------------------
+def _series_file_name(series_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", series_id) + ".jsonl"
+
+
+def _record_line(r: Dict[str, Any]) -> str:
+    rec = {k: str(r.get(k, "NA")) for k in CSV_FIELDNAMES}
+    return json.dumps(rec, ensure_ascii=False, separators=(",", ":"))
+
+
+def _read_series_partition(path: Path, cap_per_series: int = CAP_PER_SERIES) -> Tuple[List[Dict[str, str]], int, str]:
+    """
+    Replay one series log. Later lines win per data_date; keep last `cap_per_series` by data_date.
+    Never raises. Returns (rows_asc, physical_line_count, status_code).
+    """
+    if not path.exists():
+        return [], 0, "ok:missing_file"
+    try:
+        text = path.read_text(encoding="utf-8")
+    except PermissionError:
+        return [], 0, "err:permission"
+    except OSError as e:
+        return [], 0, f"err:oserror:{type(e).__name__}"
+
+    by_date: Dict[str, Dict[str, str]] = {}
+    lines = 0
+    bad = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        lines += 1
+        try:
+            obj = json.loads(line)
+        except Exception:
+            bad += 1
+            continue
+        if not isinstance(obj, dict):
+            bad += 1
+            continue
+        dd = str(obj.get("data_date", "")).strip()
+        if not _is_ymd(dd):
+            continue
+        by_date[dd] = {k: str(obj.get(k, "NA")) for k in CSV_FIELDNAMES}
+
+    rows = [by_date[dd] for dd in sorted(by_date.keys())]
+    if len(rows) > cap_per_series:
+        rows = rows[-cap_per_series:]
+    return rows, lines, ("warn:bad_lines" if bad else "ok")
+
+
+def _load_history_partitioned(
+    root: Path, series_ids: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, str]], Dict[str, int], str]:
+    """
+    Load the partitioned store (optionally only `series_ids`). Never raises.
+    Returns (rows sorted by (series_id, data_date), physical_lines_by_sid, status_code).
+    """
+    index, st = _load_json_dict(root / HISTORY_SERIES_INDEX)
+    if st != "ok":
+        return [], {}, st
+    entries = index.get("series", {})
+    if not isinstance(entries, dict):
+        return [], {}, "warn:bad_index"
+
+    rows: List[Dict[str, str]] = []
+    lines_by_sid: Dict[str, int] = {}
+    status = "ok"
+    wanted = sorted(entries.keys()) if series_ids is None else [x for x in series_ids if x in entries]
+    for sid in wanted:
+        ent = entries.get(sid, {})
+        fname = ent.get("file") if isinstance(ent, dict) else None
+        srows, lines, sst = _read_series_partition(root / str(fname or _series_file_name(sid)))
+        if sst != "ok" and status == "ok":
+            status = f"{sst}:{sid}"
+        rows.extend(srows)
+        lines_by_sid[sid] = lines
+    return rows, lines_by_sid, status
+
+
+def _write_history_partitioned(
+    root: Path,
+    prev_rows: List[Dict[str, Any]],
+    merged_rows: List[Dict[str, str]],
+    prev_lines_by_sid: Dict[str, int],
+    cap_per_series: int = CAP_PER_SERIES,
+    compact_slack: int = PARTITION_COMPACT_SLACK,
+) -> Tuple[bool, str, Dict[str, str]]:
+    """
+    Persist `merged_rows` (already upserted + capped) into the per-series logs.
+    Per series:
+      - no changed rows                       -> untouched
+      - log stays <= cap + slack after append -> append changed rows only
+      - otherwise (or file missing)           -> rewrite compacted file (tmp + replace)
+    Never raises. Returns (ok, status_code, action_by_sid).
+    """
+    actions: Dict[str, str] = {}
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+
+        prev_by_sid: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for r in prev_rows:
+            prev_by_sid.setdefault(str(r.get("series_id", "")), {})[str(r.get("data_date", ""))] = r
+        new_by_sid: Dict[str, List[Dict[str, str]]] = {}
+        for r in merged_rows:
+            new_by_sid.setdefault(r.get("series_id", ""), []).append(r)
+
+        index_series: Dict[str, Any] = {}
+        for sid in sorted(new_by_sid.keys()):
+            arr = new_by_sid[sid]
+            path = root / _series_file_name(sid)
+            prev = prev_by_sid.get(sid, {})
+            lines = int(prev_lines_by_sid.get(sid, 0))
+
+            delta = [
+                r for r in arr
+                if _record_line(prev.get(r.get("data_date", ""), {})) != _record_line(r)
+            ]
+
+            if not path.exists() or lines <= 0:
+                action = "rewrite:new"
+            elif not delta:
+                action = "skip:unchanged"
+            elif lines + len(delta) > cap_per_series + compact_slack:
+                action = "rewrite:compact"
+            else:
+                action = "append"
+
+            if action.startswith("rewrite"):
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                with tmp.open("w", encoding="utf-8") as f:
+                    for r in arr:
+                        f.write(_record_line(r) + "\n")
+                os.replace(tmp, path)
+                lines = len(arr)
+            elif action == "append":
+                with path.open("a", encoding="utf-8") as f:
+                    for r in delta:
+                        f.write(_record_line(r) + "\n")
+                lines += len(delta)
+
+            actions[sid] = f"{action}:{len(delta)}"
+            index_series[sid] = {
+                "file": path.name,
+                "rows": len(arr),
+                "lines": lines,
+                "first_date": arr[0].get("data_date", "NA") if arr else "NA",
+                "last_date": arr[-1].get("data_date", "NA") if arr else "NA",
+            }
+
+        ok, st = _write_json_pretty(
+            root / HISTORY_SERIES_INDEX,
+            {
+                "format": HISTORY_SERIES_FORMAT,
+                "cap_per_series": cap_per_series,
+                "compact_slack": compact_slack,
+                "replay_rule": "later line wins per data_date; keep last cap_per_series by data_date",
+                "series": index_series,
+            },
+        )
+        return ok, st, actions
+    except PermissionError:
+        return False, "err:permission", actions
+    except OSError as e:
+        return False, f"err:oserror:{type(e).__name__}", actions
+    except Exception as e:
+        return False, f"err:write_exc:{type(e).__name__}", actions
+
+
 def _repo_slug() -> str:
     return os.getenv("GITHUB_REPOSITORY", "Joseph-Chou911/fred-cache")
 
@@ -840,10 +1140,47 @@ def _series_points_from_history_lite(
     return [(dd, float(v)) for dd, v in out]
 
 
+def _index_history_lite(lite_rows: List[Dict[str, Any]]) -> Dict[str, Tuple[List[str], List[float]]]:
+    """
+    One pass over lite rows -> columnar index: series_id -> (dates_asc, values_asc).
+    Same validation/dedup as _series_points_from_history_lite (last row wins per date),
+    but each row is parsed once instead of once per series.
+    """
+    by_sid: Dict[str, Dict[str, float]] = {}
+    for r in lite_rows:
+        if not isinstance(r, dict):
+            continue
+        dd = str(r.get("data_date", "")).strip()
+        if not _is_ymd(dd):
+            continue
+        vf = _to_float(str(r.get("value", "NA")))
+        if vf is None:
+            continue
+        sid = str(r.get("series_id", "")).strip()
+        by_sid.setdefault(sid, {})[dd] = vf
+
+    index: Dict[str, Tuple[List[str], List[float]]] = {}
+    for sid, m in by_sid.items():
+        dates = sorted(m.keys())
+        index[sid] = (dates, [float(m[dd]) for dd in dates])
+    return index
+
+
 def _compute_stats_for_series(
     series_id: str,
     points: List[Tuple[str, float]],
     source_url_latest: str,
+) -> Dict[str, Any]:
+    dates = [dd for dd, _v in points]
+    values = [v for _dd, v in points]
+    return _compute_stats_from_arrays(series_id, dates, values, source_url_latest)
+
+
+def _compute_stats_from_arrays(
+    series_id: str,
+    dates: List[str],
+    values: List[float],
+    source_url_latest: str,
 ) -> Dict[str, Any]:
     out: Dict[str, Any] = {
         "series_id": series_id,
@@ -870,23 +1207,22 @@ def _compute_stats_for_series(
         },
     }
 
-    if not points:
+    n = len(values)
+    if n == 0:
         return out
 
-    latest_dd, latest_v = points[-1]
+    latest_dd, latest_v = dates[-1], values[-1]
     out["latest"]["data_date"] = latest_dd
     out["latest"]["value"] = latest_v
 
-    if len(points) >= 2:
-        _prev_dd, prev_v = points[-2]
-        out["metrics"]["ret1"] = latest_v - prev_v
+    if n >= 2:
+        out["metrics"]["ret1"] = latest_v - values[-2]
 
-    if len(points) >= STATS_W60:
-        w60_pts = points[-STATS_W60:]
-        xs60 = [v for _dd, v in w60_pts]
+    if n >= STATS_W60:
+        xs60 = values[-STATS_W60:]
         out["windows"]["w60"]["n"] = len(xs60)
-        out["windows"]["w60"]["start_date"] = w60_pts[0][0]
-        out["windows"]["w60"]["end_date"] = w60_pts[-1][0]
+        out["windows"]["w60"]["start_date"] = dates[-STATS_W60]
+        out["windows"]["w60"]["end_date"] = latest_dd
 
         mu60 = _mean(xs60)
         sd60 = _std(xs60, ddof=STATS_STD_DDOF)
@@ -899,12 +1235,11 @@ def _compute_stats_for_series(
         p60 = _percentile_le(latest_v, xs60)
         out["metrics"]["p60"] = p60 if p60 is not None else "NA"
 
-    if len(points) >= STATS_W252:
-        w252_pts = points[-STATS_W252:]
-        xs252 = [v for _dd, v in w252_pts]
+    if n >= STATS_W252:
+        xs252 = values[-STATS_W252:]
         out["windows"]["w252"]["n"] = len(xs252)
-        out["windows"]["w252"]["start_date"] = w252_pts[0][0]
-        out["windows"]["w252"]["end_date"] = w252_pts[-1][0]
+        out["windows"]["w252"]["start_date"] = dates[-STATS_W252]
+        out["windows"]["w252"]["end_date"] = latest_dd
 
         mu252 = _mean(xs252)
         sd252 = _std(xs252, ddof=STATS_STD_DDOF)
@@ -921,11 +1256,12 @@ def _compute_stats_latest(
     as_of_ts: str,
     data_commit_sha: str,
 ) -> Dict[str, Any]:
+    index = _index_history_lite(lite_rows)
     series_out: Dict[str, Any] = {}
     for sid in SERIES_IDS:
-        pts = _series_points_from_history_lite(lite_rows, sid)
+        dates, values = index.get(sid, ([], []))
         src = _safe_source_url_latest(sid)
-        series_out[sid] = _compute_stats_for_series(sid, pts, source_url_latest=src)
+        series_out[sid] = _compute_stats_from_arrays(sid, dates, values, source_url_latest=src)
 
     return {
         "generated_at_utc": _now_utc_iso(),
@@ -969,6 +1305,8 @@ def main() -> int:
             "limit": RECENT_HEAL_LIMIT,
             "tail_points": RECENT_HEAL_TAIL_POINTS,
             "max_calls_per_run": RECENT_HEAL_MAX_CALLS_PER_RUN,
+            "incremental": INCREMENTAL_ENABLE,
+            "overlap_days": INCREMENTAL_OVERLAP_DAYS,
             "calls_used": 0,
             "attempted": {},
             "meta": {},
@@ -981,9 +1319,9 @@ def main() -> int:
         },
     }
 
-    # 1) Fetch latest (1 obs per series)
-    for sid in SERIES_IDS:
-        res = fetch_latest_obs(session, sid, as_of_ts)
+    # 1) Fetch latest (1 obs per series); concurrent fetch, ordered bookkeeping
+    latest_results = _map_ordered(lambda s: fetch_latest_obs(session, s, as_of_ts), SERIES_IDS)
+    for sid, res in zip(SERIES_IDS, latest_results):
         rec = {k: _redact_secrets(str(v)) for k, v in res.record.items()}
         rows.append(rec)
 
@@ -1008,6 +1346,7 @@ def main() -> int:
     latest_csv = CACHE_DIR / "latest.csv"
     latest_json = CACHE_DIR / "latest.json"
     history_json = CACHE_DIR / "history.json"
+    history_series_dir = CACHE_DIR / HISTORY_SERIES_DIRNAME
     history_lite_json = CACHE_DIR / "history_lite.json"
     stats_latest_json = CACHE_DIR / "stats_latest.json"
     history_snapshot = CACHE_DIR / "history.snapshot.json"
@@ -1033,11 +1372,18 @@ def main() -> int:
     if not ok:
         _warn(f"failed to write history.snapshot.json: {st}")
 
-    # 3) Load existing history
-    existing_hist, read_status = _load_json_list(history_json)
-    dq["fs"]["history_json_read"] = read_status
-    if read_status.startswith("err:") or read_status.startswith("warn:"):
-        _warn(f"history.json read status: {read_status}")
+    # 3) Load existing history (partitioned store first; history.json is the migration/fallback source)
+    part_rows, part_lines, part_status = _load_history_partitioned(history_series_dir)
+    dq["fs"]["history_series_read"] = part_status
+    if part_status == "ok" or (part_status.startswith("warn:bad_lines") and part_rows):
+        existing_hist: List[Dict[str, Any]] = list(part_rows)
+        dq["fs"]["history_json_read"] = "skip:partitioned_store"
+    else:
+        existing_hist, read_status = _load_json_list(history_json)
+        part_lines = {}
+        dq["fs"]["history_json_read"] = read_status
+        if read_status.startswith("err:") or read_status.startswith("warn:"):
+            _warn(f"history.json read status: {read_status}")
 
     # 4) Load backfill state
     backfill_state, backfill_state_read = _load_json_dict(backfill_state_path)
@@ -1052,8 +1398,10 @@ def main() -> int:
 
     # 5) Recent-heal (light hole repair) with tightened triggers + budget + non-daily exemptions
     recent_heal_rows: List[Dict[str, str]] = []
+    heal_targets: List[Tuple[str, Optional[str]]] = []
     if RECENT_HEAL_ENABLE and RECENT_HEAL_LIMIT >= 2 and RECENT_HEAL_MAX_CALLS_PER_RUN > 0:
         latest_by_sid: Dict[str, Dict[str, str]] = {r.get("series_id", ""): r for r in rows if r.get("series_id")}
+        newest_by_sid = _newest_valid_date_per_series(existing_hist)
 
         for sid in SERIES_IDS:
             if dq["recent_heal"]["calls_used"] >= RECENT_HEAL_MAX_CALLS_PER_RUN:
@@ -1066,7 +1414,8 @@ def main() -> int:
                 continue
 
             tail_dates = _recent_dates_from_history(existing_hist, sid, RECENT_HEAL_TAIL_POINTS)
-            suspicious = _has_suspicious_gaps_daily(tail_dates)
+            gap_start = _first_suspicious_gap_start(tail_dates)
+            suspicious = gap_start is not None
 
             latest_note = latest_by_sid.get(sid, {}).get("notes", "NA")
 
@@ -1087,18 +1436,24 @@ def main() -> int:
                 reason.append(f"latest_{latest_note}")
 
             dq["recent_heal"]["attempted"][sid] = "trigger:" + ",".join(reason)
-
-            heal_rows, meta = fetch_recent_observations(
-                session, sid, as_of_ts, RECENT_HEAL_LIMIT, note_prefix="recent_heal"
-            )
-            dq["recent_heal"]["meta"][sid] = meta
+            # Budget is charged at decision time (one call per trigger), so the fetch can run concurrently.
             dq["recent_heal"]["calls_used"] += 1
+            heal_targets.append((sid, _incremental_observation_start(newest_by_sid.get(sid), gap_start)))
 
+        heal_results = _map_ordered(
+            lambda t: fetch_recent_observations(
+                session, t[0], as_of_ts, RECENT_HEAL_LIMIT, note_prefix="recent_heal", observation_start=t[1]
+            ),
+            heal_targets,
+        )
+        for (sid, _obs_start), (heal_rows, meta) in zip(heal_targets, heal_results):
+            dq["recent_heal"]["meta"][sid] = meta
             if heal_rows:
                 recent_heal_rows.extend(heal_rows)
 
     # 6) Heavy self-heal backfill to reach >=252 valid points
     backfill_rows: List[Dict[str, str]] = []
+    backfill_targets: List[Tuple[str, int]] = []
     for sid in SERIES_IDS:
         have = int(counts_before.get(sid, 0))
         series_state = backfill_state["series"].get(sid, {})
@@ -1120,10 +1475,17 @@ def main() -> int:
         else:
             dq["backfill"]["attempted"][sid] = f"attempt (have={have} < {BACKFILL_TARGET_VALID})"
 
-        bf_rows, meta = fetch_recent_observations(session, sid, as_of_ts, BACKFILL_FETCH_LIMIT, note_prefix="backfill")
+        # Reserve the key now so backfill_state["series"] keeps SERIES_IDS insertion order.
+        backfill_state["series"].setdefault(sid, {})
+        backfill_targets.append((sid, have))
+
+    backfill_results = _map_ordered(
+        lambda t: fetch_recent_observations(session, t[0], as_of_ts, BACKFILL_FETCH_LIMIT, note_prefix="backfill"),
+        backfill_targets,
+    )
+    for (sid, have), (bf_rows, meta) in zip(backfill_targets, backfill_results):
         dq["backfill"]["meta"][sid] = meta
 
-        backfill_state["series"].setdefault(sid, {})
         backfill_state["series"][sid].setdefault("attempted_success", False)
         backfill_state["series"][sid]["last_attempt"] = {
             "at": as_of_ts,
@@ -1163,7 +1525,13 @@ def main() -> int:
     if not ok:
         _warn(f"failed to write backfill_state.json: {st}")
 
-    # 9) Write history.json
+    # 9) Write partitioned store (touched series only), then history.json as the exported view
+    ok, st, part_actions = _write_history_partitioned(history_series_dir, existing_hist, merged_hist, part_lines)
+    dq["fs"]["history_series_write"] = st
+    dq["fs"]["history_series_actions"] = part_actions
+    if not ok:
+        _warn(f"failed to write history_series/: {st}")
+
     ok, st = _write_json_array_record_per_line(history_json, merged_hist)  # type: ignore[arg-type]
     dq["fs"]["history_json_write"] = st
     if not ok:
@@ -1202,6 +1570,7 @@ def main() -> int:
             "latest_csv": str(latest_csv.as_posix()),
             "latest_json": str(latest_json.as_posix()),
             "history_json": str(history_json.as_posix()),
+            "history_series_dir": str(history_series_dir.as_posix()),
             "history_lite_json": str(history_lite_json.as_posix()),
             "stats_latest_json": str(stats_latest_json.as_posix()),
             "history_snapshot_json": str(history_snapshot.as_posix()),
@@ -1213,6 +1582,8 @@ def main() -> int:
             "same_key_rerun": "overwrite_by_latest_as_of_ts",
             "cap_per_series": CAP_PER_SERIES,
             "history_json_format": "json_array_record_per_line",
+            "history_series_format": HISTORY_SERIES_FORMAT,
+            "history_series_compact_slack": PARTITION_COMPACT_SLACK,
             "history_lite_target_per_series": BACKFILL_TARGET_VALID,
             "backfill_policy": "self_heal_until_target_valid; fetch_limit_used_when_needed",
             "recent_heal_policy": {
@@ -1222,6 +1593,12 @@ def main() -> int:
                 "max_calls_per_run": RECENT_HEAL_MAX_CALLS_PER_RUN,
                 "nondaily_series": sorted(list(KNOWN_NONDAILY_SERIES)),
                 "trigger": "suspicious_gaps_daily OR latest_err OR latest_missing_value (excluding warn:retried_Nx)",
+                "incremental": {
+                    "enable": INCREMENTAL_ENABLE,
+                    "overlap_days": INCREMENTAL_OVERLAP_DAYS,
+                    "observation_start": "min(first_suspicious_gap, newest_cached_data_date) - overlap_days",
+                    "full_window_when": "incremental disabled OR series has no cached valid points",
+                },
             },
         },
         "stats_policy": {
@@ -1233,6 +1610,13 @@ def main() -> int:
             "window_definition": WINDOW_DEFINITION,
             "source": "history_lite.json",
         },
+        "fetch_policy": {
+            "workers": FETCH_WORKERS,
+            "min_interval_ms_per_host": MIN_INTERVAL_MS,
+            "max_attempts": MAX_ATTEMPTS,
+            "backoff_schedule_secs": BACKOFF_SCHEDULE,
+            "ordering": "results merged in SERIES_IDS order regardless of completion order",
+        },
         "fs_status": dq.get("fs", {}),
     }
 
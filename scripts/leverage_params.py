@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+leverage_params.py
+
+Params defaults and KEY=VALUE parsing shared by the 0050 leverage drivers
+(backtest_tw0050_leverage_sweep.py, backtest_tw0050_leverage_mc.py).
+
+- BASE_DEFAULTS: the backtest_tw0050_leverage_mvp.py CLI defaults (bb_conditional strategy).
+- PARAM_TYPES:   Params field -> type name ("int" / "float" / "bool" / "str").
+- coerce_param / split_kv: --set KEY=VALUE (and grid values) -> typed Params fields.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Any, Dict, List, Tuple
+
+from backtest_tw0050_leverage_mvp import Params
+
+
+# Same defaults as the backtest_tw0050_leverage_mvp.py CLI (bb_conditional strategy).
+BASE_DEFAULTS: Dict[str, Any] = {
+    "bb_window": 60,
+    "bb_ddof": 0,
+    "entry_z": -1.5,
+    "exit_z": 0.0,
+    "leverage_frac": 0.5,
+    "borrow_apr": 0.035,
+    "max_hold_days": 0,
+    "trading_days": 252,
+    "skip_contaminated": True,
+    "contam_horizon": 60,
+    "z_clear_days": 60,
+    "fee_rate": 0.001425,
+    "tax_rate": 0.0010,
+    "slip_bps": 5.0,
+    "cost_on": "lever",
+    "entry_mode": "bb",
+    "trend_rule": "price_gt_ma60",
+    "trend_ma_fast": 20,
+    "trend_ma_slow": 60,
+    "perf_ddof": 0,
+    "maintenance_margin": 0.0,
+    "maint_ratio_mode": "equity_over_lever_notional",
+}
+
+PARAM_TYPES: Dict[str, str] = {f.name: getattr(f.type, "__name__", str(f.type)) for f in fields(Params)}
+
+
+def coerce_param(key: str, v: Any) -> Any:
+    """CLI / grid-file value -> the Params field type of key (SystemExit on unknown key or bad value)."""
+    if key not in PARAM_TYPES:
+        raise SystemExit(f"ERROR: unknown parameter '{key}' (valid: {', '.join(PARAM_TYPES)})")
+    t = PARAM_TYPES[key]
+    if t == "bool":
+        if isinstance(v, str):
+            s = v.strip().lower()
+            if s in ("1", "true", "yes", "on"):
+                return True
+            if s in ("0", "false", "no", "off"):
+                return False
+            raise SystemExit(f"ERROR: {key}: not a bool: {v!r}")
+        return bool(v)
+    if t == "int":
+        fv = float(v)
+        if not fv.is_integer():
+            raise SystemExit(f"ERROR: {key}: not an integer: {v!r}")
+        return int(fv)
+    if t == "float":
+        return float(v)
+    return str(v).strip()
+
+
+def split_kv(items: List[str], flag: str) -> List[Tuple[str, str]]:
+    """Repeated KEY=VALUE CLI items (--set / --grid) -> [(key, value)]; SystemExit names the flag."""
+    out: List[Tuple[str, str]] = []
+    for it in items or []:
+        if "=" not in it:
+            raise SystemExit(f"ERROR: {flag} expects KEY=VALUE, got {it!r}")
+        k, v = it.split("=", 1)
+        out.append((k.strip(), v.strip()))
+    return out
@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/leverage_sim.py
+
+Array-state bar loop for backtest_tw0050_leverage_mvp.run_backtest ("base hold + leverage leg").
+
+- Signals (entry / non-time exit / RV20 block) are precomputed as boolean arrays (build_signals).
+- simulate():       one parameter set; plain-float state, no per-bar closures or dicts.
+- simulate_batch(): K parameter sets through the same bar loop; state is K-vectors and every
+                    per-bar step is a masked numpy op over the K lanes. Lanes may also carry their
+                    own price path (Monte Carlo: backtest_tw0050_leverage_mc.py).
+- Trades are kept as a struct of arrays (TRADE_FIELDS); trades_to_dicts() rebuilds the legacy
+  per-trade dicts (same keys, same key order, same float ops).
+
+Both paths do the same IEEE operations in the same order as the old per-bar loop
+(costs = notional * (fee + tax + slip), interest = principal * apr / trading_days, ...), so equity
+curves, trades and counters are bit-identical (see tools/bench_leverage_sim.py).
+
+Bar order (unchanged):
+  1) interest accrual on borrow_principal
+  2) maintenance check (maintenance_margin > 0) -> margin_call exit, hold_days + 1 recorded
+  3) hold_days += 1, exit by max_hold_days first, then by signal (exit_z / trend_off)
+  4) entry unless exited today / forbidden / RV20-blocked / equity <= 0
+  5) end-of-day equity; an open position is force-closed on the last bar (end_of_data)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EXIT_REASONS = ["exit_z", "max_hold_days", "trend_off", "margin_call", "end_of_data"]
+_R_EXIT_Z, _R_MAX_HOLD, _R_TREND_OFF, _R_MARGIN_CALL, _R_END = range(5)
+
+MAINT_RATIO_MODES = ["equity_over_lever_notional", "equity_over_borrow", "equity_over_total_notional"]
+
+TRADE_FIELDS = [
+    "entry_i",
+    "exit_i",
+    "entry_price",
+    "exit_price",
+    "entry_z",
+    "borrow_principal",
+    "lever_shares",
+    "entry_cost",
+    "exit_cost",
+    "interest_paid",
+    "hold_days",
+    "exit_reason",
+]
+
+COUNTER_FIELDS = [
+    "skipped_entries_on_forbidden",
+    "skipped_entries_on_nonpositive_equity",
+    "skipped_entries_same_day_exit",
+    "skipped_entries_on_rv20",
+    "exit_count_by_exit_z",
+    "exit_count_by_max_hold_days",
+    "exit_count_by_trend_off",
+    "exit_count_by_end_of_data",
+    "forced_eod_close",
+    "margin_call_count",
+]
+
+
+@dataclass
+class SimSpec:
+    """Per-run scalars of the bar loop (derived from backtest Params)."""
+
+    entry_mode: str
+    lever_shares_target: float
+    borrow_apr: float
+    trading_days: int
+    max_hold_days: int
+    cost_on: str
+    entry_rate: float  # fee + slip
+    exit_rate: float  # fee + tax + slip
+    entry_rate_ok: bool
+    exit_rate_ok: bool
+    maintenance_margin: float
+    maint_ratio_mode: str
+
+
+def cost_rates(fee_rate: float, tax_rate: float, slip_rate: float) -> Dict[str, Any]:
+    """Entry/exit cost multipliers exactly as _entry_cost / _exit_cost form them."""
+    ok_in = bool(np.isfinite(fee_rate) and np.isfinite(slip_rate))
+    ok_out = bool(ok_in and np.isfinite(tax_rate))
+    fr = max(float(fee_rate), 0.0) if ok_in else 0.0
+    tr = max(float(tax_rate), 0.0) if ok_out else 0.0
+    sr = max(float(slip_rate), 0.0) if ok_in else 0.0
+    return {"entry_rate": fr + sr, "exit_rate": fr + tr + sr, "entry_rate_ok": ok_in, "exit_rate_ok": ok_out}
+
+
+def build_signals(
+    prices: np.ndarray,
+    bb_z: np.ndarray,
+    ma_fast: np.ndarray,
+    ma_slow: np.ndarray,
+    rv20: np.ndarray,
+    rv20_q60: np.ndarray,
+    *,
+    entry_mode: str,
+    entry_z: float,
+    exit_z: float,
+    trend_rule: str,
+) -> Dict[str, np.ndarray]:
+    """entry / exit (signal part, not max_hold_days) / rv_block boolean arrays."""
+    p = np.asarray(prices, dtype=float)
+    z = np.asarray(bb_z, dtype=float)
+    f = np.asarray(ma_fast, dtype=float)
+    s = np.asarray(ma_slow, dtype=float)
+    n = int(p.shape[0])
+    with np.errstate(invalid="ignore"):
+        if trend_rule == "price_gt_ma60":
+            trend_on = np.isfinite(s) & np.isfinite(p) & (p > s)
+        else:
+            trend_on = np.isfinite(f) & np.isfinite(s) & (f > s)
+        z_ok = np.isfinite(z)
+        if entry_mode == "always":
+            entry = np.ones(n, dtype=bool)
+            exit_sig = np.zeros(n, dtype=bool)
+        elif entry_mode == "trend":
+            entry = trend_on
+            exit_sig = ~trend_on
+        else:
+            entry = z_ok & (z <= float(entry_z))
+            exit_sig = z_ok & (z >= float(exit_z))
+        if entry_mode == "bb":
+            r = np.asarray(rv20, dtype=float)
+            q = np.asarray(rv20_q60, dtype=float)
+            rv_block = np.isfinite(r) & np.isfinite(q) & (r > q)
+        else:
+            rv_block = np.zeros(n, dtype=bool)
+    return {"entry": entry, "exit": exit_sig, "rv_block": rv_block, "z": z}
+
+
+def _empty_trades(cap: int) -> Dict[str, np.ndarray]:
+    out: Dict[str, np.ndarray] = {}
+    for k in TRADE_FIELDS:
+        if k in ("entry_i", "exit_i", "hold_days", "exit_reason"):
+            out[k] = np.zeros(cap, dtype=np.int64)
+        else:
+            out[k] = np.zeros(cap, dtype=float)
+    return out
+
+
+def _exit_reason_for_signal(entry_mode: str) -> int:
+    return _R_TREND_OFF if entry_mode == "trend" else _R_EXIT_Z
+
+
+def simulate(
+    prices: np.ndarray,
+    signals: Dict[str, np.ndarray],
+    forbid: Optional[np.ndarray],
+    spec: SimSpec,
+    base_shares: float,
+    resume: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    One run. Returns {equity, lever_on, trades (SoA, length n_trades), n_trades, counters, totals, state}.
+
+    state is the loop state after the last bar BEFORE the end_of_data close. resume=<earlier result on a
+    prefix of the same inputs> continues from that state at bar state["n"], so appending bars only
+    costs the new bars; the result equals a full run.
+    """
+    px = np.asarray(prices, dtype=float)
+    n = int(px.shape[0])
+    P = px.tolist()
+    ENT = signals["entry"].tolist()
+    EXS = signals["exit"].tolist()
+    RVB = signals["rv_block"].tolist()
+    Z = signals["z"].tolist()
+    FB = np.asarray(forbid, dtype=bool).tolist() if forbid is not None else [False] * n
+
+    lts = float(spec.lever_shares_target)
+    apr = float(spec.borrow_apr)
+    td = int(spec.trading_days)
+    int_on = apr > 0.0 and td > 0
+    max_hold = int(spec.max_hold_days)
+    cost_all = spec.cost_on == "all"
+    er, xr = float(spec.entry_rate), float(spec.exit_rate)
+    er_ok, xr_ok = bool(spec.entry_rate_ok), bool(spec.exit_rate_ok)
+    mm = float(spec.maintenance_margin)
+    mmode = spec.maint_ratio_mode if spec.maint_ratio_mode in MAINT_RATIO_MODES else "equity_over_lever_notional"
+    sig_reason = _exit_reason_for_signal(spec.entry_mode)
+    isfinite = np.isfinite
+
+    T = {k: [] for k in TRADE_FIELDS}
+    c = dict.fromkeys(COUNTER_FIELDS, 0)
+    eq = [0.0] * n
+    lev_on = [False] * n
+
+    lever_shares = 0.0
+    borrow = 0.0
+    cash = 0.0
+    in_lever = False
+    hold = 0
+    interest_total = 0.0
+    entry_cost_total = 0.0
+    exit_cost_total = 0.0
+    cost_total = 0.0
+    tr_interest = 0.0
+    min_mr: Optional[float] = None
+    start = 0
+
+    if resume is not None:
+        st = resume["state"]
+        start = int(st["n"])
+        if start > n or start < 1:
+            raise ValueError(f"resume state rows {start} not in [1, {n}]")
+        eq[:start] = np.asarray(resume["equity"], dtype=float)[:start].tolist()
+        lev_on[:start] = np.asarray(resume["lever_on"], dtype=bool)[:start].tolist()
+        eq[start - 1] = float(st["eq_last"])
+        lev_on[start - 1] = bool(st["lev_last"])
+        for k in TRADE_FIELDS:
+            T[k] = np.asarray(resume["trades"][k]).tolist()
+        if bool(st["in_lever"]):
+            # drop the end_of_data exit of the trade that is still open at the prefix end
+            for k in ("exit_i", "exit_price", "hold_days", "exit_reason", "exit_cost", "interest_paid"):
+                T[k].pop()
+        c = {k: int(st["counters"][k]) for k in COUNTER_FIELDS}
+        lever_shares = float(st["lever_shares"])
+        borrow = float(st["borrow"])
+        cash = float(st["cash"])
+        in_lever = bool(st["in_lever"])
+        hold = int(st["hold"])
+        interest_total = float(st["interest_total"])
+        entry_cost_total = float(st["entry_cost_total"])
+        exit_cost_total = float(st["exit_cost_total"])
+        cost_total = float(st["cost_total"])
+        tr_interest = float(st["tr_interest"])
+        min_mr = None if st["min_mr"] is None else float(st["min_mr"])
+
+    def _close(i: int, price: float, hold_rec: int, reason: int) -> None:
+        nonlocal cash, exit_cost_total, cost_total
+        proceeds = lever_shares * price
+        notional = (base_shares + lever_shares) * price if cost_all else lever_shares * price
+        ec = notional * xr if (xr_ok and isfinite(notional) and notional > 0.0) else 0.0
+        if ec > 0.0:
+            cash -= ec
+            exit_cost_total += ec
+            cost_total += ec
+        cash += proceeds
+        cash -= borrow
+        T["exit_i"].append(i)
+        T["exit_price"].append(price)
+        T["hold_days"].append(hold_rec)
+        T["exit_reason"].append(reason)
+        T["exit_cost"].append(ec)
+        T["interest_paid"].append(tr_interest)
+
+    for i in range(start, n):
+        price = P[i]
+        exited = False
+
+        if in_lever and borrow > 0.0:
+            interest = borrow * apr / td if int_on else 0.0
+            cash -= interest
+            interest_total += interest
+            tr_interest = tr_interest + interest
+
+        if in_lever and mm > 0.0:
+            total_notional = (base_shares + lever_shares) * price
+            equity_flat = total_notional + cash - borrow
+            if mmode == "equity_over_borrow":
+                denom = borrow
+            elif mmode == "equity_over_total_notional":
+                denom = total_notional
+            else:
+                denom = lever_shares * price
+            mr = None
+            if denom > 0.0 and isfinite(equity_flat) and isfinite(denom):
+                mr = equity_flat / denom
+                if min_mr is None or mr < min_mr:
+                    min_mr = mr
+            if mr is not None and mr < mm:
+                _close(i, price, hold + 1, _R_MARGIN_CALL)
+                c["margin_call_count"] += 1
+                borrow = 0.0
+                lever_shares = 0.0
+                in_lever = False
+                hold = 0
+                exited = True
+
+        if in_lever:
+            hold += 1
+            reason = -1
+            if max_hold > 0 and hold >= max_hold:
+                reason = _R_MAX_HOLD
+            elif EXS[i]:
+                reason = sig_reason
+            if reason >= 0:
+                _close(i, price, hold, reason)
+                if reason == _R_EXIT_Z:
+                    c["exit_count_by_exit_z"] += 1
+                elif reason == _R_MAX_HOLD:
+                    c["exit_count_by_max_hold_days"] += 1
+                else:
+                    c["exit_count_by_trend_off"] += 1
+                borrow = 0.0
+                lever_shares = 0.0
+                in_lever = False
+                hold = 0
+                exited = True
+
+        if not in_lever and ENT[i]:
+            if exited:
+                c["skipped_entries_same_day_exit"] += 1
+            elif FB[i]:
+                c["skipped_entries_on_forbidden"] += 1
+            elif RVB[i]:
+                c["skipped_entries_on_rv20"] += 1
+            else:
+                equity_flat = (base_shares + lever_shares) * price + cash - borrow
+                if equity_flat <= 0.0:
+                    c["skipped_entries_on_nonpositive_equity"] += 1
+                elif lts > 0.0:
+                    b = lts * price
+                    if b > 0.0:
+                        notional = (base_shares + lts) * price if cost_all else lts * price
+                        ecost = notional * er if (er_ok and isfinite(notional) and notional > 0.0) else 0.0
+                        if ecost > 0.0:
+                            cash -= ecost
+                            entry_cost_total += ecost
+                            cost_total += ecost
+                        borrow = b
+                        lever_shares = lts
+                        in_lever = True
+                        hold = 0
+                        tr_interest = 0.0
+                        T["entry_i"].append(i)
+                        T["entry_price"].append(price)
+                        T["entry_z"].append(Z[i])
+                        T["borrow_principal"].append(borrow)
+                        T["lever_shares"].append(lever_shares)
+                        T["entry_cost"].append(ecost)
+
+        eq[i] = (base_shares + lever_shares) * price + cash - borrow
+        lev_on[i] = in_lever
+
+    state = {
+        "n": n,
+        "eq_last": eq[-1] if n else None,
+        "lev_last": lev_on[-1] if n else None,
+        "lever_shares": lever_shares,
+        "borrow": borrow,
+        "cash": cash,
+        "in_lever": in_lever,
+        "hold": hold,
+        "interest_total": interest_total,
+        "entry_cost_total": entry_cost_total,
+        "exit_cost_total": exit_cost_total,
+        "cost_total": cost_total,
+        "tr_interest": tr_interest,
+        "min_mr": min_mr,
+        "counters": dict(c),
+    }
+
+    open_at_end = bool(in_lever)
+    if in_lever and n > 0:
+        last = P[-1]
+        _close(n - 1, last, hold, _R_END)
+        c["forced_eod_close"] += 1
+        c["exit_count_by_end_of_data"] += 1
+        in_lever = False
+        borrow = 0.0
+        lever_shares = 0.0
+        eq[-1] = base_shares * last + cash
+        lev_on[-1] = False
+
+    nt = len(T["entry_i"])
+    trades = _empty_trades(nt)
+    for k in TRADE_FIELDS:
+        if nt:
+            trades[k][:] = T[k]
+    return {
+        "equity": np.asarray(eq, dtype=float),
+        "lever_on": np.asarray(lev_on, dtype=bool),
+        "trades": trades,
+        "n_trades": nt,
+        "counters": c,
+        "totals": {
+            "interest_paid_total": interest_total,
+            "entry_cost_total": entry_cost_total,
+            "exit_cost_total": exit_cost_total,
+            "cost_paid_total": cost_total,
+            "min_maint_ratio": min_mr,
+            "open_at_end": open_at_end,
+        },
+        "state": state,
+    }
+
+
+def simulate_batch(
+    prices: np.ndarray,
+    signals: Sequence[Dict[str, np.ndarray]],
+    forbid: Sequence[Optional[np.ndarray]],
+    specs: Sequence[SimSpec],
+    base_shares: Any,
+) -> List[Dict[str, Any]]:
+    """
+    K runs in one bar loop (K-vector state). Same result as calling simulate() K times; per-k output
+    has the same layout.
+
+    prices: (n,) shared by all lanes, or (n, K) with one price path per lane (e.g. bootstrap paths);
+    base_shares: float or K-vector accordingly.
+    """
+    K = len(specs)
+    if K == 0:
+        return []
+    px = np.asarray(prices, dtype=float)
+    n = int(px.shape[0])
+    PX = px if px.ndim == 2 else np.broadcast_to(px[:, None], (n, K))
+    if PX.shape != (n, K):
+        raise ValueError(f"prices must be (n,) or (n, {K}), got {px.shape}")
+    base = np.broadcast_to(np.asarray(base_shares, dtype=float), (K,))
+
+    ENT = np.stack([np.asarray(s["entry"], dtype=bool) for s in signals], axis=1)  # n x K
+    EXS = np.stack([np.asarray(s["exit"], dtype=bool) for s in signals], axis=1)
+    RVB = np.stack([np.asarray(s["rv_block"], dtype=bool) for s in signals], axis=1)
+    ZZ = np.stack([np.asarray(s["z"], dtype=float) for s in signals], axis=1)
+    FB = np.stack(
+        [np.asarray(f, dtype=bool) if f is not None else np.zeros(n, dtype=bool) for f in forbid], axis=1
+    )
+
+    lts = np.array([float(s.lever_shares_target) for s in specs])
+    apr = np.array([float(s.borrow_apr) for s in specs])
+    td = np.array([float(int(s.trading_days)) for s in specs])
+    int_on = (apr > 0.0) & (td > 0)
+    td_safe = np.where(td > 0, td, 1.0)
+    max_hold = np.array([int(s.max_hold_days) for s in specs], dtype=np.int64)
+    cost_all = np.array([s.cost_on == "all" for s in specs])
+    er = np.array([float(s.entry_rate) for s in specs])
+    xr = np.array([float(s.exit_rate) for s in specs])
+    er_ok = np.array([bool(s.entry_rate_ok) for s in specs])
+    xr_ok = np.array([bool(s.exit_rate_ok) for s in specs])
+    mm = np.array([float(s.maintenance_margin) for s in specs])
+    mm_on = mm > 0.0
+    modes = [s.maint_ratio_mode if s.maint_ratio_mode in MAINT_RATIO_MODES else MAINT_RATIO_MODES[0] for s in specs]
+    m_borrow = np.array([m == "equity_over_borrow" for m in modes])
+    m_total = np.array([m == "equity_over_total_notional" for m in modes])
+    sig_reason = np.array([_exit_reason_for_signal(s.entry_mode) for s in specs], dtype=np.int64)
+    any_mm = bool(mm_on.any())
+
+    lever_shares = np.zeros(K)
+    borrow = np.zeros(K)
+    cash = np.zeros(K)
+    in_lever = np.zeros(K, dtype=bool)
+    hold = np.zeros(K, dtype=np.int64)
+    interest_total = np.zeros(K)
+    entry_cost_total = np.zeros(K)
+    exit_cost_total = np.zeros(K)
+    cost_total = np.zeros(K)
+    tr_interest = np.zeros(K)
+    min_mr = np.full(K, np.nan)
+    cnt = {k: np.zeros(K, dtype=np.int64) for k in COUNTER_FIELDS}
+
+    eq = np.empty((n, K))
+    lev_on = np.empty((n, K), dtype=bool)
+
+    # event logs: (lane array, values...) appended per bar, assembled per lane at the end
+    ent_log: List[tuple] = []
+    ext_log: List[tuple] = []
+
+    def _close(m: np.ndarray, i: int, price_k: np.ndarray, hold_rec: np.ndarray, reason: np.ndarray) -> None:
+        lanes = np.flatnonzero(m)
+        ls = lever_shares[lanes]
+        price = price_k[lanes]
+        proceeds = ls * price
+        notional = np.where(cost_all[lanes], (base[lanes] + ls) * price, ls * price)
+        with np.errstate(invalid="ignore"):
+            ok = xr_ok[lanes] & np.isfinite(notional) & (notional > 0.0)
+        ec = np.where(ok, notional * xr[lanes], 0.0)
+        pos = ec > 0.0
+        lp = lanes[pos]
+        cash[lp] -= ec[pos]
+        exit_cost_total[lp] += ec[pos]
+        cost_total[lp] += ec[pos]
+        cash[lanes] += proceeds
+        cash[lanes] -= borrow[lanes]
+        ext_log.append((lanes, i, price, hold_rec[lanes].copy(), reason[lanes].copy(), ec, tr_interest[lanes].copy()))
+
+    for i in range(n):
+        price = PX[i]
+        exited = np.zeros(K, dtype=bool)
+
+        m = in_lever & (borrow > 0.0)
+        if m.any():
+            interest = np.where(int_on, borrow * apr / td_safe, 0.0)
+            cash[m] -= interest[m]
+            interest_total[m] += interest[m]
+            tr_interest[m] = tr_interest[m] + interest[m]
+
+        if any_mm:
+            m = in_lever & mm_on
+            if m.any():
+                total_notional = (base + lever_shares) * price
+                equity_flat = total_notional + cash - borrow
+                denom = np.where(m_borrow, borrow, np.where(m_total, total_notional, lever_shares * price))
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    valid = m & (denom > 0.0) & np.isfinite(equity_flat) & np.isfinite(denom)
+                    mr = np.where(valid, equity_flat / np.where(valid, denom, 1.0), np.nan)
+                    upd = valid & (np.isnan(min_mr) | (mr < min_mr))
+                min_mr[upd] = mr[upd]
+                call = valid & (mr < mm)
+                if call.any():
+                    _close(call, i, price, hold + 1, np.full(K, _R_MARGIN_CALL, dtype=np.int64))
+                    cnt["margin_call_count"][call] += 1
+                    borrow[call] = 0.0
+                    lever_shares[call] = 0.0
+                    in_lever[call] = False
+                    hold[call] = 0
+                    exited |= call
+
+        if in_lever.any():
+            hold[in_lever] += 1
+            by_time = in_lever & (max_hold > 0) & (hold >= max_hold)
+            by_sig = in_lever & ~by_time & EXS[i]
+            ex = by_time | by_sig
+            if ex.any():
+                reason = np.where(by_time, _R_MAX_HOLD, sig_reason)
+                _close(ex, i, price, hold, reason)
+                cnt["exit_count_by_max_hold_days"][by_time] += 1
+                cnt["exit_count_by_exit_z"][by_sig & (sig_reason == _R_EXIT_Z)] += 1
+                cnt["exit_count_by_trend_off"][by_sig & (sig_reason == _R_TREND_OFF)] += 1
+                borrow[ex] = 0.0
+                lever_shares[ex] = 0.0
+                in_lever[ex] = False
+                hold[ex] = 0
+                exited |= ex
+
+        want = ~in_lever & ENT[i]
+        if want.any():
+            cnt["skipped_entries_same_day_exit"][want & exited] += 1
+            want = want & ~exited
+            fb = want & FB[i]
+            cnt["skipped_entries_on_forbidden"][fb] += 1
+            want = want & ~fb
+            rb = want & RVB[i]
+            cnt["skipped_entries_on_rv20"][rb] += 1
+            want = want & ~rb
+            if want.any():
+                equity_flat = (base + lever_shares) * price + cash - borrow
+                nonpos = want & (equity_flat <= 0.0)
+                cnt["skipped_entries_on_nonpositive_equity"][nonpos] += 1
+                b = lts * price
+                go = want & ~nonpos & (lts > 0.0) & (b > 0.0)
+                if go.any():
+                    lanes = np.flatnonzero(go)
+                    lt = lts[lanes]
+                    pl = price[lanes]
+                    notional = np.where(cost_all[lanes], (base[lanes] + lt) * pl, lt * pl)
+                    with np.errstate(invalid="ignore"):
+                        ok = er_ok[lanes] & np.isfinite(notional) & (notional > 0.0)
+                    ecost = np.where(ok, notional * er[lanes], 0.0)
+                    pos = ecost > 0.0
+                    lp = lanes[pos]
+                    cash[lp] -= ecost[pos]
+                    entry_cost_total[lp] += ecost[pos]
+                    cost_total[lp] += ecost[pos]
+                    borrow[lanes] = b[lanes]
+                    lever_shares[lanes] = lt
+                    in_lever[lanes] = True
+                    hold[lanes] = 0
+                    tr_interest[lanes] = 0.0
+                    ent_log.append((lanes, i, pl, ZZ[i, lanes].copy(), b[lanes].copy(), lt.copy(), ecost))
+
+        eq[i] = (base + lever_shares) * price + cash - borrow
+        lev_on[i] = in_lever
+
+    open_at_end = in_lever.copy()
+    if n > 0 and in_lever.any():
+        last = PX[n - 1]
+        _close(in_lever, n - 1, last, hold, np.full(K, _R_END, dtype=np.int64))
+        cnt["forced_eod_close"][in_lever] += 1
+        cnt["exit_count_by_end_of_data"][in_lever] += 1
+        eq[-1, in_lever] = base[in_lever] * last[in_lever] + cash[in_lever]
+        lev_on[-1, in_lever] = False
+        borrow[in_lever] = 0.0
+        lever_shares[in_lever] = 0.0
+        in_lever[:] = False
+
+    # assemble per-lane trade SoA (entries and exits alternate per lane in bar order)
+    per_lane: List[Dict[str, List[Any]]] = [{k: [] for k in TRADE_FIELDS} for _ in range(K)]
+    for lanes, i, price, z, b, lt, ec in ent_log:
+        for j, k in enumerate(lanes.tolist()):
+            t = per_lane[k]
+            t["entry_i"].append(i)
+            t["entry_price"].append(price[j])
+            t["entry_z"].append(z[j])
+            t["borrow_principal"].append(b[j])
+            t["lever_shares"].append(lt[j])
+            t["entry_cost"].append(ec[j])
+    for lanes, i, price, h, r, ec, ti in ext_log:
+        for j, k in enumerate(lanes.tolist()):
+            t = per_lane[k]
+            t["exit_i"].append(i)
+            t["exit_price"].append(price[j])
+            t["hold_days"].append(h[j])
+            t["exit_reason"].append(r[j])
+            t["exit_cost"].append(ec[j])
+            t["interest_paid"].append(ti[j])
+
+    out: List[Dict[str, Any]] = []
+    for k in range(K):
+        nt = len(per_lane[k]["entry_i"])
+        trades = _empty_trades(nt)
+        for f in TRADE_FIELDS:
+            if nt:
+                trades[f][:] = per_lane[k][f]
+        out.append({
+            "equity": eq[:, k].copy(),
+            "lever_on": lev_on[:, k].copy(),
+            "trades": trades,
+            "n_trades": nt,
+            "counters": {f: int(cnt[f][k]) for f in COUNTER_FIELDS},
+            "totals": {
+                "interest_paid_total": float(interest_total[k]),
+                "entry_cost_total": float(entry_cost_total[k]),
+                "exit_cost_total": float(exit_cost_total[k]),
+                "cost_paid_total": float(cost_total[k]),
+                "min_maint_ratio": float(min_mr[k]) if np.isfinite(min_mr[k]) else None,
+                "open_at_end": bool(open_at_end[k]),
+            },
+        })
+    return out
+
+
+def trades_to_dicts(trades: Dict[str, np.ndarray], dates: Sequence[str]) -> List[Dict[str, Any]]:
+    """Legacy per-trade dicts (key order and float ops as the old loop)."""
+    out: List[Dict[str, Any]] = []
+    for j in range(int(trades["entry_i"].shape[0])):
+        ez = float(trades["entry_z"][j])
+        entry_cost = float(trades["entry_cost"][j])
+        exit_cost = float(trades["exit_cost"][j])
+        borrow = float(trades["borrow_principal"][j])
+        lever_shares = float(trades["lever_shares"][j])
+        exit_price = float(trades["exit_price"][j])
+        interest = float(trades["interest_paid"][j])
+        cost_paid = float(entry_cost + exit_cost)
+        lever_leg_pnl = float(lever_shares * exit_price - borrow)
+        out.append({
+            "entry_date": str(dates[int(trades["entry_i"][j])]),
+            "entry_price": float(trades["entry_price"][j]),
+            "entry_z": ez if np.isfinite(ez) else None,
+            "borrow_principal": borrow,
+            "lever_shares": lever_shares,
+            "entry_cost": entry_cost,
+            "exit_cost": exit_cost,
+            "cost_paid": cost_paid,
+            "interest_paid": interest,
+            "exit_date": str(dates[int(trades["exit_i"][j])]),
+            "exit_price": exit_price,
+            "hold_days": int(trades["hold_days"][j]),
+            "exit_reason": EXIT_REASONS[int(trades["exit_reason"][j])],
+            "lever_leg_pnl": lever_leg_pnl,
+            "net_lever_pnl_after_costs": float(lever_leg_pnl - interest - cost_paid),
+        })
+    return out
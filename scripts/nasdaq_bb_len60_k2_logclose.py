@@ -20,6 +20,14 @@ Additional cleanup (this patch):
   We keep z_thresh but set it to "NA" (string) to avoid confusing empty fields in report tables.
 - Add a generic "gate" field that always describes the condition in structured form.
 
+Event engine (this patch):
+- All conditional simulations go through evaluate_gates(df_bb, [EventGate, ...]): per gate field one
+  forward_mdd_runup call for every horizon in use, one vectorized condition matrix (rows x gates),
+  cooldown picks by searchsorted over each gate's candidate rows. The old per-function cooldown loops
+  and per-event kernel calls are gone; outputs are identical.
+- --extra_gate "series:name:field<op>value[:horizon[:cooldown]]" (repeatable) adds gates to the same
+  pass; results go to historical_simulation_extra in the snippet (default output unchanged).
+
 Notes:
 - PRICE conditional stat: forward_mdd (<= 0 by construction)
 - VOL conditional stats:
@@ -39,6 +47,7 @@ import argparse
 import dataclasses
 import json
 import os
+import re
 import time
 import urllib.parse
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -47,6 +56,8 @@ import numpy as np
 import pandas as pd
 import requests
 
+from forward_extrema import forward_mdd_runup
+
 
 # ---------------------------
 # Utilities
@@ -327,46 +338,124 @@ def forward_max_runup(close_window: np.ndarray) -> float:
     return float(m / c0 - 1.0)
 
 
-def _pick_event_positions_le(z: np.ndarray, thresh: float, cooldown: int) -> List[int]:
-    pos = []
-    i = 0
-    n = len(z)
+@dataclasses.dataclass(frozen=True)
+class EventGate:
+    """Events where <field> <op> <value> (greedy, one per cooldown bars); forward <metric> over <horizon>."""
+    name: str
+    field: str  # "z" | "position_in_band"
+    op: str  # "<=" | ">="
+    value: float
+    metric: str  # "mdd" | "runup"
+    horizon: int
+    cooldown: int
+    interpretation: str = ""
+
+
+_METRIC_NAMES = {"mdd": "forward_mdd", "runup": "forward_max_runup"}
+_METRIC_INTERPRETATION = {
+    "mdd": "<=0; closer to 0 is less pain; more negative is deeper drawdown",
+    "runup": ">=0; larger means further spike continuation risk",
+}
+
+
+def _cooldown_events(cand: np.ndarray, cooldown: int) -> np.ndarray:
+    """
+    Greedy event pick over sorted candidate rows: take a row, skip the next cooldown-1 bars,
+    continue at the first candidate >= row + cooldown (same picks as a bar-by-bar cooldown loop).
+    """
     cd = max(1, int(cooldown))
-    while i < n:
-        if np.isfinite(z[i]) and z[i] <= thresh:
-            pos.append(i)
-            i += cd
-        else:
-            i += 1
-    return pos
+    out: List[int] = []
+    i = 0
+    m = int(cand.shape[0])
+    while i < m:
+        p = int(cand[i])
+        out.append(p)
+        i = int(np.searchsorted(cand, p + cd, side="left"))
+    return np.asarray(out, dtype=np.int64)
 
 
-def _pick_event_positions_ge(z: np.ndarray, thresh: float, cooldown: int) -> List[int]:
-    pos = []
-    i = 0
-    n = len(z)
-    cd = max(1, int(cooldown))
-    while i < n:
-        if np.isfinite(z[i]) and z[i] >= thresh:
-            pos.append(i)
-            i += cd
-        else:
-            i += 1
-    return pos
+def check_gates(gates: List[EventGate]) -> None:
+    """ValueError on duplicate gate names or an unsupported op/metric (evaluate_gates input)."""
+    if len({g.name for g in gates}) != len(gates):
+        raise ValueError(f"duplicate gate names: {[g.name for g in gates]}")
+    for g in gates:
+        if g.op not in ("<=", ">=") or g.metric not in _METRIC_NAMES:
+            raise ValueError(f"unsupported gate: {g}")
 
 
-def _pick_event_positions_pos_ge(pos_arr: np.ndarray, thresh: float, cooldown: int) -> List[int]:
-    pos = []
-    i = 0
-    n = len(pos_arr)
-    cd = max(1, int(cooldown))
-    while i < n:
-        if np.isfinite(pos_arr[i]) and pos_arr[i] >= thresh:
-            pos.append(i)
-            i += cd
-        else:
-            i += 1
-    return pos
+def evaluate_gates(df_bb: pd.DataFrame, gates: List[EventGate]) -> Dict[str, Dict[str, Any]]:
+    """
+    Summaries for all gates, keyed by gate name (input order).
+
+    Per gate field: rows with NaN field/close are dropped (each gate sees the same rows as before),
+    forward extrema for every horizon in use come from one forward_mdd_runup call
+    (window close[i .. min(i+h, n-1)], entry included), and all thresholds are tested in one
+    rows x gates comparison. Per gate only the cooldown pick and the percentiles remain.
+    """
+    res: Dict[str, Dict[str, Any]] = {}
+    by_field: Dict[str, List[EventGate]] = {}
+    check_gates(gates)
+    for g in gates:
+        by_field.setdefault(g.field, []).append(g)
+
+    for field, gs in by_field.items():
+        df = df_bb.dropna(subset=[field, "close"])
+        close = df["close"].to_numpy(dtype=float)
+        x = df[field].to_numpy(dtype=float)
+        ext = forward_mdd_runup(
+            close,
+            sorted({max(0, int(g.horizon)) for g in gs}),
+            include_entry=True,
+            partial_tail=True,
+            require_positive_base=False,
+        )
+
+        thr = np.array([float(g.value) for g in gs], dtype=float)
+        le = np.array([g.op == "<=" for g in gs], dtype=bool)
+        with np.errstate(invalid="ignore"):
+            hit = np.isfinite(x)[:, None] & np.where(le[None, :], x[:, None] <= thr[None, :], x[:, None] >= thr[None, :])
+
+        for j, g in enumerate(gs):
+            ev = _cooldown_events(np.flatnonzero(hit[:, j]), g.cooldown)
+            arr = ext[max(0, int(g.horizon))][g.metric]
+            vals = [float(arr[i]) for i in ev]
+            gate = {"field": g.field, "op": g.op, "value": float(g.value)}
+            res[g.name] = _summarize(
+                values=vals,
+                metric=_METRIC_NAMES[g.metric],
+                interpretation=g.interpretation or _METRIC_INTERPRETATION[g.metric],
+                z_thresh=g.value if g.field == "z" else None,
+                horizon=g.horizon,
+                cooldown=g.cooldown,
+                gate=gate,
+                condition=gate,  # backward compatible
+            )
+    return {g.name: res[g.name] for g in gates}
+
+
+_GATE_RE = re.compile(r"^\s*(z|pos|position_in_band)\s*(<=|>=)\s*([-+]?[0-9]*\.?[0-9]+)\s*$")
+
+
+def parse_extra_gate(spec: str, horizon: int, cooldown: int) -> Tuple[str, EventGate]:
+    """
+    "series:name:field<op>value[:horizon[:cooldown]]" -> (series, gate); series is price|vxn.
+    Metric follows the series (price -> forward_mdd, vxn -> forward_max_runup).
+    e.g. "price:z_le_-2_h60:z<=-2:60", "vxn:D_pos_ge_0.95:pos>=0.95"
+    """
+    parts = [x.strip() for x in str(spec).split(":")]
+    if len(parts) < 3 or parts[0] not in ("price", "vxn") or not parts[1]:
+        raise ValueError(f"bad --extra_gate {spec!r} (want series:name:field<op>value[:horizon[:cooldown]])")
+    m = _GATE_RE.match(parts[2])
+    if m is None:
+        raise ValueError(f"bad --extra_gate condition {parts[2]!r} (want z<=-2 / z>=2 / pos>=0.8)")
+    field = "position_in_band" if m.group(1) in ("pos", "position_in_band") else "z"
+    try:
+        h = int(parts[3]) if len(parts) > 3 and parts[3] else int(horizon)
+        cd = int(parts[4]) if len(parts) > 4 and parts[4] else int(cooldown)
+    except ValueError:
+        raise ValueError(f"bad --extra_gate {spec!r} (horizon/cooldown must be integers)") from None
+    metric = "mdd" if parts[0] == "price" else "runup"
+    return parts[0], EventGate(parts[1], field, m.group(2), float(m.group(3)), metric, h, cd)
 
 
 GateValue = Union[float, int, str, None]
@@ -448,99 +537,23 @@ def _summarize(
 
 
 def conditional_stats_price_mdd(df_bb: pd.DataFrame, z_thresh: float, horizon: int, cooldown: int) -> Dict[str, Any]:
-    df = df_bb.dropna(subset=["z", "close"]).copy()
-    close = df["close"].to_numpy(dtype=float)
-    z = df["z"].to_numpy(dtype=float)
-
-    trig_pos = _pick_event_positions_le(z=z, thresh=z_thresh, cooldown=cooldown)
-    vals: List[float] = []
-    for i in trig_pos:
-        j = min(i + horizon, len(close) - 1)
-        vals.append(forward_mdd(close[i: j + 1]))
-
-    gate = {"field": "z", "op": "<=", "value": float(z_thresh)}
-    return _summarize(
-        values=vals,
-        metric="forward_mdd",
-        interpretation="<=0; closer to 0 is less pain; more negative is deeper drawdown",
-        z_thresh=z_thresh,
-        horizon=horizon,
-        cooldown=cooldown,
-        gate=gate,
-        condition=gate,  # backward compatible
-    )
+    g = EventGate("price_mdd", "z", "<=", float(z_thresh), "mdd", horizon, cooldown)
+    return evaluate_gates(df_bb, [g])[g.name]
 
 
 def conditional_stats_runup_le(df_bb: pd.DataFrame, z_thresh: float, horizon: int, cooldown: int) -> Dict[str, Any]:
-    df = df_bb.dropna(subset=["z", "close"]).copy()
-    close = df["close"].to_numpy(dtype=float)
-    z = df["z"].to_numpy(dtype=float)
-
-    trig_pos = _pick_event_positions_le(z=z, thresh=z_thresh, cooldown=cooldown)
-    vals: List[float] = []
-    for i in trig_pos:
-        j = min(i + horizon, len(close) - 1)
-        vals.append(forward_max_runup(close[i: j + 1]))
-
-    gate = {"field": "z", "op": "<=", "value": float(z_thresh)}
-    return _summarize(
-        values=vals,
-        metric="forward_max_runup",
-        interpretation=">=0; larger means bigger spike risk",
-        z_thresh=z_thresh,
-        horizon=horizon,
-        cooldown=cooldown,
-        gate=gate,
-        condition=gate,
-    )
+    g = EventGate("runup_le", "z", "<=", float(z_thresh), "runup", horizon, cooldown, ">=0; larger means bigger spike risk")
+    return evaluate_gates(df_bb, [g])[g.name]
 
 
 def conditional_stats_runup_ge(df_bb: pd.DataFrame, z_thresh: float, horizon: int, cooldown: int) -> Dict[str, Any]:
-    df = df_bb.dropna(subset=["z", "close"]).copy()
-    close = df["close"].to_numpy(dtype=float)
-    z = df["z"].to_numpy(dtype=float)
-
-    trig_pos = _pick_event_positions_ge(z=z, thresh=z_thresh, cooldown=cooldown)
-    vals: List[float] = []
-    for i in trig_pos:
-        j = min(i + horizon, len(close) - 1)
-        vals.append(forward_max_runup(close[i: j + 1]))
-
-    gate = {"field": "z", "op": ">=", "value": float(z_thresh)}
-    return _summarize(
-        values=vals,
-        metric="forward_max_runup",
-        interpretation=">=0; larger means further spike continuation risk",
-        z_thresh=z_thresh,
-        horizon=horizon,
-        cooldown=cooldown,
-        gate=gate,
-        condition=gate,
-    )
+    g = EventGate("runup_ge", "z", ">=", float(z_thresh), "runup", horizon, cooldown)
+    return evaluate_gates(df_bb, [g])[g.name]
 
 
 def conditional_stats_runup_pos_ge(df_bb: pd.DataFrame, pos_thresh: float, horizon: int, cooldown: int) -> Dict[str, Any]:
-    df = df_bb.dropna(subset=["position_in_band", "close"]).copy()
-    close = df["close"].to_numpy(dtype=float)
-    pos = df["position_in_band"].to_numpy(dtype=float)
-
-    trig_pos = _pick_event_positions_pos_ge(pos_arr=pos, thresh=pos_thresh, cooldown=cooldown)
-    vals: List[float] = []
-    for i in trig_pos:
-        j = min(i + horizon, len(close) - 1)
-        vals.append(forward_max_runup(close[i: j + 1]))
-
-    gate = {"field": "position_in_band", "op": ">=", "value": float(pos_thresh)}
-    return _summarize(
-        values=vals,
-        metric="forward_max_runup",
-        interpretation=">=0; larger means further spike continuation risk",
-        z_thresh=None,  # will be rendered as "NA" due to gate.field != "z"
-        horizon=horizon,
-        cooldown=cooldown,
-        gate=gate,
-        condition=gate,  # backward compatible
-    )
+    g = EventGate("runup_pos_ge", "position_in_band", ">=", float(pos_thresh), "runup", horizon, cooldown)
+    return evaluate_gates(df_bb, [g])[g.name]
 
 
 # ---------------------------
@@ -728,7 +741,7 @@ def build_snippet(
 # CLI / Main
 # ---------------------------
 
-def parse_args() -> argparse.Namespace:
+def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="Nasdaq BB(60,2) monitor (logclose): QQQ + optional VXN (Cboe/FRED)",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -761,31 +774,61 @@ def parse_args() -> argparse.Namespace:
 
     p.add_argument("--horizon", type=int, default=20)
     p.add_argument("--cooldown", type=int, default=20)
+    p.add_argument(
+        "--extra_gate",
+        action="append",
+        default=[],
+        help="Extra conditional simulation (repeatable): series:name:field<op>value[:horizon[:cooldown]], "
+        "series=price|vxn, field=z|pos. Evaluated in the same pass; written to historical_simulation_extra.",
+    )
 
     # Output dir (compat: accept --cache_dir as alias)
     p.add_argument("--out_dir", "--cache_dir", dest="out_dir", default="nasdaq_bb_cache")
     p.add_argument("--quiet", action="store_true")
 
-    return p.parse_args()
+    return p
+
+
+def parse_args() -> argparse.Namespace:
+    return build_parser().parse_args()
 
 
 def main() -> int:
-    args = parse_args()
+    ap = build_parser()
+    args = ap.parse_args()
     use_log = bool(args.use_log) and (not bool(args.no_log))
     params = BBParams(length=args.bb_len, k=args.bb_k, use_log=use_log, ddof=args.ddof)
 
+    # gates are built (and checked) before any fetch: bad --extra_gate input is a usage error
+    try:
+        extra = [parse_extra_gate(sp, args.horizon, args.cooldown) for sp in (args.extra_gate or [])]
+        price_extra = [g for series, g in extra if series == "price"]
+        vxn_extra = [g for series, g in extra if series == "vxn"]
+
+        price_gates = [
+            EventGate("price_mdd", "z", "<=", float(args.price_sim_z_thresh), "mdd", args.horizon, args.cooldown),
+        ] + price_extra
+        vxn_gates = [
+            EventGate("C_poswatch", "position_in_band", ">=", float(args.pos_watch_threshold), "runup", args.horizon, args.cooldown),
+            EventGate(
+                "A_lowvol", "z", "<=", float(args.z_thresh_low), "runup", args.horizon, args.cooldown,
+                ">=0; larger means bigger spike risk",
+            ),
+            EventGate("B_highvol", "z", ">=", float(args.z_thresh_high), "runup", args.horizon, args.cooldown),
+        ] + vxn_extra
+        check_gates(price_gates)
+        check_gates(vxn_gates)
+    except ValueError as e:
+        ap.error(str(e))
+
     _ensure_dir(args.out_dir)
 
     # PRICE: QQQ
     price_df, price_meta = fetch_stooq_daily(args.price_ticker)
     price_bb = compute_bollinger(price_df, params)
 
-    price_hist = conditional_stats_price_mdd(
-        price_bb,
-        z_thresh=float(args.price_sim_z_thresh),
-        horizon=args.horizon,
-        cooldown=args.cooldown,
-    )
+    price_res = evaluate_gates(price_bb, price_gates)
+    price_hist = price_res["price_mdd"]
 
     price_snippet = build_snippet(
         name=f"QQQ_BB(len={params.length},k={params.k},log={params.use_log})",
@@ -795,6 +838,8 @@ def main() -> int:
         series_kind="price",
         hist=price_hist,
     )
+    if price_extra:
+        price_snippet["historical_simulation_extra"] = {g.name: price_res[g.name] for g in price_extra}
 
     # New canonical filename (fixed)
     price_json_path = os.path.join(args.out_dir, "snippet_price_qqq.json")
@@ -848,30 +893,8 @@ def main() -> int:
 
         vxn_bb = compute_bollinger(vxn_df, params)
 
-        vxn_hist_poswatch = conditional_stats_runup_pos_ge(
-            vxn_bb,
-            pos_thresh=float(args.pos_watch_threshold),
-            horizon=args.horizon,
-            cooldown=args.cooldown,
-        )
-        vxn_hist_low = conditional_stats_runup_le(
-            vxn_bb,
-            z_thresh=args.z_thresh_low,
-            horizon=args.horizon,
-            cooldown=args.cooldown,
-        )
-        vxn_hist_high = conditional_stats_runup_ge(
-            vxn_bb,
-            z_thresh=args.z_thresh_high,
-            horizon=args.horizon,
-            cooldown=args.cooldown,
-        )
-
-        vxn_hist = {
-            "C_poswatch": vxn_hist_poswatch,
-            "A_lowvol": vxn_hist_low,
-            "B_highvol": vxn_hist_high,
-        }
+        vxn_res = evaluate_gates(vxn_bb, vxn_gates)
+        vxn_hist = {k: vxn_res[k] for k in ("C_poswatch", "A_lowvol", "B_highvol")}
 
         vxn_snippet = build_snippet(
             name=f"VXN_BB(len={params.length},k={params.k},log={params.use_log})",
@@ -881,6 +904,8 @@ def main() -> int:
             series_kind="vol",
             hist=vxn_hist,
         )
+        if vxn_extra:
+            vxn_snippet["historical_simulation_extra"] = {g.name: vxn_res[g.name] for g in vxn_extra}
 
         vxn_json_path = os.path.join(args.out_dir, "snippet_vxn.json")
         with open(vxn_json_path, "w", encoding="utf-8") as f:
@@ -8,6 +8,17 @@ from pathlib import Path
 
 
 MANIFEST_PATH = Path("market_cache/manifest.json")
+DQ_STATE_PATH = Path("market_cache/dq_state.json")
+
+
+def load_http_cache_summary() -> dict:
+    """Copy dq_state.json["http_cache"] (hits/misses per source) into the manifest; {} if absent."""
+    try:
+        obj = json.loads(DQ_STATE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    hc = obj.get("http_cache") if isinstance(obj, dict) else None
+    return hc if isinstance(hc, dict) else {}
 
 
 def utc_now_iso_z() -> str:
@@ -67,6 +78,10 @@ def main() -> None:
     else:
         obj = build_manifest(repo, data_sha)
 
+    http_cache = load_http_cache_summary()
+    if http_cache:
+        obj["http_cache"] = http_cache
+
     MANIFEST_PATH.write_text(json.dumps(obj, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
     print("[OK] patched market_cache/manifest.json (pinned + paths, include dq_state_json)")
 
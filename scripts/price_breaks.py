@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/price_breaks.py
+
+Shared (numpy-vectorized) ratio-based price break detection and horizon-aware contamination masks for:
+- scripts/tw0050_bb60_k2_forwardmdd20.py          (detect_price_breaks / build_clean_entry_mask)
+- scripts/backtest_tw0050_leverage_mvp.py         (detect_breaks_from_price / build_entry_forbidden_mask)
+- scripts/backtest_tw0050_tactical_cash.py        (detect_breaks_from_price)
+- scripts/build_tw0050_forward_return_conditional.py (_detect_break_positions / _contam_mask_from_breaks)
+- scripts/forward_cube.py
+
+Break rule (one definition everywhere):
+  is_break[j] = True  <=>  prices[j-1], prices[j] finite and > 0  and
+                           (prices[j]/prices[j-1] >= ratio_hi  or  <= ratio_lo)
+  j = 0 is never a break.
+
+Contamination (break j, look-back h, optional clear days c):
+  entries t in [j-h, j+c-1], clipped to [0, n-1]
+  - c = 0 : forward windows prices[t+1..t+h] that contain the j-1 -> j transition (t < j <= t+h)
+  - c > 0 : additionally block the c entries starting at j (backtest z_clear_days)
+
+Edge handling that used to differ between the callers (now unified, see tools/check_price_breaks.py):
+- the forward-return builder used strict > / <, the others >= / <=
+- the leverage / tactical backtests counted a non-positive current price as a break
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+
+def detect_break_flags(prices: np.ndarray, ratio_hi: float, ratio_lo: float) -> np.ndarray:
+    """Boolean array length n; True at j when the j-1 -> j transition is a ratio break."""
+    p = np.asarray(prices, dtype=float)
+    n = int(p.shape[0])
+    out = np.zeros(n, dtype=bool)
+    if n < 2:
+        return out
+    p0 = p[:-1]
+    p1 = p[1:]
+    valid = np.isfinite(p0) & np.isfinite(p1) & (p0 > 0.0) & (p1 > 0.0)
+    ratio = np.full(n - 1, np.nan, dtype=float)
+    ratio[valid] = p1[valid] / p0[valid]
+    out[1:] = valid & ((ratio >= float(ratio_hi)) | (ratio <= float(ratio_lo)))
+    return out
+
+
+def break_positions(prices: np.ndarray, ratio_hi: float, ratio_lo: float) -> np.ndarray:
+    """Sorted int64 indices j with is_break[j]."""
+    return np.flatnonzero(detect_break_flags(prices, ratio_hi, ratio_lo)).astype(np.int64)
+
+
+def contamination_mask(n: int, break_pos: Iterable[int], horizon: int, clear_days: int = 0) -> np.ndarray:
+    """True for entries t in [j-horizon, j+clear_days-1] for any break j (clipped to [0, n-1])."""
+    n = int(n)
+    if n <= 0:
+        return np.zeros(max(n, 0), dtype=bool)
+    j = np.asarray(list(break_pos) if not isinstance(break_pos, np.ndarray) else break_pos, dtype=np.int64)
+    if j.size == 0:
+        return np.zeros(n, dtype=bool)
+    lo = np.maximum(j - max(int(horizon), 0), 0)
+    hi = np.minimum(j + max(int(clear_days), 0), n)  # exclusive
+    keep = lo < hi
+    if not np.any(keep):
+        return np.zeros(n, dtype=bool)
+    delta = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(delta, lo[keep], 1)
+    np.add.at(delta, hi[keep], -1)
+    return np.cumsum(delta[:-1]) > 0
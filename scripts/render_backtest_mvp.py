@@ -6,6 +6,17 @@ render_backtest_mvp.py
 
 Render backtest_tw0050_leverage_mvp suite json (lite or full) into a compact Markdown report.
 
+v15 (2026-10-16):
+- ADD(perf): equity evidence/DQ reads the run's columnar equity_curves.<tag>.npz ("equity_curve_npz" in the
+  suite JSON, backtest v26.14 --equity_curve_format npz|both). Columns are memory-mapped (one file for all
+  strategies, no CSV parsing) and each strategy's series is loaded once for DQ + evidence.
+  Falls back to the per-strategy CSV when the npz is absent.
+
+v14 (2026-10-16):
+- FIX(DQ): equity CSV lookup prefers the strategy's own "equity_curve_csv" from the suite JSON.
+  backtest v26.13+ keeps older equity_curve.<tag>__<sid>.csv files (LRU) instead of deleting them, so the
+  glob alone could pick a stale tag. The glob remains the fallback.
+
 v13 (2026-02-24):
 - ADD(DQ): compare JSON post_neg_days vs equity CSV post neg_days_count (date >= post_start_date)
   and mark DQ_MISMATCH when they differ.
@@ -43,8 +54,10 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from equity_curve_store import CurveStore, open_curves
 
-SCRIPT_FINGERPRINT = "render_backtest_mvp@2026-02-24.v13.dq_post_neg_days_vs_equity_csv"
+
+SCRIPT_FINGERPRINT = "render_backtest_mvp@2026-10-16.v15.equity_npz_mmap"
 
 
 # =========================
@@ -282,6 +295,8 @@ def _mk_row(strat: Dict[str, Any]) -> Dict[str, Any]:
         "suite_hard_fail": suite_hard_fail,
         "entry_mode": entry_mode,
         "L": L,
+        "equity_curve_csv": strat.get("equity_curve_csv"),
+        "equity_curve_npz": strat.get("equity_curve_npz"),
         **full,
         **post,
         "post_gonogo": gg.get("decision"),
@@ -493,9 +508,13 @@ def _always_vs_trend_table(rows: List[Dict[str, Any]], trend_rule: str) -> List[
 # =========================
 # suite_hard_fail evidence + DQ from equity CSV (best-effort)
 # =========================
-def _find_equity_csv(in_json_path: str, strategy_id: str) -> Optional[str]:
+def _find_equity_csv(in_json_path: str, strategy_id: str, preferred: Optional[str] = None) -> Optional[str]:
     base_dir = os.path.dirname(os.path.abspath(in_json_path)) or "."
     sid = str(strategy_id)
+    if preferred:
+        p0 = os.path.join(base_dir, os.path.basename(str(preferred)))
+        if os.path.isfile(p0):
+            return p0
     pats = [
         os.path.join(base_dir, f"equity_curve.*__{sid}.csv"),
         os.path.join(base_dir, f"*equity_curve*__{sid}.csv"),
@@ -533,6 +552,52 @@ def _read_equity_csv_dates_and_equity(path: str) -> Tuple[List[str], List[float]
     return dates, eqs
 
 
+_CURVE_STORES: Dict[str, Optional[CurveStore]] = {}
+
+
+def _read_equity_npz_dates_and_equity(path: str, strategy_id: str) -> Tuple[List[str], List[float]]:
+    """Same contract as the CSV reader (rows with non-finite equity dropped); the store is opened once per file."""
+    if path not in _CURVE_STORES:
+        try:
+            _CURVE_STORES[path] = open_curves(path)
+        except Exception:
+            _CURVE_STORES[path] = None
+    st = _CURVE_STORES[path]
+    if st is None or not st.has(strategy_id):
+        return [], []
+    eq = np.asarray(st.column(strategy_id, "equity"), dtype=float)
+    ok = np.isfinite(eq)
+    dates = np.datetime_as_string(st.dates[ok], unit="D").tolist()
+    return dates, eq[ok].tolist()
+
+
+def _load_equity_series(in_json_path: str, r: Dict[str, Any]) -> Tuple[Optional[str], List[str], List[float]]:
+    """
+    v15: (source, dates, equity) for a row; prefers the run's npz, falls back to the strategy CSV.
+    source is "<npz path>#<strategy_id>" or the CSV path (None if neither exists). Cached on the row.
+    """
+    hit = r.get("_equity_series")
+    if hit is not None:
+        return hit
+    sid = _fmt_str(r.get("id"))
+    out: Tuple[Optional[str], List[str], List[float]] = (None, [], [])
+    npz = r.get("equity_curve_npz")
+    if npz:
+        base_dir = os.path.dirname(os.path.abspath(in_json_path)) or "."
+        npz_path = os.path.join(base_dir, os.path.basename(str(npz)))
+        if os.path.isfile(npz_path):
+            dates, eqs = _read_equity_npz_dates_and_equity(npz_path, sid)
+            if dates:
+                out = (f"{npz_path}#{sid}", dates, eqs)
+    if out[0] is None:
+        csv_path = _find_equity_csv(in_json_path, sid, r.get("equity_curve_csv"))
+        if csv_path:
+            dates, eqs = _read_equity_csv_dates_and_equity(csv_path)
+            out = (csv_path, dates, eqs)
+    r["_equity_series"] = out
+    return out
+
+
 def _equity_evidence_from_series(dates: List[str], eqs: List[float], date_ge: Optional[str] = None) -> Dict[str, Any]:
     """
     Compute:
@@ -580,9 +645,8 @@ def _attach_equity_dq_fields(in_json_path: str, rows: List[Dict[str, Any]]) -> N
       - dq_post_neg_days_detail
     """
     for r in rows:
-        sid = _fmt_str(r.get("id"))
         post_start = _fmt_str(r.get("post_start_date"))
-        csv_path = _find_equity_csv(in_json_path, sid)
+        csv_path, dates, eqs = _load_equity_series(in_json_path, r)
         r["equity_csv_path"] = csv_path
 
         if not csv_path:
@@ -590,7 +654,6 @@ def _attach_equity_dq_fields(in_json_path: str, rows: List[Dict[str, Any]]) -> N
             r["dq_post_neg_days_detail"] = "equity_csv_not_found"
             continue
 
-        dates, eqs = _read_equity_csv_dates_and_equity(csv_path)
         if not dates:
             r["dq_post_neg_days"] = "N/A"
             r["dq_post_neg_days_detail"] = "equity_csv_unreadable"
@@ -625,16 +688,14 @@ def _suite_hard_fail_evidence_block(in_json_path: str, r: Dict[str, Any]) -> Lis
     Includes v13 DQ line.
     """
     lines: List[str] = []
-    sid = _fmt_str(r.get("id"))
     post_start = _fmt_str(r.get("post_start_date"))
-    csv_path = _find_equity_csv(in_json_path, sid)
+    csv_path, dates, eqs = _load_equity_series(in_json_path, r)
 
     lines.append("- suite_hard_fail_evidence (from equity CSV, best-effort):")
     if not csv_path:
         lines.append("  - status: `N/A` (equity csv not found)")
         return lines
 
-    dates, eqs = _read_equity_csv_dates_and_equity(csv_path)
     if not dates:
         lines.append(f"  - equity_csv: `{csv_path}`")
         lines.append("  - status: `N/A` (could not read date/equity columns)")
@@ -85,6 +85,13 @@ REPORTING (noise-control):
 - _MMDD_RE accepts both MM/DD and MM-DD; 02/29 tag recognizes both separators.
 - BIG_NUMBER_ABS constant replaces magic number in _fmt threshold.
 - DQ mismatch messages include full context (latest/derived/UsedDate/anchor_idx).
+
+=== v2026-10-16 columnar store ===
+- Series (turnover/close/pct_change/amplitude/vol_mult_20) are read from the precomputed arrays in
+  roll25_store.npz + roll25_derived.npz (scripts/roll25_store.py; same definitions as the functions
+  below) when the store is readable, its derived sidecar matches it, and it is not older than the
+  newest roll25.json row. Otherwise the rows are parsed and derived here as before.
+  The source used is disclosed in Audit Notes.
 """
 
 from __future__ import annotations
@@ -103,6 +110,11 @@ try:
 except Exception:
     ZoneInfo = None  # type: ignore
 
+try:
+    import roll25_store  # needs numpy; the dict path below works without it
+except Exception:
+    roll25_store = None  # type: ignore
+
 
 # ---------------- constants ----------------
 EPSILON = 1e-9
@@ -625,6 +637,42 @@ def _series_vol_multiplier_20(
     return out, diag
 
 
+def _load_roll25_store(
+    store_path: str,
+    derived_path: str,
+    newest_row_date: Optional[date],
+) -> Tuple[Any, str]:
+    """
+    (store, note). store is None (use roll25.json rows) unless the columnar store and its derived
+    sidecar load cleanly and the store covers the newest parsed roll25 row.
+    """
+    if roll25_store is None:
+        return None, "roll25_store unavailable (import failed)"
+    st = roll25_store.load_store(store_path, derived_path)
+    if st is None:
+        return None, f"store missing/unreadable: {store_path}"
+    if st.derived is None:
+        return None, f"derived sidecar missing or not built from this store: {derived_path}"
+    if len(st) == 0:
+        return None, "store is empty"
+    if newest_row_date is not None and st.last_date < newest_row_date.isoformat():
+        return None, f"store last_date={st.last_date} older than roll25 newest={newest_row_date.isoformat()}"
+    return st, f"{store_path} rows={len(st)} range={st.dates_iso[0]}..{st.last_date}"
+
+
+def _store_vol_multiplier_diag(st: Any) -> Dict[str, Any]:
+    # same keys as _series_vol_multiplier_20's diag, counted from the stored per-row NA codes
+    codes = st.series("vol_multiplier_20_na").tolist()
+    diag: Dict[str, Any] = {
+        "win": roll25_store.VOL_WIN,
+        "min_points": roll25_store.VOL_MIN_POINTS,
+        "len_turnover": len(codes),
+    }
+    for k, name in enumerate(roll25_store.VOL_NA_CODES):
+        diag[name] = codes.count(k)
+    return diag
+
+
 def _truncate_to_common_length(*series: List[float]) -> List[List[float]]:
     m = min(len(s) for s in series) if series else 0
     return [s[:m] for s in series]
@@ -1015,6 +1063,10 @@ def main() -> int:
     ap.add_argument("--latest", required=True)
     ap.add_argument("--roll25", required=True)
     ap.add_argument("--out", required=True)
+    ap.add_argument("--store", default=os.getenv("ROLL25_STORE", ""),
+                    help="columnar store npz (default: roll25_store.npz next to --roll25)")
+    ap.add_argument("--derived", default=os.getenv("ROLL25_DERIVED", ""),
+                    help="derived-series npz (default: roll25_derived.npz next to --store)")
 
     ap.add_argument("--amp-mismatch-abs-threshold", type=float,
                     default=float(os.getenv("AMP_MISMATCH_ABS_THRESHOLD", "0.01")))
@@ -1103,6 +1155,20 @@ def main() -> int:
     rows = [r for _, r in keyed]                  # NEWEST-FIRST
     row_dates = [d for d, _ in keyed]             # NEWEST-FIRST
 
+    # prefer the columnar store (full history + precomputed series) when it is current
+    store_path = args.store or os.path.join(os.path.dirname(args.roll25) or ".", "roll25_store.npz")
+    derived_path = args.derived or os.path.join(os.path.dirname(store_path) or ".", "roll25_derived.npz")
+    st, store_note = _load_roll25_store(store_path, derived_path, row_dates[0] if row_dates else None)
+    if st is not None:
+        rows = st.items()
+        row_dates = [date.fromisoformat(d) for d in reversed(st.dates_iso)]
+        sort_diag = {
+            "total_rows": len(rows),
+            "kept_rows": len(rows),
+            "dropped_rows": 0,
+            "source": "roll25_store",
+        }
+
     dq_notes: List[str] = []
     extra_audit_notes: List[str] = []  # for non-DQ but audit clarity
 
@@ -1130,14 +1196,25 @@ def main() -> int:
                 anchor_idx = i
                 break
 
-    turnover_nf = _series_turnover(rows)
-    close_nf = _series_close(rows)
-    amp_nf = _series_amplitude_pct(rows)
+    if st is not None:
+        # precomputed arrays are oldest-first; reverse to the NEWEST-FIRST contract
+        turnover_nf = st.series("trade_value")[::-1].tolist()
+        close_nf = st.series("close")[::-1].tolist()
+        amp_nf = st.series("amplitude_pct_prevclose")[::-1].tolist()
+        pctchg_nf = st.series("pct_change")[::-1].tolist()
+        volmult_nf_raw = st.series("vol_multiplier_20")[::-1].tolist()
+        volmult_diag = _store_vol_multiplier_diag(st)
+        extra_audit_notes.append(f"ROLL25 series source: columnar store ({store_note}).")
+    else:
+        turnover_nf = _series_turnover(rows)
+        close_nf = _series_close(rows)
+        amp_nf = _series_amplitude_pct(rows)
 
-    pctchg_nf = _series_pct_change_close_from_close(close_nf)
+        pctchg_nf = _series_pct_change_close_from_close(close_nf)
 
-    # volmult returns diag
-    volmult_nf_raw, volmult_diag = _series_vol_multiplier_20(turnover_nf, min_points=15, win=20)
+        # volmult returns diag
+        volmult_nf_raw, volmult_diag = _series_vol_multiplier_20(turnover_nf, min_points=15, win=20)
+        extra_audit_notes.append(f"ROLL25 series source: roll25 rows (store not used: {store_note}).")
     volmult_nf = volmult_nf_raw
 
     # --- PATCH: TRUNCATION WARNING (no silent truncation) ---
@@ -9,6 +9,9 @@ Pure renderer (audit-first):
 - Does NOT recompute any stats/quantiles/returns.
 - NA-safe: missing fields => prints "N/A".
 - Optional: read stats_latest.json only to display alignment hints (no recompute).
+- v4: bucket tables come from the builder's compact forward_return_conditional.table (v8_0+) when
+  present (hier by_bucket / min_audit_by_bucket as fallback); extra horizons / bucket schemes in
+  the table get their own CLEAN section.
 
 Example:
   python scripts/render_tw0050_forward_return_conditional_report.py \
@@ -27,7 +30,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 
 # ===== Audit stamp =====
-BUILD_SCRIPT_FINGERPRINT = "render_tw0050_forward_return_conditional_report@2026-02-21.v3"
+BUILD_SCRIPT_FINGERPRINT = "render_tw0050_forward_return_conditional_report@2026-10-16.v4"
 
 
 def _read_json(path: str) -> Dict[str, Any]:
@@ -319,7 +322,81 @@ def _render_self_check(frc: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def _render_horizon_block(hk: str, hv: Dict[str, Any]) -> str:
+def _table_index(frc: Dict[str, Any]) -> Dict[Tuple[str, int, str], List[Dict[str, Any]]]:
+    """forward_return_conditional.table -> {(scheme, horizon, mode): [row dict, ...]} (empty if absent)."""
+    tbl = frc.get("table") if isinstance(frc.get("table"), dict) else {}
+    cols = tbl.get("columns") if isinstance(tbl.get("columns"), list) else []
+    rows = tbl.get("rows") if isinstance(tbl.get("rows"), list) else []
+    out: Dict[Tuple[str, int, str], List[Dict[str, Any]]] = {}
+    for r in rows:
+        if not isinstance(r, list) or len(r) != len(cols):
+            continue
+        d = dict(zip(cols, r))
+        try:
+            key = (str(d.get("scheme")), int(d.get("horizon")), str(d.get("mode")))
+        except Exception:
+            continue
+        d["bucket_canonical"] = d.get("bucket")
+        out.setdefault(key, []).append(d)
+    return out
+
+
+def _mode_obj_with_table(obj: Dict[str, Any], rows: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Table rows carry both the summary and the min-audit columns; hier obj keeps definition/n_total."""
+    if not rows:
+        return obj
+    merged = dict(obj)
+    merged["by_bucket"] = rows
+    merged["min_audit_by_bucket"] = rows
+    if merged.get("n_total") is None:
+        merged["n_total"] = sum(int(r.get("n") or 0) for r in rows)
+    return merged
+
+
+def _render_table_extras(frc: Dict[str, Any], tix: Dict[Tuple[str, int, str], List[Dict[str, Any]]]) -> str:
+    lines = []
+    lines.append("## Extra horizons / bucket schemes (CLEAN, from table)")
+    primary = str(frc.get("scheme"))
+    main_h = set()
+    for hk in (frc.get("horizons") or {}).keys():
+        try:
+            main_h.add(int(str(hk).replace("D", "")))
+        except Exception:
+            pass
+    keys = sorted(k for k in tix.keys() if k[2] == "clean" and not (k[0] == primary and k[1] in main_h))
+    if not keys:
+        return ""
+
+    headers = ["bucket", "n", "hit_rate", "p90", "p50", "p25", "p10", "p05", "min", "min_entry_date"]
+    for scheme, h, _ in keys:
+        rows = []
+        for r in tix[(scheme, h, "clean")]:
+            rows.append(
+                [
+                    _na(r.get("bucket")),
+                    _fmt_int(r.get("n")),
+                    _fmt_pct(r.get("hit_rate"), 2),
+                    _fmt_pct(r.get("p90"), 2),
+                    _fmt_pct(r.get("p50"), 2),
+                    _fmt_pct(r.get("p25"), 2),
+                    _fmt_pct(r.get("p10"), 2),
+                    _fmt_pct(r.get("p05"), 2),
+                    _fmt_pct(r.get("min"), 2),
+                    _na(r.get("min_entry_date")),
+                ]
+            )
+        lines.append("")
+        lines.append(f"### {scheme} / {h}D")
+        lines.append(_table(headers, rows))
+    return "\n".join(lines)
+
+
+def _render_horizon_block(
+    hk: str,
+    hv: Dict[str, Any],
+    tix: Optional[Dict[Tuple[str, int, str], List[Dict[str, Any]]]] = None,
+    scheme: Optional[str] = None,
+) -> str:
     lines = []
     lines.append(f"## Horizon {hk}")
 
@@ -331,6 +408,13 @@ def _render_horizon_block(hk: str, hv: Dict[str, Any]) -> str:
 
     clean = hv.get("clean") if isinstance(hv.get("clean"), dict) else {}
     raw = hv.get("raw") if isinstance(hv.get("raw"), dict) else {}
+    if tix:
+        try:
+            h = int(hk.replace("D", ""))
+            clean = _mode_obj_with_table(clean, tix.get((str(scheme), h, "clean")))
+            raw = _mode_obj_with_table(raw, tix.get((str(scheme), h, "raw")))
+        except ValueError:
+            pass
 
     def _summary_table(obj: Dict[str, Any], title: str, is_primary: bool) -> str:
         sub = []
@@ -518,6 +602,7 @@ def main() -> None:
     sections.append(_render_current(cur))
 
     horizons = frc.get("horizons") if isinstance(frc.get("horizons"), dict) else {}
+    tix = _table_index(frc)
     if horizons:
         def _hkey(k: str) -> Tuple[int, str]:
             try:
@@ -528,10 +613,14 @@ def main() -> None:
         for hk in sorted(horizons.keys(), key=_hkey):
             hv = horizons.get(hk)
             if isinstance(hv, dict):
-                sections.append(_render_horizon_block(hk, hv))
+                sections.append(_render_horizon_block(hk, hv, tix=tix, scheme=scheme))
     else:
         sections.append("## Horizons\n(no horizons found)")
 
+    extras = _render_table_extras(frc, tix) if tix else ""
+    if extras:
+        sections.append(extras)
+
     # Render self-check (now detailed)
     sections.append(_render_self_check(frc))
 
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/roll25_store.py
+
+Columnar roll25 history (TWSE index close/high/low/change/trade_value, one row per trading day) plus a
+derived-series sidecar that is maintained incrementally. roll25_cache/roll25.json stays the capped
+(STORE_CAP) newest-first list of dicts for existing readers; the store keeps the full history.
+
+Files (compressed .npz, JSON meta string, no pickle; writes go to a temp file + os.replace; the bytes
+depend only on the content: no wall-clock time in meta, fixed zip member timestamps):
+
+    roll25_cache/roll25_store.npz
+        date          datetime64[D] (n,)  oldest-first, unique
+        close/high/low/change/trade_value  float64 (n,)  NaN = missing
+        meta          format, rows, first/last date, digest (sha1 over date + columns)
+
+    roll25_cache/roll25_derived.npz  (aligned to the store rows; meta.store_digest ties it to one store;
+                                      not committed, kept in actions/cache and rebuilt from the store)
+        pct_change               (close[i] - close[i-1]) / close[i-1] * 100    strict row adjacency
+        amplitude_pct            (high - low) / close[i-1] * 100                 update_twse_sidecar stats
+        amplitude_pct_prevclose  (high - low) / |close - change| * 100, fallback |close|
+                                 (render_roll25_report_md)
+        chart.pct_change         100 * (close / prev_close - 1)      make_roll25_cache_charts per-row fill:
+        chart.amplitude_pct      100 * (high - low) / prev_close     prev_close = close - change, else the
+                                                                     previous row's close (amplitude: else close)
+        vol_multiplier_20        trade_value[i] / avg(valid trade_value[i-20 .. i-1]), >= 15 valid points
+        vol_multiplier_20_na     int8 reason code, see VOL_NA_CODES
+        <series>.z<w>, <series>.p<w>
+                                 for series in STAT_SERIES, w in STAT_WINDOWS: z (population std) and
+                                 tie-aware percentile of row i within the last w valid values <= row i;
+                                 NaN when the row value is missing (or std == 0 for z)
+
+Every derived row depends only on rows <= i, so an update recomputes rows from the first row whose
+date or raw values changed (usually just the appended/healed tail); rows before it are copied from the
+stored sidecar. Anything else (no sidecar, store digest mismatch, changed parameters) -> full rebuild.
+
+The z/p loop uses the same formulas and summation order (newest-first window) as
+update_twse_sidecar's previous per-call stats, so stats_latest values are unchanged.
+
+Usage:
+    from roll25_store import load_store, update_store
+    st, info = update_store(STORE_PATH, DERIVED_PATH, items_newest_first)
+    i = st.index_of("2026-03-13")
+    z60 = st.series("close.z60")[i]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import zipfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STORE_FORMAT = "roll25_store_v1"
+DERIVED_FORMAT = "roll25_derived_v1"
+
+STORE_NAME = "roll25_store.npz"
+DERIVED_NAME = "roll25_derived.npz"
+
+FIELDS = ("close", "high", "low", "change", "trade_value")
+STAT_SERIES = ("close", "trade_value", "pct_change", "amplitude_pct")
+STAT_WINDOWS = (60, 252)
+
+VOL_WIN = 20
+VOL_MIN_POINTS = 15
+EPSILON = 1e-9
+
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# index = code stored in vol_multiplier_20_na; names match render_roll25_report_md's window diag
+VOL_NA_CODES = ("computed", "na_invalid_a", "na_no_tail", "na_insufficient_window", "na_zero_avg")
+
+
+def store_paths(cache_dir: str) -> Tuple[str, str]:
+    return os.path.join(cache_dir, STORE_NAME), os.path.join(cache_dir, DERIVED_NAME)
+
+
+def _num(x: Any) -> float:
+    # same accepted inputs as update_twse_sidecar._safe_float; missing -> NaN
+    if x is None:
+        return math.nan
+    if isinstance(x, (int, float)):
+        return float(x)
+    s = str(x).strip().replace(",", "")
+    if s in ("", "NA", "na", "null", "-", "—"):
+        return math.nan
+    try:
+        return float(s)
+    except Exception:
+        return math.nan
+
+
+def _digest(dates: np.ndarray, cols: Dict[str, np.ndarray]) -> str:
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(dates.astype("datetime64[D]").astype(np.int64)).tobytes())
+    for f in FIELDS:
+        h.update(f.encode("ascii"))
+        h.update(np.ascontiguousarray(cols[f], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def columns_from_items(items: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    roll25 dict rows (any order) -> (dates datetime64[D], {field: float64}) oldest-first.
+    Rows without a YYYY-MM-DD date are skipped; duplicate dates raise ValueError.
+    """
+    keyed: List[Tuple[str, Dict[str, Any]]] = []
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        d = str(it.get("date", "")).strip()
+        if len(d) != 10 or d[4] != "-" or d[7] != "-":
+            continue
+        keyed.append((d, it))
+    keyed.sort(key=lambda x: x[0])
+    ds = [d for d, _ in keyed]
+    if len(ds) != len(set(ds)):
+        raise ValueError("roll25 items contain duplicate dates")
+    dates = np.asarray(ds, dtype="datetime64[D]")
+    cols = {f: np.asarray([_num(it.get(f)) for _, it in keyed], dtype=np.float64) for f in FIELDS}
+    return dates, cols
+
+
+# ---------------- derived series ----------------
+
+def _window_z_p(xs: List[float], x: float) -> Tuple[float, float]:
+    # xs newest-first (update_twse_sidecar summation order)
+    n = len(xs)
+    mu = sum(xs) / n
+    sd = (sum((v - mu) ** 2 for v in xs) / n) ** 0.5
+    z = (x - mu) / sd if sd != 0 else math.nan
+    less = sum(1 for v in xs if v < x)
+    equal = sum(1 for v in xs if v == x)
+    return z, 100.0 * (less + 0.5 * equal) / n
+
+
+def _rolling_z_p(values: np.ndarray, win: int, start: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = int(values.shape[0])
+    z = np.full(n - start, np.nan)
+    p = np.full(n - start, np.nan)
+    ok = ~np.isnan(values)
+    valid = values[ok].tolist()
+    cnt = np.cumsum(ok)
+    for i in range(start, n):
+        if not ok[i]:
+            continue
+        k = int(cnt[i])
+        xs = valid[max(0, k - win):k][::-1]
+        z[i - start], p[i - start] = _window_z_p(xs, float(values[i]))
+    return z, p
+
+
+def _vol_multiplier_rows(tv: np.ndarray, start: int) -> Tuple[np.ndarray, np.ndarray]:
+    # render_roll25_report_md._series_vol_multiplier_20 on the oldest-first axis
+    n = int(tv.shape[0])
+    out = np.full(n - start, np.nan)
+    code = np.zeros(n - start, dtype=np.int8)
+    for i in range(start, n):
+        a = float(tv[i])
+        if not math.isfinite(a):
+            code[i - start] = 1
+            continue
+        if i == 0:
+            code[i - start] = 2
+            continue
+        w = [v for v in tv[max(0, i - VOL_WIN):i][::-1].tolist() if math.isfinite(v)]
+        if len(w) < VOL_MIN_POINTS:
+            code[i - start] = 3
+            continue
+        avg = sum(w) / len(w)
+        if abs(avg) <= EPSILON:
+            code[i - start] = 4
+            continue
+        out[i - start] = a / avg
+    return out, code
+
+
+def compute_derived_rows(cols: Dict[str, np.ndarray], start: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Derived columns for rows [start, n). Row i only reads rows <= i, so the tail slice is exact.
+    The ratio columns are O(n) vectorized and always built in full (z/p windows reach before start);
+    the Python loops (vol multiplier, z/p) only visit rows >= start.
+    """
+    c = cols["close"]
+    h = cols["high"]
+    lo = cols["low"]
+    prev = np.concatenate([[np.nan], c[:-1]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prev_ok = ~np.isnan(prev) & (prev != 0)
+        hl_ok = ~np.isnan(h) & ~np.isnan(lo)
+        pct = np.where(prev_ok & ~np.isnan(c), (c - prev) / prev * 100.0, np.nan)
+        amp = np.where(prev_ok & hl_ok, (h - lo) / prev * 100.0, np.nan)
+
+        pc = c - cols["change"]
+        use_pc = np.isfinite(pc) & (np.abs(pc) > EPSILON)
+        use_c = ~use_pc & np.isfinite(c) & (np.abs(c) > EPSILON)
+        denom = np.where(use_pc, np.abs(pc), np.where(use_c, np.abs(c), np.nan))
+        amp_pc = np.where(hl_ok, (h - lo) / denom * 100.0, np.nan)
+
+        cpc = np.where(np.isnan(pc), prev, pc)
+        cpc_ok = ~np.isnan(cpc) & (cpc != 0)
+        chart_pct = np.where(cpc_ok & ~np.isnan(c), 100.0 * (c / cpc - 1.0), np.nan)
+        cden = np.where(np.isnan(cpc), c, cpc)
+        chart_amp = np.where(hl_ok & ~np.isnan(cden) & (cden != 0), 100.0 * (h - lo) / cden, np.nan)
+
+    out: Dict[str, np.ndarray] = {
+        "pct_change": pct[start:],
+        "amplitude_pct": amp[start:],
+        "amplitude_pct_prevclose": amp_pc[start:],
+        "chart.pct_change": chart_pct[start:],
+        "chart.amplitude_pct": chart_amp[start:],
+    }
+    out["vol_multiplier_20"], out["vol_multiplier_20_na"] = _vol_multiplier_rows(cols["trade_value"], start)
+
+    full = {"close": c, "trade_value": cols["trade_value"], "pct_change": pct, "amplitude_pct": amp}
+    for s in STAT_SERIES:
+        for w in STAT_WINDOWS:
+            out[f"{s}.z{w}"], out[f"{s}.p{w}"] = _rolling_z_p(full[s], w, start)
+    return out
+
+
+def derived_columns() -> List[str]:
+    names = [
+        "pct_change",
+        "amplitude_pct",
+        "amplitude_pct_prevclose",
+        "chart.pct_change",
+        "chart.amplitude_pct",
+        "vol_multiplier_20",
+        "vol_multiplier_20_na",
+    ]
+    for s in STAT_SERIES:
+        for w in STAT_WINDOWS:
+            names += [f"{s}.z{w}", f"{s}.p{w}"]
+    return names
+
+
+def _derived_params() -> Dict[str, Any]:
+    return {
+        "stat_series": list(STAT_SERIES),
+        "stat_windows": list(STAT_WINDOWS),
+        "vol_win": VOL_WIN,
+        "vol_min_points": VOL_MIN_POINTS,
+    }
+
+
+# ---------------- store object ----------------
+
+class Roll25Store:
+    """Loaded store (+ derived sidecar when it matches the store digest); all arrays oldest-first."""
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        cols: Dict[str, np.ndarray],
+        meta: Dict[str, Any],
+        derived: Optional[Dict[str, np.ndarray]] = None,
+        derived_meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.dates = dates.astype("datetime64[D]")
+        self.cols = cols
+        self.meta = meta
+        self.derived = derived
+        self.derived_meta = derived_meta
+        self.dates_iso: List[str] = np.datetime_as_string(self.dates, unit="D").tolist()
+
+    def __len__(self) -> int:
+        return int(self.dates.shape[0])
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return self.dates_iso[-1] if self.dates_iso else None
+
+    def series(self, name: str) -> np.ndarray:
+        """Raw field (close/high/low/change/trade_value) or derived column."""
+        if name in self.cols:
+            return self.cols[name]
+        if self.derived is None:
+            raise KeyError(f"{name}: derived sidecar not loaded")
+        return self.derived[name]
+
+    def index_of(self, date_iso: str) -> Optional[int]:
+        i = self.asof_index(date_iso)
+        return i if i >= 0 and self.dates_iso[i] == date_iso else None
+
+    def asof_index(self, date_iso: str) -> int:
+        """Last row with date <= date_iso (-1 if none)."""
+        return int(np.searchsorted(self.dates, np.datetime64(date_iso, "D"), side="right")) - 1
+
+    def value(self, name: str, i: Optional[int]) -> Optional[float]:
+        if i is None or i < 0:
+            return None
+        v = float(self.series(name)[i])
+        return v if math.isfinite(v) else None
+
+    def count_valid(self, name: str, date_iso: str) -> int:
+        """Valid (non-NaN) values of a series at rows <= date_iso."""
+        i = self.asof_index(date_iso)
+        return int(np.count_nonzero(~np.isnan(self.series(name)[: i + 1]))) if i >= 0 else 0
+
+    def take_desc(self, name: str, date_iso: str, n: int) -> List[float]:
+        """Up to n valid values at rows <= date_iso, newest-first."""
+        i = self.asof_index(date_iso)
+        xs: List[float] = []
+        if i < 0:
+            return xs
+        a = self.series(name)
+        j = i
+        step = max(n, 32)
+        while j >= 0 and len(xs) < n:
+            chunk = a[max(0, j - step + 1): j + 1][::-1]
+            xs.extend(float(v) for v in chunk[~np.isnan(chunk)])
+            j -= step
+        return xs[:n]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """One row as a roll25.json-style dict (None for missing values)."""
+        out: Dict[str, Any] = {"date": self.dates_iso[i]}
+        for f in FIELDS:
+            v = float(self.cols[f][i])
+            out[f] = v if math.isfinite(v) else None
+        return out
+
+    def items(self) -> List[Dict[str, Any]]:
+        """All rows newest-first (roll25.json order)."""
+        return [self.row(i) for i in range(len(self) - 1, -1, -1)]
+
+
+# ---------------- IO ----------------
+
+def _save_npz(path: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+    """
+    np.savez_compressed layout, but with sorted members and a fixed zip timestamp, so the same
+    content always gives the same bytes (no git churn when nothing changed).
+    """
+    members = dict(arrays, meta=np.array(json.dumps(meta, ensure_ascii=False, sort_keys=True)))
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name in sorted(members):
+            zi = zipfile.ZipInfo(name + ".npy", date_time=_ZIP_EPOCH)
+            zi.compress_type = zipfile.ZIP_DEFLATED
+            zi.external_attr = 0o644 << 16
+            with zf.open(zi, "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.asanyarray(members[name]), allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def _load_npz(path: str, fmt: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            arrays = {k: z[k] for k in z.files}
+        meta = json.loads(str(arrays.pop("meta")))
+        if meta.get("format") != fmt:
+            return None
+        return arrays, meta
+    except Exception:
+        return None
+
+
+def load_store(store_path: str, derived_path: Optional[str] = None) -> Optional[Roll25Store]:
+    """
+    Store at store_path (None if missing/unreadable). The derived sidecar is attached only when it
+    was built from exactly this store (digest + row count) with the current parameters.
+    """
+    got = _load_npz(store_path, STORE_FORMAT)
+    if got is None:
+        return None
+    arrays, meta = got
+    try:
+        dates = arrays["date"]
+        cols = {f: arrays[f].astype(np.float64) for f in FIELDS}
+    except KeyError:
+        return None
+    n = int(dates.shape[0])
+    if any(v.shape != (n,) for v in cols.values()):
+        return None
+
+    derived = None
+    dmeta = None
+    dgot = _load_npz(derived_path, DERIVED_FORMAT) if derived_path else None
+    if dgot is not None:
+        darr, dm = dgot
+        if (
+            dm.get("store_digest") == meta.get("digest")
+            and dm.get("params") == _derived_params()
+            and all(k in darr and darr[k].shape == (n,) for k in derived_columns())
+        ):
+            derived = {k: darr[k] for k in derived_columns()}
+            dmeta = dm
+    return Roll25Store(dates, cols, meta, derived, dmeta)
+
+
+def save_store(st: Roll25Store, store_path: str, derived_path: str) -> None:
+    """Write the store and its derived sidecar (derived columns are required)."""
+    if st.derived is None or st.derived_meta is None:
+        raise ValueError("save_store: derived sidecar missing")
+    _save_npz(store_path, dict(st.cols, date=st.dates), st.meta)
+    _save_npz(derived_path, st.derived, st.derived_meta)
+
+
+def _common_prefix(old: Roll25Store, dates: np.ndarray, cols: Dict[str, np.ndarray]) -> int:
+    m = min(len(old), int(dates.shape[0]))
+    same = old.dates[:m] == dates[:m]
+    for f in FIELDS:
+        a = old.cols[f][:m]
+        b = cols[f][:m]
+        same &= (a == b) | (np.isnan(a) & np.isnan(b))
+    bad = np.flatnonzero(~same)
+    return int(bad[0]) if bad.size else m
+
+
+def update_store(
+    store_path: str,
+    derived_path: str,
+    items: Sequence[Dict[str, Any]],
+    old: Optional[Roll25Store] = None,
+    save: bool = True,
+) -> Tuple[Roll25Store, Dict[str, Any]]:
+    """
+    Replace the store content with items (full history, any order) and bring the derived sidecar up
+    to date. old = an already loaded store (saves a second read). Returns (store, info) where
+    info["mode"] is "reuse" | "incremental" | "full" with the reason and rows recomputed. Nothing is
+    written on "reuse" (the files on disk already hold this content).
+    """
+    dates, cols = columns_from_items(items)
+    n = int(dates.shape[0])
+    if old is None:
+        old = load_store(store_path, derived_path)
+
+    mode, reason, start = "full", "no_store", 0
+    if old is not None:
+        if old.derived is None:
+            reason = "no_derived"
+        else:
+            k = _common_prefix(old, dates, cols)
+            if k == n == len(old):
+                mode, reason, start = "reuse", "unchanged", n
+            elif k == 0:
+                reason = "history_rewritten"
+            else:
+                mode, reason, start = "incremental", ("appended_rows" if k == len(old) else "rows_changed"), k
+
+    if mode == "reuse":
+        derived = dict(old.derived)  # type: ignore[union-attr, arg-type]
+    else:
+        rows = compute_derived_rows(cols, start=start)
+        if start > 0:
+            derived = {k: np.concatenate([old.derived[k][:start], rows[k]]) for k in derived_columns()}  # type: ignore[union-attr, index]
+        else:
+            derived = rows
+
+    digest = _digest(dates, cols)
+    first = str(dates[0]) if n else None
+    last = str(dates[-1]) if n else None
+    meta = {
+        "format": STORE_FORMAT,
+        "rows": n,
+        "first_date": first,
+        "last_date": last,
+        "fields": list(FIELDS),
+        "digest": digest,
+    }
+    dmeta = {
+        "format": DERIVED_FORMAT,
+        "rows": n,
+        "last_date": last,
+        "store_digest": digest,
+        "params": _derived_params(),
+        "columns": derived_columns(),
+        "vol_na_codes": list(VOL_NA_CODES),
+        "last_update": {"mode": mode, "reason": reason, "rows_recomputed": int(n - start)},
+    }
+    st = Roll25Store(dates, cols, meta, derived, dmeta)
+    if save and mode != "reuse":
+        save_store(st, store_path, derived_path)
+
+    info = {
+        "store_path": store_path,
+        "derived_path": derived_path,
+        "format": STORE_FORMAT,
+        "mode": mode,
+        "reason": reason,
+        "rows": n,
+        "rows_recomputed": int(n - start),
+        "first_date": first,
+        "last_date": last,
+    }
+    return st, info
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/rolling_stats.py
+
+Reusable rolling-window stats engine (stdlib only).
+
+For every index i in [start, end) with a full trailing window xs[i-w+1 : i+1] it emits:
+- mean / ma : sum(window) / w
+- std       : population std (ddof=0)
+- z         : (x - mean) / std   (None if std == 0)
+- p         : count(window <= x) / w * 100   (percentile_le)
+- dev       : x - mean
+Indices without a full window get None in every column.
+
+Modes:
+- exact=True (default): bit-compatible with the per-window formulas used by
+  update_market_cache.mean / std_ddof0 / percentile_le (same summation order).
+  The percentile uses a sorted window maintained incrementally (bisect), so only
+  mean/std still touch the whole window, in C-level sum() over a list slice.
+- exact=False: running (shifted) sum / sum of squares, O(1) per step for mean/std. Values drift
+  from the exact definitions by float rounding (~1e-12 relative); use for charts and
+  full-history scans, not for audited stats_latest outputs.
+
+Usage:
+    from rolling_stats import rolling_window_stats
+    cols = rolling_window_stats([p.value for p in pts], 60)
+    z60 = cols["z"]
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Sequence
+
+COLUMNS = ("mean", "std", "z", "p", "ma", "dev")
+
+
+def _empty(n: int) -> Dict[str, List[Optional[float]]]:
+    return {k: [None] * n for k in COLUMNS}
+
+
+def rolling_window_stats(
+    xs: Sequence[float],
+    w: int,
+    start: int = 0,
+    end: Optional[int] = None,
+    exact: bool = True,
+) -> Dict[str, List[Optional[float]]]:
+    """
+    Columnar rolling stats for indices [start, end) of xs (end defaults to len(xs)).
+    Column k holds the value for index start+k. Raises ValueError for w < 1 or a bad range.
+    """
+    n_all = len(xs)
+    if w < 1:
+        raise ValueError("w must be >= 1")
+    if end is None:
+        end = n_all
+    if start < 0 or end > n_all or start > end:
+        raise ValueError("start/end out of range")
+
+    out = _empty(end - start)
+    first = max(start, w - 1)  # first index with a full window
+    if first >= end:
+        return out
+
+    vals = list(xs)
+    sorted_win = sorted(vals[first - w + 1 : first + 1])
+
+    # shift by the first window value to limit cancellation in sum(x^2) - n*mean^2
+    shift = vals[first - w + 1]
+    run_sum = 0.0
+    run_sq = 0.0
+    if not exact:
+        for v in vals[first - w + 1 : first + 1]:
+            run_sum += v - shift
+            run_sq += (v - shift) ** 2
+
+    for i in range(first, end):
+        if i > first:
+            old = vals[i - w]
+            new = vals[i]
+            del sorted_win[bisect_left(sorted_win, old)]
+            insort(sorted_win, new)
+            if not exact:
+                run_sum += new - old
+                run_sq += (new - shift) ** 2 - (old - shift) ** 2
+
+        x = vals[i]
+        if exact:
+            win = vals[i - w + 1 : i + 1]
+            mu = sum(win) / len(win)
+            sd = math.sqrt(sum((v - mu) ** 2 for v in win) / len(win))
+        else:
+            m_shift = run_sum / w
+            mu = shift + m_shift
+            sd = math.sqrt(max(run_sq / w - m_shift * m_shift, 0.0))
+
+        k = i - start
+        out["mean"][k] = mu
+        out["ma"][k] = mu
+        out["std"][k] = sd
+        out["z"][k] = None if sd == 0 else (x - mu) / sd
+        out["p"][k] = bisect_right(sorted_win, x) / w * 100.0
+        out["dev"][k] = x - mu
+
+    return out
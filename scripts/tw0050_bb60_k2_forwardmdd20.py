@@ -64,6 +64,9 @@ import pandas as pd
 import pytz
 import requests
 
+from forward_extrema import forward_mdd_runup
+from price_breaks import contamination_mask, detect_break_flags
+
 try:
     import yfinance as yf
 except Exception:
@@ -578,20 +581,13 @@ def compute_forward_mdd(
         stats = ForwardMDDStats(0, float("nan"), float("nan"), float("nan"), float("nan"), float("nan"), -1, -1)
         return out, stats
 
-    if valid_entry_mask is None:
-        valid_entry_mask = np.ones(n, dtype=bool)
-
-    for i in range(0, n - fwd_days):
-        if not valid_entry_mask[i]:
-            continue
-        base = prices[i]
-        if not np.isfinite(base) or base <= 0:
-            continue
-        future = prices[i + 1: i + fwd_days + 1]
-        if future.size == 0:
-            continue
-        rel = future / base - 1.0
-        out[i] = np.nanmin(rel)
+    # shared sparse-table kernel; nan_policy="omit" == np.nanmin over the future window
+    out = forward_mdd_runup(
+        prices,
+        [fwd_days],
+        valid_entry_mask=valid_entry_mask,
+        nan_policy="omit",
+    )[fwd_days]["mdd"]
 
     valid = out[np.isfinite(out)]
     if valid.size == 0:
@@ -796,17 +792,7 @@ def detect_price_breaks(prices: np.ndarray, ratio_hi: float, ratio_lo: float) ->
       - Cash dividends typically cause small drops (a few %) and will NOT trigger by default.
       - Splits / reverse splits / severe data breaks are what this targets.
     """
-    n = len(prices)
-    breaks = np.zeros(n, dtype=bool)
-    for i in range(1, n):
-        a = prices[i - 1]
-        b = prices[i]
-        if not np.isfinite(a) or not np.isfinite(b) or a <= 0 or b <= 0:
-            continue
-        r = b / a
-        if r >= ratio_hi or r <= ratio_lo:
-            breaks[i] = True
-    return breaks
+    return detect_break_flags(prices, ratio_hi=ratio_hi, ratio_lo=ratio_lo)
 
 
 def build_clean_entry_mask(n: int, breaks: np.ndarray, fwd_days: int) -> np.ndarray:
@@ -817,13 +803,7 @@ def build_clean_entry_mask(n: int, breaks: np.ndarray, fwd_days: int) -> np.ndar
     Exclude entries i where:
       i < j <= i+fwd_days  => i in [j - fwd_days, j-1]
     """
-    mask = np.ones(n, dtype=bool)
-    break_idxs = np.where(breaks)[0]
-    for j in break_idxs:
-        lo = max(0, j - fwd_days)
-        hi = min(n, j)  # exclude up to j-1
-        mask[lo:hi] = False
-    return mask
+    return ~contamination_mask(n, np.flatnonzero(breaks), horizon=fwd_days)
 
 
 # -------------------------
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scripts/twse_client.py
+
+Shared HTTP client for TWSE JSON endpoints (www.twse.com.tw / openapi.twse.com.tw), used by
+update_twse_sidecar.py, backfill_twse_history.py, fetch_twse_market_maint_ratio.py and
+fetch_tw0050_chip_overlay.py.
+
+- One requests.Session per process (keep-alive connection pool, sized for the worker pools).
+- Global rate limit: at most one network request per TWSE_MIN_INTERVAL_S (default 0.5s), enforced
+  across threads AND processes via an flock'ed timestamp file (TWSE_RATELIMIT_FILE, default
+  <tmpdir>/twse_client.ratelimit; independent of the payload cache, so TWSE_HTTP_CACHE=0 writes
+  nothing under the cache dir), so parallel scripts in one job do not trip TWSE throttling. Cache
+  hits are free.
+- Retries on network errors / 429 / 5xx with the caller's backoff schedule; raises RuntimeError on
+  final failure (never returns a guessed payload).
+
+On-disk payload cache (TWSE_HTTP_CACHE_DIR, default .twse_http_cache; TWSE_HTTP_CACHE=0 disables):
+
+    refs/<kk>/<key>.json    key = sha1(url + sorted params, cache-buster "_" excluded)
+                            {url, params, content_sha1, fetched_at_utc, fetched_local_date, period_end}
+    blobs/<cc>/<sha1>.json  raw response body, content-addressed (identical payloads stored once,
+                            e.g. the "no data" page of every holiday)
+
+Freshness is decided by period_end, the last calendar day (local tz) the payload covers:
+- period closed (period_end < today) AND fetched after it closed -> immutable, reused forever
+- anything else (today's data, "latest" endpoints, period_end=None)  -> TTL (TWSE_HTTP_CACHE_TTL_S,
+  default 900s)
+Use day_period_end("YYYYMMDD") / month_period_end("YYYYMM01") for date-parameterized endpoints.
+Callers pass cacheable=... to keep error pages (stat != OK) out of the cache.
+
+    from twse_client import get_client, day_period_end
+    j = get_client().get_json(url, params={...}, period_end=day_period_end(ymd))
+"""
+
+from __future__ import annotations
+
+import calendar
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: rate limit is per-process only
+    fcntl = None  # type: ignore[assignment]
+
+CLIENT_VERSION = "twse_client@2026-10-16.v1"
+
+UA = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.environ.get(name, default).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "").strip() or default)
+    except ValueError:
+        return float(default)
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def day_period_end(yyyymmdd: str) -> date:
+    s = str(yyyymmdd).replace("-", "").strip()
+    return date(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+
+
+def month_period_end(yyyymm01: str) -> date:
+    s = str(yyyymm01).replace("-", "").strip()
+    y, m = int(s[0:4]), int(s[4:6])
+    return date(y, m, calendar.monthrange(y, m)[1])
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _decode_json(body: bytes) -> Any:
+    return json.loads(body.decode("utf-8", errors="replace").lstrip("\ufeff").strip())
+
+
+class TwseClient:
+    """Thread-safe (one shared Session, locked stats / rate limit); see module docstring."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        *,
+        cache_enable: Optional[bool] = None,
+        ttl_s: Optional[float] = None,
+        min_interval_s: Optional[float] = None,
+        tz: str = "Asia/Taipei",
+        pool_size: int = 8,
+        user_agent: str = UA,
+    ) -> None:
+        self.cache_dir = cache_dir or os.environ.get("TWSE_HTTP_CACHE_DIR", ".twse_http_cache")
+        self.cache_enable = _env_bool("TWSE_HTTP_CACHE", "1") if cache_enable is None else bool(cache_enable)
+        self.ttl_s = _env_float("TWSE_HTTP_CACHE_TTL_S", 900.0) if ttl_s is None else float(ttl_s)
+        self.min_interval_s = _env_float("TWSE_MIN_INTERVAL_S", 0.5) if min_interval_s is None else float(min_interval_s)
+        self.ratelimit_path = os.environ.get("TWSE_RATELIMIT_FILE", "").strip() or os.path.join(
+            tempfile.gettempdir(), "twse_client.ratelimit"
+        )
+        self.tz = ZoneInfo(tz)
+        self.user_agent = user_agent
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, int(pool_size)))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._last_request_mono = 0.0
+        self.stats: Dict[str, int] = {"hit": 0, "miss": 0, "expired": 0, "stored": 0, "requests": 0, "errors": 0}
+
+    # ---------- cache ----------
+
+    def cache_key(self, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        p = {str(k): str(v) for k, v in (params or {}).items() if str(k) != "_"}
+        s = json.dumps({"url": url, "params": p}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "refs", key[:2], f"{key}.json")
+
+    def _blob_path(self, sha1: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", sha1[:2], f"{sha1}.json")
+
+    def _today(self) -> date:
+        return datetime.now(tz=self.tz).date()
+
+    def _fresh(self, ref: Dict[str, Any]) -> bool:
+        pe = ref.get("period_end")
+        fetched_local = str(ref.get("fetched_local_date") or "")
+        if pe and pe < self._today().isoformat() and fetched_local > pe:
+            return True  # closed period, fetched after close: immutable
+        try:
+            fetched = datetime.fromisoformat(str(ref["fetched_at_utc"]).replace("Z", "+00:00"))
+        except Exception:
+            return False
+        return (datetime.now(timezone.utc) - fetched).total_seconds() < self.ttl_s
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._ref_path(key), "r", encoding="utf-8") as f:
+                ref = json.load(f)
+        except Exception:
+            return None
+        if not self._fresh(ref):
+            self._count("expired")
+            return None
+        try:
+            with open(self._blob_path(str(ref["content_sha1"])), "rb") as f:
+                return _decode_json(f.read())
+        except Exception:
+            return None
+
+    def _store(self, key: str, url: str, params: Optional[Dict[str, Any]], body: bytes, period_end: Optional[date]) -> None:
+        sha1 = hashlib.sha1(body).hexdigest()
+        blob = self._blob_path(sha1)
+        if not os.path.isfile(blob):
+            _atomic_write_bytes(blob, body)
+        ref = {
+            "url": url,
+            "params": {str(k): str(v) for k, v in (params or {}).items() if str(k) != "_"},
+            "content_sha1": sha1,
+            "bytes": len(body),
+            "fetched_at_utc": utc_now_iso(),
+            "fetched_local_date": self._today().isoformat(),
+            "period_end": period_end.isoformat() if period_end else None,
+            "client": CLIENT_VERSION,
+        }
+        _atomic_write_bytes(self._ref_path(key), json.dumps(ref, ensure_ascii=False, indent=2).encode("utf-8"))
+        self._count("stored")
+
+    def _count(self, k: str) -> None:
+        with self._lock:
+            self.stats[k] = self.stats.get(k, 0) + 1
+
+    # ---------- rate limit ----------
+
+    def _throttle(self) -> None:
+        """Wait until min_interval_s has passed since the last request of any thread/process."""
+        if self.min_interval_s <= 0:
+            return
+        with self._rate_lock:
+            f = None
+            if fcntl is not None and self.ratelimit_path:
+                try:
+                    f = open(self.ratelimit_path, "a+", encoding="utf-8")
+                except OSError:
+                    f = None
+            if f is None:  # per-process only
+                wait = self._last_request_mono + self.min_interval_s - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                self._last_request_mono = time.monotonic()
+                return
+            with f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        last = float(f.read().strip() or 0.0)
+                    except ValueError:
+                        last = 0.0
+                    wait = last + self.min_interval_s - time.time()
+                    if wait > 0:
+                        time.sleep(min(wait, self.min_interval_s))
+                    f.seek(0)
+                    f.truncate()
+                    f.write(f"{time.time():.6f}")
+                    f.flush()
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # ---------- fetch ----------
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        period_end: Optional[date] = None,
+        referer: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 25.0,
+        max_tries: int = 3,
+        backoffs: Sequence[float] = (2, 4, 8),
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        use_cache: bool = True,
+        info: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Decoded JSON for url(+params). Served from cache when fresh (see module docstring).
+        Fetched payloads are stored only if cacheable(payload) is true (default: any JSON).
+        Sleeps backoffs[i] between tries; raises RuntimeError after max_tries.
+        info (optional dict) receives {"key", "cache": hit|miss|disabled, "stored"}.
+        """
+        if not isinstance(url, str) or not url.strip():
+            raise ValueError("URL is missing/empty")
+
+        caching = self.cache_enable and use_cache
+        key = self.cache_key(url, params)
+        if info is not None:
+            info.update({"key": key, "cache": "miss" if caching else "disabled", "stored": False})
+        if caching:
+            hit = self._lookup(key)
+            if hit is not None:
+                self._count("hit")
+                if info is not None:
+                    info["cache"] = "hit"
+                return hit
+        self._count("miss")
+
+        h = {"User-Agent": self.user_agent, "Accept": "application/json, text/javascript, */*; q=0.01"}
+        if referer:
+            h["Referer"] = referer
+        h.update(headers or {})
+
+        last_err: Optional[str] = None
+        tries = max(1, int(max_tries))
+        for i in range(tries):
+            try:
+                self._throttle()
+                self._count("requests")
+                r = self.session.get(url, params=params, headers=h, timeout=timeout)
+                if r.status_code in RETRY_STATUS:
+                    raise RuntimeError(f"http_{r.status_code}")
+                r.raise_for_status()
+                body = r.content
+                payload = _decode_json(body)
+                if caching and (cacheable is None or cacheable(payload)):
+                    try:
+                        self._store(key, url, params, body, period_end)
+                        if info is not None:
+                            info["stored"] = True
+                    except OSError as e:
+                        print(f"[WARN] twse_client cache write failed: {type(e).__name__}: {e}")
+                return payload
+            except Exception as e:
+                last_err = f"try{i + 1}:{type(e).__name__}:{e}"
+                if i + 1 < tries and backoffs:
+                    time.sleep(float(backoffs[min(i, len(backoffs) - 1)]))
+        self._count("errors")
+        raise RuntimeError(f"HTTP GET failed after {tries} tries: {url} ; last_err={last_err}")
+
+    def audit(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.stats)
+        return {
+            "client": CLIENT_VERSION,
+            "cache_enable": self.cache_enable,
+            "cache_dir": self.cache_dir,
+            "ttl_s": self.ttl_s,
+            "min_interval_s": self.min_interval_s,
+            "ratelimit_file": self.ratelimit_path,
+            **counts,
+        }
+
+
+_CLIENT: Optional[TwseClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> TwseClient:
+    """Process-wide client configured from env (one Session, one cache, one rate limit)."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = TwseClient()
+        return _CLIENT
+
+
+NO_DATA_STAT = "沒有符合條件的資料"
+
+
+def stat_ok(payload: Any) -> bool:
+    """cacheable= predicate for www.twse.com.tw payloads: only stat == OK."""
+    return isinstance(payload, dict) and str(payload.get("stat", "")).strip().upper() == "OK"
+
+
+def stat_ok_or_no_data(payload: Any) -> bool:
+    """cacheable= predicate that also keeps TWSE's "no data" page (non-trading days stay non-trading)."""
+    return stat_ok(payload) or (isinstance(payload, dict) and NO_DATA_STAT in str(payload.get("stat", "")))
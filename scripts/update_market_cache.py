@@ -33,6 +33,20 @@ B) Per-series staleness thresholds:
 C) Ret1 pct definition is recorded in dq_state.json:
    - ret1_pct = (delta / abs(prev)) * 100
 
+HTTP cache (conditional GET):
+- Full-history CSVs are cached on disk (MARKET_HTTP_CACHE_DIR, default market_cache/.http_cache)
+  with their ETag / Last-Modified validators; reruns send If-None-Match / If-Modified-Since.
+- 304 (or an identical body) reuses the cached parse result, so unchanged sources skip CSV parsing.
+- Hits/misses are recorded in dq_state.json["http_cache"] and copied into manifest.json.
+- MARKET_HTTP_CACHE=0 disables the cache (plain GET every run).
+
+Fetch concurrency / partial failure:
+- The five sources (OFR_FSI, VIX, SP500, HYG, IEF) are fetched concurrently, each with its own
+  timeout + attempt budget (FETCH_POLICY). Total latency ~= slowest single source.
+- A source that still fails is recorded as a "fetch" ERR check for that series only; the series
+  carries forward its previous history_lite.json points (if any) so staleness checks and
+  downstream consumers keep working. HYG or IEF failing downgrades HYG_IEF_RATIO the same way.
+
 Design goals:
 - auditable: keep source URLs (ratio keeps both URLs + formula notes)
 - no guessing: insufficient window -> NA
@@ -43,15 +57,21 @@ Design goals:
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
 import math
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone, date as date_cls
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
+from rolling_stats import rolling_window_stats
+
 
 OUT_DIR = os.path.join("market_cache")
 LATEST_PATH = os.path.join(OUT_DIR, "latest.json")
@@ -62,6 +82,11 @@ DQ_STATE_PATH = os.path.join(OUT_DIR, "dq_state.json")
 SCRIPT_VERSION = "market_cache_v2_2_stats_zp_w60_w252_ret1_delta_pctAbs_deltas_dq_lite400"
 LITE_KEEP_N = int(os.environ.get("LITE_KEEP_N", "400"))
 
+HTTP_CACHE_DIR = os.environ.get("MARKET_HTTP_CACHE_DIR", os.path.join(OUT_DIR, ".http_cache"))
+HTTP_CACHE_ENABLE = os.environ.get("MARKET_HTTP_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+# bump when parse_* output changes so stale parsed entries are never reused
+PARSE_CACHE_VERSION = "parse_v1"
+
 # Primary sources (user-specified)
 URL_OFR_FSI = "https://www.financialresearch.gov/financial-stress-index/data/fsi.csv"
 URL_VIX_CBOE = "https://cdn.cboe.com/api/global/us_indices/daily_prices/VIX_History.csv"
@@ -87,6 +112,19 @@ STALENESS_POLICY: Dict[str, Dict[str, int]] = {
 
 RET1_PCT_DEFINITION = "ret1_pct = (ret1_delta / abs(prev)) * 100"
 
+# -------------------------
+# Fetch policy (per source timeout + attempt budget)
+# -------------------------
+FETCH_POLICY: Dict[str, Dict[str, int]] = {
+    "OFR_FSI": {"timeout_secs": 45, "attempts": 3},   # multi-MB full history
+    "VIX": {"timeout_secs": 30, "attempts": 3},
+    "SP500": {"timeout_secs": 30, "attempts": 3},
+    "HYG": {"timeout_secs": 30, "attempts": 3},
+    "IEF": {"timeout_secs": 30, "attempts": 3},
+}
+FETCH_BACKOFF_SECS = [2, 4, 8]
+FETCH_WORKERS = int(os.environ.get("MARKET_FETCH_WORKERS", "5"))
+
 
 @dataclass
 class Point:
@@ -116,17 +154,13 @@ def days_stale(latest_date: str, as_of_utc: str) -> Optional[int]:
     return (as_of_dt - d).days
 
 
-def http_get_text(url: str, timeout: int = 30) -> str:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (compatible; market_cache/2.2; +https://github.com/)",
-            "Accept": "text/csv,text/plain,*/*",
-        },
-        method="GET",
-    )
-    with urlopen(req, timeout=timeout) as resp:
-        raw = resp.read()
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; market_cache/2.2; +https://github.com/)",
+    "Accept": "text/csv,text/plain,*/*",
+}
+
+
+def decode_body(raw: bytes) -> str:
     for enc in ("utf-8-sig", "utf-8", "cp1252"):
         try:
             return raw.decode(enc)
@@ -135,6 +169,152 @@ def http_get_text(url: str, timeout: int = 30) -> str:
     return raw.decode("utf-8", errors="replace")
 
 
+def http_get_text(url: str, timeout: int = 30) -> str:
+    req = Request(url, headers=dict(HTTP_HEADERS), method="GET")
+    with urlopen(req, timeout=timeout) as resp:
+        raw = resp.read()
+    return decode_body(raw)
+
+
+# -------------------------
+# On-disk conditional HTTP cache
+# -------------------------
+def _cache_paths(url: str) -> Tuple[str, str, str]:
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(HTTP_CACHE_DIR, key)
+    return base + ".meta.json", base + ".body", base + ".parsed.json"
+
+
+def _read_json_or_none(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        return obj if isinstance(obj, dict) else None
+    except Exception:
+        return None
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def http_get_bytes_cached(url: str, timeout: int = 30) -> Tuple[bytes, Dict[str, object]]:
+    """
+    Conditional GET backed by HTTP_CACHE_DIR.
+    Returns (body_bytes, info) where info["cache"] is:
+      - "hit"      : server answered 304, cached body reused
+      - "miss"     : full 200 response (cache refreshed)
+      - "disabled" : MARKET_HTTP_CACHE=0
+    Cache write failures never fail the fetch.
+    """
+    if not HTTP_CACHE_ENABLE:
+        req = Request(url, headers=dict(HTTP_HEADERS), method="GET")
+        with urlopen(req, timeout=timeout) as resp:
+            raw = resp.read()
+        return raw, {"url": url, "cache": "disabled", "http_status": 200, "bytes": len(raw)}
+
+    meta_path, body_path, _ = _cache_paths(url)
+    meta = _read_json_or_none(meta_path) or {}
+    have_body = os.path.exists(body_path)
+
+    headers = dict(HTTP_HEADERS)
+    if have_body:
+        if meta.get("etag"):
+            headers["If-None-Match"] = str(meta["etag"])
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = str(meta["last_modified"])
+
+    req = Request(url, headers=headers, method="GET")
+    try:
+        with urlopen(req, timeout=timeout) as resp:
+            raw = resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            status = getattr(resp, "status", 200)
+    except HTTPError as e:
+        if e.code == 304 and have_body:
+            with open(body_path, "rb") as f:
+                raw = f.read()
+            return raw, {
+                "url": url,
+                "cache": "hit",
+                "http_status": 304,
+                "bytes": len(raw),
+                "body_sha256": meta.get("body_sha256"),
+            }
+        raise
+
+    body_sha = hashlib.sha256(raw).hexdigest()
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        _write_atomic(body_path, raw)
+        new_meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body_sha256": body_sha,
+            "bytes": len(raw),
+            "fetched_at_utc": utc_now_iso(),
+        }
+        _write_atomic(meta_path, (json.dumps(new_meta, ensure_ascii=False, indent=2) + "\n").encode("utf-8"))
+    except OSError as e:
+        print(f"[WARN] http cache write failed for {url}: {type(e).__name__}", file=sys.stderr)
+
+    return raw, {
+        "url": url,
+        "cache": "miss",
+        "http_status": status,
+        "bytes": len(raw),
+        "body_sha256": body_sha,
+        "validators": {"etag": bool(etag), "last_modified": bool(last_modified)},
+    }
+
+
+def fetch_and_parse_cached(
+    url: str,
+    parse_fn: Callable[[str], Any],
+    to_json: Callable[[Any], Any],
+    from_json: Callable[[Any], Any],
+    timeout: int = 30,
+) -> Tuple[Any, Dict[str, object]]:
+    """
+    Fetch url via the conditional cache and parse it, reusing the stored parse result when the
+    body is unchanged (304 hit, or a 200 whose sha256 matches the previous body).
+    info["parse"] is "reused" or "parsed".
+    """
+    raw, info = http_get_bytes_cached(url, timeout=timeout)
+    body_sha = info.get("body_sha256") or hashlib.sha256(raw).hexdigest()
+
+    parsed_path = _cache_paths(url)[2]
+    if info.get("cache") != "disabled":
+        cached = _read_json_or_none(parsed_path)
+        if (
+            cached
+            and cached.get("parse_version") == PARSE_CACHE_VERSION
+            and cached.get("body_sha256") == body_sha
+            and "result" in cached
+        ):
+            try:
+                result = from_json(cached["result"])
+                info["parse"] = "reused"
+                return result, info
+            except Exception:
+                pass
+
+    result = parse_fn(decode_body(raw))
+    info["parse"] = "parsed"
+    if info.get("cache") != "disabled":
+        try:
+            payload = {"parse_version": PARSE_CACHE_VERSION, "body_sha256": body_sha, "result": to_json(result)}
+            _write_atomic(parsed_path, json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        except OSError as e:
+            print(f"[WARN] parse cache write failed for {url}: {type(e).__name__}", file=sys.stderr)
+    return result, info
+
+
 def parse_csv_points_generic(text: str, date_col_hint: str = "date") -> Tuple[List[Point], List[str], str]:
     """
     Parse a CSV with header:
@@ -234,6 +414,89 @@ def parse_stooq_ohlc(text: str) -> List[Point]:
     return pts
 
 
+def _pts_to_json(pts: List[Point]) -> List[List[object]]:
+    return [[p.date, p.value] for p in pts]
+
+
+def _pts_from_json(obj: List[List[object]]) -> List[Point]:
+    return [Point(str(d), float(v)) for d, v in obj]
+
+
+def load_csv_points_generic(
+    url: str, date_col_hint: str = "date", timeout: int = 30
+) -> Tuple[Tuple[List[Point], List[str], str], Dict[str, object]]:
+    return fetch_and_parse_cached(
+        url,
+        lambda text: parse_csv_points_generic(text, date_col_hint=date_col_hint),
+        lambda r: {"points": _pts_to_json(r[0]), "header": r[1], "value_col": r[2]},
+        lambda o: (_pts_from_json(o["points"]), list(o["header"]), str(o["value_col"])),
+        timeout=timeout,
+    )
+
+
+def load_stooq_ohlc(url: str, timeout: int = 30) -> Tuple[List[Point], Dict[str, object]]:
+    return fetch_and_parse_cached(url, parse_stooq_ohlc, _pts_to_json, _pts_from_json, timeout=timeout)
+
+
+@dataclass
+class SourceResult:
+    name: str
+    ok: bool
+    result: object = None
+    info: Optional[Dict[str, object]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed_secs: float = 0.0
+
+
+def fetch_source_with_retry(name: str, loader: Callable[[int], Tuple[object, Dict[str, object]]]) -> SourceResult:
+    """
+    Run loader(timeout) under FETCH_POLICY[name]. Never raises: the last error is returned
+    so one bad source cannot abort the whole run.
+    """
+    policy = FETCH_POLICY.get(name, {"timeout_secs": 30, "attempts": 3})
+    attempts = max(1, int(policy["attempts"]))
+    t0 = time.monotonic()
+    last_err = "unknown"
+    for i in range(attempts):
+        try:
+            result, info = loader(int(policy["timeout_secs"]))
+            return SourceResult(name, True, result, info, None, i + 1, round(time.monotonic() - t0, 3))
+        except Exception as e:
+            last_err = f"{type(e).__name__}: {e}"
+            if i < attempts - 1:
+                time.sleep(FETCH_BACKOFF_SECS[min(i, len(FETCH_BACKOFF_SECS) - 1)])
+    return SourceResult(name, False, None, None, last_err, attempts, round(time.monotonic() - t0, 3))
+
+
+def fetch_sources_concurrently(
+    loaders: Dict[str, Callable[[int], Tuple[object, Dict[str, object]]]],
+    workers: int = FETCH_WORKERS,
+) -> Dict[str, SourceResult]:
+    """Dispatch all loaders at once; results are keyed (and later consumed) in loaders order."""
+    names = list(loaders.keys())
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as ex:
+        futs = {n: ex.submit(fetch_source_with_retry, n, loaders[n]) for n in names}
+        return {n: futs[n].result() for n in names}
+
+
+def load_previous_lite(path: str = HISTORY_LITE_PATH) -> Dict[str, List[Point]]:
+    """Previous run's history_lite.json series (for carry-forward); {} if unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        series = obj.get("series", {}) if isinstance(obj, dict) else {}
+        out: Dict[str, List[Point]] = {}
+        for sid, arr in series.items():
+            pts = [Point(str(r["date"]), float(r["value"])) for r in arr if parse_yyyy_mm_dd(str(r["date"]))]
+            pts.sort(key=lambda x: x.date)
+            if pts:
+                out[sid] = pts
+        return out
+    except Exception:
+        return {}
+
+
 def align_ratio(hyg: List[Point], ief: List[Point]) -> List[Point]:
     m_h = {p.date: p.value for p in hyg}
     m_i = {p.date: p.value for p in ief}
@@ -267,6 +530,51 @@ def percentile_le(xs: List[float], x: float) -> float:
     return c / n * 100.0
 
 
+def window_stats_range(values: List[Point], w: int, start_idx: int, end_idx: Optional[int] = None) -> List[Dict[str, object]]:
+    """
+    Window stats for every idx in [start_idx, end_idx) in one pass (rolling_stats engine, exact mode).
+    Same numbers as the per-window mean / std_ddof0 / percentile_le definitions.
+    """
+    if end_idx is None:
+        end_idx = len(values)
+    if start_idx < 0 or end_idx > len(values) or start_idx >= end_idx:
+        raise IndexError("idx out of range")
+
+    cols = rolling_window_stats([p.value for p in values], w, start=start_idx, end=end_idx)
+    out: List[Dict[str, object]] = []
+    for k, idx in enumerate(range(start_idx, end_idx)):
+        end = idx + 1
+        start = end - w
+        if start < 0:
+            # insufficient window
+            out.append({
+                "n": end,
+                "window": w,
+                "start_date": values[0].date,
+                "end_date": values[idx].date,
+                "mean": None,
+                "std": None,
+                "z": None,
+                "p": None,
+                "ma": None,
+                "dev_ma": None,
+            })
+            continue
+        out.append({
+            "n": w,
+            "window": w,
+            "start_date": values[start].date,
+            "end_date": values[idx].date,
+            "mean": cols["mean"][k],
+            "std": cols["std"][k],
+            "z": cols["z"][k],
+            "p": cols["p"][k],
+            "ma": cols["ma"][k],
+            "dev_ma": cols["dev"][k],
+        })
+    return out
+
+
 def window_stats_at(values: List[Point], w: int, idx: int) -> Dict[str, object]:
     """
     Compute window stats ending at values[idx] (inclusive).
@@ -274,44 +582,7 @@ def window_stats_at(values: List[Point], w: int, idx: int) -> Dict[str, object]:
     """
     if idx < 0 or idx >= len(values):
         raise IndexError("idx out of range")
-
-    end = idx + 1
-    start = end - w
-    if start < 0:
-        # insufficient window
-        return {
-            "n": end,
-            "window": w,
-            "start_date": values[0].date,
-            "end_date": values[idx].date,
-            "mean": None,
-            "std": None,
-            "z": None,
-            "p": None,
-            "ma": None,
-            "dev_ma": None,
-        }
-    win = values[start:end]
-    xs = [p.value for p in win]
-    x = xs[-1]
-    mu = mean(xs)
-    sd = std_ddof0(xs)
-    z = None if sd == 0 else (x - mu) / sd
-    p = percentile_le(xs, x)
-    ma = mu
-    dev = x - ma
-    return {
-        "n": w,
-        "window": w,
-        "start_date": win[0].date,
-        "end_date": win[-1].date,
-        "mean": mu,
-        "std": sd,
-        "z": z,
-        "p": p,
-        "ma": ma,
-        "dev_ma": dev,
-    }
+    return window_stats_range(values, w, idx, idx + 1)[0]
 
 
 def ret1_delta(values: List[Point]) -> Optional[float]:
@@ -368,52 +639,107 @@ def main() -> None:
     # -------------------------
     add_check("GLOBAL", "ret1_pct_definition", "OK", definition=RET1_PCT_DEFINITION)
 
-    # ---- Fetch + parse series ----
-    # OFR_FSI
-    ofr_text = http_get_text(URL_OFR_FSI)
-    ofr_pts, ofr_header, ofr_valcol = parse_csv_points_generic(ofr_text, date_col_hint="date")
-    add_check("OFR_FSI", "csv_value_col", "OK", value_col=ofr_valcol)
-
-    # VIX (CBOE)
-    vix_text = http_get_text(URL_VIX_CBOE)
-    vix_pts, vix_header, vix_valcol = parse_csv_points_generic(vix_text, date_col_hint="date")
-    add_check("VIX", "csv_value_col", "OK", value_col=vix_valcol)
+    # ---- Fetch + parse series (concurrent; conditional HTTP cache; per-source failure tolerance) ----
+    fetched = fetch_sources_concurrently(
+        {
+            "OFR_FSI": lambda t: load_csv_points_generic(URL_OFR_FSI, date_col_hint="date", timeout=t),
+            "VIX": lambda t: load_csv_points_generic(URL_VIX_CBOE, date_col_hint="date", timeout=t),
+            "SP500": lambda t: load_stooq_ohlc(URL_SPX, timeout=t),
+            "HYG": lambda t: load_stooq_ohlc(URL_HYG, timeout=t),
+            "IEF": lambda t: load_stooq_ohlc(URL_IEF, timeout=t),
+        }
+    )
+    http_cache_sources: Dict[str, Dict[str, object]] = {n: r.info for n, r in fetched.items() if r.info}
+    prev_lite: Optional[Dict[str, List[Point]]] = None
+
+    def carry_forward(series_id: str, reason: str, sources: List[str]) -> Optional[List[Point]]:
+        nonlocal prev_lite
+        if prev_lite is None:
+            prev_lite = load_previous_lite()
+        pts = prev_lite.get(series_id)
+        add_check(
+            series_id,
+            "fetch",
+            "ERR",
+            reason=reason,
+            sources={n: {"error": fetched[n].error, "attempts": fetched[n].attempts} for n in sources if not fetched[n].ok},
+            fallback="carry_forward_history_lite" if pts else "none",
+        )
+        return pts
+
+    source_pts: Dict[str, Optional[List[Point]]] = {}
+    source_extra: Dict[str, Dict[str, object]] = {}
+
+    # OFR_FSI / VIX (generic CSV)
+    for sid in ("OFR_FSI", "VIX"):
+        r = fetched[sid]
+        if r.ok:
+            pts, header, valcol = r.result  # type: ignore[misc]
+            add_check(sid, "csv_value_col", "OK", value_col=valcol)
+            source_pts[sid] = pts
+            source_extra[sid] = {"parse_header": header}
+        else:
+            source_pts[sid] = carry_forward(sid, "fetch_failed", [sid])
+            source_extra[sid] = {"carried_forward": True}
 
     # SP500 via Stooq ^SPX
-    spx_text = http_get_text(URL_SPX)
-    spx_pts = parse_stooq_ohlc(spx_text)
-    add_check("SP500", "stooq_has_close", "OK")
+    if fetched["SP500"].ok:
+        source_pts["SP500"] = fetched["SP500"].result  # type: ignore[assignment]
+        add_check("SP500", "stooq_has_close", "OK")
+    else:
+        source_pts["SP500"] = carry_forward("SP500", "fetch_failed", ["SP500"])
+        source_extra["SP500"] = {"carried_forward": True}
 
     # HYG / IEF via Stooq
-    hyg_text = http_get_text(URL_HYG)
-    ief_text = http_get_text(URL_IEF)
-    hyg_pts = parse_stooq_ohlc(hyg_text)
-    ief_pts = parse_stooq_ohlc(ief_text)
-    ratio_pts = align_ratio(hyg_pts, ief_pts)
-    add_check("HYG_IEF_RATIO", "aligned_points", "OK", n=len(ratio_pts))
-
-    # -------------------------
-    # (A) Ratio latest date must exist in BOTH HYG and IEF
-    # -------------------------
-    hyg_dates = {p.date for p in hyg_pts}
-    ief_dates = {p.date for p in ief_pts}
-    ratio_latest_date = ratio_pts[-1].date
-    if (ratio_latest_date in hyg_dates) and (ratio_latest_date in ief_dates):
-        add_check(
-            "HYG_IEF_RATIO",
-            "ratio_latest_date_present_in_hyg_and_ief",
-            "OK",
-            latest_date=ratio_latest_date,
-        )
-    else:
-        add_check(
-            "HYG_IEF_RATIO",
-            "ratio_latest_date_present_in_hyg_and_ief",
-            "ERR",
-            latest_date=ratio_latest_date,
-            hyg_has=(ratio_latest_date in hyg_dates),
-            ief_has=(ratio_latest_date in ief_dates),
-        )
+    ratio_extra: Dict[str, object] = {
+        "sources": [URL_HYG, URL_IEF],
+        "formula": "HYG_close / IEF_close (aligned by same trading date)",
+    }
+    ratio_pts: Optional[List[Point]] = None
+    if fetched["HYG"].ok and fetched["IEF"].ok:
+        hyg_pts: List[Point] = fetched["HYG"].result  # type: ignore[assignment]
+        ief_pts: List[Point] = fetched["IEF"].result  # type: ignore[assignment]
+        try:
+            ratio_pts = align_ratio(hyg_pts, ief_pts)
+        except ValueError as e:
+            add_check("HYG_IEF_RATIO", "aligned_points", "ERR", error=str(e))
+        if ratio_pts is not None:
+            add_check("HYG_IEF_RATIO", "aligned_points", "OK", n=len(ratio_pts))
+
+            # -------------------------
+            # (A) Ratio latest date must exist in BOTH HYG and IEF
+            # -------------------------
+            hyg_dates = {p.date for p in hyg_pts}
+            ief_dates = {p.date for p in ief_pts}
+            ratio_latest_date = ratio_pts[-1].date
+            if (ratio_latest_date in hyg_dates) and (ratio_latest_date in ief_dates):
+                add_check(
+                    "HYG_IEF_RATIO",
+                    "ratio_latest_date_present_in_hyg_and_ief",
+                    "OK",
+                    latest_date=ratio_latest_date,
+                )
+            else:
+                add_check(
+                    "HYG_IEF_RATIO",
+                    "ratio_latest_date_present_in_hyg_and_ief",
+                    "ERR",
+                    latest_date=ratio_latest_date,
+                    hyg_has=(ratio_latest_date in hyg_dates),
+                    ief_has=(ratio_latest_date in ief_dates),
+                )
+    if ratio_pts is None:
+        ratio_pts = carry_forward("HYG_IEF_RATIO", "component_fetch_or_align_failed", ["HYG", "IEF"])
+        ratio_extra["carried_forward"] = True
+    source_pts["HYG_IEF_RATIO"] = ratio_pts
+
+    add_check(
+        "GLOBAL",
+        "fetch_timing",
+        "OK",
+        workers=FETCH_WORKERS,
+        sources={n: {"ok": r.ok, "attempts": r.attempts, "elapsed_secs": r.elapsed_secs} for n, r in fetched.items()},
+    )
 
     # ---- Build normalized series dict ----
     series_map: Dict[str, Dict[str, object]] = {}
@@ -473,18 +799,12 @@ def main() -> None:
         if extra:
             series_map[series_id]["latest"].update(extra)
 
-    add_series("OFR_FSI", ofr_pts, URL_OFR_FSI, extra={"parse_header": ofr_header})
-    add_series("VIX", vix_pts, URL_VIX_CBOE, extra={"parse_header": vix_header})
-    add_series("SP500", spx_pts, URL_SPX)
-    add_series(
-        "HYG_IEF_RATIO",
-        ratio_pts,
-        "DERIVED",
-        extra={
-            "sources": [URL_HYG, URL_IEF],
-            "formula": "HYG_close / IEF_close (aligned by same trading date)",
-        },
-    )
+    for sid, url in (("OFR_FSI", URL_OFR_FSI), ("VIX", URL_VIX_CBOE), ("SP500", URL_SPX), ("HYG_IEF_RATIO", "DERIVED")):
+        pts = source_pts.get(sid)
+        if not pts:
+            continue  # fetch failed and nothing to carry forward; already recorded as ERR
+        extra = ratio_extra if sid == "HYG_IEF_RATIO" else source_extra.get(sid)
+        add_series(sid, pts, url, extra=extra or None)
 
     # ---- Output latest.json ----
     latest_obj = {
@@ -529,13 +849,10 @@ def main() -> None:
         latest = pts[-1]
         prev = pts[-2]
 
-        idx_latest = len(pts) - 1
         idx_prev = len(pts) - 2
 
-        w60_now = window_stats_at(pts, 60, idx_latest)
-        w60_prev = window_stats_at(pts, 60, idx_prev)
-        w252_now = window_stats_at(pts, 252, idx_latest)
-        w252_prev = window_stats_at(pts, 252, idx_prev)
+        w60_prev, w60_now = window_stats_range(pts, 60, idx_prev)
+        w252_prev, w252_now = window_stats_range(pts, 252, idx_prev)
 
         def delta(a: Optional[float], b: Optional[float]) -> Optional[float]:
             if a is None or b is None:
@@ -626,12 +943,22 @@ def main() -> None:
         json.dump(stats_obj, f, ensure_ascii=False, indent=2)
 
     # ---- Output dq_state.json ----
+    http_cache_obj = {
+        "enable": HTTP_CACHE_ENABLE,
+        "dir": HTTP_CACHE_DIR,
+        "hits": sum(1 for v in http_cache_sources.values() if v.get("cache") == "hit"),
+        "misses": sum(1 for v in http_cache_sources.values() if v.get("cache") == "miss"),
+        "parse_reused": sum(1 for v in http_cache_sources.values() if v.get("parse") == "reused"),
+        "sources": http_cache_sources,
+    }
+
     dq_obj = {
         "generated_at_utc": as_of_ts,
         "as_of_ts": as_of_ts,
         "script_version": SCRIPT_VERSION,
         "dq": dq_overall,
         "checks": dq_checks,
+        "http_cache": http_cache_obj,
     }
     with open(DQ_STATE_PATH, "w", encoding="utf-8") as f:
         json.dump(dq_obj, f, ensure_ascii=False, indent=2)
@@ -641,6 +968,10 @@ def main() -> None:
     print(f"[OK] wrote: {STATS_LATEST_PATH}")
     print(f"[OK] wrote: {DQ_STATE_PATH}")
     print(f"[DQ] overall={dq_overall} checks={len(dq_checks)}")
+    print(
+        f"[HTTP_CACHE] hits={http_cache_obj['hits']} misses={http_cache_obj['misses']} "
+        f"parse_reused={http_cache_obj['parse_reused']}"
+    )
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ TWSE sidecar updater (roll25_cache/) - supports daily + month backfill.
 
 Writes (atomic):
   - roll25_cache/roll25.json
+  - roll25_cache/roll25_store.npz + roll25_derived.npz (scripts/roll25_store.py)
   - roll25_cache/latest_report.json
   - roll25_cache/stats_latest.json
 
@@ -44,6 +45,23 @@ Notes (output semantics):
   (prevents losing historical OHLC when only one endpoint is degraded).
 - Add cache-only degrade path: if both OpenAPI and monthly fallback fail, keep last cache and still emit report/stats
   anchored to cached latest date, with explicit downgrade notes (no guessing / no new data invented).
+
+2026-10-16 HTTP CLIENT UPDATE (values unchanged):
+- All fetches go through scripts/twse_client.py (one pooled session, global rate limit, on-disk payload
+  cache). Closed backfill months are served from .twse_http_cache instead of being refetched;
+  OpenAPI daily payloads are reused within the TTL only, and only cached when they are a non-empty
+  list of dated rows (_openapi_rows_ok). fetch.http_cache records hits/requests.
+
+2026-10-16 ROLL25 STORE UPDATE (values unchanged for the same history):
+- The merged history (previous store + roll25.json + new rows) is kept uncapped in a columnar store
+  (roll25_cache/roll25_store.npz); roll25.json stays capped at STORE_CAP for existing readers.
+- pct_change / amplitude_pct / rolling z,p (win60/win252) are precomputed per row in
+  roll25_derived.npz and only recomputed from the first changed row; stats and derived signals read
+  them at UsedDate instead of rebuilding date->row dicts and sorted date lists on every run.
+- The npz files are only rewritten when the store changed (mode != reuse) and their bytes depend only
+  on the content; roll25_derived.npz is not committed (actions/cache, rebuilt from the store on a miss).
+- stats.store records the store update (mode/reason/rows_recomputed); window_note.n_total_available
+  counts the full store history <= UsedDate.
 """
 
 from __future__ import annotations
@@ -55,10 +73,11 @@ import re
 import sys
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-import requests
+import roll25_store
+from twse_client import get_client, month_period_end, stat_ok
 
 CACHE_DIR = "roll25_cache"
 SCHEMA_PATH = os.path.join(CACHE_DIR, "twse_schema.json")
@@ -66,6 +85,7 @@ SCHEMA_PATH = os.path.join(CACHE_DIR, "twse_schema.json")
 ROLL_PATH = os.path.join(CACHE_DIR, "roll25.json")
 REPORT_PATH = os.path.join(CACHE_DIR, "latest_report.json")
 STATS_PATH = os.path.join(CACHE_DIR, "stats_latest.json")
+STORE_PATH, DERIVED_PATH = roll25_store.store_paths(CACHE_DIR)
 
 LOOKBACK_TARGET = 20
 BACKFILL_LIMIT = 252
@@ -115,37 +135,43 @@ def _today_tz(tz: ZoneInfo) -> date:
 def _is_weekend(d: date) -> bool:
     return d.weekday() >= 5
 
-def _http_get_json(url: str, timeout: int = 25, *, max_tries: int = 3) -> Any:
+def _openapi_rows_ok(date_keys: Optional[List[str]] = None) -> Callable[[Any], bool]:
+    """cacheable= predicate for OpenAPI "latest" payloads: a non-empty list of dicts, each with a date key."""
+    def ok(payload: Any) -> bool:
+        if not isinstance(payload, list) or not payload:
+            return False
+        return all(
+            isinstance(r, dict) and (date_keys is None or _pick_first_key(r, date_keys) not in (None, ""))
+            for r in payload
+        )
+    return ok
+
+def _http_get_json(
+    url: str,
+    timeout: int = 25,
+    *,
+    max_tries: int = 3,
+    period_end: Optional[date] = None,
+    date_keys: Optional[List[str]] = None,
+) -> Any:
     """
     Guardrail: retry/backoff on transient network / gateway errors.
     - Deterministic backoff: 2s, 4s, 8s
     - Does NOT "guess" payload; on final failure it raises.
+    - Goes through the shared twse_client (pooled session, global rate limit, payload cache):
+      period_end=None (OpenAPI "latest") -> TTL, cached only if _openapi_rows_ok(date_keys);
+      monthly endpoints pass the month end -> stat == OK only, and a closed month is immutable once
+      fetched after it closed.
     """
-    if not isinstance(url, str) or not url.strip():
-        raise ValueError("URL is missing/empty")
-
-    headers = {"Accept": "application/json", "User-Agent": UA}
-    backoffs = [2, 4, 8]
-    last_err: Optional[BaseException] = None
-
-    for i in range(max_tries):
-        try:
-            r = requests.get(url, headers=headers, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            last_err = e
-            # retry only if we still have attempts
-            if i + 1 >= max_tries:
-                break
-            # deterministic backoff
-            try:
-                import time
-                time.sleep(backoffs[min(i, len(backoffs) - 1)])
-            except Exception:
-                pass
-
-    raise RuntimeError(f"HTTP GET failed after {max_tries} tries: {url} ; last_err={last_err}")
+    return get_client().get_json(
+        url,
+        headers={"Accept": "application/json", "User-Agent": UA},
+        timeout=timeout,
+        max_tries=max_tries,
+        backoffs=(2, 4, 8),
+        period_end=period_end,
+        cacheable=(stat_ok if period_end is not None else _openapi_rows_ok(date_keys)),
+    )
 
 def _safe_float(x: Any) -> Optional[float]:
     if x is None:
@@ -400,7 +426,11 @@ def _merge_row_keep_existing_non_none(existing: Dict[str, Any], new: Dict[str, A
             out[k] = v
     return out
 
-def _merge_roll(existing: List[Dict[str, Any]], new_items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+def _merge_roll(
+    existing: List[Dict[str, Any]],
+    new_items: List[Dict[str, Any]],
+    cap: Optional[int] = STORE_CAP,
+) -> Tuple[List[Dict[str, Any]], bool]:
     m: Dict[str, Dict[str, Any]] = {}
     for it in existing:
         if isinstance(it, dict) and "date" in it:
@@ -414,7 +444,8 @@ def _merge_roll(existing: List[Dict[str, Any]], new_items: List[Dict[str, Any]])
                 m[d] = it
     merged = list(m.values())
     merged.sort(key=lambda x: str(x.get("date", "")), reverse=True)  # newest->oldest
-    merged = merged[:STORE_CAP]
+    if cap is not None:
+        merged = merged[:cap]
     dates = [str(x.get("date", "")) for x in merged if isinstance(x, dict)]
     dedupe_ok = (len(dates) == len(set(dates)))
     return merged, dedupe_ok
@@ -488,108 +519,23 @@ def _build_items_from_maps(
 def _avg(xs: List[float]) -> Optional[float]:
     return (sum(xs) / len(xs)) if xs else None
 
-def _std_pop(xs: List[float]) -> Optional[float]:
-    if not xs:
-        return None
-    mu = _avg(xs)
-    if mu is None:
-        return None
-    var = sum((x - mu) ** 2 for x in xs) / len(xs)
-    return var ** 0.5
-
-def _percentile_tie_aware(x: float, xs: List[float]) -> Optional[float]:
-    if not xs:
-        return None
-    less = sum(1 for v in xs if v < x)
-    equal = sum(1 for v in xs if v == x)
-    n = len(xs)
-    return 100.0 * (less + 0.5 * equal) / n
-
 def _calc_amplitude_pct(high: float, low: float, prev_close: float) -> Optional[float]:
     if prev_close == 0:
         return None
     return (high - low) / prev_close * 100.0
 
-def _index_by_date(roll: List[Dict[str, Any]], used_date: str) -> Dict[str, Dict[str, Any]]:
-    m: Dict[str, Dict[str, Any]] = {}
-    for r in roll:
-        if not isinstance(r, dict):
-            continue
-        d = str(r.get("date", ""))
-        if not d or d > used_date:
-            continue
-        m[d] = r
-    return m
-
-def _dates_desc(m: Dict[str, Dict[str, Any]]) -> List[str]:
-    return sorted(m.keys(), reverse=True)
-
-def _series_value_desc(m: Dict[str, Dict[str, Any]], key: str) -> List[Tuple[str, float]]:
-    out: List[Tuple[str, float]] = []
-    for d in _dates_desc(m):
-        v = _safe_float(m[d].get(key))
-        if v is None:
-            continue
-        out.append((d, float(v)))
-    return out
-
-def _series_pct_change_desc(m: Dict[str, Dict[str, Any]]) -> List[Tuple[str, float]]:
-    ds = _dates_desc(m)
-    out: List[Tuple[str, float]] = []
-    for i, d in enumerate(ds):
-        c = _safe_float(m[d].get("close"))
-        if c is None or i + 1 >= len(ds):
-            continue
-        dprev = ds[i + 1]
-        pc = _safe_float(m[dprev].get("close"))
-        if pc is None or pc == 0:
-            continue
-        out.append((d, (c - pc) / pc * 100.0))
-    return out
-
-def _series_amplitude_pct_desc(m: Dict[str, Dict[str, Any]]) -> List[Tuple[str, float]]:
-    ds = _dates_desc(m)
-    out: List[Tuple[str, float]] = []
-    for i, d in enumerate(ds):
-        h = _safe_float(m[d].get("high"))
-        l = _safe_float(m[d].get("low"))
-        if h is None or l is None:
-            continue
-        if i + 1 >= len(ds):
-            continue
-        dprev = ds[i + 1]
-        pc = _safe_float(m[dprev].get("close"))
-        if pc is None or pc == 0:
-            continue
-        out.append((d, (h - l) / pc * 100.0))
-    return out
-
-def _window_take(values_desc: List[Tuple[str, float]], n: int, used_date: str) -> List[float]:
-    xs: List[float] = []
-    for d, v in values_desc:
-        if d > used_date:
-            continue
-        xs.append(float(v))
-        if len(xs) >= n:
-            break
-    return xs
-
-def _calc_stats_for_series(values_desc: List[Tuple[str, float]], used_date: str, win: int) -> Dict[str, Any]:
-    x = None
-    for d, v in values_desc:
-        if d == used_date:
-            x = float(v)
-            break
-    xs = _window_take(values_desc, win, used_date)
-    n_actual = len(xs)
+def _calc_stats_from_store(st: roll25_store.Roll25Store, series: str, used_date: str, win: int) -> Dict[str, Any]:
+    """
+    z/p of the series at used_date over the last `win` valid values <= used_date
+    (precomputed per row in roll25_derived.npz; population std, tie-aware percentile).
+    """
+    i = st.index_of(used_date)
+    x = st.value(series, i)
+    n_actual = min(win, st.count_valid(series, used_date))
     if x is None or n_actual == 0:
         return {"value": x, "window_n_target": win, "window_n_actual": n_actual, "z": None, "p": None}
-    mu = _avg(xs)
-    sd = _std_pop(xs)
-    z = None
-    if mu is not None and sd is not None and sd != 0:
-        z = (x - mu) / sd
-    p = _percentile_tie_aware(x, xs)
+    z = st.value(f"{series}.z{win}", i)
+    p = st.value(f"{series}.p{win}", i)
     return {
         "value": x,
         "window_n_target": win,
@@ -601,46 +547,15 @@ def _calc_stats_for_series(values_desc: List[Tuple[str, float]], used_date: str,
 
 # ----------------- ADDITIVE unified-friendly derived signals -----------------
 
-def _take_trade_values_desc(m: Dict[str, Dict[str, Any]], used_date: str, n: int) -> List[float]:
-    xs: List[float] = []
-    for d in _dates_desc(m):
-        if d > used_date:
-            continue
-        tv = _safe_float(m[d].get("trade_value"))
-        if tv is None:
-            continue
-        xs.append(float(tv))
-        if len(xs) >= n:
-            break
-    return xs
-
-def _take_closes_desc(m: Dict[str, Dict[str, Any]], used_date: str, n: int) -> List[float]:
-    xs: List[float] = []
-    for d in _dates_desc(m):
-        if d > used_date:
-            continue
-        c = _safe_float(m[d].get("close"))
-        if c is None:
-            continue
-        xs.append(float(c))
-        if len(xs) >= n:
-            break
-    return xs
-
-def _consecutive_down_days(series_ret_desc: List[Tuple[str, float]], used_date: str, max_n: int = 60) -> Optional[int]:
+def _consecutive_down_days(st: roll25_store.Roll25Store, used_date: str, max_n: int = 60) -> Optional[int]:
     """
     Count consecutive days where daily return < 0 starting from used_date.
     Returns None if used_date return is missing.
     """
-    mret = {d: float(v) for d, v in series_ret_desc}
-    if used_date not in mret:
+    if st.value("pct_change", st.index_of(used_date)) is None:
         return None
     cnt = 0
-    for d, v in series_ret_desc:
-        if d > used_date:
-            continue
-        if cnt >= max_n:
-            break
+    for v in st.take_desc("pct_change", used_date, max_n):
         if float(v) < 0:
             cnt += 1
         else:
@@ -712,7 +627,7 @@ def _fetch_month_current(schema: Dict[str, Any], today: date) -> Tuple[List[FmtR
     yyyymm01 = _month_yyyymm01(date(today.year, today.month, 1))
     try:
         url = bf_fmt_tpl.format(yyyymm01=yyyymm01)
-        p = _http_get_json(url)
+        p = _http_get_json(url, period_end=month_period_end(yyyymm01))
         fmt_rows = _parse_twse_monthly_fmtqik(p)
     except Exception as e:
         notes.append(f"monthly_fallback_fmtqik_failed:{e}")
@@ -720,7 +635,7 @@ def _fetch_month_current(schema: Dict[str, Any], today: date) -> Tuple[List[FmtR
 
     try:
         url = bf_ohlc_tpl.format(yyyymm01=yyyymm01)
-        p = _http_get_json(url)
+        p = _http_get_json(url, period_end=month_period_end(yyyymm01))
         ohlc_rows = _parse_twse_monthly_ohlc(p)
     except Exception as e:
         notes.append(f"monthly_fallback_ohlc_failed:{e}")
@@ -778,7 +693,7 @@ def main() -> None:
 
     if (not args.prefer_monthly) and (not _is_weekend(today)) and isinstance(daily_fmt_url, str) and daily_fmt_url.strip():
         try:
-            fmt_raw = _http_get_json(daily_fmt_url)
+            fmt_raw = _http_get_json(daily_fmt_url, date_keys=schema["fmtqik"]["date_keys"])
             daily_fmt_rows = _parse_fmtqik_rows(fmt_raw, schema)
             if not daily_fmt_rows:
                 daily_ok = False
@@ -797,7 +712,7 @@ def main() -> None:
 
     if (not args.prefer_monthly) and isinstance(daily_ohlc_url, str) and daily_ohlc_url.strip():
         try:
-            ohlc_raw = _http_get_json(daily_ohlc_url)
+            ohlc_raw = _http_get_json(daily_ohlc_url, date_keys=schema["mi_5mins_hist"]["date_keys"])
             daily_ohlc_rows = _parse_ohlc_rows(ohlc_raw, schema)
         except Exception as e:
             fetch_notes.append(f"openapi_ohlc_failed(downgrade):{e}")
@@ -838,13 +753,13 @@ def main() -> None:
         for yyyymm01 in yyyymm01_list:
             try:
                 url = bf_fmt_tpl.format(yyyymm01=yyyymm01)
-                p = _http_get_json(url)
+                p = _http_get_json(url, period_end=month_period_end(yyyymm01))
                 backfill_fmt_rows.extend(_parse_twse_monthly_fmtqik(p))
             except Exception as e:
                 print(f"[WARN] backfill FMTQIK month={yyyymm01} failed: {e}")
             try:
                 url = bf_ohlc_tpl.format(yyyymm01=yyyymm01)
-                p = _http_get_json(url)
+                p = _http_get_json(url, period_end=month_period_end(yyyymm01))
                 backfill_ohlc_rows.extend(_parse_twse_monthly_ohlc(p))
             except Exception as e:
                 print(f"[WARN] backfill MI_5MINS_HIST month={yyyymm01} failed: {e}")
@@ -900,6 +815,12 @@ def main() -> None:
 
     merged_roll, dedupe_ok = _merge_roll(existing_roll, new_items)
 
+    # full history for the columnar store: previous store + roll25.json (e.g. an uncapped backfill) + new rows
+    store_old = roll25_store.load_store(STORE_PATH, DERIVED_PATH)
+    history, _ = _merge_roll(store_old.items() if store_old is not None else [], existing_roll, cap=None)
+    history, _ = _merge_roll(history, new_items, cap=None)
+    st, store_info = roll25_store.update_store(STORE_PATH, DERIVED_PATH, history, old=store_old, save=False)
+
     lookback = _extract_lookback(merged_roll, used_date)
     n_actual = len(lookback)
     oldest = lookback[-1]["date"] if lookback else "NA"
@@ -916,8 +837,8 @@ def main() -> None:
         freshness_ok = False
 
     # used row
-    m_used = _index_by_date(merged_roll, used_date)
-    row_used = m_used.get(used_date, {})
+    i_used = st.index_of(used_date)
+    row_used = st.row(i_used) if i_used is not None else {}
 
     ohlc_ok = bool(
         row_used
@@ -971,17 +892,15 @@ def main() -> None:
     NEWLOW_N = 60
     NEWLOW_MIN_POINTS = 40
 
-    m_all = _index_by_date(merged_roll, used_date)
-    tv_desc = _take_trade_values_desc(m_all, used_date, VOL_WIN)
-    closes_desc = _take_closes_desc(m_all, used_date, NEWLOW_N)
+    tv_desc = st.take_desc("trade_value", used_date, VOL_WIN)
+    closes_desc = st.take_desc("close", used_date, NEWLOW_N)
 
     vol_mult_20 = _vol_multiplier(today_trade_value, tv_desc, VOL_WIN, VOL_MIN_POINTS)
     volume_ampl = _volume_amplified(vol_mult_20, VOL_THRESHOLD)
 
     new_low_n = _new_low_n(today_close, closes_desc, NEWLOW_N, NEWLOW_MIN_POINTS)
 
-    series_ret = _series_pct_change_desc(m_all)
-    cons_down = _consecutive_down_days(series_ret, used_date, max_n=60)
+    cons_down = _consecutive_down_days(st, used_date, max_n=60)
 
     additive_signal = {
         "VolumeAmplified": volume_ampl,
@@ -1009,6 +928,7 @@ def main() -> None:
         "fetch": {
             "fetch_plan": fetch_plan,
             "notes": fetch_notes[:50],  # keep bounded
+            "http_cache": get_client().audit(),
         },
 
         "numbers": {
@@ -1073,10 +993,7 @@ def main() -> None:
     }
 
     # stats
-    series_close = _series_value_desc(m_all, "close")
-    series_tv = _series_value_desc(m_all, "trade_value")
-    series_ret2 = _series_pct_change_desc(m_all)
-    series_amp = _series_amplitude_pct_desc(m_all)
+    n_avail = {k: st.count_valid(k, used_date) for k in roll25_store.STAT_SERIES}
 
     stats = {
         "schema_version": "twse_stats_v1",
@@ -1097,6 +1014,7 @@ def main() -> None:
         "backfill_months": args.backfill_months,
         "backfill_limit": BACKFILL_LIMIT,
         "store_cap": STORE_CAP,
+        "store": store_info,
 
         # GUARDRAIL DIAGNOSTICS (additive)
         "fetch": {
@@ -1104,36 +1022,37 @@ def main() -> None:
             "cache_only_mode": cache_only_mode,
             "cache_only_reason": cache_only_reason,
             "notes": fetch_notes[:50],
+            "http_cache": get_client().audit(),
         },
 
         "series": {
             "close": {
                 "asof": used_date,
-                "win60": _calc_stats_for_series(series_close, used_date, 60),
-                "win252": _calc_stats_for_series(series_close, used_date, 252),
-                "window_note": {"n_total_available": len(series_close)}
+                "win60": _calc_stats_from_store(st, "close", used_date, 60),
+                "win252": _calc_stats_from_store(st, "close", used_date, 252),
+                "window_note": {"n_total_available": n_avail["close"]}
             },
             "trade_value": {
                 "asof": used_date,
-                "win60": _calc_stats_for_series(series_tv, used_date, 60),
-                "win252": _calc_stats_for_series(series_tv, used_date, 252),
-                "window_note": {"n_total_available": len(series_tv)}
+                "win60": _calc_stats_from_store(st, "trade_value", used_date, 60),
+                "win252": _calc_stats_from_store(st, "trade_value", used_date, 252),
+                "window_note": {"n_total_available": n_avail["trade_value"]}
             },
             "pct_change": {
                 "asof": used_date,
-                "win60": _calc_stats_for_series(series_ret2, used_date, 60),
-                "win252": _calc_stats_for_series(series_ret2, used_date, 252),
+                "win60": _calc_stats_from_store(st, "pct_change", used_date, 60),
+                "win252": _calc_stats_from_store(st, "pct_change", used_date, 252),
                 "window_note": {
-                    "n_total_available": len(series_ret2),
-                    "note": "pct_change needs D-1 close; with backfill_limit=252, max pct_change points are typically <=251."
+                    "n_total_available": n_avail["pct_change"],
+                    "note": "pct_change needs D-1 close; n_total_available counts the full (uncapped) store history <= asof, so it is typically close_n - 1."
                 }
             },
             "amplitude_pct": {
                 "asof": used_date,
-                "win60": _calc_stats_for_series(series_amp, used_date, 60),
-                "win252": _calc_stats_for_series(series_amp, used_date, 252),
+                "win60": _calc_stats_from_store(st, "amplitude_pct", used_date, 60),
+                "win252": _calc_stats_from_store(st, "amplitude_pct", used_date, 252),
                 "window_note": {
-                    "n_total_available": len(series_amp),
+                    "n_total_available": n_avail["amplitude_pct"],
                     "note": "amplitude_pct needs high/low + D-1 close; if OHLC missing, series is sparse and windows may be incomplete."
                 }
             }
@@ -1165,6 +1084,8 @@ def main() -> None:
     }
 
     _atomic_write_json(ROLL_PATH, merged_roll)
+    if store_info["mode"] != "reuse":
+        roll25_store.save_store(st, STORE_PATH, DERIVED_PATH)
     _atomic_write_json(REPORT_PATH, latest_report)
     _atomic_write_json(STATS_PATH, stats)
 
@@ -1172,12 +1093,14 @@ def main() -> None:
     print(f"  UsedDate={used_date} Mode={mode} freshness_ok={freshness_ok} age_days={freshness_age_days}")
     print(f"  run_day_tag={run_day_tag} used_date_status={used_date_status}")
     print(f"  roll_records={len(merged_roll)} dedupe_ok={dedupe_ok}")
-    print(f"  close_n={len(series_close)} tv_n={len(series_tv)} ret_n={len(series_ret2)} amp_n={len(series_amp)}")
+    print(f"  close_n={n_avail['close']} tv_n={n_avail['trade_value']} ret_n={n_avail['pct_change']} amp_n={n_avail['amplitude_pct']}")
+    print(f"  STORE: rows={store_info['rows']} mode={store_info['mode']} reason={store_info['reason']} "
+          f"rows_recomputed={store_info['rows_recomputed']}")
     print(f"  ADDITIVE: vol_multiplier_20={None if vol_mult_20 is None else round(float(vol_mult_20), 6)} "
           f"VolumeAmplified={volume_ampl} NewLow_N={new_low_n} ConsecutiveBreak={cons_down}")
     print(f"  ADDITIVE: latest_report.cache_roll25 points={len(cache_roll25)} (newest->oldest)")
     print(f"  GUARDRAIL: fetch_plan={fetch_plan} cache_only_mode={cache_only_mode}")
-    print(f"  wrote: {ROLL_PATH}, {REPORT_PATH}, {STATS_PATH}")
+    print(f"  wrote: {ROLL_PATH}, {REPORT_PATH}, {STATS_PATH}, {STORE_PATH}, {DERIVED_PATH}")
 
 
 if __name__ == "__main__":
@@ -71,6 +71,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from forward_extrema import forward_mdd_runup
+
 try:
     import yfinance as yf
 except Exception as e:
@@ -362,17 +364,16 @@ def bucket_from_z(z: float) -> str:
 
 
 def compute_forward_mdd(prices: np.ndarray, forward_days: int) -> np.ndarray:
-    n = len(prices)
-    out = np.full(n, np.nan, dtype=float)
-    for t in range(0, n - forward_days):
-        p0 = prices[t]
-        if not np.isfinite(p0) or p0 <= 0:
-            continue
-        future_min = np.min(prices[t + 1: t + forward_days + 1])
-        if not np.isfinite(future_min) or future_min <= 0:
-            continue
-        out[t] = (future_min / p0) - 1.0
-    return out
+    """
+    out[t] = min(prices[t+1..t+forward_days]) / prices[t] - 1
+    NaN when the window is incomplete, p0 is not finite/positive, or future_min is not finite/positive.
+    """
+    return forward_mdd_runup(
+        prices,
+        [forward_days],
+        nan_policy="propagate",
+        require_positive_extreme=True,
+    )[forward_days]["mdd"]
 
 
 def summarize_mdd(mdd: np.ndarray, min_n_required: int = 200) -> Dict[str, Any]:
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_forward_extrema.py
+
+Benchmark scripts/forward_extrema.py against the legacy per-index forward-MDD loop
+(VT compute_forward_mdd definition) on a long price history.
+
+Price source (first available):
+- --yf-ticker VT  : yfinance period="max" (needs yfinance + network)
+- --csv PATH      : CSV with a price column (default tw0050_bb_cache/data.csv, column adjclose)
+- synthetic       : --synthetic-n points of geometric random walk
+
+Both paths are checked for bit-identical output before timings are printed.
+
+Usage:
+    python tools/bench_forward_extrema.py --yf-ticker VT --horizons 5,10,20,60,120
+    python tools/bench_forward_extrema.py --csv tw0050_bb_cache/data.csv --col adjclose
+    python tools/bench_forward_extrema.py --synthetic-n 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from forward_extrema import forward_mdd_runup  # noqa: E402
+
+
+def legacy_forward_mdd(prices: np.ndarray, forward_days: int) -> np.ndarray:
+    n = len(prices)
+    out = np.full(n, np.nan, dtype=float)
+    for t in range(0, n - forward_days):
+        p0 = prices[t]
+        if not np.isfinite(p0) or p0 <= 0:
+            continue
+        future_min = np.min(prices[t + 1: t + forward_days + 1])
+        if not np.isfinite(future_min) or future_min <= 0:
+            continue
+        out[t] = (future_min / p0) - 1.0
+    return out
+
+
+def load_prices(args: argparse.Namespace) -> Tuple[np.ndarray, str]:
+    if args.yf_ticker:
+        try:
+            import yfinance as yf
+
+            df = yf.Ticker(args.yf_ticker).history(period="max", auto_adjust=False)
+            col = "Adj Close" if "Adj Close" in df.columns else "Close"
+            px = df[col].to_numpy(dtype=float)
+            if px.size > 0:
+                return px, f"yfinance:{args.yf_ticker} period=max ({col})"
+        except Exception as e:
+            print(f"[WARN] yfinance load failed ({type(e).__name__}); falling back", file=sys.stderr)
+
+    if args.synthetic_n <= 0:
+        p = Path(args.csv)
+        if p.exists():
+            import pandas as pd
+
+            px = pd.read_csv(p)[args.col].to_numpy(dtype=float)
+            return px, f"csv:{p} ({args.col})"
+
+    n = max(args.synthetic_n, 1000)
+    rng = np.random.default_rng(7)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n))), f"synthetic:n={n}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--yf-ticker", default=None)
+    ap.add_argument("--csv", default="tw0050_bb_cache/data.csv")
+    ap.add_argument("--col", default="adjclose")
+    ap.add_argument("--synthetic-n", type=int, default=0)
+    ap.add_argument("--horizons", default="5,10,20,60,120")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    prices, label = load_prices(args)
+    horizons: List[int] = [int(x) for x in args.horizons.split(",") if x.strip()]
+
+    def run_legacy():
+        return {h: legacy_forward_mdd(prices, h) for h in horizons}
+
+    def run_kernel():
+        res = forward_mdd_runup(prices, horizons, require_positive_extreme=True)
+        return {h: res[h]["mdd"] for h in horizons}
+
+    a, b = run_legacy(), run_kernel()
+    for h in horizons:
+        if not np.array_equal(a[h], b[h], equal_nan=True):
+            print(f"[ERROR] mismatch at horizon={h}", file=sys.stderr)
+            return 1
+
+    def best(fn) -> float:
+        t_best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn()
+            t_best = min(t_best, time.perf_counter() - t0)
+        return t_best
+
+    t_legacy, t_kernel = best(run_legacy), best(run_kernel)
+    print(f"source   : {label}")
+    print(f"n        : {len(prices)}")
+    print(f"horizons : {horizons} (kernel also returns forward max run-up)")
+    print(f"legacy   : {t_legacy:.4f}s")
+    print(f"kernel   : {t_kernel:.4f}s")
+    print(f"speedup  : {t_legacy / t_kernel if t_kernel > 0 else float('inf'):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_fred_stats_index.py
+
+Micro-benchmark for scripts/fred_cache.py stats stage:
+- legacy : _series_points_from_history_lite per series (O(series x rows) scans)
+- indexed: _index_history_lite once, then _compute_stats_from_arrays per series
+
+Rows are synthetic (history_lite schema, BACKFILL_TARGET_VALID points per series).
+Both paths are checked for identical output before timings are printed.
+
+Usage:
+    python tools/bench_fred_stats_index.py
+    python tools/bench_fred_stats_index.py --series-counts 13,50,100,200,400 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import fred_cache as fc  # noqa: E402
+
+
+def make_rows(n_series: int, points: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    start = date(2025, 1, 1)
+    rows: List[Dict[str, Any]] = []
+    for k in range(n_series):
+        sid = f"S{k:04d}"
+        v = 100.0
+        for i in range(points):
+            v += rnd.gauss(0.0, 1.0)
+            rows.append(
+                {
+                    "as_of_ts": "2026-01-01T00:00:00+08:00",
+                    "series_id": sid,
+                    "data_date": (start + timedelta(days=i)).isoformat(),
+                    "value": f"{v:.4f}",
+                    "source_url": "NA",
+                    "notes": "NA",
+                }
+            )
+    rows.sort(key=lambda x: (x["series_id"], x["data_date"]))
+    return rows
+
+
+def run_legacy(rows: List[Dict[str, Any]], sids: List[str]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for sid in sids:
+        pts = fc._series_points_from_history_lite(rows, sid)
+        out[sid] = fc._compute_stats_for_series(sid, pts, source_url_latest="NA")
+    return out
+
+
+def run_indexed(rows: List[Dict[str, Any]], sids: List[str]) -> Dict[str, Any]:
+    index = fc._index_history_lite(rows)
+    out: Dict[str, Any] = {}
+    for sid in sids:
+        dates, values = index.get(sid, ([], []))
+        out[sid] = fc._compute_stats_from_arrays(sid, dates, values, source_url_latest="NA")
+    return out
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series-counts", default="13,50,100,200,400")
+    ap.add_argument("--points", type=int, default=fc.BACKFILL_TARGET_VALID)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    counts = [int(x) for x in args.series_counts.split(",") if x.strip()]
+    print(f"{'series':>7} {'rows':>8} {'legacy_s':>10} {'indexed_s':>10} {'speedup':>8}")
+    for n in counts:
+        rows = make_rows(n, args.points)
+        sids = sorted({r["series_id"] for r in rows})
+        if run_legacy(rows, sids) != run_indexed(rows, sids):
+            print(f"[ERROR] output mismatch at series={n}", file=sys.stderr)
+            return 1
+        t_legacy = best_of(lambda: run_legacy(rows, sids), args.repeat)
+        t_indexed = best_of(lambda: run_indexed(rows, sids), args.repeat)
+        speedup = t_legacy / t_indexed if t_indexed > 0 else float("inf")
+        print(f"{n:>7} {len(rows):>8} {t_legacy:>10.4f} {t_indexed:>10.4f} {speedup:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
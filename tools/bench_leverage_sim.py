@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_leverage_sim.py
+
+Benchmark + identity check for scripts/leverage_sim.py (array-state bar loop of
+backtest_tw0050_leverage_mvp.run_backtest).
+
+Three engines on the same prepared frame and indicators:
+- legacy : the v26.11 per-bar loop (closures + per-trade dicts), copied below verbatim
+- single : leverage_sim.simulate, one parameter set per call (what run_backtest uses now)
+- batch  : leverage_sim.simulate_batch, all K parameter sets in one bar loop
+
+Equity curves, lever_on flags, trade dicts and counters must be identical (exact float equality)
+before timings are printed. Exit code 1 on any mismatch.
+
+Price source:
+- --csv PATH      : default tw0050_bb_cache/data.csv (~4,200 rows)
+- --synthetic-n N : geometric random walk of N rows (e.g. 50000), fixed --seed
+
+Usage:
+    python tools/bench_leverage_sim.py
+    python tools/bench_leverage_sim.py --synthetic-n 50000 --k 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from backtest_tw0050_leverage_mvp import (  # noqa: E402
+    MAINT_RATIO_MODES,
+    Params,
+    _daily_interest,
+    _entry_cost,
+    _exit_cost,
+    _prepare_backtest_frame,
+    _signals,
+    _sim_spec,
+    _slip_rate,
+    _to_finite_float,
+)
+from leverage_sim import COUNTER_FIELDS, simulate, simulate_batch, trades_to_dicts  # noqa: E402
+
+
+def legacy_loop(df: pd.DataFrame, params: Params, forbid_entry_mask: Optional[List[bool]]) -> Dict[str, Any]:
+    """v26.11 run_backtest bar loop (df already prepared with indicator columns)."""
+    n = int(len(df))
+    p0 = float(df["price"].iloc[0])
+    base_shares = 1.0 / p0
+    lever_shares_target = max(float(base_shares) * float(params.leverage_frac), 0.0)
+
+    prices = df["price"].to_numpy(dtype=float)
+    zs = df["bb_z"].to_numpy(dtype=float)
+    dates = df["date"].astype(str).to_numpy()
+    ma_fast = df["ma_fast"].to_numpy(dtype=float)
+    ma_slow = df["ma_slow"].to_numpy(dtype=float)
+    rv20 = df["rv20"].to_numpy(dtype=float)
+    rv20_q60 = df["rv20_q60"].to_numpy(dtype=float)
+
+    lever_shares = 0.0
+    borrow_principal = 0.0
+    cash = 0.0
+    in_lever = False
+    hold_days = 0
+    interest_paid_total = 0.0
+
+    entry_cost_total = 0.0
+    exit_cost_total = 0.0
+    cost_paid_total = 0.0
+
+    slip_rate = _slip_rate(params.slip_bps)
+
+    trades: List[Dict[str, Any]] = []
+    cur_trade: Optional[Dict[str, Any]] = None
+
+    eq_arr = np.empty(n, dtype=float)
+    base_arr = np.empty(n, dtype=float)
+    lev_on_arr = np.empty(n, dtype=bool)
+
+    skipped_entries_on_forbidden = 0
+    skipped_entries_on_nonpositive_equity = 0
+    skipped_entries_same_day_exit = 0  # v26.4 audit
+    skipped_entries_on_rv20 = 0         # v26.5 audit
+
+    exit_count_by_exit_z = 0
+    exit_count_by_max_hold_days = 0
+    exit_count_by_trend_off = 0
+    exit_count_by_end_of_data = 0
+    forced_eod_close = 0
+
+    margin_call_count = 0
+    min_maint_ratio = None
+
+    forbid = forbid_entry_mask if (forbid_entry_mask is not None and len(forbid_entry_mask) == n) else [False] * n
+
+    def _trend_on(i: int) -> bool:
+        if params.trend_rule == "price_gt_ma60":
+            m = ma_slow[i]
+            p = prices[i]
+            if not np.isfinite(m) or not np.isfinite(p):
+                return False
+            return p > m
+        f = ma_fast[i]
+        s = ma_slow[i]
+        if not np.isfinite(f) or not np.isfinite(s):
+            return False
+        return f > s
+
+    def _entry_signal(i: int) -> bool:
+        if params.entry_mode == "always":
+            return True
+        if params.entry_mode == "trend":
+            return _trend_on(i)
+        zf_entry = _to_finite_float(zs[i])
+        return (zf_entry is not None) and (zf_entry <= float(params.entry_z))
+
+    def _rv20_block(i: int) -> bool:
+        if str(params.entry_mode) != "bb":
+            return False
+        r = rv20[i]
+        q = rv20_q60[i]
+        return bool(np.isfinite(r) and np.isfinite(q) and (float(r) > float(q)))
+
+    def _exit_signal(i: int) -> Tuple[bool, str]:
+        by_time = (params.max_hold_days > 0 and hold_days >= params.max_hold_days)
+        if by_time:
+            return True, "max_hold_days"
+
+        if params.entry_mode == "always":
+            return False, "none"
+
+        if params.entry_mode == "trend":
+            if not _trend_on(i):
+                return True, "trend_off"
+            return False, "none"
+
+        zf = _to_finite_float(zs[i])
+        by_z = (zf is not None and zf >= float(params.exit_z))
+        return (by_z, ("exit_z" if by_z else "none"))
+
+    timing_assumption = "assume close-at-EOD on exit date; interest charged for that day before exit"
+
+    def _maint_ratio(equity: float, lever_notional: float, total_notional: float, borrow: float) -> Optional[float]:
+        mode = str(params.maint_ratio_mode).strip()
+        if mode not in MAINT_RATIO_MODES:
+            mode = "equity_over_lever_notional"
+
+        denom = None
+        if mode == "equity_over_borrow":
+            denom = borrow
+        elif mode == "equity_over_total_notional":
+            denom = total_notional
+        else:
+            denom = lever_notional
+
+        if denom is None or denom <= 0.0:
+            return None
+        if not np.isfinite(equity) or not np.isfinite(denom):
+            return None
+        return float(equity) / float(denom)
+
+    for i in range(n):
+        exited_today = False
+
+        price = float(prices[i])
+        z_raw = float(zs[i]) if np.isfinite(zs[i]) else float("nan")
+        date = str(dates[i])
+
+        # accrue interest at start of bar if in position
+        if in_lever and borrow_principal > 0.0:
+            interest = _daily_interest(borrow_principal, params.borrow_apr, params.trading_days)
+            cash -= interest
+            interest_paid_total += interest
+            if cur_trade is not None:
+                cur_trade["interest_paid"] = float(cur_trade.get("interest_paid", 0.0) + interest)
+
+        base_now = base_shares * price
+
+        # maintenance margin check BEFORE normal hold_days increment
+        if in_lever and float(params.maintenance_margin) > 0.0:
+            total_shares_flat = base_shares + lever_shares
+            total_notional = float(total_shares_flat * price)
+            equity_flat = float(total_notional + cash - borrow_principal)
+
+            lever_notional = float(lever_shares * price)
+            mr = _maint_ratio(equity_flat, lever_notional, total_notional, float(borrow_principal))
+
+            if mr is not None:
+                if (min_maint_ratio is None) or (mr < float(min_maint_ratio)):
+                    min_maint_ratio = float(mr)
+
+            if (mr is not None) and (mr < float(params.maintenance_margin)):
+                hold_days_effective = int(hold_days) + 1  # v26.2 alignment
+
+                proceeds = lever_shares * price
+
+                if params.cost_on == "all":
+                    notional_exit = (base_shares + lever_shares) * price
+                else:
+                    notional_exit = lever_shares * price
+
+                exit_cost = _exit_cost(notional_exit, params.fee_rate, params.tax_rate, slip_rate)
+                if exit_cost > 0.0:
+                    cash -= exit_cost
+                    exit_cost_total += exit_cost
+                    cost_paid_total += exit_cost
+
+                cash += proceeds
+                cash -= borrow_principal
+
+                if cur_trade is not None:
+                    cur_trade["exit_date"] = date
+                    cur_trade["exit_price"] = price
+                    cur_trade["hold_days"] = int(hold_days_effective)
+                    cur_trade["exit_reason"] = "margin_call"
+                    cur_trade["exit_cost"] = float(exit_cost)
+                    cost_paid = float(cur_trade.get("entry_cost", 0.0) + cur_trade.get("exit_cost", 0.0))
+                    cur_trade["cost_paid"] = float(cost_paid)
+                    lever_leg_pnl = float(proceeds - float(cur_trade.get("borrow_principal", 0.0)))
+                    cur_trade["lever_leg_pnl"] = float(lever_leg_pnl)
+                    net_after_costs = lever_leg_pnl - float(cur_trade.get("interest_paid", 0.0)) - cost_paid
+                    cur_trade["net_lever_pnl_after_costs"] = float(net_after_costs)
+                    trades.append(cur_trade)
+
+                margin_call_count += 1
+
+                borrow_principal = 0.0
+                lever_shares = 0.0
+                in_lever = False
+                cur_trade = None
+                hold_days = 0
+
+                exited_today = True
+
+        # normal exit logic
+        if in_lever:
+            hold_days += 1
+            exit_now, exit_reason = _exit_signal(i)
+
+            if exit_now:
+                proceeds = lever_shares * price
+
+                if params.cost_on == "all":
+                    notional_exit = (base_shares + lever_shares) * price
+                else:
+                    notional_exit = lever_shares * price
+
+                exit_cost = _exit_cost(notional_exit, params.fee_rate, params.tax_rate, slip_rate)
+                if exit_cost > 0.0:
+                    cash -= exit_cost
+                    exit_cost_total += exit_cost
+                    cost_paid_total += exit_cost
+
+                cash += proceeds
+                cash -= borrow_principal
+
+                if cur_trade is not None:
+                    cur_trade["exit_date"] = date
+                    cur_trade["exit_price"] = price
+                    cur_trade["hold_days"] = int(hold_days)
+                    cur_trade["exit_reason"] = str(exit_reason)
+                    cur_trade["exit_cost"] = float(exit_cost)
+                    cost_paid = float(cur_trade.get("entry_cost", 0.0) + cur_trade.get("exit_cost", 0.0))
+                    cur_trade["cost_paid"] = float(cost_paid)
+                    lever_leg_pnl = float(proceeds - float(cur_trade.get("borrow_principal", 0.0)))
+                    cur_trade["lever_leg_pnl"] = float(lever_leg_pnl)
+                    net_after_costs = lever_leg_pnl - float(cur_trade.get("interest_paid", 0.0)) - cost_paid
+                    cur_trade["net_lever_pnl_after_costs"] = float(net_after_costs)
+                    trades.append(cur_trade)
+
+                if exit_reason == "exit_z":
+                    exit_count_by_exit_z += 1
+                elif exit_reason == "max_hold_days":
+                    exit_count_by_max_hold_days += 1
+                elif exit_reason == "trend_off":
+                    exit_count_by_trend_off += 1
+
+                borrow_principal = 0.0
+                lever_shares = 0.0
+                in_lever = False
+                cur_trade = None
+                hold_days = 0
+
+                exited_today = True
+
+        # entry logic (apply RV20 filter only when entry would otherwise be allowed)
+        if not in_lever:
+            if exited_today:
+                if _entry_signal(i):
+                    skipped_entries_same_day_exit += 1
+            else:
+                if forbid[i]:
+                    if _entry_signal(i):
+                        skipped_entries_on_forbidden += 1
+                else:
+                    if _entry_signal(i):
+                        if _rv20_block(i):
+                            skipped_entries_on_rv20 += 1
+                        else:
+                            equity_flat = (base_shares + lever_shares) * price + cash - borrow_principal
+                            if equity_flat <= 0.0:
+                                skipped_entries_on_nonpositive_equity += 1
+                            elif lever_shares_target > 0.0:
+                                borrow = float(lever_shares_target * price)
+                                if borrow > 0.0:
+                                    if params.cost_on == "all":
+                                        notional_entry = (base_shares + lever_shares_target) * price
+                                    else:
+                                        notional_entry = lever_shares_target * price
+
+                                    entry_cost = _entry_cost(notional_entry, params.fee_rate, slip_rate)
+                                    if entry_cost > 0.0:
+                                        cash -= entry_cost
+                                        entry_cost_total += entry_cost
+                                        cost_paid_total += entry_cost
+
+                                    borrow_principal = borrow
+                                    lever_shares = lever_shares_target
+                                    in_lever = True
+                                    hold_days = 0
+
+                                    zf_entry = _to_finite_float(z_raw)
+                                    cur_trade = {
+                                        "entry_date": date,
+                                        "entry_price": price,
+                                        "entry_z": zf_entry,
+                                        "borrow_principal": float(borrow_principal),
+                                        "lever_shares": float(lever_shares),
+                                        "entry_cost": float(entry_cost),
+                                        "exit_cost": 0.0,
+                                        "cost_paid": float(entry_cost),
+                                        "interest_paid": 0.0,
+                                    }
+
+        total_shares_eod = base_shares + lever_shares
+        equity_eod = total_shares_eod * price + cash - borrow_principal
+        eq_arr[i] = float(equity_eod)
+        base_arr[i] = float(base_now)
+        lev_on_arr[i] = bool(in_lever)
+
+    open_at_end = bool(in_lever)
+    if in_lever and cur_trade is not None and n > 0:
+        last_price = float(prices[-1])
+        last_date = str(dates[-1])
+        proceeds = lever_shares * last_price
+
+        if params.cost_on == "all":
+            notional_exit = (base_shares + lever_shares) * last_price
+        else:
+            notional_exit = lever_shares * last_price
+
+        exit_cost = _exit_cost(notional_exit, params.fee_rate, params.tax_rate, slip_rate)
+        if exit_cost > 0.0:
+            cash -= exit_cost
+            exit_cost_total += exit_cost
+            cost_paid_total += exit_cost
+
+        cash += proceeds
+        cash -= borrow_principal
+
+        cur_trade["exit_date"] = last_date
+        cur_trade["exit_price"] = last_price
+        cur_trade["hold_days"] = int(hold_days)
+        cur_trade["exit_reason"] = "end_of_data"
+        cur_trade["exit_cost"] = float(exit_cost)
+        cost_paid = float(cur_trade.get("entry_cost", 0.0) + float(cur_trade.get("exit_cost", 0.0)))
+        cur_trade["cost_paid"] = float(cost_paid)
+        cur_trade["lever_leg_pnl"] = float(proceeds - float(cur_trade.get("borrow_principal", 0.0)))
+        net_after_costs = float(cur_trade["lever_leg_pnl"]) - float(cur_trade.get("interest_paid", 0.0)) - cost_paid
+        cur_trade["net_lever_pnl_after_costs"] = float(net_after_costs)
+        trades.append(cur_trade)
+
+        forced_eod_close += 1
+        exit_count_by_end_of_data += 1
+
+        in_lever = False
+        borrow_principal = 0.0
+        lever_shares = 0.0
+        cur_trade = None
+
+        equity_final = base_shares * last_price + cash
+        eq_arr[-1] = float(equity_final)
+        lev_on_arr[-1] = False
+
+    return {
+        "equity": eq_arr,
+        "lever_on": lev_on_arr,
+        "trades": trades,
+        "counters": {
+            "skipped_entries_on_forbidden": skipped_entries_on_forbidden,
+            "skipped_entries_on_nonpositive_equity": skipped_entries_on_nonpositive_equity,
+            "skipped_entries_same_day_exit": skipped_entries_same_day_exit,
+            "skipped_entries_on_rv20": skipped_entries_on_rv20,
+            "exit_count_by_exit_z": exit_count_by_exit_z,
+            "exit_count_by_max_hold_days": exit_count_by_max_hold_days,
+            "exit_count_by_trend_off": exit_count_by_trend_off,
+            "exit_count_by_end_of_data": exit_count_by_end_of_data,
+            "forced_eod_close": forced_eod_close,
+            "margin_call_count": margin_call_count,
+        },
+        "totals": {
+            "interest_paid_total": interest_paid_total,
+            "entry_cost_total": entry_cost_total,
+            "exit_cost_total": exit_cost_total,
+            "cost_paid_total": cost_paid_total,
+            "min_maint_ratio": min_maint_ratio,
+            "open_at_end": open_at_end,
+        },
+    }
+
+
+def make_params(**kw: Any) -> Params:
+    base: Dict[str, Any] = dict(
+        bb_window=60, bb_ddof=0, entry_z=-1.5, exit_z=0.0, leverage_frac=0.5, borrow_apr=0.035,
+        max_hold_days=60, trading_days=252, skip_contaminated=True, contam_horizon=60, z_clear_days=60,
+        fee_rate=0.001425, tax_rate=0.0010, slip_bps=5.0, cost_on="lever", entry_mode="bb",
+        trend_rule="price_gt_ma60", trend_ma_fast=20, trend_ma_slow=60, perf_ddof=0,
+        maintenance_margin=0.0, maint_ratio_mode="equity_over_lever_notional",
+    )
+    base.update(kw)
+    return Params(**base)
+
+
+def param_grid(k: int) -> List[Params]:
+    """k parameter sets covering every entry mode, exit path, cost mode and maintenance mode."""
+    combos = itertools.product(
+        ["bb", "always", "trend"],
+        [(-2.0, 0.0), (-1.5, 0.5), (-1.0, -0.5)],
+        [0.2, 0.5, 1.5],
+        [0, 20, 60],
+        [("lever", 0.0, MAINT_RATIO_MODES[0]), ("all", 0.35, MAINT_RATIO_MODES[0]),
+         ("lever", 1.1, MAINT_RATIO_MODES[1]), ("all", 0.3, MAINT_RATIO_MODES[2])],
+        ["price_gt_ma60", "ma20_gt_ma60"],
+    )
+    out: List[Params] = []
+    for mode, (ez, xz), lf, mh, (co, mm, mrm), tr in combos:
+        out.append(make_params(entry_mode=mode, entry_z=ez, exit_z=xz, leverage_frac=lf, max_hold_days=mh,
+                               cost_on=co, maintenance_margin=mm, maint_ratio_mode=mrm, trend_rule=tr))
+    rng = np.random.default_rng(0)
+    idx = rng.permutation(len(out))[: max(int(k), 1)]
+    return [out[i] for i in sorted(idx.tolist())]
+
+
+def load_frame(args: argparse.Namespace) -> Tuple[pd.DataFrame, str]:
+    if int(args.synthetic_n) > 0:
+        rng = np.random.default_rng(int(args.seed))
+        n = int(args.synthetic_n)
+        px = 50.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.013, n)))
+        dts = pd.bdate_range("1900-01-01", periods=n)
+        df = pd.DataFrame({"date": dts.strftime("%Y-%m-%d"), "date_ts": dts, "price": px})
+        return df, f"synthetic n={n} seed={args.seed}"
+    df = pd.read_csv(args.csv)
+    df["date_ts"] = pd.to_datetime(df["date"], errors="coerce")
+    df["price"] = pd.to_numeric(df[args.col], errors="coerce")
+    df = df.dropna(subset=["date_ts", "price"]).reset_index(drop=True)
+    return df[["date", "date_ts", "price"]], f"{args.csv} col={args.col}"
+
+
+def forbid_mask(n: int) -> List[bool]:
+    """Synthetic forbid windows (every 997th row blocks the next 40 entries)."""
+    m = [False] * n
+    for b in range(500, n, 997):
+        for i in range(b, min(b + 40, n)):
+            m[i] = True
+    return m
+
+
+def _same(a: Dict[str, Any], b: Dict[str, Any], dates: np.ndarray) -> List[str]:
+    bad: List[str] = []
+    if not np.array_equal(np.asarray(a["equity"]), np.asarray(b["equity"])):
+        bad.append("equity")
+    if not np.array_equal(np.asarray(a["lever_on"]), np.asarray(b["lever_on"])):
+        bad.append("lever_on")
+    ta = a["trades"] if isinstance(a["trades"], list) else trades_to_dicts(a["trades"], dates)
+    tb = b["trades"] if isinstance(b["trades"], list) else trades_to_dicts(b["trades"], dates)
+    if ta != tb or [list(t) for t in ta] != [list(t) for t in tb]:
+        bad.append("trades")
+    if {k: int(a["counters"][k]) for k in COUNTER_FIELDS} != {k: int(b["counters"][k]) for k in COUNTER_FIELDS}:
+        bad.append("counters")
+    if a["totals"] != b["totals"]:
+        bad.append("totals")
+    return bad
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=str(Path(__file__).resolve().parents[1] / "tw0050_bb_cache" / "data.csv"))
+    ap.add_argument("--col", default="adjclose")
+    ap.add_argument("--synthetic-n", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--k", type=int, default=32, help="parameter sets (max 648)")
+    ap.add_argument("--skip-legacy", action="store_true", help="time single vs batch only (long series)")
+    args = ap.parse_args()
+
+    df_raw, src = load_frame(args)
+    plist = param_grid(int(args.k))
+    frames = [_prepare_backtest_frame(df_raw, p, None) for p in plist]
+    base_shares = frames[0][1]
+    n = int(len(frames[0][0]))
+    dates = frames[0][0]["date"].astype(str).to_numpy()
+    fb = forbid_mask(n)
+    masks = [fb if p.entry_mode == "bb" else None for p in plist]
+    sigs = [_signals(d, p) for (d, _), p in zip(frames, plist)]
+    specs = [_sim_spec(p, base_shares) for p in plist]
+    prices = frames[0][0]["price"].to_numpy(dtype=float)
+    print(f"[bench] source={src} rows={n} K={len(plist)}")
+
+    t0 = time.perf_counter()
+    single = [simulate(prices, s, np.asarray(m, dtype=bool) if m is not None else None, sp, base_shares)
+              for s, m, sp in zip(sigs, masks, specs)]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = simulate_batch(prices, sigs, [np.asarray(m, dtype=bool) if m is not None else None for m in masks],
+                           specs, base_shares)
+    t_batch = time.perf_counter() - t0
+
+    failures: List[str] = []
+    t_legacy = None
+    if not args.skip_legacy:
+        t0 = time.perf_counter()
+        legacy = [legacy_loop(d, p, m) for (d, _), p, m in zip(frames, plist, masks)]
+        t_legacy = time.perf_counter() - t0
+        for j, (lg, sg) in enumerate(zip(legacy, single)):
+            for b in _same(lg, sg, dates):
+                failures.append(f"set {j} ({plist[j].entry_mode}): single != legacy: {b}")
+    for j, (sg, bt) in enumerate(zip(single, batch)):
+        for b in _same(sg, bt, dates):
+            failures.append(f"set {j} ({plist[j].entry_mode}): batch != single: {b}")
+
+    trades = sum(int(s["n_trades"]) for s in single)
+    calls = sum(int(s["counters"]["margin_call_count"]) for s in single)
+    print(f"[bench] trades={trades} margin_calls={calls}")
+    if t_legacy is not None:
+        print(f"[bench] legacy  {t_legacy * 1e3:9.1f} ms  ({t_legacy / len(plist) * 1e3:7.2f} ms/set)")
+    print(f"[bench] single  {t_single * 1e3:9.1f} ms  ({t_single / len(plist) * 1e3:7.2f} ms/set)"
+          + (f"  x{t_legacy / t_single:.1f} vs legacy" if t_legacy else ""))
+    print(f"[bench] batch   {t_batch * 1e3:9.1f} ms  ({t_batch / len(plist) * 1e3:7.2f} ms/set)"
+          + (f"  x{t_legacy / t_batch:.1f} vs legacy" if t_legacy else f"  x{t_single / t_batch:.1f} vs single"))
+
+    if failures:
+        for f in failures[:20]:
+            print(f"[FAIL] {f}", file=sys.stderr)
+        return 1
+    print("OK: legacy / single / batch identical" if t_legacy is not None else "OK: single / batch identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+check_price_breaks.py
+
+Conformance check for scripts/price_breaks.py (shared break detection + contamination masks).
+
+1) Pinned: break indices/dates on tw0050_bb_cache/data.csv (close and adjclose) at the
+   default thresholds must equal PINNED_BREAKS.
+2) Legacy parity: on data.csv every legacy loop (copied below as it was before the shared
+   module) must give exactly the same breaks and masks as the shared implementation, for
+   several horizons / z_clear_days.
+3) Edge cases: synthetic series with exact-threshold ratios and non-positive prices.
+   The shared rule is checked against its documented definition; the cases where the old
+   callers disagreed are printed for the record.
+
+Exit code 0 = all checks passed, 1 = mismatch.
+
+Usage:
+    python tools/check_price_breaks.py
+    python tools/check_price_breaks.py --csv tw0050_bb_cache/data.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from price_breaks import break_positions, contamination_mask, detect_break_flags  # noqa: E402
+
+RATIO_HI = 1.8
+RATIO_LO = 0.5555555556
+
+# data.csv as of the shared-module change (2009-01-02 .. 2026-03-13): 0050 1:4 split style break
+PINNED_BREAKS: Dict[str, List[str]] = {
+    "close": ["2014-01-02"],
+    "adjclose": ["2014-01-02"],
+}
+
+
+# ---- legacy reference implementations (verbatim logic) ----
+
+def legacy_forwardmdd_breaks(prices: np.ndarray, ratio_hi: float, ratio_lo: float) -> np.ndarray:
+    n = len(prices)
+    breaks = np.zeros(n, dtype=bool)
+    for i in range(1, n):
+        a = prices[i - 1]
+        b = prices[i]
+        if not np.isfinite(a) or not np.isfinite(b) or a <= 0 or b <= 0:
+            continue
+        r = b / a
+        if r >= ratio_hi or r <= ratio_lo:
+            breaks[i] = True
+    return breaks
+
+
+def legacy_clean_entry_mask(n: int, breaks: np.ndarray, fwd_days: int) -> np.ndarray:
+    mask = np.ones(n, dtype=bool)
+    for j in np.where(breaks)[0]:
+        lo = max(0, j - fwd_days)
+        hi = min(n, j)
+        mask[lo:hi] = False
+    return mask
+
+
+def legacy_builder_break_positions(price: pd.Series, hi: float, lo: float) -> np.ndarray:
+    px = price.astype(float)
+    ratio = px / px.shift(1)
+    bad = ratio.isna() | ~np.isfinite(ratio)
+    ratio = ratio.mask(bad)
+    is_break = ((ratio > hi) | (ratio < lo)).fillna(False)
+    return np.where(is_break.values)[0]
+
+
+def legacy_builder_contam(n: int, break_pos: np.ndarray, horizon: int) -> np.ndarray:
+    if n <= 0 or break_pos.size == 0:
+        return np.zeros(n, dtype=bool)
+    delta = np.zeros(n + 1, dtype=int)
+    for i in break_pos:
+        if i <= 0:
+            continue
+        start = max(0, int(i) - int(horizon))
+        end = int(i)
+        if start < end:
+            delta[start] += 1
+            delta[end] -= 1
+    return np.cumsum(delta[:-1]) > 0
+
+
+def legacy_backtest_break_idxs(px: np.ndarray, ratio_hi: float, ratio_lo: float) -> np.ndarray:
+    if len(px) < 2:
+        return np.zeros(0, dtype=int)
+    p0 = px[:-1]
+    p1 = px[1:]
+    valid = np.isfinite(p0) & np.isfinite(p1) & (p0 > 0.0)
+    ratio = np.full_like(p1, np.nan, dtype=float)
+    ratio[valid] = p1[valid] / p0[valid]
+    mask = (ratio >= float(ratio_hi)) | (ratio <= float(ratio_lo))
+    return (np.where(mask & np.isfinite(ratio))[0] + 1).astype(int)
+
+
+def legacy_forbidden_mask(n: int, idxs: List[int], contam_horizon: int, z_clear_days: int) -> List[bool]:
+    forbid = [False] * int(n)
+    ch = max(int(contam_horizon), 0)
+    zc = max(int(z_clear_days), 0)
+    for bi in idxs:
+        lo = max(bi - ch, 0)
+        hi = min(bi + zc - 1, n - 1)
+        for i in range(lo, hi + 1):
+            forbid[i] = True
+    return forbid
+
+
+# ---- checks ----
+
+def check_series(name: str, px: np.ndarray, dates: np.ndarray, failures: List[str]) -> None:
+    pos = break_positions(px, RATIO_HI, RATIO_LO)
+    got_dates = [str(d) for d in dates[pos]]
+    if name in PINNED_BREAKS and got_dates != PINNED_BREAKS[name]:
+        failures.append(f"{name}: pinned breaks {PINNED_BREAKS[name]} != {got_dates}")
+
+    flags = detect_break_flags(px, RATIO_HI, RATIO_LO)
+    if not np.array_equal(flags, legacy_forwardmdd_breaks(px, RATIO_HI, RATIO_LO)):
+        failures.append(f"{name}: detect_break_flags != legacy forwardmdd loop")
+    if not np.array_equal(pos, legacy_builder_break_positions(pd.Series(px), RATIO_HI, RATIO_LO)):
+        failures.append(f"{name}: break_positions != legacy builder")
+    if not np.array_equal(pos, legacy_backtest_break_idxs(px, RATIO_HI, RATIO_LO)):
+        failures.append(f"{name}: break_positions != legacy backtest")
+
+    n = len(px)
+    for h in (0, 1, 5, 10, 20, 60, 250):
+        new = contamination_mask(n, pos, horizon=h)
+        if not np.array_equal(~new, legacy_clean_entry_mask(n, flags, h)):
+            failures.append(f"{name}: clean mask h={h} mismatch")
+        if not np.array_equal(new, legacy_builder_contam(n, pos, h)):
+            failures.append(f"{name}: builder contam h={h} mismatch")
+        for zc in (0, 1, 5, 20):
+            fm = contamination_mask(n, pos, horizon=h, clear_days=zc).tolist()
+            if fm != legacy_forbidden_mask(n, pos.tolist(), h, zc):
+                failures.append(f"{name}: forbidden mask h={h} zc={zc} mismatch")
+
+    print(f"[{name}] n={n} breaks={got_dates}")
+
+
+def check_edges(failures: List[str]) -> None:
+    cases: Dict[str, np.ndarray] = {
+        "exact_hi": np.array([10.0, 18.0, 18.0]),
+        "exact_lo": np.array([18.0, 10.0, 10.0]),
+        "zero_next": np.array([10.0, 0.0, 10.0]),
+        "negative_next": np.array([10.0, -5.0, 10.0]),
+        "nan_gap": np.array([10.0, np.nan, 30.0, 30.0]),
+    }
+    for name, px in cases.items():
+        flags = detect_break_flags(px, 1.8, 10.0 / 18.0)
+        expect = np.zeros(len(px), dtype=bool)
+        for j in range(1, len(px)):
+            a, b = px[j - 1], px[j]
+            if np.isfinite(a) and np.isfinite(b) and a > 0 and b > 0:
+                r = b / a
+                expect[j] = bool(r >= 1.8 or r <= 10.0 / 18.0)
+        if not np.array_equal(flags, expect):
+            failures.append(f"edge {name}: {flags.tolist()} != {expect.tolist()}")
+
+        row: Dict[str, Any] = {
+            "shared": np.flatnonzero(flags).tolist(),
+            "old_builder": legacy_builder_break_positions(pd.Series(px), 1.8, 10.0 / 18.0).tolist(),
+            "old_backtest": legacy_backtest_break_idxs(px, 1.8, 10.0 / 18.0).tolist(),
+        }
+        print(f"[edge] {name:<14} {row}")
+
+    # mask clipping: breaks near both ends and out-of-range indices (stats samples can be stale)
+    n = 10
+    for idxs in ([0], [9], [12], [-3], [2, 3, 8]):
+        for h, zc in ((0, 0), (3, 0), (3, 2), (0, 4)):
+            fm = contamination_mask(n, idxs, horizon=h, clear_days=zc).tolist()
+            if fm != legacy_forbidden_mask(n, idxs, h, zc):
+                failures.append(f"edge mask idxs={idxs} h={h} zc={zc} mismatch")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=str(Path(__file__).resolve().parents[1] / "tw0050_bb_cache" / "data.csv"))
+    args = ap.parse_args()
+
+    df = pd.read_csv(args.csv)
+    failures: List[str] = []
+    for col in ("close", "adjclose"):
+        if col not in df.columns:
+            continue
+        sub = df[["date", col]].copy()
+        sub[col] = pd.to_numeric(sub[col], errors="coerce")
+        sub = sub.dropna(subset=[col]).reset_index(drop=True)
+        check_series(col, sub[col].to_numpy(dtype=float), sub["date"].astype(str).to_numpy(), failures)
+    check_edges(failures)
+
+    if failures:
+        for f in failures:
+            print(f"[FAIL] {f}", file=sys.stderr)
+        return 1
+    print("OK: price_breaks conformance passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
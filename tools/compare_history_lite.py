@@ -34,6 +34,8 @@ Usage:
     python compare_history_lite.py --periods 7,30,90,180,365
     python compare_history_lite.py --json-out out.json
     python compare_history_lite.py --csv-out out.csv
+    python compare_history_lite.py --series-dir cache/history_series --series DGS10
+      (partitioned store: reads only <series>.jsonl; full capped history instead of the lite window)
 """
 
 from __future__ import annotations
@@ -100,6 +102,51 @@ def load_rows(path: Path) -> List[Row]:
     if not isinstance(obj, list):
         raise ValueError("history_lite.json must be a list of dict rows")
 
+    return rows_from_records(obj, str(path))
+
+
+def load_rows_partitioned(series_dir: Path, series_ids: Optional[List[str]] = None) -> List[Row]:
+    """
+    Load from the per-series store written by scripts/fred_cache.py (history_series/).
+    Only the requested series files are parsed. Replay matches the writer: later line wins
+    per data_date, then keep the last cap_per_series dates.
+    """
+    index_path = series_dir / "index.json"
+    with index_path.open("r", encoding="utf-8") as f:
+        index = json.load(f)
+
+    entries = index.get("series", {}) if isinstance(index, dict) else {}
+    if not isinstance(entries, dict):
+        raise ValueError(f"bad partition index: {index_path}")
+
+    cap = int(index.get("cap_per_series", 0) or 0)
+    wanted = series_ids if series_ids else sorted(entries.keys())
+    records: List[Dict[str, Any]] = []
+    for sid in wanted:
+        ent = entries.get(sid)
+        if not isinstance(ent, dict):
+            continue
+        by_date: Dict[str, Dict[str, Any]] = {}
+        with (series_dir / str(ent.get("file", f"{sid}.jsonl"))).open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(rec, dict):
+                    by_date[str(rec.get("data_date", ""))] = rec
+        dates = sorted(by_date.keys())
+        if cap > 0:
+            dates = dates[-cap:]
+        records.extend(by_date[dd] for dd in dates)
+
+    return rows_from_records(records, str(series_dir))
+
+
+def rows_from_records(obj: List[Any], source_label: str) -> List[Row]:
     out: List[Row] = []
     for r in obj:
         if not isinstance(r, dict):
@@ -125,7 +172,7 @@ def load_rows(path: Path) -> List[Row]:
         )
 
     if not out:
-        raise ValueError("No valid rows parsed from history_lite.json")
+        raise ValueError(f"No valid rows parsed from {source_label}")
 
     return out
 
@@ -258,6 +305,7 @@ def write_csv(path: Path, results: Dict[str, List[Dict[str, Any]]]) -> None:
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--file", default="cache/history_lite.json", help="Input JSON path")
+    parser.add_argument("--series-dir", default=None, help="Optional partitioned store dir (cache/history_series); overrides --file")
     parser.add_argument("--series", default=None, help="Optional series_id filter")
     parser.add_argument("--periods", default="7,30,90,180,365", help="Comma-separated lookback days")
     parser.add_argument("--json-out", default=None, help="Optional JSON output path")
@@ -266,7 +314,10 @@ def main() -> None:
 
     periods = [int(x.strip()) for x in args.periods.split(",") if x.strip()]
 
-    rows = load_rows(Path(args.file))
+    if args.series_dir:
+        rows = load_rows_partitioned(Path(args.series_dir), [args.series] if args.series else None)
+    else:
+        rows = load_rows(Path(args.file))
     grouped = dedupe_and_group(rows)
 
     if args.series:
@@ -283,7 +334,7 @@ def main() -> None:
     print_report(results)
 
     meta = {
-        "source_file": args.file,
+        "source_file": args.series_dir or args.file,
         "series_filter": args.series,
         "periods": periods,
         "generated_at": datetime.now().isoformat(timespec="seconds"),
@@ -26,6 +26,13 @@ Outputs (to --out):
 - 03_z60_vs_rank252_scatter.png
 - 04_ret1_signed_pct.png   (保留正負號)
 - 04_ret1_abs_pct.png      (真正的 abs 版本：|ret1%|)
+
+資料來源（2026-10-16）：
+- 優先讀取 roll25_store.npz + roll25_derived.npz（scripts/roll25_store.py 的欄式完整歷史與預先計算序列）：
+  INDEX_%CHG = chart.pct_change、AMPL_% = chart.amplitude_pct（與下方 points_to_df 逐列補齊同定義），
+  TURNOVERx20 = vol_multiplier_20（與報表同一欄；前 20 日有效值、至少 15 點，同 compute_metrics）。
+- store 缺失/與 derived 不一致/比 roll25.json 舊，或 --min-points-volmult 不是 store 的設定時，
+  退回原本的 roll25.json 逐列解析與推導。
 """
 
 from __future__ import annotations
@@ -33,6 +40,7 @@ from __future__ import annotations
 import argparse
 import json
 import math
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -45,6 +53,10 @@ import matplotlib
 matplotlib.use("Agg", force=True)
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import roll25_store  # noqa: E402
+
 
 # -----------------------------
 # Matplotlib font (best-effort for CJK)
@@ -425,6 +437,40 @@ def points_to_df(points: List[Dict[str, Any]]) -> pd.DataFrame:
     return df
 
 
+def load_store_df(cache_dir: Path, points: List[Dict[str, Any]]) -> Tuple[Optional[pd.DataFrame], str]:
+    """
+    Columnar store -> the points_to_df() columns (ascending) plus precomputed vol_multiplier_20.
+    Returns (None, reason) when the store is missing, its derived sidecar does not match it,
+    or it is older than the newest roll25.json point.
+    """
+    store_path, derived_path = roll25_store.store_paths(str(cache_dir))
+    st = roll25_store.load_store(store_path, derived_path)
+    if st is None:
+        return None, "store missing/unreadable"
+    if st.derived is None:
+        return None, "derived sidecar missing or stale"
+    if len(st) == 0:
+        return None, "store empty"
+    newest = max((str(p.get("date", "")) for p in points if isinstance(p, dict)), default="")
+    if st.last_date < newest:
+        return None, f"store last_date={st.last_date} < roll25 newest={newest}"
+
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(st.dates),
+            "turnover_twd": st.series("trade_value"),
+            "close": st.series("close"),
+            "change": st.series("change"),
+            "pct_change_close": st.series("chart.pct_change"),
+            "amplitude_pct": st.series("chart.amplitude_pct"),
+            "high": st.series("high"),
+            "low": st.series("low"),
+            "vol_multiplier_20": st.series("vol_multiplier_20"),
+        }
+    )
+    return df, f"{roll25_store.STORE_NAME} rows={len(st)}"
+
+
 # -----------------------------
 # Metrics
 # -----------------------------
@@ -436,10 +482,11 @@ def compute_metrics(df: pd.DataFrame, min_points_20: int = 15) -> pd.DataFrame:
         if col not in df.columns:
             df[col] = np.nan
 
-    # vol_multiplier_20：用「前 20 日（不含今天）」的成交金額均值當分母
-    tv = df["turnover_twd"].astype(float)
-    roll_mean_20_prev = tv.shift(1).rolling(window=20, min_periods=min_points_20).mean()
-    df["vol_multiplier_20"] = tv / roll_mean_20_prev
+    # vol_multiplier_20：用「前 20 日（不含今天）」的成交金額均值當分母（store 已預先計算時沿用）
+    if "vol_multiplier_20" not in df.columns:
+        tv = df["turnover_twd"].astype(float)
+        roll_mean_20_prev = tv.shift(1).rolling(window=20, min_periods=min_points_20).mean()
+        df["vol_multiplier_20"] = tv / roll_mean_20_prev
 
     i = len(df) - 1
     if i < 1:
@@ -764,7 +811,16 @@ def main() -> int:
     ensure_dir(out_dir)
 
     points, meta = load_points(cache_dir)
-    df_points = points_to_df(points)
+    df_points = None
+    if args.min_points_volmult == roll25_store.VOL_MIN_POINTS:
+        df_points, store_note = load_store_df(cache_dir, points)
+    else:
+        store_note = f"--min-points-volmult={args.min_points_volmult} != store {roll25_store.VOL_MIN_POINTS}"
+    if df_points is not None:
+        meta.source = store_note
+    else:
+        print(f"[INFO] roll25 store not used ({store_note}); deriving from {meta.source}")
+        df_points = points_to_df(points)
 
     used_dt = parse_date_any(meta.used_date) if meta.used_date else None
     latest_dt = pd.Timestamp(df_points["date"].iloc[-1]).normalize()